@@ -0,0 +1,6 @@
+"""
+성능 측정 스크립트 모음
+
+실행 방법 (backend 디렉터리에서):
+    python -m benchmarks.<모듈명> [옵션]
+"""
@@ -0,0 +1,62 @@
+"""
+로그인(비밀번호 검증) 처리량 벤치마크
+
+password_hasher와 같은 경로(PasswordHasher.verify)로 동시 로그인 요청을 흉내 내어
+워커 프로세스 수별 초당 검증 수와 코어당 처리량을 출력.
+비교 기준으로 이벤트 루프 스레드에서 직접 검증하는 경우(inline)도 함께 측정.
+
+실행:
+    python -m benchmarks.login_throughput [--requests 200] [--rounds 29000] [--workers 1 2 4]
+"""
+import argparse
+import asyncio
+import os
+import time
+from typing import List
+
+from src.services.password_hashing import PASSWORD_HASH_ROUNDS, PasswordHasher, crypt_context
+
+
+async def _measure(hasher: PasswordHasher, hashed: str, requests: int) -> float:
+    """requests개의 검증을 동시에 요청하여 초당 처리 수 반환."""
+    await hasher.verify("benchmark-password", hashed)  # 워커 기동 비용 제외
+    start = time.perf_counter()
+    results = await asyncio.gather(*(hasher.verify("benchmark-password", hashed) for _ in range(requests)))
+    elapsed = time.perf_counter() - start
+    assert all(verified for verified, _ in results)
+    return requests / elapsed
+
+
+def _measure_inline(hashed: str, rounds: int, requests: int) -> float:
+    context = crypt_context(rounds)
+    start = time.perf_counter()
+    for _ in range(requests):
+        context.verify("benchmark-password", hashed)
+    return requests / (time.perf_counter() - start)
+
+
+def run(requests: int, rounds: int, worker_counts: List[int]) -> None:
+    hashed = crypt_context(rounds).hash("benchmark-password")
+    print(f"pbkdf2_sha256 rounds={rounds}, {requests} concurrent logins, {os.cpu_count()} CPUs")
+    print(f"{'mode':<12}{'logins/s':>12}{'per core':>12}")
+
+    inline = _measure_inline(hashed, rounds, requests)
+    print(f"{'inline':<12}{inline:>12.1f}{inline:>12.1f}")
+
+    for workers in worker_counts:
+        hasher = PasswordHasher(workers=workers, max_pending=requests + 1, rounds=rounds)
+        try:
+            throughput = asyncio.run(_measure(hasher, hashed, requests))
+        finally:
+            hasher.stop()
+        print(f"{f'pool x{workers}':<12}{throughput:>12.1f}{throughput / workers:>12.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure password verification throughput per core")
+    parser.add_argument("--requests", type=int, default=200, help="concurrent logins per run")
+    parser.add_argument("--rounds", type=int, default=PASSWORD_HASH_ROUNDS, help="pbkdf2_sha256 rounds")
+    parser.add_argument("--workers", type=int, nargs="+", default=sorted({1, os.cpu_count() or 1}),
+                        help="process pool sizes to measure")
+    args = parser.parse_args()
+    run(args.requests, args.rounds, args.workers)
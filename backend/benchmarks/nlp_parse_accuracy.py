@@ -0,0 +1,105 @@
+"""
+자연어 작업 파싱 정확도/지연 시간 벤치마크
+
+라벨링된 문장 모음(nlp_parse_corpus.json)을 고정된 기준 시각으로 파싱하여
+경로별 필드 정확도와 지연 시간(p50/p95)을 출력.
+
+- rules: 규칙 기반 파서만 사용 (모든 문장)
+- fast path: 신뢰도가 기준 이상이라 AI 없이 응답한 문장만 (규칙 적용률과 그 정확도)
+- llm: 모든 문장을 Gemini로 분석 (--llm, GOOGLE_API_KEY 필요, 캐시 미사용)
+- hybrid: NaturalLanguageParser와 같은 경로 (신뢰도 기준 이상은 규칙, 나머지는 Gemini)
+
+실행:
+    python -m benchmarks.nlp_parse_accuracy [--min-confidence 0.8] [--llm]
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.services import ai_service
+from src.services.ai_cache import AIResponseCache
+from src.services.nlp_parser import NLP_RULES_MIN_CONFIDENCE, KoreanRuleParser
+
+CORPUS_PATH = os.path.join(os.path.dirname(__file__), "nlp_parse_corpus.json")
+FIELDS = ("description", "due_date", "priority", "estimated_time_minutes")
+
+Outcome = Tuple[Dict[str, Any], Dict[str, Any], float]  # (정답, 결과, 지연 초)
+
+
+def _matches(field: str, expected: Any, actual: Any) -> bool:
+    if field == "description":
+        return "".join(str(expected).split()) == "".join(str(actual or "").split())
+    return expected == actual
+
+
+def _report(name: str, outcomes: List[Outcome]) -> None:
+    if not outcomes:
+        print(f"{name:<12}{'-':>6}")
+        return
+    accuracies = []
+    for field in FIELDS:
+        labelled = [(expected, actual) for expected, actual, _ in outcomes if field in expected]
+        correct = sum(_matches(field, expected[field], actual.get(field)) for expected, actual in labelled)
+        accuracies.append(correct / len(labelled) if labelled else 1.0)
+    exact = sum(all(_matches(field, expected[field], actual.get(field)) for field in expected)
+                for expected, actual, _ in outcomes) / len(outcomes)
+    latencies = sorted(latency * 1000 for _, _, latency in outcomes)
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+    print(f"{name:<12}{len(outcomes):>6}" + "".join(f"{accuracy:>10.0%}" for accuracy in accuracies)
+          + f"{exact:>8.0%}{statistics.median(latencies):>11.2f}{p95:>11.2f}")
+
+
+async def _analyze(text: str, now: datetime) -> Tuple[Dict[str, Any], float]:
+    start = time.perf_counter()
+    result = await ai_service.analyze_task_from_natural_language(text, now=now)
+    return result, time.perf_counter() - start
+
+
+async def run(min_confidence: float, use_llm: bool) -> None:
+    with open(CORPUS_PATH, encoding="utf-8") as f:
+        corpus = json.load(f)
+    now = datetime.fromisoformat(corpus["now"])
+    cases = corpus["cases"]
+    parser = KoreanRuleParser()
+
+    rules: List[Outcome] = []
+    confident: List[bool] = []
+    for case in cases:
+        start = time.perf_counter()
+        result, confidence = parser.parse(case["text"], now)
+        rules.append((case["expected"], result, time.perf_counter() - start))
+        confident.append(confidence >= min_confidence)
+
+    llm: Optional[List[Outcome]] = None
+    if use_llm:
+        # 같은 문장의 두 번째 호출이 캐시로 빨라지지 않도록 파싱 결과 캐시를 끔
+        ai_service.ai_cache = AIResponseCache(path=None, ttls={"analyze_task_from_natural_language": 0})
+        llm = []
+        for case in cases:
+            result, latency = await _analyze(case["text"], now)
+            llm.append((case["expected"], result, latency))
+
+    covered = sum(confident)
+    print(f"{len(cases)} cases, now={corpus['now']}, min confidence {min_confidence}, "
+          f"fast path {covered}/{len(cases)} ({covered / len(cases):.0%})")
+    print(f"{'path':<12}{'cases':>6}" + "".join(f"{label:>10}" for label in ("desc", "due", "priority", "minutes"))
+          + f"{'exact':>8}{'p50 ms':>11}{'p95 ms':>11}")
+    _report("rules", rules)
+    _report("fast path", [outcome for outcome, ok in zip(rules, confident) if ok])
+    if llm is not None:
+        _report("llm", llm)
+        _report("hybrid", [rule if ok else ai for rule, ai, ok in zip(rules, llm, confident)])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure rule-based vs Gemini task parsing accuracy and latency")
+    parser.add_argument("--min-confidence", type=float, default=NLP_RULES_MIN_CONFIDENCE,
+                        help="confidence needed to skip Gemini")
+    parser.add_argument("--llm", action="store_true", help="also parse every case with Gemini (needs GOOGLE_API_KEY)")
+    args = parser.parse_args()
+    asyncio.run(run(args.min_confidence, args.llm))
@@ -1,7 +1,10 @@
 """
-인증 API 라우터 모듈 (Firestore)
+인증 API 라우터 모듈
 
 사용자 인증 관련 REST API 엔드포인트를 정의.
+저장 엔진(Firestore/SQLite)은 storage 모듈이 선택한 서비스 구현을 사용.
+모든 엔드포인트는 async def이며, 비밀번호 해싱/검증은 프로세스 풀(password_hasher),
+네이버/카카오 OAuth 호출은 공유 연결 풀 클라이언트(oauth_http)에서 실행.
 
 주요 엔드포인트:
 - POST /auth/register: 사용자 등록
@@ -17,25 +20,19 @@
 - 카카오 OAuth 2.0
 """
 import os
-import requests
 from datetime import timedelta
 
+import httpx
+
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from firebase_admin import auth as firebase_auth
 
 from ..schemas import Token, UserCreate, SocialLoginRequest, NaverCallbackRequest, KakaoCallbackRequest
-
-# 환경 변수에서 DB 타입 확인
-USE_FIRESTORE = os.getenv("USE_FIRESTORE", "false").lower() == "true"
-
-if USE_FIRESTORE:
-    from ..services import auth_service_firestore as auth_service
-else:
-    from ..services import auth_service
-    from ..database import get_db
-    from sqlalchemy.orm import Session
-    from ..models.user import User
+from ..services import security, storage
+from ..services.firebase_tokens import firebase_token_verifier
+from ..services.oauth_http import oauth_http, provider_unavailable_exception
+from ..services.password_hashing import password_hasher
+from ..services.storage import auth_service, get_current_user
 
 router = APIRouter()
 
@@ -45,10 +42,16 @@ NAVER_CLIENT_SECRET = os.getenv("NAVER_CLIENT_SECRET")
 KAKAO_CLIENT_ID = os.getenv("KAKAO_CLIENT_ID")
 KAKAO_CLIENT_SECRET = os.getenv("KAKAO_CLIENT_SECRET")
 
+# OAuth 제공자 엔드포인트
+NAVER_TOKEN_URL = "https://nid.naver.com/oauth2.0/token"
+NAVER_PROFILE_URL = "https://openapi.naver.com/v1/nid/me"
+KAKAO_TOKEN_URL = "https://kauth.kakao.com/oauth/token"
+KAKAO_PROFILE_URL = "https://kapi.kakao.com/v2/user/me"
+
 
 # ==================== 기본 인증 엔드포인트 ====================
 @router.post("/register", status_code=status.HTTP_201_CREATED)
-def register_user(user_create: UserCreate):
+async def register_user(user_create: UserCreate):
     """
     사용자 등록.
     
@@ -59,75 +62,45 @@ def register_user(user_create: UserCreate):
         등록 성공 메시지
     
     Raises:
-        400: 이미 등록된 username
+        400: 이미 등록된 username (중복 확인은 create_user가 생성과 원자적으로 수행)
+        503: 비밀번호 해싱 대기열 초과
     """
-    """사용자 등록"""
-    if USE_FIRESTORE:
-        # Firestore 버전
-        existing_user = auth_service.get_user_by_username(user_create.username)
-        if existing_user:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Username already registered"
-            )
-        
-        hashed_password = auth_service.get_password_hash(user_create.password)
-        auth_service.create_user(user_create.username, user_create.email, hashed_password)
-        
-    else:
-        # SQLite 버전
-        db = next(get_db())
-        try:
-            user = db.query(User).filter(User.username == user_create.username).first()
-            if user:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Username already registered"
-                )
-            
-            hashed_password = auth_service.get_password_hash(user_create.password)
-            db_user = User(
-                username=user_create.username,
-                hashed_password=hashed_password,
-                email=user_create.email
-            )
-            db.add(db_user)
-            db.commit()
-            db.refresh(db_user)
-        finally:
-            db.close()
+    hashed_password = await password_hasher.hash(user_create.password)
+    created_user = await auth_service.create_user(user_create.username, user_create.email, hashed_password)
+    if created_user is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Username already registered"
+        )
     
     return {"message": "User registered successfully"}
 
 
 @router.post("/login", response_model=Token)
-def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends()):
-    """로그인 및 액세스 토큰 발급"""
-    if USE_FIRESTORE:
-        # Firestore 버전
-        user = auth_service.get_user_by_username(form_data.username)
-        if not user or not auth_service.verify_password(form_data.password, user['hashed_password']):
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Incorrect username or password",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-    else:
-        # SQLite 버전
-        db = next(get_db())
-        try:
-            user = db.query(User).filter(User.username == form_data.username).first()
-            if not user or not auth_service.verify_password(form_data.password, user.hashed_password):
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Incorrect username or password",
-                    headers={"WWW-Authenticate": "Bearer"},
-                )
-        finally:
-            db.close()
+async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends()):
+    """
+    로그인 및 액세스 토큰 발급.
+
+    저장된 해시가 현재 해싱 설정보다 약하면 검증에 성공한 비밀번호로 다시 해싱하여 저장.
+
+    Raises:
+        401: username 또는 비밀번호 불일치
+        503: 비밀번호 해싱 대기열 초과
+    """
+    user = await auth_service.get_user_by_username(form_data.username)
+    verified, new_hash = (await password_hasher.verify(form_data.password, user['hashed_password'])
+                          if user else (False, None))
+    if not verified:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Incorrect username or password",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    if new_hash:
+        await auth_service.update_password_hash(user, new_hash)
     
-    access_token_expires = timedelta(minutes=auth_service.ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = auth_service.create_access_token(
+    access_token_expires = timedelta(minutes=security.ACCESS_TOKEN_EXPIRE_MINUTES)
+    access_token = security.create_access_token(
         data={"sub": form_data.username}, expires_delta=access_token_expires
     )
     return {"access_token": access_token, "token_type": "bearer"}
@@ -135,18 +108,18 @@ def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends()):
 
 @router.post("/social-login", response_model=Token)
 # [추가] 소셜 로그인(Google, GitHub) 엔드포인트 – OAuth 인증 지원
-def social_login(social_login_req: SocialLoginRequest):
+async def social_login(social_login_req: SocialLoginRequest):
     """소셜 로그인 (Google, GitHub)"""
-    if not USE_FIRESTORE:
+    # Firebase ID 토큰 검증에는 Firebase Admin SDK 초기화가 필요
+    if storage.STORAGE_ENGINE != "firestore":
         raise HTTPException(
             status_code=status.HTTP_501_NOT_IMPLEMENTED,
             detail="Social login is only supported with Firestore"
         )
     
     try:
-        # Firebase ID 토큰 검증
-        from firebase_admin import auth as firebase_auth
-        decoded_token = firebase_auth.verify_id_token(social_login_req.id_token)
+        # Firebase ID 토큰 검증 (캐시된 Google 인증서로 로컬 검증, 같은 토큰은 검증 결과 재사용)
+        decoded_token = await firebase_token_verifier.verify(social_login_req.id_token)
         firebase_uid = decoded_token['uid']
         
         # 사용자 정보 생성 또는 조회
@@ -155,29 +128,35 @@ def social_login(social_login_req: SocialLoginRequest):
         username = f"google_{email_prefix}"
         
         # 기존 사용자 확인
-        existing_user = auth_service.get_user_by_username(username)
+        existing_user = await auth_service.get_user_by_username(username)
         
         if not existing_user:
             # 새 사용자 생성 (소셜 로그인은 비밀번호 불필요)
             # 랜덤 비밀번호 생성 (실제로는 사용되지 않음)
             import secrets
             random_password = secrets.token_urlsafe(32)
-            hashed_password = auth_service.get_password_hash(random_password)
+            hashed_password = await password_hasher.hash(random_password)
             
-            auth_service.create_user(
+            await auth_service.create_user(
                 username=username,
                 email=social_login_req.email,
                 hashed_password=hashed_password
             )
         
         # JWT 토큰 생성
-        access_token_expires = timedelta(minutes=auth_service.ACCESS_TOKEN_EXPIRE_MINUTES)
-        access_token = auth_service.create_access_token(
+        access_token_expires = timedelta(minutes=security.ACCESS_TOKEN_EXPIRE_MINUTES)
+        access_token = security.create_access_token(
             data={"sub": username}, expires_delta=access_token_expires
         )
         
         return {"access_token": access_token, "token_type": "bearer"}
         
+    except HTTPException:
+        # 해싱 대기열 초과(503) 등은 그대로 전달
+        raise
+    except httpx.HTTPError:
+        # Google 인증서를 받을 수 없음
+        raise provider_unavailable_exception("Google")
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -188,17 +167,10 @@ def social_login(social_login_req: SocialLoginRequest):
 
 @router.post("/naver-callback", response_model=Token)
 # [추가] 네이버 로그인 콜백 처리 – OAuth 2.0 인증 흐름
-def naver_callback(callback_req: NaverCallbackRequest):
+async def naver_callback(callback_req: NaverCallbackRequest):
     """네이버 OAuth 콜백 처리"""
-    if not USE_FIRESTORE:
-        raise HTTPException(
-            status_code=status.HTTP_501_NOT_IMPLEMENTED,
-            detail="Social login is only supported with Firestore"
-        )
-    
     try:
         # 1. 액세스 토큰 발급
-        token_url = "https://nid.naver.com/oauth2.0/token"
         token_params = {
             "grant_type": "authorization_code",
             "client_id": NAVER_CLIENT_ID,
@@ -207,7 +179,7 @@ def naver_callback(callback_req: NaverCallbackRequest):
             "state": callback_req.state
         }
         
-        token_response = requests.post(token_url, params=token_params)
+        token_response = await oauth_http.post(NAVER_TOKEN_URL, params=token_params)
         token_data = token_response.json()
         
         if "access_token" not in token_data:
@@ -219,10 +191,9 @@ def naver_callback(callback_req: NaverCallbackRequest):
         access_token = token_data["access_token"]
         
         # 2. 사용자 정보 조회
-        profile_url = "https://openapi.naver.com/v1/nid/me"
         headers = {"Authorization": f"Bearer {access_token}"}
         
-        profile_response = requests.get(profile_url, headers=headers)
+        profile_response = await oauth_http.get(NAVER_PROFILE_URL, headers=headers)
         profile_data = profile_response.json()
         
         if profile_data.get("resultcode") != "00":
@@ -243,22 +214,22 @@ def naver_callback(callback_req: NaverCallbackRequest):
         else:
             username = f"naver_{user_info.get('id')}"
         
-        existing_user = auth_service.get_user_by_username(username)
+        existing_user = await auth_service.get_user_by_username(username)
         
         if not existing_user:
             import secrets
             random_password = secrets.token_urlsafe(32)
-            hashed_password = auth_service.get_password_hash(random_password)
+            hashed_password = await password_hasher.hash(random_password)
             
-            auth_service.create_user(
+            await auth_service.create_user(
                 username=username,
                 email=email or f"{username}@naver.social",
                 hashed_password=hashed_password
             )
         
         # 4. JWT 토큰 생성
-        access_token_expires = timedelta(minutes=auth_service.ACCESS_TOKEN_EXPIRE_MINUTES)
-        jwt_token = auth_service.create_access_token(
+        access_token_expires = timedelta(minutes=security.ACCESS_TOKEN_EXPIRE_MINUTES)
+        jwt_token = security.create_access_token(
             data={"sub": username}, expires_delta=access_token_expires
         )
         
@@ -266,6 +237,9 @@ def naver_callback(callback_req: NaverCallbackRequest):
         
     except HTTPException:
         raise
+    except httpx.HTTPError:
+        # 재시도 후에도 제공자 연결 실패/타임아웃/5xx
+        raise provider_unavailable_exception("Naver")
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -275,17 +249,10 @@ def naver_callback(callback_req: NaverCallbackRequest):
 
 @router.post("/kakao-callback", response_model=Token)
 # [추가] 카카오 로그인 콜백 처리 – OAuth 2.0 인증 흐름
-def kakao_callback(callback_req: KakaoCallbackRequest):
+async def kakao_callback(callback_req: KakaoCallbackRequest):
     """카카오 OAuth 콜백 처리"""
-    if not USE_FIRESTORE:
-        raise HTTPException(
-            status_code=status.HTTP_501_NOT_IMPLEMENTED,
-            detail="Social login is only supported with Firestore"
-        )
-    
     try:
         # 1. 액세스 토큰 발급
-        token_url = "https://kauth.kakao.com/oauth/token"
         token_data = {
             "grant_type": "authorization_code",
             "client_id": KAKAO_CLIENT_ID,
@@ -296,7 +263,7 @@ def kakao_callback(callback_req: KakaoCallbackRequest):
         if KAKAO_CLIENT_SECRET:
             token_data["client_secret"] = KAKAO_CLIENT_SECRET
         
-        token_response = requests.post(token_url, data=token_data)
+        token_response = await oauth_http.post(KAKAO_TOKEN_URL, data=token_data)
         token_result = token_response.json()
         
         if "access_token" not in token_result:
@@ -308,10 +275,9 @@ def kakao_callback(callback_req: KakaoCallbackRequest):
         access_token = token_result["access_token"]
         
         # 2. 사용자 정보 조회
-        profile_url = "https://kapi.kakao.com/v2/user/me"
         headers = {"Authorization": f"Bearer {access_token}"}
         
-        profile_response = requests.get(profile_url, headers=headers)
+        profile_response = await oauth_http.get(KAKAO_PROFILE_URL, headers=headers)
         profile_data = profile_response.json()
         
         kakao_account = profile_data.get("kakao_account", {})
@@ -333,25 +299,25 @@ def kakao_callback(callback_req: KakaoCallbackRequest):
         else:
             username = f"kakao_{profile_data.get('id')}"
         
-        existing_user = auth_service.get_user_by_username(username)
+        existing_user = await auth_service.get_user_by_username(username)
         
         if not existing_user:
             import secrets
             random_password = secrets.token_urlsafe(32)
-            hashed_password = auth_service.get_password_hash(random_password)
+            hashed_password = await password_hasher.hash(random_password)
             
             # 이메일이 없으면 가상 이메일 생성
             user_email = email if email else f"{username}@kakao.social"
             
-            auth_service.create_user(
+            await auth_service.create_user(
                 username=username,
                 email=user_email,
                 hashed_password=hashed_password
             )
         
         # 4. JWT 토큰 생성
-        access_token_expires = timedelta(minutes=auth_service.ACCESS_TOKEN_EXPIRE_MINUTES)
-        jwt_token = auth_service.create_access_token(
+        access_token_expires = timedelta(minutes=security.ACCESS_TOKEN_EXPIRE_MINUTES)
+        jwt_token = security.create_access_token(
             data={"sub": username}, expires_delta=access_token_expires
         )
         
@@ -359,6 +325,9 @@ def kakao_callback(callback_req: KakaoCallbackRequest):
         
     except HTTPException:
         raise
+    except httpx.HTTPError:
+        # 재시도 후에도 제공자 연결 실패/타임아웃/5xx
+        raise provider_unavailable_exception("Kakao")
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -368,7 +337,7 @@ def kakao_callback(callback_req: KakaoCallbackRequest):
 
 # [추가] 회원탈퇴 엔드포인트
 @router.delete("/me", status_code=status.HTTP_200_OK)
-def delete_my_account(current_user = Depends(auth_service.get_current_user)):
+async def delete_my_account(current_user = Depends(get_current_user)):
     """
     현재 로그인한 사용자의 계정 삭제 (회원탈퇴).
     
@@ -377,14 +346,8 @@ def delete_my_account(current_user = Depends(auth_service.get_current_user)):
     Returns:
         삭제 성공 메시지
     """
-    if not USE_FIRESTORE:
-        raise HTTPException(
-            status_code=status.HTTP_501_NOT_IMPLEMENTED,
-            detail="Account deletion is only supported with Firestore"
-        )
-    
     try:
-        auth_service.delete_user(current_user.id)
+        await auth_service.delete_user(current_user.id)
         return {"message": "Account deleted successfully"}
     except Exception as e:
         raise HTTPException(
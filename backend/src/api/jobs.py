@@ -0,0 +1,65 @@
+"""
+백그라운드 작업 API 라우터 모듈
+
+Prefer: respond-async로 요청한 AI 생성(POST /todos/generate, /todos/items/{id}/generate-subtasks)의
+진행 상황과 결과를 조회. 작업은 만든 사용자만 조회할 수 있음.
+
+주요 엔드포인트:
+- GET /jobs/{id}: 작업 상태 조회 (폴링용)
+- GET /jobs/{id}/events: 작업 상태가 바뀔 때마다 SSE(text/event-stream)로 전송, 작업이 끝나면 종료
+"""
+import json
+from typing import Any, AsyncIterator
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
+
+from ..services.job_queue import job_queue
+from ..services.storage import get_current_user
+from ..schemas import JobResponse
+
+
+router = APIRouter()
+
+
+def _job_not_found() -> HTTPException:
+    return HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job(
+    job_id: str,
+    current_user: Any = Depends(get_current_user),
+):
+    """작업 상태 조회 (queued → running → succeeded/failed, 성공 시 result 포함)."""
+    job = await job_queue.get(job_id, current_user)
+    if job is None:
+        raise _job_not_found()
+    return job
+
+
+async def _job_events(job_id: str, current_user: Any) -> AsyncIterator[str]:
+    async for job in job_queue.watch(job_id, current_user):
+        payload = json.dumps(JobResponse.model_validate(job).model_dump(mode="json"), ensure_ascii=False)
+        yield f"event: {job['status']}\ndata: {payload}\n\n"
+
+
+@router.get("/{job_id}/events")
+async def get_job_events(
+    job_id: str,
+    current_user: Any = Depends(get_current_user),
+):
+    """
+    작업 상태 변화를 SSE로 전송.
+
+    Events:
+        queued / running / succeeded / failed: 해당 상태가 된 작업 (GET /jobs/{id} 응답과 같은 형식).
+        처음에 현재 상태를 보내고, succeeded/failed 이벤트 후 스트림 종료.
+    """
+    if await job_queue.get(job_id, current_user) is None:
+        raise _job_not_found()
+    return StreamingResponse(
+        _job_events(job_id, current_user),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,40 +1,96 @@
 """
-할 일 API 라우터 모듈 (Firestore)
+할 일 API 라우터 모듈
 
 할 일 관련 REST API 엔드포인트를 정의.
+저장 엔진(Firestore/SQLite)은 storage 모듈이 선택한 서비스 구현을 사용.
+모든 엔드포인트는 async def이며 서비스 함수를 await로 호출.
+AI 생성/분석 엔드포인트(generate, generate/stream, generate-subtasks, parse-and-create-item(s))는
+사용자별 AI 한도/일일 할당량(rate_limit.ai_limit)을 함께 사용하며, 나머지는 공용 한도를 사용.
 
 주요 엔드포인트:
 - POST /todos/items: 빠른 작업 추가 (AI 파싱 없음)
 - POST /todos/parse-and-create-item: 자연어 파싱 기반 작업 생성
-- POST /todos/generate: AI 기반 프로젝트 생성
-- POST /todos/items/{id}/generate-subtasks: 서브태스크 AI 생성
+- POST /todos/parse-and-create-items: 여러 줄 자연어 일괄 가져오기 (줄별 결과 반환)
+- POST /todos/generate: AI 기반 프로젝트 생성 (Prefer: respond-async면 202 + 백그라운드 작업)
+- POST /todos/generate/stream: AI 기반 프로젝트 생성 (아이템마다 저장 후 SSE 이벤트 전송)
+- POST /todos/items/{id}/generate-subtasks: 서브태스크 AI 생성 (Prefer: respond-async면 202 + 백그라운드 작업)
 - GET /todos: 전체 프로젝트 목록 조회
 - GET /todos/{id}: 특정 프로젝트 조회
 - PUT /todos/{id}: 프로젝트 업데이트
 - PUT /todos/items/{id}: 아이템 업데이트
+- POST /todos/items:batch: 여러 아이템 일괄 업데이트
+- POST /todos/items/{id}/move: 아이템 이동 (순서/부모 변경)
 - DELETE /todos/items/{id}: 아이템 삭제
 - DELETE /todos/{id}: 프로젝트 삭제
 """
-from typing import List, Any
-import os
+import json
+import uuid
+from typing import List, Any, AsyncIterator, Dict, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status, Body
+from fastapi import APIRouter, Depends, HTTPException, status, Body, Header, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
 
-from ..services.auth_service_firestore import get_current_user
-from ..services import todo_service_firestore as todo_service
-from ..services.nlp_parser import nlp_parser
+from ..services.storage import get_current_user, todo_service
+from ..services.nlp_parser import NLP_BATCH_MAX_LINES, nlp_parser
+from ..services.generation_stream import stream_todo_list_generation
+from ..services.single_flight import SingleFlight
+from ..services.job_queue import job_queue
+from ..services.rate_limit import ai_limit
 from ..schemas import (
     ToDoListCreate, ToDoListResponse, ToDoItemUpdate, 
-    ToDoItemResponse, ToDoListUpdate, NaturalLanguageTaskCreate
+    ToDoItemResponse, ToDoListUpdate, NaturalLanguageTaskCreate,
+    NaturalLanguageTaskBatchCreate, NaturalLanguageTaskBatchResult,
+    ToDoItemBatchUpdate, ToDoItemBatchResult, ToDoItemMove, JobResponse
 )
 
 
 router = APIRouter()
 
+# 아이템별 진행 중인 하위 작업 생성 (더블 클릭/재시도가 하위 작업을 중복 생성하지 않도록)
+subtask_generations = SingleFlight()
+
+
+# ==================== 백그라운드 작업 ====================
+def _respond_async(prefer: Optional[str]) -> bool:
+    """Prefer 헤더에 respond-async가 있는지 (RFC 7240)."""
+    return prefer is not None and "respond-async" in [part.strip().lower() for part in prefer.split(",")]
+
+
+def _accepted(job: Dict[str, Any]) -> JSONResponse:
+    """작업을 넣은 뒤의 202 응답 (Location: 작업 상태 URL)."""
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content=JobResponse.model_validate(job).model_dump(mode="json"),
+        headers={"Location": f"/jobs/{job['id']}", "Preference-Applied": "respond-async"},
+    )
+
+
+# 작업은 중단되면 처음부터 다시 실행되므로(job_queue), 생성 ID를 작업 ID에서 파생해
+# 이미 저장된 결과가 있으면 다시 만들지 않음
+async def _generate_todo_list_job(user: Any, params: Dict[str, Any], job_id: str) -> Dict[str, Any]:
+    list_id = str(uuid.UUID(job_id))
+    todo_list = await todo_service.create_todo_list_with_ai_items(user, params["keyword"], list_id=list_id)
+    return ToDoListResponse.model_validate(todo_list).model_dump(mode="json")
+
+
+async def _create_subtasks_job(user: Any, params: Dict[str, Any], job_id: str) -> Dict[str, Any]:
+    item_id = params["item_id"]
+    updated_parent_item = await subtask_generations.run(
+        (user.id, item_id), lambda: todo_service.create_subtasks_for_item(user, item_id, request_id=job_id),
+        "create_subtasks_for_item",
+    )
+    if not updated_parent_item:
+        raise LookupError("Parent item not found or not authorized")
+    return ToDoItemResponse.model_validate(updated_parent_item).model_dump(mode="json")
+
+
+job_queue.register("generate_todo_list", _generate_todo_list_job)
+job_queue.register("create_subtasks_for_item", _create_subtasks_job)
+
 
 # ==================== 아이템 생성 엔드포인트 ====================
 @router.post("/items", response_model=ToDoItemResponse)
-def create_todo_item_fast(
+async def create_todo_item_fast(
     description: str = Body(...),
     list_id: str = Body(...),
     priority: str = Body("none"),
@@ -60,65 +116,32 @@ def create_todo_item_fast(
     Raises:
         404: 프로젝트를 찾을 수 없거나 권한 없음
     """
-    from datetime import datetime
-    from zoneinfo import ZoneInfo
-    import uuid
-    from ..firestore_db import get_firestore_db
-    
-    db = get_firestore_db()
-    
     # Validate priority
     valid_priorities = ["high", "medium", "low", "none"]
     if priority not in valid_priorities:
         priority = "none"
     
-    # Verify list exists and belongs to user
-    list_doc = db.collection('todo_lists').document(list_id).get()
-    if not list_doc.exists or list_doc.to_dict().get('user_id') != current_user.id:
+    new_item = await todo_service.create_todo_item(
+        current_user,
+        list_id,
+        description=description,
+        priority=priority,
+        due_date=due_date,
+        parent_id=parent_id,
+    )
+    if not new_item:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="To-Do List not found or you do not have permission to access it.",
         )
-    
-    # Get order for new item (count items at the same parent level)
-    items_query = db.collection('todo_items').where('todo_list_id', '==', list_id).where('parent_id', '==', parent_id).stream()
-    order = sum(1 for _ in items_query)
-    
-    # Create item
-    item_id = str(uuid.uuid4())
-    
-    # Handle due date if provided
-    due_date_obj = None
-    if due_date:
-        try:
-            naive_dt = datetime.fromisoformat(due_date)
-            kst = ZoneInfo("Asia/Seoul")
-            due_date_obj = naive_dt.replace(tzinfo=kst)
-        except (ValueError, TypeError):
-            due_date_obj = None
-    
-    new_item_doc = {
-        "id": item_id,
-        "todo_list_id": list_id,
-        "parent_id": parent_id,  # [수정] 요청에서 받은 parent_id 사용
-        "description": description,
-        "is_completed": False,
-        "order": order,
-        "priority": priority,
-        "due_date": due_date_obj,
-        "reminder_date": None,
-        "created_at": datetime.now(ZoneInfo("Asia/Seoul")),
-        "updated_at": datetime.now(ZoneInfo("Asia/Seoul")),
-    }
-    
-    db.collection('todo_items').document(item_id).set(new_item_doc)
-    
-    # Return created item
-    return todo_service.get_todo_item_by_id(item_id)
+    return new_item
 
 
 @router.post("/parse-and-create-item", response_model=ToDoItemResponse)
-def parse_and_create_todo_item(
+@ai_limit
+async def parse_and_create_todo_item(
+    request: Request,
+    response: Response,
     task_create: NaturalLanguageTaskCreate,
     current_user: Any = Depends(get_current_user),
 ):
@@ -126,7 +149,7 @@ def parse_and_create_todo_item(
     Parses a natural language string to create a new ToDo item.
     """
     # 1. Parse the natural language text to get structured data
-    parsed_data = nlp_parser.parse_task(task_create.text)
+    parsed_data = await nlp_parser.parse_task(task_create.text, user_id=current_user.id)
     if not parsed_data:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -134,7 +157,7 @@ def parse_and_create_todo_item(
         )
 
     # 2. Create the ToDo item in the specified list
-    new_item = todo_service.create_todo_item_from_parsed_data(
+    new_item = await todo_service.create_todo_item_from_parsed_data(
         user=current_user,
         list_id=task_create.list_id,
         parsed_data=parsed_data
@@ -149,94 +172,248 @@ def parse_and_create_todo_item(
     return new_item
 
 
-@router.post("/generate", response_model=ToDoListResponse)
-def generate_todo_list(
+@router.post("/parse-and-create-items", response_model=List[NaturalLanguageTaskBatchResult])
+@ai_limit
+async def parse_and_create_todo_items(
+    request: Request,
+    response: Response,
+    task_batch: NaturalLanguageTaskBatchCreate,
+    current_user: Any = Depends(get_current_user),
+):
+    """
+    여러 줄 자연어 일괄 가져오기 (Quick Add에 목록을 붙여넣은 경우).
+
+    모든 줄을 한 번에 파싱하고(규칙 기반 파서, 나머지는 AI 일괄 분석 한 번)
+    파싱된 줄을 입력 순서대로 프로젝트 루트 맨 뒤에 한 번의 일괄 쓰기로 추가.
+    빈 줄은 'skipped', 파싱하지 못한 줄은 'failed'로 보고하고 저장하지 않음.
+
+    Raises:
+        400: 줄 수가 NLP_BATCH_MAX_LINES 초과
+        404: 프로젝트를 찾을 수 없거나 권한 없음
+    """
+    if len(task_batch.lines) > NLP_BATCH_MAX_LINES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Too many lines (max {NLP_BATCH_MAX_LINES}).",
+        )
+    line_numbers = [number for number, line in enumerate(task_batch.lines) if line.strip()]
+    parsed = await nlp_parser.parse_tasks(
+        [task_batch.lines[number].strip() for number in line_numbers], user_id=current_user.id,
+    )
+    parsed_lines = [(number, data) for number, data in zip(line_numbers, parsed) if data is not None]
+
+    new_items = await todo_service.create_todo_items_from_parsed_data(
+        current_user, task_batch.list_id, [data for _, data in parsed_lines],
+    )
+    if new_items is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="To-Do List not found or you do not have permission to access it.",
+        )
+
+    results = [{"line": number, "status": "skipped"} for number in range(len(task_batch.lines))]
+    for number in line_numbers:
+        results[number] = {"line": number, "status": "failed", "detail": "Could not parse the line."}
+    for (number, _), item in zip(parsed_lines, new_items):
+        results[number] = {"line": number, "status": "created", "item": item}
+    return results
+
+
+@router.post("/generate", response_model=ToDoListResponse, responses={202: {"model": JobResponse}})
+@ai_limit
+async def generate_todo_list(
+    request: Request,
+    response: Response,
     todo_list_create: ToDoListCreate,
     current_user: Any = Depends(get_current_user),
+    prefer: Optional[str] = Header(None),
 ):
-    """AI를 사용하여 새로운 Todo 리스트 생성"""
-    todo_list = todo_service.create_todo_list_with_ai_items(current_user, todo_list_create.keyword)
+    """
+    AI를 사용하여 새로운 Todo 리스트 생성
+
+    Prefer: respond-async 헤더가 있으면 백그라운드 작업으로 넣고 바로 202를 반환
+    (결과는 GET /jobs/{id}의 result, 형식은 이 엔드포인트의 200 응답과 같음).
+    """
+    if _respond_async(prefer):
+        return _accepted(await job_queue.enqueue("generate_todo_list", current_user,
+                                                 {"keyword": todo_list_create.keyword}))
+    todo_list = await todo_service.create_todo_list_with_ai_items(current_user, todo_list_create.keyword)
     return todo_list
 
 
-@router.post("/items/{item_id}/generate-subtasks", response_model=ToDoItemResponse)
-def generate_subtasks_for_item(
+def _sse_payload(event: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    """이벤트 데이터를 REST 응답과 같은 스키마로 직렬화."""
+    if event in ("list", "done"):
+        return ToDoListResponse.model_validate(data).model_dump(mode="json")
+    if event == "item":
+        item = ToDoItemResponse.model_validate(data).model_dump(mode="json")
+        return {**item, "parent_id": data.get("parent_id"), "path": data["path"]}
+    return data
+
+
+async def _sse_events(current_user: Any, keyword: str) -> AsyncIterator[str]:
+    async for event, data in stream_todo_list_generation(current_user, keyword):
+        payload = json.dumps(_sse_payload(event, data), ensure_ascii=False)
+        yield f"event: {event}\ndata: {payload}\n\n"
+
+
+@router.post("/generate/stream")
+@ai_limit
+async def generate_todo_list_stream(
+    request: Request,
+    response: Response,
+    todo_list_create: ToDoListCreate,
+    current_user: Any = Depends(get_current_user),
+):
+    """
+    AI를 사용하여 새로운 Todo 리스트를 생성하며 진행 상황을 SSE(text/event-stream)로 전송.
+
+    Gemini 스트리밍 응답에서 아이템이 완성될 때마다 저장하고 item 이벤트를 보내므로
+    첫 아이템이 전체 생성 완료를 기다리지 않고 표시됨.
+
+    Events:
+        list: 생성된 빈 프로젝트
+        item: 저장된 아이템 (parent_id, path 포함, 부모가 먼저)
+        error: 일부 아이템 저장 후 생성 실패 (저장된 아이템은 유지)
+        done: 전체 프로젝트 (POST /todos/generate 응답과 같은 형식)
+    """
+    return StreamingResponse(
+        _sse_events(current_user, todo_list_create.keyword),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/items/{item_id}/generate-subtasks", response_model=ToDoItemResponse,
+             responses={202: {"model": JobResponse}})
+@ai_limit
+async def generate_subtasks_for_item(
+    request: Request,
+    response: Response,
     item_id: str,
     current_user: Any = Depends(get_current_user),
+    prefer: Optional[str] = Header(None),
 ):
-    """특정 아이템의 하위 작업 AI 생성"""
-    updated_parent_item = todo_service.create_subtasks_for_item(current_user, item_id)
+    """
+    특정 아이템의 하위 작업 AI 생성.
+
+    같은 사용자의 같은 아이템에 대한 생성이 진행 중이면 새로 생성하지 않고
+    진행 중인 생성의 결과를 함께 반환 (하위 작업이 한 번만 추가됨).
+    Prefer: respond-async 헤더가 있으면 백그라운드 작업으로 넣고 바로 202를 반환
+    (아이템이 없으면 작업이 failed로 끝남).
+    """
+    if _respond_async(prefer):
+        return _accepted(await job_queue.enqueue("create_subtasks_for_item", current_user, {"item_id": item_id}))
+    updated_parent_item = await subtask_generations.run(
+        (current_user.id, item_id),
+        lambda: todo_service.create_subtasks_for_item(current_user, item_id),
+        "create_subtasks_for_item",
+    )
     if not updated_parent_item:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Parent item not found or not authorized")
     return updated_parent_item
 
 
 @router.get("", response_model=List[ToDoListResponse])
-def get_all_todo_lists(
+async def get_all_todo_lists(
     current_user: Any = Depends(get_current_user),
 ):
     """사용자의 모든 Todo 리스트 조회"""
-    todo_lists = todo_service.get_todo_lists_by_user(current_user)
+    todo_lists = await todo_service.get_todo_lists_by_user(current_user)
     return todo_lists
 
 
 @router.get("/{list_id}", response_model=ToDoListResponse)
-def get_single_todo_list(
+async def get_single_todo_list(
     list_id: str,
     current_user: Any = Depends(get_current_user),
 ):
     """특정 Todo 리스트 상세 조회"""
-    todo_list = todo_service.get_todo_list_by_id(list_id, current_user)
+    todo_list = await todo_service.get_todo_list_by_id(list_id, current_user)
     if not todo_list:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="To-Do List not found or not authorized")
     return todo_list
 
 
 @router.put("/{list_id}", response_model=ToDoListResponse)
-def update_todo_list_endpoint(
+async def update_todo_list_endpoint(
     list_id: str,
     list_update: ToDoListUpdate,
     current_user: Any = Depends(get_current_user),
 ):
     """Todo 리스트 업데이트"""
-    updated_list = todo_service.update_todo_list(list_id, current_user, list_update)
+    updated_list = await todo_service.update_todo_list(list_id, current_user, list_update)
     if not updated_list:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="To-Do List not found or not authorized")
     return updated_list
 
 
 @router.put("/items/{item_id}", response_model=ToDoItemResponse)
-def update_todo_item_endpoint(
+async def update_todo_item_endpoint(
     item_id: str,
     item_update: ToDoItemUpdate,
     current_user: Any = Depends(get_current_user),
 ):
     """Todo 아이템 업데이트"""
-    updated_item = todo_service.update_todo_item(item_id, current_user, item_update)
+    updated_item = await todo_service.update_todo_item(item_id, current_user, item_update)
     if not updated_item:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="To-Do Item not found or not authorized")
     return updated_item
 
 
+@router.post("/items:batch", response_model=List[ToDoItemBatchResult])
+async def batch_update_todo_items_endpoint(
+    updates: List[ToDoItemBatchUpdate],
+    current_user: Any = Depends(get_current_user),
+):
+    """
+    여러 Todo 아이템 일괄 업데이트.
+    
+    드래그 앤 드롭/정렬 후 순서 저장처럼 다수 아이템을 동시에 수정할 때 사용.
+    권한이 없거나 존재하지 않는 아이템은 'not_found'로 보고하고 나머지는 적용.
+    """
+    return await todo_service.batch_update_todo_items(current_user, updates)
+
+
+@router.post("/items/{item_id}/move", response_model=ToDoItemResponse)
+async def move_todo_item_endpoint(
+    item_id: str,
+    move: ToDoItemMove,
+    current_user: Any = Depends(get_current_user),
+):
+    """
+    Todo 아이템 이동.
+    
+    드래그 앤 드롭 후 이동한 아이템 하나만 기록 (형제 재번호 매김 없음).
+    """
+    try:
+        moved_item = await todo_service.move_todo_item(item_id, current_user, move)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if not moved_item:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="To-Do Item not found or not authorized")
+    return moved_item
+
+
 @router.delete("/items/{item_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_todo_item_endpoint(
+async def delete_todo_item_endpoint(
     item_id: str,
     current_user: Any = Depends(get_current_user),
 ):
     """Todo 아이템 삭제"""
-    success = todo_service.delete_todo_item(item_id, current_user)
+    success = await todo_service.delete_todo_item(item_id, current_user)
     if not success:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="To-Do Item not found or not authorized")
     return
 
 
 @router.delete("/{list_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_todo_list_endpoint(
+async def delete_todo_list_endpoint(
     list_id: str,
     current_user: Any = Depends(get_current_user),
 ):
     """Todo 리스트 삭제"""
-    success = todo_service.delete_todo_list(list_id, current_user)
+    success = await todo_service.delete_todo_list(list_id, current_user)
     if not success:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="To-Do List not found or not authorized")
     return
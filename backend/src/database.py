@@ -0,0 +1,135 @@
+"""
+SQLite 데이터베이스 모듈
+
+Firestore 없이 자체 호스팅/부하 테스트 환경에서 사용하는 로컬 저장 엔진.
+
+주요 기능:
+- 스레드별 SQLite 연결 관리 (WAL 모드)
+- 스키마 및 인덱스 생성
+- 재귀 CTE 기반 서브트리 조회/삭제 쿼리
+
+환경 변수:
+- SQLITE_PATH: 데이터베이스 파일 경로 (기본값: taskgenie.db)
+"""
+import os
+import sqlite3
+import threading
+
+SQLITE_PATH = os.getenv("SQLITE_PATH", "taskgenie.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id TEXT PRIMARY KEY,
+    username TEXT NOT NULL,
+    email TEXT,
+    hashed_password TEXT NOT NULL,
+    created_at TEXT,
+    updated_at TEXT
+);
+CREATE UNIQUE INDEX IF NOT EXISTS ix_users_username ON users (username);
+
+CREATE TABLE IF NOT EXISTS todo_lists (
+    id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL REFERENCES users (id) ON DELETE CASCADE,
+    keyword TEXT NOT NULL,
+    color TEXT,
+    icon TEXT,
+    created_at TEXT,
+    updated_at TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_todo_lists_user_id ON todo_lists (user_id);
+
+CREATE TABLE IF NOT EXISTS todo_items (
+    id TEXT PRIMARY KEY,
+    todo_list_id TEXT NOT NULL REFERENCES todo_lists (id) ON DELETE CASCADE,
+    user_id TEXT NOT NULL,
+    parent_id TEXT REFERENCES todo_items (id) ON DELETE CASCADE,
+    description TEXT NOT NULL,
+    is_completed INTEGER NOT NULL DEFAULT 0,
+    "order" INTEGER NOT NULL DEFAULT 0,
+    rank TEXT NOT NULL,
+    priority TEXT NOT NULL DEFAULT 'none',
+    due_date TEXT,
+    reminder_date TEXT,
+    created_at TEXT,
+    updated_at TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_todo_items_list_parent ON todo_items (todo_list_id, parent_id, rank);
+CREATE INDEX IF NOT EXISTS ix_todo_items_parent_id ON todo_items (parent_id);
+CREATE INDEX IF NOT EXISTS ix_todo_items_user_id ON todo_items (user_id);
+"""
+
+# 특정 아이템의 모든 자손 (자기 자신 제외)
+SUBTREE_QUERY = """
+WITH RECURSIVE subtree AS (
+    SELECT * FROM todo_items WHERE parent_id = :item_id
+    UNION ALL
+    SELECT child.* FROM todo_items AS child JOIN subtree ON child.parent_id = subtree.id
+)
+SELECT * FROM subtree
+"""
+
+# 특정 아이템과 모든 자손 삭제
+DELETE_SUBTREE_QUERY = """
+WITH RECURSIVE subtree(id) AS (
+    SELECT :item_id
+    UNION ALL
+    SELECT child.id FROM todo_items AS child JOIN subtree ON child.parent_id = subtree.id
+)
+DELETE FROM todo_items WHERE id IN subtree
+"""
+
+# 특정 아이템부터 루트까지의 경로 (depth 0 = 자기 자신)
+ANCESTRY_QUERY = """
+WITH RECURSIVE path(id, parent_id, description, depth) AS (
+    SELECT id, parent_id, description, 0 FROM todo_items WHERE id = :item_id
+    UNION ALL
+    SELECT parent.id, parent.parent_id, parent.description, path.depth + 1
+    FROM todo_items AS parent JOIN path ON parent.id = path.parent_id
+)
+SELECT id, description FROM path ORDER BY depth DESC
+"""
+
+_local = threading.local()
+
+
+def _connect() -> sqlite3.Connection:
+    """WAL 모드 및 외래 키가 활성화된 새 연결 생성."""
+    conn = sqlite3.connect(SQLITE_PATH, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA foreign_keys=ON")
+    conn.execute("PRAGMA busy_timeout=5000")
+    return conn
+
+
+def get_connection() -> sqlite3.Connection:
+    """
+    현재 스레드의 SQLite 연결 반환.
+
+    sqlite3 연결은 스레드 간 공유가 안전하지 않으므로 스레드마다 하나씩 생성하여 재사용.
+    WAL 모드에서는 읽기가 쓰기를 막지 않으므로 여러 워커 스레드가 동시에 조회 가능.
+    """
+    conn = getattr(_local, "conn", None)
+    if conn is None or getattr(_local, "path", None) != SQLITE_PATH:
+        conn = _connect()
+        _local.conn = conn
+        _local.path = SQLITE_PATH
+    return conn
+
+
+def init_db() -> None:
+    """테이블 및 인덱스 생성 (이미 있으면 유지)."""
+    conn = get_connection()
+    conn.executescript(SCHEMA)
+    conn.commit()
+
+
+def drop_db() -> None:
+    """모든 테이블 삭제 (테스트/개발용)."""
+    conn = get_connection()
+    conn.executescript(
+        "DROP TABLE IF EXISTS todo_items; DROP TABLE IF EXISTS todo_lists; DROP TABLE IF EXISTS users;"
+    )
+    conn.commit()
@@ -5,7 +5,7 @@ Google Cloud Firestore 연결 및 초기화를 담당.
 
 주요 기능:
 - Firebase Admin SDK 초기화
-- Firestore 클라이언트 생성 및 관리
+- Firestore 클라이언트 생성 및 관리 (동기 Client / 비동기 AsyncClient)
 - 환경별 인증 정보 처리 (로컬/클라우드)
 
 환경 변수:
@@ -15,9 +15,11 @@ Google Cloud Firestore 연결 및 초기화를 담당.
 import os
 import json
 import firebase_admin
-from firebase_admin import credentials, firestore
+from firebase_admin import credentials, firestore, firestore_async
 from dotenv import load_dotenv
 
+from .instrumentation import instrument_firestore
+
 load_dotenv()
 
 
@@ -63,6 +65,8 @@ def initialize_firestore():
 
 # 싱글톤 Firestore 클라이언트 인스턴스
 db = None
+# 싱글톤 Firestore AsyncClient 인스턴스 (비동기 요청 경로용)
+async_db = None
 
 
 def get_firestore_db():
@@ -70,16 +74,59 @@ def get_firestore_db():
     Firestore 클라이언트 인스턴스 반환.
     
     싱글톤 패턴으로 한 번 생성된 클라이언트를 재사용.
+    set_firestore_db()로 주입된 클라이언트가 있으면 그것을 반환.
+    요청별 읽기/쓰기 집계를 위해 instrumentation 래퍼로 감싸서 반환.
     
     Returns:
         Firestore 클라이언트
     """
     global db
     if db is None:
-        db = initialize_firestore()
+        db = instrument_firestore(initialize_firestore())
     return db
 
 
+def set_firestore_db(client):
+    """
+    Firestore 클라이언트 주입 (테스트용 인메모리 클라이언트 등).
+    
+    None을 넘기면 다음 get_firestore_db() 호출 시 실제 클라이언트를 다시 초기화.
+    
+    Args:
+        client: google.cloud.firestore.Client와 같은 인터페이스의 객체
+    """
+    global db
+    db = instrument_firestore(client)
+
+
+def get_async_firestore_db():
+    """
+    Firestore AsyncClient 인스턴스 반환.
+    
+    비동기 라우트/서비스에서 사용하며, 요청 처리 중 스레드풀을 점유하지 않고
+    이벤트 루프에서 직접 gRPC 호출을 대기. 인증 정보는 동기 클라이언트와 공유.
+    
+    Returns:
+        Firestore AsyncClient
+    """
+    global async_db
+    if async_db is None:
+        initialize_firestore()
+        async_db = instrument_firestore(firestore_async.client(), is_async=True)
+    return async_db
+
+
+def set_async_firestore_db(client):
+    """
+    Firestore AsyncClient 주입 (테스트용 인메모리 클라이언트 등).
+    
+    Args:
+        client: google.cloud.firestore.AsyncClient와 같은 인터페이스의 객체
+    """
+    global async_db
+    async_db = instrument_firestore(client, is_async=True)
+
+
 def get_db():
     """
     FastAPI Dependency용 Firestore 클라이언트 반환.
@@ -0,0 +1,480 @@
+"""
+요청 계측 모듈
+
+요청마다 Firestore 읽기/쓰기 횟수와 지연 시간, Gemini 호출 시간을 집계.
+
+주요 기능:
+- Firestore 클라이언트 래퍼 (동기 Client / AsyncClient 공통, 쿼리 형태 기록)
+- Gemini 호출 계측 (record_ai_call)
+- 요청 계측 미들웨어 (Server-Timing 헤더, 느린 요청 로그)
+- Prometheus 텍스트 형식 지표 (/metrics)
+
+읽기 횟수는 Firestore 과금 기준을 따름:
+문서 조회는 문서당 1회, 쿼리는 반환 문서 수(최소 1회).
+
+환경 변수:
+- SLOW_REQUEST_MS: 느린 요청 로그 기준 (기본값: 1000ms)
+"""
+import contextvars
+import logging
+import os
+import threading
+import time
+from collections import Counter as _TallyCounter
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+SLOW_REQUEST_MS = float(os.getenv("SLOW_REQUEST_MS", "1000"))
+
+# 라우트가 매칭되지 않은 요청의 라벨 (경로를 그대로 쓰면 라벨 종류가 무한히 늘어남)
+UNMATCHED_ROUTE = "unmatched"
+
+
+# ==================== 요청별 집계 ====================
+class RequestStats:
+    """한 요청 동안의 데이터 저장소/AI 호출 집계."""
+
+    def __init__(self):
+        self.reads = 0
+        self.writes = 0
+        self.datastore_seconds = 0.0
+        self.ai_calls = 0
+        self.ai_seconds = 0.0
+        self.query_shapes: List[str] = []
+        self._lock = threading.Lock()
+
+    def record_datastore(self, reads: int, writes: int, seconds: float, shape: Optional[str] = None) -> None:
+        with self._lock:
+            self.reads += reads
+            self.writes += writes
+            self.datastore_seconds += seconds
+            if shape:
+                self.query_shapes.append(shape)
+
+    def record_ai(self, seconds: float) -> None:
+        with self._lock:
+            self.ai_calls += 1
+            self.ai_seconds += seconds
+
+
+_current_stats: contextvars.ContextVar[Optional[RequestStats]] = contextvars.ContextVar("request_stats", default=None)
+
+
+def current_request_stats() -> Optional[RequestStats]:
+    """현재 요청의 집계 객체 (요청 밖에서 호출되면 None)."""
+    return _current_stats.get()
+
+
+# ==================== Prometheus 지표 ====================
+def _escape_label(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape_label(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_number(value: float) -> str:
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Counter:
+    """라벨별 누적 카운터."""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, *labelvalues: str) -> None:
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def value(self, *labelvalues: str) -> float:
+        return self._values.get(labelvalues, 0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for labelvalues, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, labelvalues)} {_format_number(value)}")
+        return lines
+
+
+class Histogram:
+    """라벨별 누적 버킷 히스토그램."""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labelvalues: str) -> None:
+        with self._lock:
+            # [버킷별 개수..., +Inf 개수, 합계]
+            state = self._values.setdefault(labelvalues, [0] * (len(self.buckets) + 2))
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[index] += 1
+            state[-2] += 1
+            state[-1] += value
+
+    def count(self, *labelvalues: str) -> int:
+        state = self._values.get(labelvalues)
+        return int(state[-2]) if state else 0
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for labelvalues, state in sorted(self._values.items()):
+                for bound, count in zip(self.buckets, state):
+                    labels = _format_labels(self.labelnames, labelvalues, f'le="{_format_number(bound)}"')
+                    lines.append(f"{self.name}_bucket{labels} {count}")
+                labels = _format_labels(self.labelnames, labelvalues, 'le="+Inf"')
+                lines.append(f"{self.name}_bucket{labels} {state[-2]}")
+                plain = _format_labels(self.labelnames, labelvalues)
+                lines.append(f"{self.name}_sum{plain} {_format_number(state[-1])}")
+                lines.append(f"{self.name}_count{plain} {state[-2]}")
+        return lines
+
+
+class Gauge:
+    """수집 시점에 함수를 호출해 현재 값을 보고하는 게이지 (캐시 크기 등)."""
+
+    def __init__(self, name: str, documentation: str, function):
+        self.name = name
+        self.documentation = documentation
+        self._function = function
+
+    def render(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} gauge",
+            f"{self.name} {_format_number(self._function())}",
+        ]
+
+
+_COUNT_BUCKETS = (0, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+REQUESTS_TOTAL = Counter("http_requests_total", "HTTP requests.", ("method", "route", "status"))
+REQUEST_DURATION = Histogram("http_request_duration_seconds", "HTTP request latency.", ("method", "route"))
+DATASTORE_READS_TOTAL = Counter("datastore_reads_total", "Billable Firestore document reads.", ("route",))
+DATASTORE_WRITES_TOTAL = Counter("datastore_writes_total", "Firestore document writes.", ("route",))
+DATASTORE_READS_PER_REQUEST = Histogram(
+    "datastore_reads_per_request", "Firestore document reads per request.", ("route",), buckets=_COUNT_BUCKETS)
+DATASTORE_WRITES_PER_REQUEST = Histogram(
+    "datastore_writes_per_request", "Firestore document writes per request.", ("route",), buckets=_COUNT_BUCKETS)
+DATASTORE_DURATION = Histogram(
+    "datastore_duration_seconds", "Summed Firestore call time per request.", ("route",))
+AI_CALLS_TOTAL = Counter("ai_calls_total", "Gemini API calls.", ("function",))
+AI_CALL_DURATION = Histogram(
+    "ai_call_duration_seconds", "Gemini API call latency.", ("function",),
+    buckets=(0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60))
+
+METRICS = [
+    REQUESTS_TOTAL, REQUEST_DURATION,
+    DATASTORE_READS_TOTAL, DATASTORE_WRITES_TOTAL,
+    DATASTORE_READS_PER_REQUEST, DATASTORE_WRITES_PER_REQUEST, DATASTORE_DURATION,
+    AI_CALLS_TOTAL, AI_CALL_DURATION,
+]
+
+
+def register_metric(metric):
+    """다른 모듈에서 정의한 지표를 /metrics 출력에 추가."""
+    METRICS.append(metric)
+    return metric
+
+
+def render_metrics() -> str:
+    """모든 지표를 Prometheus 텍스트 형식(0.0.4)으로 변환."""
+    lines = []
+    for metric in METRICS:
+        lines += metric.render()
+    return "\n".join(lines) + "\n"
+
+
+# ==================== Gemini 호출 계측 ====================
+@contextmanager
+def record_ai_call(function: str):
+    """Gemini 호출 구간의 횟수와 지연 시간 기록 (예외가 나도 기록)."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        AI_CALLS_TOTAL.inc(1, function)
+        AI_CALL_DURATION.observe(elapsed, function)
+        stats = current_request_stats()
+        if stats is not None:
+            stats.record_ai(elapsed)
+
+
+# ==================== Firestore 클라이언트 래퍼 ====================
+def _record(reads: int, writes: int, seconds: float, shape: Optional[str] = None) -> None:
+    stats = current_request_stats()
+    if stats is not None:
+        stats.record_datastore(reads, writes, seconds, shape)
+
+
+def _unwrap(obj):
+    return obj._wrapped if isinstance(obj, (_DocumentReference, _Query)) else obj
+
+
+class _Wrapper:
+    def __init__(self, wrapped, is_async: bool):
+        self._wrapped = wrapped
+        self._is_async = is_async
+
+    def __getattr__(self, name):
+        return getattr(self._wrapped, name)
+
+    def _timed(self, func, reads: int = 0, writes: int = 0, shape: Optional[str] = None):
+        """단일 호출(get/set/update/delete/commit)을 계측 (AsyncClient면 코루틴 반환)."""
+        if self._is_async:
+            async def run_async():
+                start = time.perf_counter()
+                try:
+                    return await func()
+                finally:
+                    _record(reads, writes, time.perf_counter() - start, shape)
+            return run_async()
+        start = time.perf_counter()
+        try:
+            return func()
+        finally:
+            _record(reads, writes, time.perf_counter() - start, shape)
+
+    def _streamed(self, iterator_factory, shape: str):
+        """쿼리 결과 스트림을 계측 (읽기 = 반환 문서 수, 최소 1)."""
+        if self._is_async:
+            async def stream_async():
+                start, count = time.perf_counter(), 0
+                try:
+                    async for snapshot in iterator_factory():
+                        count += 1
+                        yield snapshot
+                finally:
+                    _record(max(1, count), 0, time.perf_counter() - start, shape)
+            return stream_async()
+
+        def stream():
+            start, count = time.perf_counter(), 0
+            try:
+                for snapshot in iterator_factory():
+                    count += 1
+                    yield snapshot
+            finally:
+                _record(max(1, count), 0, time.perf_counter() - start, shape)
+        return stream()
+
+
+class _DocumentReference(_Wrapper):
+    def __init__(self, wrapped, is_async: bool, collection: str):
+        super().__init__(wrapped, is_async)
+        self._collection = collection
+
+    def get(self, *args, **kwargs):
+        return self._timed(lambda: self._wrapped.get(*args, **kwargs), reads=1, shape=f"{self._collection} get")
+
+    def create(self, *args, **kwargs):
+        return self._timed(lambda: self._wrapped.create(*args, **kwargs), writes=1)
+
+    def set(self, *args, **kwargs):
+        return self._timed(lambda: self._wrapped.set(*args, **kwargs), writes=1)
+
+    def update(self, *args, **kwargs):
+        return self._timed(lambda: self._wrapped.update(*args, **kwargs), writes=1)
+
+    def delete(self, *args, **kwargs):
+        return self._timed(lambda: self._wrapped.delete(*args, **kwargs), writes=1)
+
+
+class _Query(_Wrapper):
+    def __init__(self, wrapped, is_async: bool, shape: str):
+        super().__init__(wrapped, is_async)
+        self._shape = shape
+
+    def _derive(self, wrapped, clause: str) -> "_Query":
+        return _Query(wrapped, self._is_async, f"{self._shape} {clause}")
+
+    def where(self, field_path=None, op_string=None, value=None, **kwargs):
+        query_filter = kwargs.get("filter")
+        if query_filter is not None:
+            field_path, op_string = query_filter.field_path, query_filter.op_string
+            wrapped = self._wrapped.where(**kwargs)
+        else:
+            wrapped = self._wrapped.where(field_path, op_string, value, **kwargs)
+        # 값은 빼고 필드와 연산자만 남겨 쿼리 형태로 기록 (예: todo_items where todo_list_id==)
+        return self._derive(wrapped, f"where {field_path}{op_string}")
+
+    def order_by(self, field_path, *args, **kwargs):
+        direction = kwargs.get("direction", args[0] if args else "ASCENDING")
+        return self._derive(self._wrapped.order_by(field_path, *args, **kwargs),
+                            f"order_by {field_path} {str(direction).lower()}")
+
+    def limit(self, count):
+        return self._derive(self._wrapped.limit(count), "limit")
+
+    def stream(self, *args, **kwargs):
+        return self._streamed(lambda: self._wrapped.stream(*args, **kwargs), self._shape)
+
+    def get(self, *args, **kwargs):
+        if self._is_async:
+            async def get_async():
+                return [snapshot async for snapshot in self.stream(*args, **kwargs)]
+            return get_async()
+        return list(self.stream(*args, **kwargs))
+
+
+class _CollectionReference(_Query):
+    def document(self, *args, **kwargs):
+        return _DocumentReference(self._wrapped.document(*args, **kwargs), self._is_async, self._shape)
+
+
+class _WriteBatch(_Wrapper):
+    def __init__(self, wrapped, is_async: bool):
+        super().__init__(wrapped, is_async)
+        self._operations = 0
+
+    def create(self, reference, *args, **kwargs):
+        self._operations += 1
+        return self._wrapped.create(_unwrap(reference), *args, **kwargs)
+
+    def set(self, reference, *args, **kwargs):
+        self._operations += 1
+        return self._wrapped.set(_unwrap(reference), *args, **kwargs)
+
+    def update(self, reference, *args, **kwargs):
+        self._operations += 1
+        return self._wrapped.update(_unwrap(reference), *args, **kwargs)
+
+    def delete(self, reference, *args, **kwargs):
+        self._operations += 1
+        return self._wrapped.delete(_unwrap(reference), *args, **kwargs)
+
+    def commit(self, *args, **kwargs):
+        return self._timed(lambda: self._wrapped.commit(*args, **kwargs), writes=self._operations)
+
+
+class InstrumentedFirestore(_Wrapper):
+    """
+    Firestore 클라이언트 래퍼.
+
+    collection/document/where/stream/batch/get_all 호출을 그대로 위임하면서
+    현재 요청의 읽기/쓰기 횟수, 소요 시간, 쿼리 형태를 기록.
+    """
+
+    def collection(self, name, *args, **kwargs):
+        return _CollectionReference(self._wrapped.collection(name, *args, **kwargs), self._is_async, name)
+
+    def batch(self, *args, **kwargs):
+        return _WriteBatch(self._wrapped.batch(*args, **kwargs), self._is_async)
+
+    def get_all(self, references, *args, **kwargs):
+        references = list(references)
+        collections = sorted({
+            reference._collection if isinstance(reference, _DocumentReference)
+            else getattr(getattr(reference, "parent", None), "id", None) or "?"
+            for reference in references
+        })
+        shape = f"{','.join(collections)} get_all"
+        references = [_unwrap(reference) for reference in references]
+        return self._streamed(lambda: self._wrapped.get_all(references, *args, **kwargs), shape)
+
+
+def instrument_firestore(client, is_async: bool = False):
+    """Firestore 클라이언트를 계측 래퍼로 감쌈 (None이나 이미 감싼 객체는 그대로 반환)."""
+    if client is None or isinstance(client, InstrumentedFirestore):
+        return client
+    return InstrumentedFirestore(client, is_async)
+
+
+# ==================== 요청 계측 미들웨어 ====================
+def _route_template(scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+def _server_timing(stats: RequestStats, total_seconds: float) -> str:
+    entries = [f"total;dur={total_seconds * 1000:.1f}"]
+    if stats.reads or stats.writes:
+        entries.append(
+            f'db;dur={stats.datastore_seconds * 1000:.1f};desc="reads={stats.reads} writes={stats.writes}"')
+    if stats.ai_calls:
+        entries.append(f'ai;dur={stats.ai_seconds * 1000:.1f};desc="calls={stats.ai_calls}"')
+    return ", ".join(entries)
+
+
+def _summarize_shapes(shapes: List[str]) -> str:
+    return "; ".join(f"{shape} x{count}" if count > 1 else shape for shape, count in _TallyCounter(shapes).items())
+
+
+class RequestMetricsMiddleware:
+    """
+    요청 계측 ASGI 미들웨어.
+
+    - 요청마다 RequestStats를 컨텍스트에 두고 Firestore/Gemini 래퍼가 기록하게 함
+    - 응답에 Server-Timing 헤더 추가 (total, db, ai)
+    - 라우트 템플릿(예: /todos/{list_id}) 단위로 지표 집계
+    - SLOW_REQUEST_MS를 넘는 요청은 쿼리 형태와 함께 경고 로그
+    """
+
+    def __init__(self, app, slow_request_ms: Optional[float] = None):
+        self.app = app
+        self.slow_request_ms = slow_request_ms
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current_stats.set(stats)
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_with_timing(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", _server_timing(stats, time.perf_counter() - start).encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_stats.reset(token)
+            self._observe(scope, stats, status_code, time.perf_counter() - start)
+
+    def _observe(self, scope, stats: RequestStats, status_code: int, elapsed: float) -> None:
+        route = _route_template(scope)
+        method = scope.get("method", "")
+        REQUESTS_TOTAL.inc(1, method, route, str(status_code))
+        REQUEST_DURATION.observe(elapsed, method, route)
+        DATASTORE_READS_TOTAL.inc(stats.reads, route)
+        DATASTORE_WRITES_TOTAL.inc(stats.writes, route)
+        DATASTORE_READS_PER_REQUEST.observe(stats.reads, route)
+        DATASTORE_WRITES_PER_REQUEST.observe(stats.writes, route)
+        DATASTORE_DURATION.observe(stats.datastore_seconds, route)
+
+        slow_request_ms = SLOW_REQUEST_MS if self.slow_request_ms is None else self.slow_request_ms
+        if elapsed * 1000 >= slow_request_ms:
+            logger.warning(
+                "Slow request: %s %s -> %s in %.1fms (db %.1fms, reads=%d, writes=%d, ai %.1fms/%d calls) queries: %s",
+                method, route, status_code, elapsed * 1000, stats.datastore_seconds * 1000,
+                stats.reads, stats.writes, stats.ai_seconds * 1000, stats.ai_calls,
+                _summarize_shapes(stats.query_shapes) or "-",
+            )
@@ -4,41 +4,98 @@ TaskGenie Backend 메인 모듈
 FastAPI 애플리케이션의 진입점으로, 다음 기능을 담당:
 - 앱 초기화 및 환경 설정
 - 데이터베이스 연결 (Firestore/SQLite)
+- 공유 캐시(Redis) 연결 및 무효화 채널 구독
+- 비밀번호 해싱 프로세스 풀 시작/종료
+- OAuth 제공자 HTTP 연결 풀 생성/정리
+- Firebase ID 토큰 서명 인증서 백그라운드 갱신
+- AI(Gemini) 동시 호출 제한 초기화, 만료된 AI 응답 캐시 정리, 키워드 유사도 인덱스 로드
+- 백그라운드 작업 큐(AI 생성) 워커 시작/종료, 중단된 작업 재개
 - CORS 미들웨어 설정
+- 요청 계측 (Server-Timing 헤더, 토큰으로 보호되는 /metrics 지표, 느린 요청 로그)
+- 요청 수 제한 (사용자/IP별, AI 생성 엔드포인트는 별도 한도와 일일 할당량)
 - API 라우터 등록
 - 전역 예외 처리
 """
 import logging
 import os
+import secrets
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.exceptions import RequestValidationError
 from dotenv import load_dotenv
 from fastapi.middleware.cors import CORSMiddleware
+from slowapi.errors import RateLimitExceeded
+from slowapi.middleware import SlowAPIASGIMiddleware
+
+from .instrumentation import RequestMetricsMiddleware, render_metrics
 
 # ==================== 환경 설정 ====================
 # Render 배포 환경이 아닌 경우에만 .env 파일 로드
 if os.getenv("RENDER") is None:
     load_dotenv()
 
+# /metrics 접근 토큰 (Authorization: Bearer <토큰>). 설정하지 않으면 /metrics는 404
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
 # ==================== 데이터베이스 초기화 ====================
-# 환경 변수에 따라 Firestore 또는 SQLite 사용
-USE_FIRESTORE = os.getenv("USE_FIRESTORE", "false").lower() == "true"
-
-if USE_FIRESTORE:
-    # Firestore (클라우드 DB) 초기화
-    from .firestore_db import initialize_firestore
-    initialize_firestore()
-    from .api import auth_firestore as auth
-    from .api import todos_firestore as todos
-else:
-    # SQLite (로컬 DB) 초기화
-    from .database import Base, engine
-    Base.metadata.create_all(bind=engine)
-    from .api import auth, todos
+# 환경 변수(STORAGE_ENGINE)에 따라 Firestore 또는 SQLite 사용
+from .services import storage
+from .services.storage import init_storage
+init_storage()
+from .api import auth_firestore as auth
+from .api import todos_firestore as todos
+from .api import jobs
+from .services.ai_cache import ai_cache
+from .services.ai_client import ai_client
+from .services.firebase_tokens import firebase_token_verifier
+from .services.job_queue import job_queue
+from .services.keyword_index import keyword_index
+from .services.oauth_http import oauth_http
+from .services.password_hashing import password_hasher
+from .services.rate_limit import limiter, rate_limit_exceeded_handler
+from .services.shared_cache import shared_cache
+
+
+# ==================== 앱 수명 주기 ====================
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    REDIS_URL이 설정되어 있으면 공유 캐시를 연결하고 워커 간 무효화 채널을 구독.
+    비밀번호 해싱 rounds를 보정(PASSWORD_HASH_TARGET_MS)하고 해싱 프로세스 풀을 띄움.
+    네이버/카카오 OAuth 호출용 HTTP 연결 풀을 만들고 종료 시 닫음.
+    Firestore 엔진이면 소셜 로그인용 Firebase 서명 인증서를 받아 만료 전에 갱신.
+    AI 동시 호출 제한(세마포어)을 현재 이벤트 루프 기준으로 초기화하고 만료된 AI 응답 캐시를 정리.
+    키워드 유사도 인덱스를 읽고, 종료 시 진행 중인 백그라운드 재생성을 취소.
+    백그라운드 작업 워커를 띄우고 이전 프로세스에서 끝나지 않은 작업을 다시 넣음 (종료 시 워커를 먼저 멈춤).
+    """
+    password_hasher.start()
+    ai_client.start()
+    await ai_cache.start()
+    await keyword_index.start()
+    oauth_http.start()
+    if storage.STORAGE_ENGINE == "firestore":
+        firebase_token_verifier.start()
+    await shared_cache.start()
+    await job_queue.start()
+    yield
+    await job_queue.stop()
+    await shared_cache.stop()
+    await firebase_token_verifier.stop()
+    await oauth_http.stop()
+    await keyword_index.stop()
+    password_hasher.stop()
+
 
 # ==================== FastAPI 앱 생성 ====================
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
+
+# ==================== 요청 수 제한 ====================
+# 일반 엔드포인트는 미들웨어가 공용 한도를, AI 엔드포인트는 @ai_limit이 별도 한도를 적용
+# (CORS보다 안쪽에 두어 429 응답에도 CORS 헤더가 붙도록 먼저 등록)
+app.state.limiter = limiter
+app.add_exception_handler(RateLimitExceeded, rate_limit_exceeded_handler)
+app.add_middleware(SlowAPIASGIMiddleware)
 
 # ==================== CORS 미들웨어 설정 ====================
 # 허용된 프론트엔드 도메인 목록
@@ -56,9 +113,14 @@ app.add_middleware(
     allow_credentials=True,     # 쿠키/인증 헤더 허용
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
     allow_headers=["*"],
-    expose_headers=["*"],
+    # 자격 증명 요청에서는 "*"가 와일드카드로 동작하지 않으므로 백오프에 필요한 헤더를 명시
+    expose_headers=["*", "Retry-After", "X-RateLimit-Limit", "X-RateLimit-Remaining", "X-RateLimit-Reset"],
 )
 
+# ==================== 요청 계측 미들웨어 ====================
+# Firestore 읽기/쓰기, Gemini 호출 시간을 요청/라우트 단위로 집계
+app.add_middleware(RequestMetricsMiddleware)
+
 # ==================== 로깅 설정 ====================
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -68,6 +130,8 @@ logger = logging.getLogger(__name__)
 app.include_router(auth.router, prefix="/auth", tags=["auth"])
 # 할 일 관련 엔드포인트: /todos/*
 app.include_router(todos.router, prefix="/todos", tags=["todos"])
+# 백그라운드 작업 조회 엔드포인트: /jobs/*
+app.include_router(jobs.router, prefix="/jobs", tags=["jobs"])
 
 
 # ==================== 전역 예외 처리 ====================
@@ -103,6 +167,28 @@ async def generic_exception_handler(request: Request, exc: Exception):
 
 # ==================== 루트 엔드포인트 ====================
 @app.get("/", tags=["root"])
+@limiter.exempt
 async def root():
     """API 서버 상태 확인용 루트 엔드포인트."""
     return {"message": "Welcome to the AI Task Generator API"}
+
+
+@app.get("/metrics", include_in_schema=False)
+@limiter.exempt
+async def metrics(request: Request):
+    """
+    Prometheus 수집용 지표 (요청 지연, Firestore 읽기/쓰기, Gemini 호출).
+
+    트래픽, AI 사용량, 대기열 길이가 드러나므로 METRICS_TOKEN을 Bearer 토큰으로 보낸 수집기만 허용.
+    METRICS_TOKEN이 없으면 엔드포인트를 노출하지 않음 (404).
+    """
+    if not METRICS_TOKEN:
+        return JSONResponse(status_code=status.HTTP_404_NOT_FOUND, content={"detail": "Not Found"})
+    authorization = request.headers.get("authorization", "")
+    if not secrets.compare_digest(authorization.encode(), f"Bearer {METRICS_TOKEN}".encode()):
+        return JSONResponse(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            content={"detail": "Not authenticated"},
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
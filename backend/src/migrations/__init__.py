@@ -0,0 +1,8 @@
+"""
+데이터 마이그레이션 모듈
+
+Firestore 문서 구조 변경 시 기존 데이터를 새 구조로 변환하는 일회성 스크립트 모음.
+
+실행 방법 (backend 디렉터리에서):
+    python -m src.migrations.<모듈명> [--dry-run]
+"""
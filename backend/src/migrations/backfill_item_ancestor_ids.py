@@ -0,0 +1,77 @@
+"""
+todo_items.ancestor_ids 백필 마이그레이션
+
+서브트리 조회/삭제가 ancestor_ids array_contains 쿼리를 사용하도록
+변경됨에 따라, 기존 아이템 문서에 루트부터 직계 부모까지의
+아이템 ID 목록(ancestor_ids)을 채워 넣음.
+
+실행:
+    python -m src.migrations.backfill_item_ancestor_ids [--dry-run]
+"""
+import argparse
+from typing import Any, Dict, List
+
+from ..firestore_db import get_firestore_db
+
+# Firestore batch write 최대 작업 수
+BATCH_LIMIT = 500
+
+
+def _compute_ancestor_ids(item_id: str, parent_by_id: Dict[str, str]) -> List[str]:
+    """parent_id 연결을 따라 루트부터의 조상 ID 목록 계산 (순환 참조 방지 포함)."""
+    ancestors = []
+    seen = {item_id}
+    parent_id = parent_by_id.get(item_id)
+    while parent_id and parent_id not in seen and parent_id in parent_by_id:
+        ancestors.insert(0, parent_id)
+        seen.add(parent_id)
+        parent_id = parent_by_id.get(parent_id)
+    return ancestors
+
+
+def backfill_item_ancestor_ids(db: Any = None, dry_run: bool = False) -> int:
+    """
+    ancestor_ids가 없거나 parent_id 체인과 다른 아이템에 ancestor_ids 설정.
+
+    Args:
+        db: Firestore 클라이언트 (기본값: get_firestore_db())
+        dry_run: True이면 변경 대상 개수만 계산하고 쓰지 않음
+
+    Returns:
+        갱신한(또는 갱신 대상인) 아이템 수
+    """
+    db = db or get_firestore_db()
+
+    docs = list(db.collection('todo_items').stream())
+    parent_by_id = {doc.id: doc.to_dict().get('parent_id') for doc in docs}
+
+    updated = 0
+    pending = 0
+    batch = db.batch()
+    for item_doc in docs:
+        ancestor_ids = _compute_ancestor_ids(item_doc.id, parent_by_id)
+        if item_doc.to_dict().get('ancestor_ids') == ancestor_ids:
+            continue
+        updated += 1
+        if dry_run:
+            continue
+        batch.update(item_doc.reference, {'ancestor_ids': ancestor_ids})
+        pending += 1
+        if pending == BATCH_LIMIT:
+            batch.commit()
+            batch = db.batch()
+            pending = 0
+
+    if pending:
+        batch.commit()
+    return updated
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill ancestor_ids on todo_items documents")
+    parser.add_argument("--dry-run", action="store_true", help="count affected items without writing")
+    args = parser.parse_args()
+
+    count = backfill_item_ancestor_ids(dry_run=args.dry_run)
+    action = "would update" if args.dry_run else "updated"
+    print(f"{action} {count} todo_items documents")
@@ -0,0 +1,73 @@
+"""
+todo_items.rank 백필 마이그레이션
+
+형제 순서가 정수 order 대신 사전식 rank 키로 관리됨에 따라,
+rank 필드가 없는 아이템이 포함된 형제 그룹에 현재 순서대로
+균등 간격의 rank를 부여함.
+
+rank가 없는 문서도 order에서 파생한 키로 올바르게 정렬되므로 이 마이그레이션은
+필수는 아니지만, 완료 후 LEGACY_ITEM_FALLBACK=false로 추가 조회를 끌 수 있음.
+
+실행:
+    python -m src.migrations.backfill_item_rank [--dry-run]
+"""
+import argparse
+from typing import Any, Dict, List, Tuple
+
+from ..firestore_db import get_firestore_db
+from ..services.rank import rank_sequence
+from ..services.todo_tree import item_rank
+
+# Firestore batch write 최대 작업 수
+BATCH_LIMIT = 500
+
+
+def backfill_item_rank(db: Any = None, dry_run: bool = False) -> int:
+    """
+    rank가 없는 아이템이 있는 형제 그룹 전체에 rank 재부여.
+
+    Args:
+        db: Firestore 클라이언트 (기본값: get_firestore_db())
+        dry_run: True이면 변경 대상 개수만 계산하고 쓰지 않음
+
+    Returns:
+        갱신한(또는 갱신 대상인) 아이템 수
+    """
+    db = db or get_firestore_db()
+
+    groups: Dict[Tuple[str, str], List[Any]] = {}
+    for item_doc in db.collection('todo_items').stream():
+        item_data = item_doc.to_dict()
+        groups.setdefault((item_data.get('todo_list_id'), item_data.get('parent_id')), []).append(item_doc)
+
+    updated = 0
+    pending = 0
+    batch = db.batch()
+    for docs in groups.values():
+        if all(doc.to_dict().get('rank') for doc in docs):
+            continue
+        docs.sort(key=lambda doc: item_rank(doc.to_dict()))
+        for doc, rank in zip(docs, rank_sequence(len(docs))):
+            updated += 1
+            if dry_run:
+                continue
+            batch.update(doc.reference, {'rank': rank})
+            pending += 1
+            if pending == BATCH_LIMIT:
+                batch.commit()
+                batch = db.batch()
+                pending = 0
+
+    if pending:
+        batch.commit()
+    return updated
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill rank keys on todo_items documents")
+    parser.add_argument("--dry-run", action="store_true", help="count affected items without writing")
+    args = parser.parse_args()
+
+    count = backfill_item_rank(dry_run=args.dry_run)
+    action = "would update" if args.dry_run else "updated"
+    print(f"{action} {count} todo_items documents")
@@ -0,0 +1,70 @@
+"""
+todo_items.user_id 백필 마이그레이션
+
+GET /todos가 사용자의 모든 아이템을 단일 쿼리(user_id ==)로 조회하도록
+변경됨에 따라, user_id 필드가 없는 기존 아이템 문서에 소유 프로젝트의
+user_id를 채워 넣음.
+
+실행:
+    python -m src.migrations.backfill_item_user_id [--dry-run]
+
+백필 완료 후 LEGACY_ITEM_FALLBACK=false로 설정하면
+프로젝트 단위 폴백 조회가 비활성화됨.
+"""
+import argparse
+from typing import Any
+
+from ..firestore_db import get_firestore_db
+
+# Firestore batch write 최대 작업 수
+BATCH_LIMIT = 500
+
+
+def backfill_item_user_id(db: Any = None, dry_run: bool = False) -> int:
+    """
+    user_id가 없거나 프로젝트 소유자와 다른 아이템에 user_id 설정.
+
+    Args:
+        db: Firestore 클라이언트 (기본값: get_firestore_db())
+        dry_run: True이면 변경 대상 개수만 계산하고 쓰지 않음
+
+    Returns:
+        갱신한(또는 갱신 대상인) 아이템 수
+    """
+    db = db or get_firestore_db()
+
+    owner_by_list = {}
+    for list_doc in db.collection('todo_lists').stream():
+        owner_by_list[list_doc.id] = list_doc.to_dict().get('user_id')
+
+    updated = 0
+    pending = 0
+    batch = db.batch()
+    for item_doc in db.collection('todo_items').stream():
+        item_data = item_doc.to_dict()
+        owner_id = owner_by_list.get(item_data.get('todo_list_id'))
+        if owner_id is None or item_data.get('user_id') == owner_id:
+            continue
+        updated += 1
+        if dry_run:
+            continue
+        batch.update(item_doc.reference, {'user_id': owner_id})
+        pending += 1
+        if pending == BATCH_LIMIT:
+            batch.commit()
+            batch = db.batch()
+            pending = 0
+
+    if pending:
+        batch.commit()
+    return updated
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill user_id on todo_items documents")
+    parser.add_argument("--dry-run", action="store_true", help="count affected items without writing")
+    args = parser.parse_args()
+
+    count = backfill_item_user_id(dry_run=args.dry_run)
+    action = "would update" if args.dry_run else "updated"
+    print(f"{action} {count} todo_items documents")
@@ -0,0 +1,97 @@
+"""
+usernames 인덱스 백필 마이그레이션
+
+username 조회가 쿼리 대신 인덱스 문서(usernames/{username_key}) 단건 조회로
+변경됨에 따라, 인덱스 문서가 없는 기존 사용자의 인덱스 문서(사용자 문서 사본)를 생성.
+
+같은 username의 사용자가 여럿이면(인덱스 도입 전 가입 경쟁 상태) 가장 먼저 가입한
+사용자만 인덱스에 넣고 나머지는 충돌로 출력 (해당 사용자는 폴백 쿼리로만 조회되므로
+LEGACY_USERNAME_FALLBACK을 끄기 전에 username을 정리해야 함).
+
+실행:
+    python -m src.migrations.backfill_username_index [--dry-run]
+
+백필 완료 후 LEGACY_USERNAME_FALLBACK=false로 설정하면
+username 폴백 쿼리가 비활성화됨.
+"""
+import argparse
+from datetime import timezone
+from typing import Any, Dict, List, Tuple
+
+from ..firestore_db import get_firestore_db
+from ..services.firestore_common import USERNAME_INDEX_COLLECTION, username_key
+
+# Firestore batch write 최대 작업 수
+BATCH_LIMIT = 500
+
+
+def _signup_order(user_data: Dict[str, Any]) -> float:
+    """가입 시각 (created_at이 없으면 가장 뒤, naive datetime은 UTC로 간주)."""
+    created_at = user_data.get('created_at')
+    if created_at is None:
+        return float('inf')
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    return created_at.timestamp()
+
+
+def backfill_username_index(db: Any = None, dry_run: bool = False) -> Tuple[int, List[str]]:
+    """
+    인덱스 문서가 없는 사용자의 usernames 인덱스 문서 생성.
+
+    Args:
+        db: Firestore 클라이언트 (기본값: get_firestore_db())
+        dry_run: True이면 생성 대상 개수만 계산하고 쓰지 않음
+
+    Returns:
+        (생성한(또는 생성 대상인) 인덱스 문서 수, 충돌로 건너뛴 username 목록)
+    """
+    db = db or get_firestore_db()
+
+    indexed: Dict[str, str] = {
+        doc.id: doc.to_dict().get('id') for doc in db.collection(USERNAME_INDEX_COLLECTION).stream()
+    }
+    users = []
+    for user_doc in db.collection('users').stream():
+        user_data = user_doc.to_dict()
+        user_data['id'] = user_doc.id
+        users.append(user_data)
+    # 같은 username의 사용자가 있으면 먼저 가입한 사용자가 인덱스를 차지
+    users.sort(key=_signup_order)
+
+    created = 0
+    conflicts = []
+    pending = 0
+    batch = db.batch()
+    for user_data in users:
+        key = username_key(user_data['username'])
+        if key in indexed:
+            if indexed[key] != user_data['id']:
+                conflicts.append(user_data['username'])
+            continue
+        indexed[key] = user_data['id']
+        created += 1
+        if dry_run:
+            continue
+        batch.create(db.collection(USERNAME_INDEX_COLLECTION).document(key), user_data)
+        pending += 1
+        if pending == BATCH_LIMIT:
+            batch.commit()
+            batch = db.batch()
+            pending = 0
+
+    if pending:
+        batch.commit()
+    return created, conflicts
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build usernames index documents for existing users")
+    parser.add_argument("--dry-run", action="store_true", help="count missing index documents without writing")
+    args = parser.parse_args()
+
+    count, conflicts = backfill_username_index(dry_run=args.dry_run)
+    action = "would create" if args.dry_run else "created"
+    print(f"{action} {count} usernames documents")
+    for username in conflicts:
+        print(f"conflict: {username!r} is already indexed for another user")
@@ -7,9 +7,10 @@ API 요청/응답의 데이터 검증 및 직렬화를 위한 Pydantic 모델 
 - 사용자 인증 스키마 (UserCreate, Token 등)
 - 소셜 로그인 스키마 (SocialLoginRequest, NaverCallback 등)
 - 할 일 스키마 (ToDoItem, ToDoList 등)
-- 자연어 파싱 스키마 (NaturalLanguageTaskCreate)
+- 자연어 파싱 스키마 (NaturalLanguageTaskCreate, NaturalLanguageTaskBatchCreate)
+- 백그라운드 작업 스키마 (JobResponse)
 """
-from typing import List, Optional
+from typing import Any, List, Optional
 from datetime import datetime
 import uuid
 
@@ -119,7 +120,60 @@ class ToDoItemUpdate(BaseModel):
     due_date: Optional[datetime] = None
     reminder_date: Optional[datetime] = None
 
+class ToDoItemBatchUpdate(ToDoItemUpdate):
+    """일괄 수정 요청의 개별 항목 (대상 아이템 ID + 부분 수정 필드)."""
+    id: str
+
+class ToDoItemBatchResult(BaseModel):
+    """일괄 수정 결과 (항목별): 'updated' | 'not_found'."""
+    id: str
+    status: str
+
+class ToDoItemMove(BaseModel):
+    """
+    아이템 이동 요청 스키마.
+
+    after_id/before_id는 이동 후 바로 앞/뒤에 올 형제 아이템 ID.
+    parent_id를 지정하면 해당 부모 아래로 이동 (null이면 루트), 생략하면 현재 부모 유지.
+    """
+    after_id: Optional[str] = None
+    before_id: Optional[str] = None
+    parent_id: Optional[str] = None
+
 class NaturalLanguageTaskCreate(BaseModel):
     text: str
     list_id: str
 
+class NaturalLanguageTaskBatchCreate(BaseModel):
+    """여러 줄 자연어 가져오기 요청 (붙여넣은 텍스트를 줄 단위로 나눈 목록)."""
+    lines: List[str]
+    list_id: str
+
+class NaturalLanguageTaskBatchResult(BaseModel):
+    """
+    일괄 가져오기 결과 (줄별).
+
+    status: 'created' | 'failed'(파싱 실패, 저장 안 함) | 'skipped'(빈 줄)
+    """
+    line: int                                   # 요청 lines에서의 위치 (0부터)
+    status: str
+    item: Optional[ToDoItemResponse] = None     # 생성된 아이템 (created일 때)
+    detail: Optional[str] = None                # 실패 사유
+
+
+# ==================== 백그라운드 작업 스키마 ====================
+class JobResponse(BaseModel):
+    """
+    백그라운드 작업 상태 (202 응답, GET /jobs/{id}).
+
+    status: 'queued' | 'running' | 'succeeded' | 'failed'
+    """
+    id: str
+    kind: str                                   # 'generate_todo_list' | 'create_subtasks_for_item'
+    status: str
+    position: Optional[int] = None              # 앞에서 대기 중인 작업 수 (queued일 때)
+    result: Optional[Any] = None                # 성공 시 동기 엔드포인트와 같은 형식의 응답
+    error: Optional[str] = None                 # 실패 사유
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
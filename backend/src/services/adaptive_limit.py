@@ -0,0 +1,98 @@
+"""
+적응형 동시 호출 제한(AIMD) 모듈
+
+상위 서비스가 요청량 제한(429/503)으로 응답하면 동시 호출 한도를 곱으로 줄이고(multiplicative
+decrease), 성공할 때마다 조금씩 늘려(additive increase) 상위 서비스가 감당하는 수준을 찾아감.
+고정된 세마포어 대신 사용하며, 한도를 넘은 호출은 도착 순서대로 대기.
+
+- 성공 1회마다 한도 += 1 / 현재 한도 (한도만큼 성공하면 약 +1)
+- 요청량 제한 1회마다 한도 *= backoff (한 번 줄인 뒤 시작된 호출의 제한 응답만 반영하여,
+  동시에 도착한 제한 응답들로 한도가 연달아 줄어들지 않도록)
+- 한도는 min_limit ~ max_limit 사이. 실제 동시 호출 수는 한도의 정수 부분까지
+"""
+import asyncio
+import collections
+import time
+from typing import Callable, Deque
+
+from google.api_core import exceptions as google_exceptions
+
+
+def is_throttled(error: BaseException) -> bool:
+    """상위 서비스가 요청량 제한/과부하로 거절한 오류인지 (429, 503)."""
+    return isinstance(error, (google_exceptions.TooManyRequests, google_exceptions.ServiceUnavailable))
+
+
+class AdaptiveLimit:
+    """
+    AIMD로 한도가 조정되는 비동기 세마포어.
+
+    Args:
+        max_limit: 최대(초기) 한도
+        min_limit: 최소 한도
+        backoff: 요청량 제한 시 한도에 곱할 값 (0~1)
+        clock: 현재 시각 함수 (테스트용)
+    """
+
+    def __init__(self, max_limit: int, min_limit: int = 1, backoff: float = 0.5,
+                 clock: Callable[[], float] = time.monotonic):
+        self.max_limit = max_limit
+        self.min_limit = min(min_limit, max_limit)
+        self.backoff = backoff
+        self.clock = clock
+        self.limit = float(max_limit)
+        self.in_use = 0
+        self._waiters: Deque[asyncio.Future] = collections.deque()
+        self._last_backoff = float("-inf")
+
+    def _available(self) -> bool:
+        return self.in_use < int(self.limit)
+
+    async def acquire(self) -> float:
+        """
+        자리가 날 때까지 대기 후 차지.
+
+        Returns:
+            차지한 시각 (on_throttle에 넘김)
+        """
+        if not self._waiters and self._available():
+            self.in_use += 1
+            return self.clock()
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # 자리를 넘겨받은 직후 취소됨: 다음 대기자에게 넘김
+                self.release()
+            raise
+        return self.clock()
+
+    def release(self) -> None:
+        self.in_use -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters and self._available():
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_use += 1
+                waiter.set_result(None)
+
+    def on_success(self) -> None:
+        """성공한 호출 반영 (한도를 조금 늘림)."""
+        self.limit = min(self.limit + 1 / self.limit, float(self.max_limit))
+        self._wake()
+
+    def on_throttle(self, started_at: float) -> None:
+        """
+        요청량 제한을 받은 호출 반영 (한도를 줄임).
+
+        Args:
+            started_at: 그 호출이 자리를 차지한 시각 (마지막으로 줄인 뒤 시작된 호출만 반영)
+        """
+        if started_at < self._last_backoff:
+            return
+        self.limit = max(self.limit * self.backoff, float(self.min_limit))
+        self._last_backoff = self.clock()
@@ -0,0 +1,221 @@
+"""
+AI 응답 캐시 모듈
+
+같은 입력으로 반복되는 Gemini 호출(인기 키워드 생성, 같은 작업의 하위 작업 재생성,
+같은 문장 재파싱)의 결과를 재사용.
+
+- 1단계: 프로세스 내 LRU (항목별 만료 시각)
+- 2단계: SQLite 파일 (재시작 후에도 유지, 여러 워커가 공유)
+- 키는 함수 이름, 모델, 정규화한 입력(NFKC, 공백 정리, 대소문자 무시)의 SHA-256.
+  입력 외에 결과를 바꾸는 맥락(자연어 파싱의 현재 시각 등)은 호출하는 쪽에서 키에 포함
+- 값은 JSON으로 저장하고 조회할 때마다 새로 역직렬화하므로 호출자가 결과를 수정해도 캐시는 그대로
+- 디스크 캐시 오류는 로그만 남기고 미스로 처리
+- 적중 시 원래 호출에 걸렸던 시간을 절약 시간 지표로 기록
+
+환경 변수:
+- AI_CACHE_MAX_ENTRIES: 프로세스 내 캐시 최대 항목 수 (기본값: 1024, 0이면 비활성화)
+- AI_CACHE_PATH: 디스크 캐시 SQLite 파일 경로 (기본값: ai_cache.db, 빈 값이면 비활성화)
+- AI_CACHE_KEYWORD_TTL_SECONDS: 키워드 기반 목록 생성 결과 유효 시간 (기본값: 7일)
+- AI_CACHE_SUBTASKS_TTL_SECONDS: 하위 작업 생성 결과 유효 시간 (기본값: 1일)
+- AI_CACHE_PARSE_TTL_SECONDS: 자연어 파싱 결과 유효 시간 (기본값: 1800초, 키에 KST 날짜와
+  "내일까지"의 30분 단위 마감 시각이 포함되어 항목이 적중할 수 있는 기간이 최대 30분이므로 그에 맞춤)
+"""
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from cachetools import TLRUCache
+from starlette.concurrency import run_in_threadpool
+
+from ..instrumentation import Counter, register_metric
+
+logger = logging.getLogger(__name__)
+
+AI_CACHE_MAX_ENTRIES = int(os.getenv("AI_CACHE_MAX_ENTRIES", "1024"))
+AI_CACHE_PATH = os.getenv("AI_CACHE_PATH", "ai_cache.db")
+
+# 함수별 유효 시간 (초)
+AI_CACHE_TTLS = {
+    "generate_todo_items_from_keyword": float(os.getenv("AI_CACHE_KEYWORD_TTL_SECONDS", str(7 * 24 * 3600))),
+    "generate_sub_tasks_from_main_task": float(os.getenv("AI_CACHE_SUBTASKS_TTL_SECONDS", str(24 * 3600))),
+    "analyze_task_from_natural_language": float(os.getenv("AI_CACHE_PARSE_TTL_SECONDS", "1800")),
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS ai_cache (
+    key TEXT PRIMARY KEY,
+    function TEXT NOT NULL,
+    value TEXT NOT NULL,
+    latency REAL NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_ai_cache_expires_at ON ai_cache (expires_at);
+"""
+
+
+def normalize_text(text: Optional[str]) -> str:
+    """캐시 키용 입력 정규화 (NFKC, 앞뒤/연속 공백 정리, 대소문자 무시)."""
+    if text is None:
+        return ""
+    return " ".join(unicodedata.normalize("NFKC", text).split()).casefold()
+
+
+class AIResponseCache:
+    """
+    2단계(메모리 + SQLite) AI 응답 캐시.
+
+    Args:
+        max_entries: 프로세스 내 캐시 최대 항목 수 (0이면 메모리 단계 비활성화)
+        path: SQLite 파일 경로 (빈 값이면 디스크 단계 비활성화)
+        ttls: 함수 이름 → 유효 시간 (초)
+        timer: 현재 시각 함수 (epoch 초, 디스크 항목은 재시작 후에도 유효하므로 time.time 기준)
+    """
+
+    def __init__(self, max_entries: int = AI_CACHE_MAX_ENTRIES, path: Optional[str] = AI_CACHE_PATH,
+                 ttls: Optional[Dict[str, float]] = None, timer: Callable[[], float] = time.time):
+        self.memory_enabled = max_entries > 0
+        self.path = path
+        self.ttls = dict(AI_CACHE_TTLS if ttls is None else ttls)
+        self._timer = timer
+        # key -> (JSON 문자열, 원래 호출 시간, 만료 시각)
+        self._entries = TLRUCache(maxsize=max(max_entries, 1), ttu=self._expires_at, timer=timer)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @staticmethod
+    def _expires_at(key: str, value: Tuple[str, float, float], now: float) -> float:
+        return value[2]
+
+    def key(self, function: str, model_name: str, *parts: Any) -> str:
+        """함수 이름, 모델, 입력(문자열은 정규화)으로 캐시 키 생성."""
+        normalized = [
+            normalize_text(part) if isinstance(part, str) or part is None
+            else [normalize_text(p) for p in part] for part in parts
+        ]
+        payload = json.dumps([function, model_name, normalized], ensure_ascii=False, separators=(",", ":"))
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    # ==================== 디스크 단계 ====================
+    def _connection(self) -> sqlite3.Connection:
+        """현재 스레드의 디스크 캐시 연결 (database 모듈과 같은 방식으로 스레드마다 하나)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None or getattr(self._local, "path", None) != self.path:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=5000")
+            conn.executescript(SCHEMA)
+            self._local.conn = conn
+            self._local.path = self.path
+        return conn
+
+    def _disk_get(self, key: str) -> Optional[Tuple[str, float, float]]:
+        try:
+            row = self._connection().execute(
+                "SELECT value, latency, expires_at FROM ai_cache WHERE key = ? AND expires_at > ?",
+                (key, self._timer()),
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"AI cache disk read failed: {e}")
+            AI_CACHE_ERRORS.inc(1, "get")
+            return None
+        return tuple(row) if row is not None else None
+
+    def _disk_put(self, key: str, function: str, entry: Tuple[str, float, float]) -> None:
+        try:
+            conn = self._connection()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO ai_cache (key, function, value, latency, expires_at) VALUES (?, ?, ?, ?, ?)",
+                    (key, function, *entry),
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"AI cache disk write failed: {e}")
+            AI_CACHE_ERRORS.inc(1, "put")
+
+    def prune(self) -> int:
+        """만료된 디스크 항목 삭제 (삭제한 개수 반환)."""
+        if not self.path:
+            return 0
+        try:
+            conn = self._connection()
+            with conn:
+                return conn.execute("DELETE FROM ai_cache WHERE expires_at <= ?", (self._timer(),)).rowcount
+        except sqlite3.Error as e:
+            logger.warning(f"AI cache prune failed: {e}")
+            return 0
+
+    # ==================== 조회/저장 ====================
+    async def get(self, function: str, key: str) -> Optional[Any]:
+        """
+        캐시된 결과 (없거나 만료되면 None).
+
+        메모리에서 못 찾고 디스크에서 찾으면 메모리에도 올려 둠.
+        """
+        entry = None
+        tier = "miss"
+        if self.memory_enabled:
+            with self._lock:
+                entry = self._entries.get(key)
+            if entry is not None:
+                tier = "memory"
+        if entry is None and self.path:
+            entry = await run_in_threadpool(self._disk_get, key)
+            if entry is not None:
+                tier = "disk"
+                if self.memory_enabled:
+                    with self._lock:
+                        self._entries[key] = entry
+        AI_CACHE_REQUESTS.inc(1, function, tier)
+        if entry is None:
+            return None
+        AI_CACHE_SAVED_SECONDS.inc(entry[1], function)
+        return json.loads(entry[0])
+
+    async def put(self, function: str, key: str, value: Any, latency: float) -> None:
+        """
+        결과 저장 (유효 시간은 함수별 설정, 0 이하이면 저장하지 않음).
+
+        Args:
+            latency: 결과를 만드는 데 걸린 시간 (적중 시 절약 시간으로 기록)
+        """
+        ttl = self.ttls.get(function, 0)
+        if ttl <= 0:
+            return
+        entry = (json.dumps(value, ensure_ascii=False), latency, self._timer() + ttl)
+        if self.memory_enabled:
+            with self._lock:
+                self._entries[key] = entry
+        if self.path:
+            await run_in_threadpool(self._disk_put, key, function, entry)
+
+    async def start(self) -> None:
+        """앱 시작 시 호출. 만료된 디스크 항목 정리."""
+        pruned = await run_in_threadpool(self.prune)
+        if pruned:
+            logger.info(f"Pruned {pruned} expired AI cache entries")
+
+    def clear(self) -> None:
+        """메모리 단계 비우기 (디스크 단계는 유지)."""
+        with self._lock:
+            self._entries.clear()
+
+
+AI_CACHE_REQUESTS = register_metric(
+    Counter("ai_cache_requests_total", "AI response cache lookups by tier that answered.", ["function", "result"])
+)
+AI_CACHE_SAVED_SECONDS = register_metric(
+    Counter("ai_cache_saved_seconds_total", "Gemini call time avoided by AI response cache hits.", ["function"])
+)
+AI_CACHE_ERRORS = register_metric(
+    Counter("ai_cache_errors_total", "AI response cache disk errors.", ["operation"])
+)
+
+# 프로세스 전역 AI 응답 캐시
+ai_cache = AIResponseCache()
@@ -0,0 +1,330 @@
+"""
+Gemini 클라이언트 모듈
+
+AI 서비스(ai_service)가 사용하는 공용 Gemini 호출 계층.
+
+- 모델 인스턴스(GenerativeModel)를 모델 이름별로 한 번만 만들어 재사용
+- generate_content_async로 이벤트 루프에서 호출 (스레드를 점유하지 않음)
+- 전역/사용자별 동시 호출 수를 제한하여, 몰린 요청은 스레드를 소모하지 않고 도착 순서대로 대기.
+  전역 한도는 AIMD로 조정 (Gemini가 429/503으로 거절하면 줄이고 성공하면 천천히 늘림, adaptive_limit)
+- 호출마다 기능별 마감 시간(deadline)을 적용. 대기 시간과 호출 시간을 합쳐 넘으면 TimeoutError
+- 오류/시간 초과/느린 응답이 잦으면 회로 차단기가 열려 마감 시간까지 기다리지 않고 바로
+  CircuitOpenError로 실패 (circuit_breaker). 호출하는 쪽(ai_service)은 기본 응답으로 대체
+- stream()은 응답을 스트리밍 모드로 받아 텍스트 조각을 도착하는 대로 전달 (같은 동시 호출 제한)
+
+동기 서비스 모듈(SQLite 등)은 스레드풀에서 call_from_thread()로 같은 클라이언트를
+이벤트 루프에서 호출하므로 동시 호출 제한을 함께 적용받음.
+
+환경 변수:
+- GEMINI_MODEL: 사용할 모델 (기본값: gemini-2.5-flash)
+- AI_MAX_CONCURRENCY: 프로세스 전체 최대 동시 호출 수 (기본값: 8)
+- AI_MIN_CONCURRENCY: 요청량 제한을 받아 줄일 수 있는 최소 동시 호출 수 (기본값: 1)
+- AI_MAX_CONCURRENCY_PER_USER: 사용자별 동시 호출 수 (기본값: 2)
+- AI_CALL_TIMEOUT_SECONDS: 호출 1회의 기본 마감 시간, 대기 포함 (기본값: 30초)
+- AI_DEADLINE_KEYWORD_SECONDS / AI_DEADLINE_SUBTASKS_SECONDS / AI_DEADLINE_PARSE_SECONDS /
+  AI_DEADLINE_PARSE_BATCH_SECONDS: 기능별 마감 시간 (기본값: 30 / 15 / 8 / 30초)
+- AI_CIRCUIT_WINDOW, AI_CIRCUIT_MIN_CALLS, AI_CIRCUIT_FAILURE_RATE: 최근 호출 수, 판단 시작 호출 수,
+  회로를 여는 실패 비율 (기본값: 20, 10, 0.5)
+- AI_CIRCUIT_SLOW_CALL_SECONDS: 이보다 느린 응답은 실패로 셈 (기본값: 20초, 스트리밍 제외)
+- AI_CIRCUIT_OPEN_SECONDS, AI_CIRCUIT_PROBES: 회로를 연 뒤 시험 호출까지의 시간, 시험 호출 수 (기본값: 30초, 1)
+"""
+import asyncio
+import contextlib
+import functools
+import logging
+import os
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional, TypeVar
+
+import anyio.from_thread
+import google.generativeai as genai
+
+from ..instrumentation import Counter, Gauge, record_ai_call, register_metric
+from .adaptive_limit import AdaptiveLimit, is_throttled
+from .circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+
+logger = logging.getLogger(__name__)
+
+GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.5-flash")
+AI_MAX_CONCURRENCY = int(os.getenv("AI_MAX_CONCURRENCY", "8"))
+AI_MAX_CONCURRENCY_PER_USER = int(os.getenv("AI_MAX_CONCURRENCY_PER_USER", "2"))
+AI_MIN_CONCURRENCY = int(os.getenv("AI_MIN_CONCURRENCY", "1"))
+AI_CALL_TIMEOUT_SECONDS = float(os.getenv("AI_CALL_TIMEOUT_SECONDS", "30"))
+
+# 기능별 마감 시간 (없는 기능은 AI_CALL_TIMEOUT_SECONDS)
+AI_DEADLINES = {
+    "generate_todo_items_from_keyword": float(os.getenv("AI_DEADLINE_KEYWORD_SECONDS", "30")),
+    "generate_sub_tasks_from_main_task": float(os.getenv("AI_DEADLINE_SUBTASKS_SECONDS", "15")),
+    "analyze_task_from_natural_language": float(os.getenv("AI_DEADLINE_PARSE_SECONDS", "8")),
+    "analyze_tasks_from_natural_language": float(os.getenv("AI_DEADLINE_PARSE_BATCH_SECONDS", "30")),
+}
+
+AI_CIRCUIT_WINDOW = int(os.getenv("AI_CIRCUIT_WINDOW", "20"))
+AI_CIRCUIT_MIN_CALLS = int(os.getenv("AI_CIRCUIT_MIN_CALLS", "10"))
+AI_CIRCUIT_FAILURE_RATE = float(os.getenv("AI_CIRCUIT_FAILURE_RATE", "0.5"))
+AI_CIRCUIT_SLOW_CALL_SECONDS = float(os.getenv("AI_CIRCUIT_SLOW_CALL_SECONDS", "20"))
+AI_CIRCUIT_OPEN_SECONDS = float(os.getenv("AI_CIRCUIT_OPEN_SECONDS", "30"))
+AI_CIRCUIT_PROBES = int(os.getenv("AI_CIRCUIT_PROBES", "1"))
+
+T = TypeVar("T")
+
+
+class AIClient:
+    """
+    동시 호출 수가 제한된 Gemini 클라이언트.
+
+    Args:
+        model_name: 기본 모델 이름
+        max_concurrency: 프로세스 전체 최대 동시 호출 수
+        max_concurrency_per_user: 사용자별 동시 호출 수
+        timeout: 호출 1회의 기본 마감 시간 (초, 대기 포함)
+        deadlines: 기능별 마감 시간 (기본값: AI_DEADLINES)
+        min_concurrency: 요청량 제한을 받아 줄일 수 있는 최소 동시 호출 수
+        breaker: 회로 차단기 (기본값: AI_CIRCUIT_* 설정)
+    """
+
+    def __init__(self, model_name: str = GEMINI_MODEL, max_concurrency: int = AI_MAX_CONCURRENCY,
+                 max_concurrency_per_user: int = AI_MAX_CONCURRENCY_PER_USER,
+                 timeout: float = AI_CALL_TIMEOUT_SECONDS, deadlines: Optional[Dict[str, float]] = None,
+                 min_concurrency: int = AI_MIN_CONCURRENCY, breaker: Optional[CircuitBreaker] = None):
+        self.model_name = model_name
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.max_concurrency_per_user = max_concurrency_per_user
+        self.timeout = timeout
+        self.deadlines = dict(AI_DEADLINES if deadlines is None else deadlines)
+        self.breaker = breaker or CircuitBreaker(
+            window=AI_CIRCUIT_WINDOW, min_calls=AI_CIRCUIT_MIN_CALLS, failure_rate=AI_CIRCUIT_FAILURE_RATE,
+            slow_call_seconds=AI_CIRCUIT_SLOW_CALL_SECONDS, open_seconds=AI_CIRCUIT_OPEN_SECONDS,
+            probes=AI_CIRCUIT_PROBES, on_change=_log_circuit_change,
+        )
+        self._models: Dict[str, genai.GenerativeModel] = {}
+        self.in_flight = 0
+        self.waiting = 0
+        self.start()
+
+    def start(self) -> None:
+        """
+        앱 시작 시 호출. 동시 호출 제한을 현재 이벤트 루프용으로 새로 만듦.
+        """
+        self._slots = AdaptiveLimit(self.max_concurrency, self.min_concurrency)
+        # user_id -> [세마포어, 사용 중이거나 대기 중인 호출 수] (0이 되면 제거)
+        self._user_slots: Dict[str, List[Any]] = {}
+
+    @property
+    def concurrency_limit(self) -> float:
+        """현재 전역 동시 호출 한도 (AIMD로 조정됨)."""
+        return self._slots.limit
+
+    def model(self, model_name: Optional[str] = None) -> genai.GenerativeModel:
+        """모델 이름별 GenerativeModel (처음 요청될 때 한 번 생성)."""
+        model_name = model_name or self.model_name
+        if model_name not in self._models:
+            self._models[model_name] = genai.GenerativeModel(model_name)
+        return self._models[model_name]
+
+    def _user_semaphore(self, user_id: str) -> asyncio.Semaphore:
+        entry = self._user_slots.get(user_id)
+        if entry is None:
+            entry = self._user_slots[user_id] = [asyncio.Semaphore(self.max_concurrency_per_user), 0]
+        entry[1] += 1
+        return entry[0]
+
+    def _release_user(self, user_id: str) -> None:
+        entry = self._user_slots[user_id]
+        entry[1] -= 1
+        if entry[1] == 0:
+            del self._user_slots[user_id]
+
+    def _deadline(self, operation: str, timeout: Optional[float]) -> float:
+        """이벤트 루프 시각 기준 마감 시각 (timeout → 기능별 마감 시간 → 기본 마감 시간 순)."""
+        if timeout is None:
+            timeout = self.deadlines.get(operation, self.timeout)
+        return asyncio.get_running_loop().time() + timeout
+
+    def _check_circuit(self, operation: str) -> None:
+        """
+        회로가 열려 있으면 대기열에 들어가지 않고 바로 실패.
+
+        Raises:
+            CircuitOpenError: 회로가 열려 있음
+        """
+        try:
+            self.breaker.check()
+        except CircuitOpenError:
+            AI_CIRCUIT_REJECTIONS.inc(1, operation)
+            raise
+
+    @contextlib.contextmanager
+    def _upstream(self, operation: str, started_at: float, measure_latency: bool = True) -> Iterator[None]:
+        """
+        Gemini 호출 1회의 결과를 회로 차단기와 동시 호출 한도에 반영.
+
+        Raises:
+            CircuitOpenError: 슬롯을 기다리는 동안 회로가 열림
+        """
+        try:
+            with self.breaker.attempt(measure_latency):
+                yield
+        except CircuitOpenError:
+            AI_CIRCUIT_REJECTIONS.inc(1, operation)
+            raise
+        except Exception as e:
+            if is_throttled(e):
+                AI_THROTTLED_CALLS.inc(1, operation)
+                self._slots.on_throttle(started_at)
+            raise
+        self._slots.on_success()
+
+    @contextlib.asynccontextmanager
+    async def _slot(self, operation: str, user_id: Optional[str], deadline: float) -> AsyncIterator[float]:
+        """
+        사용자 슬롯 → 전역 슬롯 순서로 대기 (마감 시간까지)하고 블록이 끝나면 반납.
+
+        Yields:
+            전역 슬롯을 얻은 시각 (요청량 제한 반영용)
+
+        Raises:
+            TimeoutError: 슬롯을 얻기 전에 마감 시간 초과
+        """
+        user_semaphore = self._user_semaphore(user_id) if user_id else None
+        acquired: List[Any] = []
+        try:
+            self.waiting += 1
+            try:
+                async with asyncio.timeout_at(deadline):
+                    if user_semaphore is not None:
+                        await user_semaphore.acquire()
+                        acquired.append(user_semaphore)
+                    started_at = await self._slots.acquire()
+                    acquired.append(self._slots)
+            except TimeoutError:
+                AI_CALL_TIMEOUTS.inc(1, operation, "queued")
+                raise
+            finally:
+                self.waiting -= 1
+            self.in_flight += 1
+            try:
+                yield started_at
+            finally:
+                self.in_flight -= 1
+        finally:
+            for semaphore in reversed(acquired):
+                semaphore.release()
+            if user_id:
+                self._release_user(user_id)
+
+    async def generate(self, prompt: str, operation: str, user_id: Optional[str] = None,
+                       timeout: Optional[float] = None, model_name: Optional[str] = None) -> str:
+        """
+        프롬프트 실행 후 응답 텍스트 반환.
+
+        사용자 슬롯 → 전역 슬롯 순서로 대기한 뒤 호출하며, 대기와 호출을 합친 시간이
+        마감 시간을 넘으면 취소. 회로가 열려 있으면 대기하지 않고 바로 실패.
+
+        Args:
+            prompt: 프롬프트
+            operation: 계측용 호출 이름이자 기능별 마감 시간 키 (예: "generate_todo_items_from_keyword")
+            user_id: 요청 사용자 (있으면 사용자별 동시 호출 수 제한 적용)
+            timeout: 마감 시간 (초, 기본값: 기능별 마감 시간 또는 AI_CALL_TIMEOUT_SECONDS)
+            model_name: 모델 이름 (기본값: GEMINI_MODEL)
+
+        Raises:
+            TimeoutError: 마감 시간 초과
+            CircuitOpenError: 회로가 열려 있음
+        """
+        self._check_circuit(operation)
+        loop = asyncio.get_running_loop()
+        deadline = self._deadline(operation, timeout)
+        async with self._slot(operation, user_id, deadline) as started_at:
+            try:
+                with self._upstream(operation, started_at):
+                    async with asyncio.timeout_at(deadline):
+                        with record_ai_call(operation):
+                            response = await self.model(model_name).generate_content_async(
+                                prompt, request_options={"timeout": max(deadline - loop.time(), 0.001)},
+                            )
+            except TimeoutError:
+                AI_CALL_TIMEOUTS.inc(1, operation, "running")
+                raise
+        return response.text
+
+    async def stream(self, prompt: str, operation: str, user_id: Optional[str] = None,
+                     timeout: Optional[float] = None, model_name: Optional[str] = None) -> AsyncIterator[str]:
+        """
+        프롬프트를 스트리밍 모드로 실행하여 응답 텍스트 조각을 도착하는 대로 반환.
+
+        동시 호출 제한과 회로 차단기는 generate와 같으며 슬롯은 마지막 조각을 받을 때(또는 호출자가
+        반복을 멈출 때)까지 점유. 마감 시간은 대기부터 마지막 조각까지 전체에 적용.
+        응답 길이에 따라 시간이 달라지므로 느린 응답은 회로 차단기의 실패로 세지 않음 (오류/시간 초과만).
+
+        Raises:
+            TimeoutError: 마감 시간 초과
+            CircuitOpenError: 회로가 열려 있음
+        """
+        self._check_circuit(operation)
+        loop = asyncio.get_running_loop()
+        deadline = self._deadline(operation, timeout)
+        async with self._slot(operation, user_id, deadline) as started_at:
+            with record_ai_call(operation):
+                try:
+                    with self._upstream(operation, started_at, measure_latency=False):
+                        async with asyncio.timeout_at(deadline):
+                            response = await self.model(model_name).generate_content_async(
+                                prompt, stream=True, request_options={"timeout": max(deadline - loop.time(), 0.001)},
+                            )
+                        chunks = response.__aiter__()
+                        while True:
+                            # 마감 시간은 조각을 기다리는 동안에만 적용 (yield 중인 호출자 코드는 제외)
+                            async with asyncio.timeout_at(deadline):
+                                try:
+                                    chunk = await chunks.__anext__()
+                                except StopAsyncIteration:
+                                    break
+                            yield chunk.text
+                except TimeoutError:
+                    AI_CALL_TIMEOUTS.inc(1, operation, "running")
+                    raise
+
+
+def call_from_thread(func: Callable[..., Awaitable[T]], *args: Any, **kwargs: Any) -> T:
+    """
+    스레드풀에서 실행 중인 동기 코드가 AI 코루틴 함수를 호출할 때 사용.
+
+    요청 처리 중(AnyIO 워커 스레드)이면 앱 이벤트 루프에서 실행하여 동시 호출 제한을 공유하고,
+    이벤트 루프 밖(스크립트 등)이면 새 루프에서 실행.
+    """
+    call = functools.partial(func, *args, **kwargs)
+    try:
+        return anyio.from_thread.run(call)
+    except RuntimeError as e:
+        if "AnyIO worker thread" not in str(e):
+            raise
+    return asyncio.run(call())
+
+
+def _log_circuit_change(state: str) -> None:
+    log = logger.warning if state == OPEN else logger.info
+    log("Gemini circuit breaker %s", state)
+
+
+AI_CALL_TIMEOUTS = register_metric(
+    Counter("ai_call_timeouts_total", "Gemini calls cancelled at their deadline.", ["function", "stage"])
+)
+AI_CIRCUIT_REJECTIONS = register_metric(
+    Counter("ai_circuit_rejections_total", "Gemini calls failed fast because the circuit breaker was open.",
+            ["function"])
+)
+AI_THROTTLED_CALLS = register_metric(
+    Counter("ai_throttled_calls_total", "Gemini calls rejected by the upstream with 429/503.", ["function"])
+)
+_CIRCUIT_STATES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+# 프로세스 전역 AI 클라이언트
+ai_client = AIClient()
+
+register_metric(Gauge("ai_calls_in_flight", "Gemini calls running.", lambda: ai_client.in_flight))
+register_metric(Gauge("ai_calls_waiting", "Gemini calls waiting for a concurrency slot.", lambda: ai_client.waiting))
+register_metric(Gauge("ai_concurrency_limit", "Current adaptive limit on concurrent Gemini calls.",
+                      lambda: ai_client.concurrency_limit))
+register_metric(Gauge("ai_circuit_state", "Gemini circuit breaker state (0 closed, 1 half-open, 2 open).",
+                      lambda: _CIRCUIT_STATES[ai_client.breaker.state]))
@@ -6,44 +6,51 @@ Google Gemini AI를 활용한 작업 생성 및 자연어 파싱 기능 제공.
 주요 기능:
 - 키워드 기반 할 일 목록 자동 생성
 - 메인 작업에서 세부 작업(서브태스크) 분해
-- 자연어 문장에서 작업 속성 추출 (날짜, 우선순위 등)
+- 자연어 문장에서 작업 속성 추출 (날짜, 우선순위 등), 여러 문장은 프롬프트 하나로 일괄 추출
+
+모든 호출은 ai_client를 통해 비동기로 실행되며 동시 호출 수 제한과 기능별 마감 시간이 적용됨.
+Gemini 장애로 회로 차단기가 열려 있으면 호출이 바로 실패하므로 각 기능은 즉시 기본 응답(폴백)을 반환.
+user_id를 넘기면 사용자별 동시 호출 수 제한도 적용.
+정상 응답은 정규화한 입력을 키로 ai_cache에 저장하여 같은 입력의 재호출을 생략
+(폴백 응답은 저장하지 않음).
+키워드 기반 목록 생성은 정확히 같은 입력이 없어도 비슷한 키워드의 이전 결과를
+keyword_index에서 찾아 재사용하고, 필요하면 백그라운드에서 요청 키워드로 다시 생성.
+stream_todo_items_from_keyword는 같은 목록을 Gemini 스트리밍 응답에서 항목이 완성될 때마다 반환.
 """
-from typing import List
+from typing import AsyncIterator, List, Optional
+import asyncio
 import google.generativeai as genai
 import os
 import re
+import time
 from dotenv import load_dotenv
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 import json
 
+from .ai_cache import ai_cache
+from .ai_client import ai_client
+from .keyword_index import AI_SIMILARITY_REFRESH, keyword_index
+from .single_flight import SingleFlight
+from .tree_stream import Node, TreeStreamParser, iter_tree_nodes
+
+# 날짜 계산 기준 시간대 (서울)
+KST = ZoneInfo("Asia/Seoul")
+
+# 일괄 자연어 분석에서 프롬프트 하나에 묶는 최대 문장 수 (넘으면 여러 프롬프트로 나눠 동시 호출)
+AI_PARSE_BATCH_SIZE = int(os.getenv("AI_PARSE_BATCH_SIZE", "25"))
+
+# 진행 중인 Gemini 호출 (캐시 키별). 같은 요청이 동시에 들어오면 호출 하나를 함께 기다림
+ai_requests = SingleFlight()
+
 # 환경 변수 로드 및 Gemini API 키 설정
 load_dotenv()
 genai.configure(api_key=os.environ.get("GOOGLE_API_KEY"))
 
 
-def generate_todo_items_from_keyword(keyword: str) -> List[dict]:
-    """
-    키워드 기반 계층적 할 일 목록 생성.
-    
-    Gemini AI를 호출하여 주어진 키워드에 대한
-    상위/하위 구조의 할 일 목록을 자동 생성.
-    
-    Args:
-        keyword: 프로젝트 또는 작업의 핵심 키워드 (예: "웹사이트 개발")
-    
-    Returns:
-        계층적 할 일 목록. 각 항목은 description과 선택적 children 포함.
-        예: [{"description": "기획", "children": [{"description": "목표 정의"}]}]
-    
-    Note:
-        API 오류 시 기본 폴백 응답 반환
-    """
-    try:
-        model = genai.GenerativeModel('gemini-2.5-flash')  # [수정] 모델 버전 명시화
-        
-        # AI 프롬프트: 한국어로 계층적 할 일 목록 생성 요청
-        prompt = f"""Generate a hierarchical list of to-do items for the keyword '{keyword}'.
+def _keyword_prompt(keyword: str) -> str:
+    """키워드 기반 목록 생성 프롬프트 (한국어로 계층적 할 일 목록 생성 요청)."""
+    return f"""Generate a hierarchical list of to-do items for the keyword '{keyword}'.
 
 IMPORTANT RULES:
 - All descriptions must be in Korean (한국어)
@@ -75,32 +82,160 @@ Example for keyword 'Build a website':
   {{ "description": "배포" }}
 ]
 """
-        response = model.generate_content(prompt)
-        
+
+
+def _fallback_items(keyword: str) -> List[dict]:
+    """API 오류 시 사용하는 기본 폴백 목록."""
+    return [
+        {
+            "description": f"{keyword} 관련 작업 브레인스토밍",
+            "children": [
+                { "description": "세부 아이디어 1" },
+                { "description": "세부 아이디어 2" }
+            ]
+        },
+        { "description": f"가장 중요한 {keyword} 작업 우선순위 지정" }
+    ]
+
+
+async def generate_todo_items_from_keyword(keyword: str, user_id: Optional[str] = None) -> List[dict]:
+    """
+    키워드 기반 계층적 할 일 목록 생성.
+    
+    Gemini AI를 호출하여 주어진 키워드에 대한
+    상위/하위 구조의 할 일 목록을 자동 생성.
+    
+    Args:
+        keyword: 프로젝트 또는 작업의 핵심 키워드 (예: "웹사이트 개발")
+        user_id: 요청 사용자 ID (사용자별 동시 호출 수 제한용)
+    
+    Returns:
+        계층적 할 일 목록. 각 항목은 description과 선택적 children 포함.
+        예: [{"description": "기획", "children": [{"description": "목표 정의"}]}]
+    
+    Note:
+        비슷한 키워드(keyword_index)의 결과를 재사용하면 AI_SIMILARITY_REFRESH에 따라
+        백그라운드에서 요청 키워드로 다시 생성하여 캐시에 저장 (다음 요청부터 사용).
+        API 오류/마감 시간 초과 시 기본 폴백 응답 반환
+    """
+    cache_key = ai_cache.key("generate_todo_items_from_keyword", ai_client.model_name, keyword)
+    cached = await ai_cache.get("generate_todo_items_from_keyword", cache_key)
+    if cached is not None:
+        return cached
+
+    similar = keyword_index.lookup(keyword)
+    if similar is not None:
+        if AI_SIMILARITY_REFRESH:
+            keyword_index.refresh(keyword, lambda: _generate_todo_items(keyword, cache_key, user_id))
+        return similar
+
+    try:
+        return await _generate_todo_items(keyword, cache_key, user_id)
+    except Exception as e:
+        print(f"Error calling Gemini API or parsing JSON: {e}")
+        # API 오류 시 기본 폴백 응답 반환
+        return _fallback_items(keyword)
+
+
+async def _generate_todo_items(keyword: str, cache_key: str, user_id: Optional[str]) -> List[dict]:
+    """
+    Gemini로 키워드 기반 목록을 생성하고 정상 결과를 ai_cache와 keyword_index에 저장.
+
+    같은 키워드의 생성(스트리밍 포함)이 진행 중이면 새로 호출하지 않고 그 결과를 기다림.
+
+    Raises:
+        Gemini 호출/JSON 파싱 오류를 그대로 올림 (폴백은 호출하는 쪽에서 처리)
+    """
+    async def generate() -> List[dict]:
+        prompt = _keyword_prompt(keyword)
+        start = time.perf_counter()
+        response_text = await ai_client.generate(prompt, "generate_todo_items_from_keyword", user_id=user_id)
+
         # 응답에서 JSON 부분만 추출 (마크다운 코드 블록 제거)
-        json_str = response.text.strip().replace('```json', '').replace('```', '').strip()
-        
+        json_str = response_text.strip().replace('```json', '').replace('```', '').strip()
+
         # JSON 문자열을 Python 객체로 파싱
         todo_items_json = json.loads(json_str)
+        if todo_items_json:
+            await ai_cache.put("generate_todo_items_from_keyword", cache_key, todo_items_json,
+                               time.perf_counter() - start)
+            await keyword_index.add(keyword, todo_items_json)
         return todo_items_json
+
+    return await ai_requests.run(cache_key, generate, "generate_todo_items_from_keyword")
+
+async def stream_todo_items_from_keyword(keyword: str, user_id: Optional[str] = None) -> AsyncIterator[Node]:
+    """
+    키워드 기반 계층적 할 일 목록을 항목 단위로 스트리밍 생성.
+
+    Gemini를 스트리밍 모드로 호출하고 응답 조각을 TreeStreamParser로 읽어,
+    항목이 완성될 때마다 (경로, description)을 반환 (부모가 자식보다 먼저).
+    캐시/유사 키워드 적중 시에는 저장된 목록의 항목을 바로 반환.
+
+    Args:
+        keyword: 프로젝트 또는 작업의 핵심 키워드
+        user_id: 요청 사용자 ID (사용자별 동시 호출 수 제한용)
+
+    Yields:
+        (경로, description). 경로는 최상위부터의 위치 튜플 (예: (0, 1))
+
+    Raises:
+        항목을 하나 이상 반환한 뒤 생긴 Gemini 호출/파싱 오류 (그 전의 오류는 폴백 목록으로 대체)
+    """
+    cache_key = ai_cache.key("generate_todo_items_from_keyword", ai_client.model_name, keyword)
+    stored = await ai_cache.get("generate_todo_items_from_keyword", cache_key)
+    if stored is None:
+        stored = keyword_index.lookup(keyword)
+        if stored is not None and AI_SIMILARITY_REFRESH:
+            keyword_index.refresh(keyword, lambda: _generate_todo_items(keyword, cache_key, user_id))
+    if stored is None:
+        # 같은 키워드의 생성이 진행 중이면 완성된 목록을 기다렸다가 반환
+        in_flight = ai_requests.joinable(cache_key, "generate_todo_items_from_keyword")
+        if in_flight is not None:
+            try:
+                stored = await ai_requests.wait(in_flight)
+            except Exception as e:
+                print(f"Error in coalesced generation for streaming: {e}")
+                stored = _fallback_items(keyword)
+    if stored is not None:
+        for node in iter_tree_nodes(stored):
+            yield node
+        return
+
+    # 이 스트림이 끝날 때까지 같은 키워드의 다른 요청은 완성된 목록을 기다림
+    shared = ai_requests.lead(cache_key)
+    parser = TreeStreamParser()
+    emitted = 0
+    start = time.perf_counter()
+    try:
+        async for chunk in ai_client.stream(_keyword_prompt(keyword), "generate_todo_items_from_keyword",
+                                            user_id=user_id):
+            for node in parser.feed(chunk):
+                emitted += 1
+                yield node
+        tree = parser.close()
+        if tree:
+            await ai_cache.put("generate_todo_items_from_keyword", cache_key, tree, time.perf_counter() - start)
+            await keyword_index.add(keyword, tree)
+        shared.set_result(tree)
     except Exception as e:
-        print(f"Error calling Gemini API or parsing JSON: {e}")
-        # API 오류 시 기본 폴백 응답 반환
-        return [
-            {
-                "description": f"{keyword} 관련 작업 브레인스토밍",
-                "children": [
-                    { "description": "세부 아이디어 1" },
-                    { "description": "세부 아이디어 2" }
-                ]
-            },
-            { "description": f"가장 중요한 {keyword} 작업 우선순위 지정" }
-        ]
+        shared.set_exception(e)
+        if emitted:
+            raise
+        print(f"Error streaming from Gemini API or parsing JSON: {e}")
+        for node in iter_tree_nodes(_fallback_items(keyword)):
+            yield node
+        return
+    finally:
+        if not shared.done():
+            # 클라이언트 연결 종료 등으로 스트림이 중단됨
+            shared.set_exception(ConnectionAbortedError("Streaming generation was abandoned"))
 
-def generate_sub_tasks_from_main_task(
+async def generate_sub_tasks_from_main_task(
     main_task_description: str, 
     project_keyword: str = None,
-    context_path: List[str] = None
+    context_path: List[str] = None,
+    user_id: Optional[str] = None
 ) -> List[str]:
     """
     메인 작업에서 세부 작업(서브태스크) 목록 생성.
@@ -112,26 +247,31 @@ def generate_sub_tasks_from_main_task(
         main_task_description: 분해할 현재 작업의 설명
         project_keyword: 전체 프로젝트의 핵심 키워드 (맥락 제공용)
         context_path: 현재 작업까지의 상위 작업 경로 목록
+        user_id: 요청 사용자 ID (사용자별 동시 호출 수 제한용)
     
     Returns:
         세부 작업 문자열 목록 (3~5개)
     
     Note:
-        API 오류 시 기본 폴백 응답 반환
+        API 오류/마감 시간 초과 시 기본 폴백 응답 반환
     """
-    try:
-        model = genai.GenerativeModel('gemini-2.5-flash')  # [수정] 모델 버전 명시화
-        
+    # 현재 작업을 제외한 상위 항목들 (프롬프트에 들어가는 맥락만 캐시 키에 포함)
+    parent_items = context_path[:-1] if context_path and len(context_path) > 1 else []
+    cache_key = ai_cache.key(
+        "generate_sub_tasks_from_main_task", ai_client.model_name, main_task_description, project_keyword, parent_items,
+    )
+    cached = await ai_cache.get("generate_sub_tasks_from_main_task", cache_key)
+    if cached is not None:
+        return cached
+
+    async def generate() -> List[str]:
         # 맥락 정보 구성: 프로젝트명과 상위 작업 경로
         context_info = ""
         if project_keyword:
             context_info += f"프로젝트: {project_keyword}\n"
         
-        if context_path and len(context_path) > 1:
-            # 현재 작업을 제외한 상위 항목들
-            parent_items = context_path[:-1]
-            if parent_items:
-                context_info += f"상위 작업: {' > '.join(parent_items)}\n"
+        if parent_items:
+            context_info += f"상위 작업: {' > '.join(parent_items)}\n"
         
         prompt = f"""Given the following context, generate a list of 3 to 5 detailed, actionable sub-tasks for the current task.
 
@@ -151,12 +291,18 @@ Return the list as a numbered list, e.g.,
 2. 두 번째 세부 작업
 ..."""
         
-        response = model.generate_content(prompt)
+        start = time.perf_counter()
+        response_text = await ai_client.generate(prompt, "generate_sub_tasks_from_main_task", user_id=user_id)
         
         # 번호 목록 형식 응답 파싱 (1. 2. 3. 형식)
-        parts = re.split(r'\d+\.\s*', response.text)
+        parts = re.split(r'\d+\.\s*', response_text)
         sub_tasks = [part.strip() for part in parts[1:] if part.strip()]
+        if sub_tasks:
+            await ai_cache.put("generate_sub_tasks_from_main_task", cache_key, sub_tasks, time.perf_counter() - start)
         return sub_tasks
+
+    try:
+        return await ai_requests.run(cache_key, generate, "generate_sub_tasks_from_main_task")
     except Exception as e:
         print(f"Error calling Gemini API for sub-tasks: {e}")
         # API 오류 시 기본 폴백 응답 반환
@@ -167,7 +313,41 @@ Return the list as a numbered list, e.g.,
         ]
 
 
-def analyze_task_from_natural_language(natural_language_text: str) -> dict:
+# 자연어 작업 분석 프롬프트의 필드 설명 (단건/일괄 분석 공용)
+_TASK_FIELDS = """1.  `description`: (string) The core action or task to be done.
+2.  `due_date`: (string, ISO 8601 format YYYY-MM-DD HH:MM:SS or YYYY-MM-DD) The deadline for the task. Infer from relative terms like '내일', '오늘 저녁 6시', '다음 주 수요일'. If no date is mentioned, return null.
+3.  `priority`: (string) The priority of the task. Infer from keywords like '긴급', '중요'. Can be 'high', 'medium', 'low', 'none'. If not specified, default to 'none'.
+4.  `estimated_time_minutes`: (integer) The estimated time required to complete the task in minutes. Infer from the task's complexity and description. Examples: '5분 스트레칭' -> 5, '보고서 작성' -> 120. If not clear, return null.
+5.  `category`: (string) The category of the task. Infer from the content. Examples: '업무', '개인', '운동', '학습'. If not clear, return null.
+"""
+
+
+def tomorrow_due_date(now: datetime) -> datetime:
+    """
+    "내일까지"의 마감 시각.
+
+    지금부터 24시간 뒤를 30분 단위로 올림 (초 이하는 버림).
+    nlp_parser의 규칙 기반 파서도 같은 규칙을 사용.
+    """
+    target_time = now + timedelta(hours=24)
+    if target_time.minute % 30 != 0:
+        target_time += timedelta(minutes=30 - (target_time.minute % 30))
+    return target_time.replace(second=0, microsecond=0)
+
+
+def _parse_cache_key(text: str, now: datetime) -> str:
+    """
+    자연어 분석 결과의 캐시 키 (단건/일괄 분석이 같은 항목을 공유).
+
+    상대 날짜('내일', '다음 주 수요일')의 결과는 KST 날짜와 "내일까지"의 30분 단위 마감 시각에
+    따라 달라지므로 분 단위 현재 시각 대신 이 둘을 키에 포함 (같은 구간 안에서는 다시 분석하지 않음).
+    """
+    return ai_cache.key("analyze_task_from_natural_language", ai_client.model_name,
+                        text, now.strftime("%Y-%m-%d"), tomorrow_due_date(now).strftime("%Y-%m-%d %H:%M"))
+
+
+async def analyze_task_from_natural_language(natural_language_text: str, user_id: Optional[str] = None,
+                                             now: Optional[datetime] = None) -> dict:
     """
     자연어 문장에서 작업 속성 추출.
     
@@ -176,6 +356,8 @@ def analyze_task_from_natural_language(natural_language_text: str) -> dict:
     
     Args:
         natural_language_text: 사용자가 입력한 자연어 작업 문장
+        user_id: 요청 사용자 ID (사용자별 동시 호출 수 제한용)
+        now: 상대 날짜의 기준 시각 (기본값: 현재 KST 시각)
     
     Returns:
         추출된 작업 속성 딕셔너리:
@@ -186,27 +368,19 @@ def analyze_task_from_natural_language(natural_language_text: str) -> dict:
         - category: 카테고리 (업무/개인/운동/학습 등)
     
     Note:
-        API 오류 시 원본 텍스트를 description으로 반환
+        API 오류/마감 시간 초과 시 원본 텍스트를 description으로 반환
     """
-    try:
-        model = genai.GenerativeModel('gemini-2.5-flash')  # [수정] 모델 버전 명시화
-        
-        # Get current date and time to provide context to the AI
-        
-        # Set timezone to Seoul
-        kst = ZoneInfo("Asia/Seoul")
-        now = datetime.now(kst)
-        current_time_str = now.strftime("%Y-%m-%d %H:%M")
-
-        # New rule for "by tomorrow": 24 hours from now, rounded up to the nearest 30 mins
-        target_time = now + timedelta(hours=24)
-        if target_time.minute % 30 != 0:
-            minutes_to_add = 30 - (target_time.minute % 30)
-            target_time += timedelta(minutes=minutes_to_add)
-        # Reset seconds for a clean time
-        target_time = target_time.replace(second=0, microsecond=0)
-        tomorrow_due_date_str = target_time.strftime("%Y-%m-%d %H:%M:%S")
+    # Get current date and time to provide context to the AI
+    now = now or datetime.now(KST)
+    current_time_str = now.strftime("%Y-%m-%d %H:%M")
+    tomorrow_due_date_str = tomorrow_due_date(now).strftime("%Y-%m-%d %H:%M:%S")
 
+    cache_key = _parse_cache_key(natural_language_text, now)
+    cached = await ai_cache.get("analyze_task_from_natural_language", cache_key)
+    if cached is not None:
+        return cached
+
+    async def analyze() -> dict:
         prompt = f"""You are a sophisticated task parser. Analyze the following to-do item and return its components as a JSON object.
 
 Current date and time for context: {current_time_str}
@@ -215,12 +389,7 @@ To-do item: "{natural_language_text}"
 
 Analyze the text and provide the following information in a valid JSON object format ONLY. Do not include any other text, explanations, or markdown formatting.
 
-1.  `description`: (string) The core action or task to be done.
-2.  `due_date`: (string, ISO 8601 format YYYY-MM-DD HH:MM:SS or YYYY-MM-DD) The deadline for the task. Infer from relative terms like '내일', '오늘 저녁 6시', '다음 주 수요일'. If no date is mentioned, return null.
-3.  `priority`: (string) The priority of the task. Infer from keywords like '긴급', '중요'. Can be 'high', 'medium', 'low', 'none'. If not specified, default to 'none'.
-4.  `estimated_time_minutes`: (integer) The estimated time required to complete the task in minutes. Infer from the task's complexity and description. Examples: '5분 스트레칭' -> 5, '보고서 작성' -> 120. If not clear, return null.
-5.  `category`: (string) The category of the task. Infer from the content. Examples: '업무', '개인', '운동', '학습'. If not clear, return null.
-
+{_TASK_FIELDS}
 Example 1:
 Input: "내일까지 운동하기"
 Output:
@@ -254,14 +423,21 @@ Output:
   "category": "개인"
 }}
 """
-        response = model.generate_content(prompt)
+        start = time.perf_counter()
+        response_text = await ai_client.generate(prompt, "analyze_task_from_natural_language", user_id=user_id)
         
         # Clean the response to get only the JSON part
-        json_str = response.text.strip().replace('```json', '').replace('```', '').strip()
+        json_str = response_text.strip().replace('```json', '').replace('```', '').strip()
         
         parsed_data = json.loads(json_str)
+        if parsed_data:
+            await ai_cache.put("analyze_task_from_natural_language", cache_key, parsed_data,
+                               time.perf_counter() - start)
         return parsed_data
 
+    try:
+        return await ai_requests.run(cache_key, analyze, "analyze_task_from_natural_language")
+
     except Exception as e:
         print(f"Error in analyze_task_from_natural_language: {e}")
         # Fallback to a simple parsing
@@ -271,4 +447,78 @@ Output:
             "priority": "none",
             "estimated_time_minutes": None,
             "category": None
-        }
\ No newline at end of file
+        }
+
+
+async def analyze_tasks_from_natural_language(texts: List[str], user_id: Optional[str] = None,
+                                              now: Optional[datetime] = None) -> List[Optional[dict]]:
+    """
+    여러 자연어 문장을 한 번에 분석 (여러 줄 붙여넣기용).
+
+    캐시에 없는 문장을 AI_PARSE_BATCH_SIZE개씩 번호를 붙여 하나의 프롬프트로 묶고,
+    묶음끼리는 동시에 호출. 결과는 문장별로 단건 분석과 같은 캐시 키에 저장.
+
+    Args:
+        texts: 분석할 문장 목록
+        user_id: 요청 사용자 ID (사용자별 동시 호출 수 제한용)
+        now: 상대 날짜의 기준 시각 (기본값: 현재 KST 시각)
+
+    Returns:
+        texts와 같은 순서의 작업 속성 딕셔너리 목록.
+        응답에서 빠졌거나 형식이 잘못된 문장, 호출이 실패한 묶음의 문장은 None
+    """
+    now = now or datetime.now(KST)
+    current_time_str = now.strftime("%Y-%m-%d %H:%M")
+    tomorrow_due_date_str = tomorrow_due_date(now).strftime("%Y-%m-%d %H:%M:%S")
+    keys = [_parse_cache_key(text, now) for text in texts]
+    results: List[Optional[dict]] = [
+        await ai_cache.get("analyze_task_from_natural_language", key) for key in keys
+    ]
+    missing = [index for index, result in enumerate(results) if result is None]
+    chunks = [missing[start:start + AI_PARSE_BATCH_SIZE] for start in range(0, len(missing), AI_PARSE_BATCH_SIZE)]
+
+    async def analyze_chunk(indexes: List[int]) -> None:
+        numbered = "\n".join(f"{number}. {json.dumps(texts[index], ensure_ascii=False)}"
+                             for number, index in enumerate(indexes, start=1))
+        prompt = f"""You are a sophisticated task parser. Analyze each of the following numbered to-do items and return their components as a JSON array.
+
+Current date and time for context: {current_time_str}
+
+To-do items:
+{numbered}
+
+Return a valid JSON array ONLY, with exactly one object per to-do item. Do not include any other text, explanations, or markdown formatting.
+Each object has an `index` (integer, the number of the to-do item) and the following fields:
+
+{_TASK_FIELDS}
+Example:
+Input:
+1. "내일까지 운동하기"
+2. "긴급! 오늘 저녁 6시까지 보고서 제출"
+Output:
+[
+  {{"index": 1, "description": "운동하기", "due_date": "{tomorrow_due_date_str}", "priority": "none", "estimated_time_minutes": 60, "category": "운동"}},
+  {{"index": 2, "description": "보고서 제출", "due_date": "{now.strftime('%Y-%m-%d')} 18:00:00", "priority": "high", "estimated_time_minutes": 180, "category": "업무"}}
+]
+"""
+        try:
+            start = time.perf_counter()
+            response_text = await ai_client.generate(prompt, "analyze_tasks_from_natural_language", user_id=user_id)
+            json_str = response_text.strip().replace('```json', '').replace('```', '').strip()
+            parsed = json.loads(json_str)
+            if not isinstance(parsed, list):
+                raise ValueError("response is not a JSON array")
+        except Exception as e:
+            print(f"Error in analyze_tasks_from_natural_language: {e}")
+            return
+        latency = (time.perf_counter() - start) / len(indexes)
+        for entry in parsed:
+            number = entry.pop("index", None) if isinstance(entry, dict) else None
+            if not isinstance(number, int) or not 1 <= number <= len(indexes) or not entry.get("description"):
+                continue
+            index = indexes[number - 1]
+            results[index] = entry
+            await ai_cache.put("analyze_task_from_natural_language", keys[index], entry, latency)
+
+    await asyncio.gather(*(analyze_chunk(chunk) for chunk in chunks))
+    return results
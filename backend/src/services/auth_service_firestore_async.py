@@ -0,0 +1,147 @@
+"""
+인증 서비스 모듈 (Firestore, 비동기)
+
+repository.UserRepository 계약을 코루틴으로 구현.
+Firestore AsyncClient를 사용하므로 인증 의존성(get_current_user)이 스레드풀을 점유하지 않음.
+username 조회는 인덱스 문서(usernames/{username_key}) 단건 조회이며,
+공유 캐시(Redis)가 설정되어 있으면 사용자 문서를 같은 키로 캐시.
+"""
+import asyncio
+from datetime import datetime
+
+from fastapi import Depends
+from google.api_core.exceptions import AlreadyExists
+
+from ..firestore_db import get_async_firestore_db
+from .security import (  # noqa: F401 - 기존 auth_service.* 호출부 호환
+    SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES, pwd_context, oauth2_scheme,
+    verify_password, get_password_hash, create_access_token, decode_access_token,
+    credentials_exception, UserObject, principal_cache,
+)
+from .firestore_common import (
+    BATCH_WRITE_LIMIT, LEGACY_USERNAME_FALLBACK, USERNAME_INDEX_COLLECTION, new_user_document, username_key,
+)
+from .shared_cache import invalidate_trees, shared_cache
+
+
+async def _legacy_get_user(db, username: str):
+    """인덱스 문서가 없는 기존 사용자 조회 (username 쿼리)."""
+    users_ref = db.collection('users').where('username', '==', username).limit(1)
+    async for doc in users_ref.stream():
+        user_data = doc.to_dict()
+        user_data['id'] = doc.id
+        return user_data
+    return None
+
+
+async def get_user_by_username(username: str):
+    """username으로 사용자 조회 (공유 캐시 → 인덱스 문서 → 폴백 쿼리 순)"""
+    key = username_key(username)
+    cached, generation = await shared_cache.get("user", key)
+    if cached is not None:
+        return cached
+    db = get_async_firestore_db()
+    index_doc = await db.collection(USERNAME_INDEX_COLLECTION).document(key).get()
+    if index_doc.exists:
+        user_data = index_doc.to_dict()
+    elif LEGACY_USERNAME_FALLBACK:
+        user_data = await _legacy_get_user(db, username)
+    else:
+        user_data = None
+    if user_data is not None:
+        await shared_cache.put("user", key, user_data, generation)
+    return user_data
+
+
+async def create_user(username: str, email: str, hashed_password: str):
+    """
+    새 사용자 생성.
+
+    인덱스 문서를 create(존재하지 않을 때만 성공)로 사용자 문서와 같은 batch에 쓰므로
+    동시에 같은 username으로 가입해도 하나만 성공.
+
+    Returns:
+        생성한 사용자 문서, username이 이미 사용 중이면 None
+    """
+    db = get_async_firestore_db()
+    if LEGACY_USERNAME_FALLBACK and await _legacy_get_user(db, username) is not None:
+        return None
+
+    user_doc = new_user_document(username, email, hashed_password)
+    batch = db.batch()
+    batch.create(db.collection(USERNAME_INDEX_COLLECTION).document(username_key(username)), user_doc)
+    batch.set(db.collection('users').document(user_doc["id"]), user_doc)
+    try:
+        await batch.commit()
+    except AlreadyExists:
+        return None
+    return user_doc
+
+
+async def get_current_user(token: str = Depends(oauth2_scheme)):
+    """JWT 토큰에서 현재 사용자 가져오기"""
+    username = decode_access_token(token)
+    user = await get_user_by_username(username)
+    if user is None:
+        raise credentials_exception()
+    return UserObject.from_dict(user)
+
+
+async def update_password_hash(user: dict, hashed_password: str) -> None:
+    """
+    비밀번호 해시 갱신 (로그인 시 재해싱).
+
+    username 인덱스 문서는 사용자 문서 전체 사본으로 다시 쓰므로 인덱스가 없던 기존 사용자도 함께 백필됨.
+    """
+    db = get_async_firestore_db()
+    key = username_key(user['username'])
+    update_data = {"hashed_password": hashed_password, "updated_at": datetime.utcnow()}
+    batch = db.batch()
+    batch.update(db.collection('users').document(user['id']), update_data)
+    batch.set(db.collection(USERNAME_INDEX_COLLECTION).document(key), {**user, **update_data})
+    await batch.commit()
+    await shared_cache.invalidate("user", key)
+
+
+async def delete_user(user_id: str) -> bool:
+    """
+    사용자 계정 삭제.
+
+    사용자 정보와 해당 사용자의 모든 프로젝트, 할 일 항목을 삭제.
+    프로젝트별 아이템 조회는 동시에 실행하고, 삭제는 최대 500개 단위 batch로 적용.
+    삭제 후 프로젝트 트리, 인증 주체, 사용자 캐시를 무효화(다른 워커에도 전파).
+
+    Args:
+        user_id: 삭제할 사용자 ID
+
+    Returns:
+        삭제 성공 시 True
+    """
+    db = get_async_firestore_db()
+
+    async def list_refs_of_user():
+        query = db.collection('todo_lists').where('user_id', '==', user_id)
+        return [doc.reference async for doc in query.stream()]
+
+    # username 인덱스 문서와 사용자 캐시 항목은 username 키이므로 삭제 전에 username 확인
+    list_refs, user_doc = await asyncio.gather(list_refs_of_user(), db.collection('users').document(user_id).get())
+    key = username_key(user_doc.to_dict()['username']) if user_doc.exists else None
+
+    async def item_refs_of(list_ref):
+        query = db.collection('todo_items').where('todo_list_id', '==', list_ref.id)
+        return [doc.reference async for doc in query.stream()]
+
+    item_refs = await asyncio.gather(*(item_refs_of(list_ref) for list_ref in list_refs))
+    refs = [ref for refs_of_list in item_refs for ref in refs_of_list] + list_refs
+    refs.append(db.collection('users').document(user_id))
+    if key:
+        refs.append(db.collection(USERNAME_INDEX_COLLECTION).document(key))
+    for start in range(0, len(refs), BATCH_WRITE_LIMIT):
+        batch = db.batch()
+        for ref in refs[start:start + BATCH_WRITE_LIMIT]:
+            batch.delete(ref)
+        await batch.commit()
+    await invalidate_trees(*(list_ref.id for list_ref in list_refs))
+    await shared_cache.invalidate("principal", user_id)
+    await shared_cache.invalidate("user", key)
+    return True
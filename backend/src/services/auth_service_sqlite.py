@@ -0,0 +1,90 @@
+"""
+인증 서비스 모듈 (SQLite)
+
+auth_service_firestore_async와 동일한 인터페이스(repository.UserRepository)를
+로컬 SQLite 저장 엔진으로 구현.
+"""
+import sqlite3
+import uuid
+from datetime import datetime
+
+from fastapi import Depends
+
+from ..database import get_connection
+from .security import (  # noqa: F401 - 기존 auth_service.* 호출부 호환
+    SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES, pwd_context, oauth2_scheme,
+    verify_password, get_password_hash, create_access_token, decode_access_token,
+    credentials_exception, UserObject, principal_cache,
+)
+
+
+def _row_to_user(row: sqlite3.Row) -> dict:
+    user_data = dict(row)
+    for field in ("created_at", "updated_at"):
+        if user_data.get(field):
+            user_data[field] = datetime.fromisoformat(user_data[field])
+    return user_data
+
+
+def get_user_by_username(username: str):
+    """username으로 사용자 조회 (username 고유 인덱스 사용)"""
+    row = get_connection().execute("SELECT * FROM users WHERE username = ?", (username,)).fetchone()
+    return _row_to_user(row) if row else None
+
+
+def create_user(username: str, email: str, hashed_password: str):
+    """새 사용자 생성 (username 고유 인덱스 위반 시 None)"""
+    conn = get_connection()
+    now = datetime.utcnow()
+    user_doc = {
+        "id": str(uuid.uuid4()),
+        "username": username,
+        "email": email,
+        "hashed_password": hashed_password,
+        "created_at": now,
+        "updated_at": now,
+    }
+    try:
+        with conn:
+            conn.execute(
+                "INSERT INTO users (id, username, email, hashed_password, created_at, updated_at) "
+                "VALUES (:id, :username, :email, :hashed_password, :created_at, :updated_at)",
+                {**user_doc, "created_at": now.isoformat(), "updated_at": now.isoformat()},
+            )
+    except sqlite3.IntegrityError:
+        return None
+    return user_doc
+
+
+def get_current_user(token: str = Depends(oauth2_scheme)):
+    """JWT 토큰에서 현재 사용자 가져오기"""
+    username = decode_access_token(token)
+    user = get_user_by_username(username)
+    if user is None:
+        raise credentials_exception()
+    return UserObject.from_dict(user)
+
+
+def update_password_hash(user: dict, hashed_password: str) -> None:
+    """비밀번호 해시 갱신 (로그인 시 재해싱)"""
+    conn = get_connection()
+    with conn:
+        conn.execute(
+            "UPDATE users SET hashed_password = ?, updated_at = ? WHERE id = ?",
+            (hashed_password, datetime.utcnow().isoformat(), user["id"]),
+        )
+
+
+def delete_user(user_id: str) -> bool:
+    """
+    사용자 계정 삭제.
+
+    사용자 정보와 해당 사용자의 모든 프로젝트, 할 일 항목을 한 트랜잭션으로 삭제.
+    """
+    conn = get_connection()
+    with conn:
+        conn.execute("DELETE FROM todo_items WHERE user_id = ?", (user_id,))
+        conn.execute("DELETE FROM todo_lists WHERE user_id = ?", (user_id,))
+        conn.execute("DELETE FROM users WHERE id = ?", (user_id,))
+    principal_cache.invalidate(user_id)
+    return True
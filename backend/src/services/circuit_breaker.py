@@ -0,0 +1,144 @@
+"""
+회로 차단기(circuit breaker) 모듈
+
+외부 호출(Gemini)의 최근 결과를 보고 장애로 판단되면 호출을 막아(open) 바로 실패시킴.
+상위 서비스가 느리거나 내려가 있을 때 요청마다 마감 시간까지 기다리지 않고
+즉시 폴백 응답을 돌려주기 위해 사용.
+
+- closed: 모든 호출 허용. 최근 window개 호출 중 실패(오류, 시간 초과, slow_call_seconds보다
+  느린 응답) 비율이 failure_rate 이상이면 open (최소 min_calls개가 쌓인 뒤부터 판단)
+- open: 호출을 CircuitOpenError로 즉시 거절. open_seconds가 지나면 half-open
+- half-open: 시험 호출을 probes개까지만 허용. 모두 성공하면 closed, 하나라도 실패하면 다시 open
+
+잘못된 요청(4xx)처럼 상위 서비스 상태와 무관한 오류는 실패로 세지 않음 (counts_as_failure).
+"""
+import collections
+import contextlib
+import time
+from typing import Callable, Deque, Iterator, Optional
+
+from google.api_core import exceptions as google_exceptions
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """회로가 열려 있어 호출하지 않고 거절함."""
+
+
+def counts_as_failure(error: BaseException) -> bool:
+    """상위 서비스 장애로 볼 오류인지 (요청 자체가 잘못된 4xx는 제외, 429는 포함)."""
+    if isinstance(error, google_exceptions.TooManyRequests):
+        return True
+    return not isinstance(error, google_exceptions.ClientError)
+
+
+class CircuitBreaker:
+    """
+    오류율/지연 기반 회로 차단기.
+
+    Args:
+        window: 판단에 쓰는 최근 호출 수
+        min_calls: open 여부를 판단하기 시작하는 최소 호출 수
+        failure_rate: open 기준 실패 비율 (0~1)
+        slow_call_seconds: 이보다 오래 걸린 성공 호출도 실패로 셈
+        open_seconds: open 상태 유지 시간 (이후 half-open)
+        probes: half-open에서 허용하는 시험 호출 수
+        clock: 현재 시각 함수 (테스트용)
+        on_change: 상태가 바뀔 때 호출 (새 상태 이름)
+    """
+
+    def __init__(self, window: int = 20, min_calls: int = 10, failure_rate: float = 0.5,
+                 slow_call_seconds: float = 10.0, open_seconds: float = 30.0, probes: int = 1,
+                 clock: Callable[[], float] = time.monotonic,
+                 on_change: Optional[Callable[[str], None]] = None):
+        self.window = window
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.open_seconds = open_seconds
+        self.probes = probes
+        self.clock = clock
+        self.on_change = on_change
+        self.state = CLOSED
+        self._outcomes: Deque[bool] = collections.deque(maxlen=window)  # True = 실패
+        self._opened_at = 0.0
+        self._probes_running = 0
+        self._probes_passed = 0
+
+    def _transition(self, state: str) -> None:
+        self.state = state
+        self._outcomes.clear()
+        self._probes_running = self._probes_passed = 0
+        if state == OPEN:
+            self._opened_at = self.clock()
+        if self.on_change is not None:
+            self.on_change(state)
+
+    def check(self) -> None:
+        """
+        지금 호출할 수 있는지 확인 (시험 호출 자리를 차지하지는 않음).
+
+        Raises:
+            CircuitOpenError: open 상태이거나 half-open 시험 호출이 모두 진행 중
+        """
+        if self.state == OPEN and self.clock() - self._opened_at >= self.open_seconds:
+            self._transition(HALF_OPEN)
+        if self.state == OPEN:
+            raise CircuitOpenError(f"circuit open, retry in {self.retry_after():.0f}s")
+        if self.state == HALF_OPEN and self._probes_running >= self.probes:
+            raise CircuitOpenError("circuit half-open, probe in progress")
+
+    def retry_after(self) -> float:
+        """open 상태가 끝나기까지 남은 시간 (초)."""
+        if self.state != OPEN:
+            return 0.0
+        return max(self.open_seconds - (self.clock() - self._opened_at), 0.0)
+
+    @contextlib.contextmanager
+    def attempt(self, measure_latency: bool = True) -> Iterator[None]:
+        """
+        블록 실행을 호출 1회로 기록. 오류는 그대로 올림.
+
+        Args:
+            measure_latency: False면 느린 성공을 실패로 세지 않음 (스트리밍처럼 길이가 응답 크기에 비례하는 호출)
+
+        Raises:
+            CircuitOpenError: 호출할 수 없는 상태 (블록을 실행하지 않음)
+        """
+        self.check()
+        state = self.state
+        if state == HALF_OPEN:
+            self._probes_running += 1
+        start = self.clock()
+        try:
+            yield
+        except Exception as e:
+            self._record(state, counts_as_failure(e))
+            raise
+        except BaseException:
+            # 취소: 결과를 알 수 없으므로 기록하지 않고 시험 호출 자리만 반납
+            if state == HALF_OPEN and self.state == HALF_OPEN:
+                self._probes_running -= 1
+            raise
+        else:
+            self._record(state, measure_latency and self.clock() - start > self.slow_call_seconds)
+
+    def _record(self, started_in: str, failed: bool) -> None:
+        if started_in != self.state:
+            # 상태가 바뀌기 전에 시작한 호출의 결과는 새 상태 판단에 쓰지 않음
+            return
+        if self.state == HALF_OPEN:
+            self._probes_running -= 1
+            if failed:
+                self._transition(OPEN)
+            else:
+                self._probes_passed += 1
+                if self._probes_passed >= self.probes:
+                    self._transition(CLOSED)
+            return
+        self._outcomes.append(failed)
+        if len(self._outcomes) >= self.min_calls and sum(self._outcomes) >= self.failure_rate * len(self._outcomes):
+            self._transition(OPEN)
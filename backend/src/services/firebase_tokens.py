@@ -0,0 +1,251 @@
+"""
+Firebase ID 토큰 검증 모듈
+
+/auth/social-login의 Firebase ID 토큰을 firebase_admin.auth.verify_id_token 대신 직접 검증.
+
+- Google 공개 인증서를 Cache-Control max-age 동안 캐시하고, 만료 전에 백그라운드
+  작업이 미리 갱신하므로 요청 경로에서는 인증서를 받으러 가지 않음
+- 검증을 마친 토큰의 클레임은 토큰 SHA-256 다이제스트를 키로 짧게 캐시하여
+  같은 토큰으로 반복 로그인하면 서명 검증도 생략
+- 알 수 없는 kid(Google 키 교체 직후)는 인증서를 다시 받아 확인 (MIN_REFRESH_INTERVAL에 한 번까지)
+
+검증 항목 (Firebase 문서 기준): RS256 서명과 kid, aud=프로젝트 ID,
+iss=https://securetoken.google.com/<프로젝트 ID>, sub(비어 있지 않음, 128자 이하),
+exp/iat/auth_time
+
+환경 변수:
+- FIREBASE_PROJECT_ID: aud/iss 검증용 프로젝트 ID (없으면 초기화된 Firebase 앱의 프로젝트 ID)
+- FIREBASE_TOKEN_CACHE_MAX_ENTRIES: 캐시할 최대 토큰 수 (기본값: 10000, 0이면 비활성화)
+- FIREBASE_TOKEN_CACHE_TTL_SECONDS: 항목 유효 시간 상한 (기본값: 300초, 토큰 만료가 더 이르면 그 시각까지)
+"""
+import asyncio
+import hashlib
+import logging
+import os
+import re
+import time
+from typing import Any, Callable, Dict, Optional
+
+from cachetools import TLRUCache
+from cryptography import x509
+from jose import JWTError, jwt
+
+from .oauth_http import OAuthHttpClient, oauth_http
+
+logger = logging.getLogger(__name__)
+
+FIREBASE_PROJECT_ID = os.getenv("FIREBASE_PROJECT_ID")
+FIREBASE_TOKEN_CACHE_MAX_ENTRIES = int(os.getenv("FIREBASE_TOKEN_CACHE_MAX_ENTRIES", "10000"))
+FIREBASE_TOKEN_CACHE_TTL_SECONDS = float(os.getenv("FIREBASE_TOKEN_CACHE_TTL_SECONDS", "300"))
+
+# Firebase ID 토큰 서명 인증서 (kid -> PEM x509 인증서)
+GOOGLE_CERTS_URL = "https://www.googleapis.com/robot/v1/metadata/x509/securetoken@system.gserviceaccount.com"
+ISSUER_PREFIX = "https://securetoken.google.com/"
+
+# Cache-Control이 없을 때의 인증서 유효 시간 (초)
+DEFAULT_CERTS_MAX_AGE = 3600
+# max-age 중 이 비율이 지나면 백그라운드에서 갱신
+REFRESH_AHEAD_RATIO = 0.9
+# 갱신 간 최소 간격, 갱신 실패 시 재시도 간격 (초)
+MIN_REFRESH_INTERVAL = 60
+# exp/iat 비교 시 허용하는 시계 오차 (초)
+CLOCK_SKEW_SECONDS = 60
+
+_MAX_AGE_PATTERN = re.compile(r"max-age=(\d+)")
+
+
+def _max_age(headers) -> int:
+    """Cache-Control max-age에서 Age를 뺀 남은 유효 시간 (초)."""
+    match = _MAX_AGE_PATTERN.search(headers.get("cache-control", ""))
+    if match is None:
+        return DEFAULT_CERTS_MAX_AGE
+    return max(int(match.group(1)) - int(headers.get("age", "0") or 0), 0)
+
+
+def _default_project_id() -> Optional[str]:
+    if FIREBASE_PROJECT_ID:
+        return FIREBASE_PROJECT_ID
+    import firebase_admin
+    return firebase_admin.get_app().project_id if firebase_admin._apps else None
+
+
+class GoogleCertificates:
+    """
+    Firebase 서명 인증서 저장소.
+
+    Args:
+        url: 인증서 JSON 주소
+        http: HTTP 클라이언트 (기본값: oauth_http 연결 풀)
+        timer: 현재 시각 함수 (단조 시계)
+    """
+
+    def __init__(self, url: str = GOOGLE_CERTS_URL, http: OAuthHttpClient = oauth_http,
+                 timer: Callable[[], float] = time.monotonic):
+        self.url = url
+        self.http = http
+        self._timer = timer
+        self._keys: Dict[str, Any] = {}
+        self.expires_at = 0.0
+        self.refresh_at = 0.0
+        self._fetched_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def fresh(self) -> bool:
+        return self._timer() < self.expires_at
+
+    async def refresh(self) -> None:
+        """인증서를 받아 교체. max-age에 따라 만료/갱신 시각 설정."""
+        response = await self.http.get(self.url)
+        response.raise_for_status()
+        keys = {
+            kid: x509.load_pem_x509_certificate(pem.encode("utf-8")).public_key()
+            for kid, pem in response.json().items()
+        }
+        max_age = _max_age(response.headers)
+        now = self._timer()
+        self._keys = keys
+        self._fetched_at = now
+        self.expires_at = now + max_age
+        self.refresh_at = now + max(max_age * REFRESH_AHEAD_RATIO, min(MIN_REFRESH_INTERVAL, max_age))
+
+    async def get_key(self, kid: str) -> Optional[Any]:
+        """
+        kid의 공개 키 (없으면 None).
+
+        인증서가 만료되었거나 kid를 모르면 한 번 다시 받음 (동시 요청은 한 번의 갱신을 공유).
+        """
+        if self.fresh and kid in self._keys:
+            return self._keys[kid]
+        async with self._lock:
+            recently_fetched = (self._fetched_at is not None
+                                and self._timer() - self._fetched_at < MIN_REFRESH_INTERVAL)
+            if not self.fresh or (kid not in self._keys and not recently_fetched):
+                await self.refresh()
+        return self._keys.get(kid)
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+                delay = self.refresh_at - self._timer()
+            except Exception as e:
+                logger.warning(f"Firebase certificate refresh failed: {e}")
+                delay = MIN_REFRESH_INTERVAL
+            await asyncio.sleep(max(delay, 0))
+
+    def start(self) -> None:
+        """앱 시작 시 호출. 인증서를 받고 만료 전에 갱신하는 백그라운드 작업 시작."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self) -> None:
+        """앱 종료 시 호출. 백그라운드 갱신 작업 종료."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def clear(self) -> None:
+        self._keys = {}
+        self._fetched_at = None
+        self.expires_at = self.refresh_at = 0.0
+
+
+class FirebaseTokenVerifier:
+    """
+    Firebase ID 토큰 검증기.
+
+    검증된 토큰의 클레임은 토큰 만료 시각(exp)과 ttl 중 이른 시각까지 캐시되며,
+    최대 개수를 넘으면 LRU로 제거.
+
+    Args:
+        certificates: 서명 인증서 저장소
+        project_id: Firebase 프로젝트 ID (기본값: FIREBASE_PROJECT_ID 또는 Firebase 앱 설정)
+        max_entries: 캐시할 최대 토큰 수 (0이면 캐시 안 함)
+        ttl: 항목 유효 시간 상한 (초)
+        timer: 현재 시각 함수 (epoch 초, 토큰 exp와 비교하므로 time.time 기준)
+    """
+
+    def __init__(self, certificates: Optional[GoogleCertificates] = None, project_id: Optional[str] = None,
+                 max_entries: int = FIREBASE_TOKEN_CACHE_MAX_ENTRIES, ttl: float = FIREBASE_TOKEN_CACHE_TTL_SECONDS,
+                 timer: Callable[[], float] = time.time):
+        self.certificates = certificates or GoogleCertificates()
+        self.project_id = project_id
+        self.enabled = max_entries > 0
+        self.ttl = ttl
+        self._timer = timer
+        self._entries = TLRUCache(maxsize=max(max_entries, 1), ttu=self._expires_at, timer=timer)
+
+    def _expires_at(self, key: bytes, value: Dict[str, Any], now: float) -> float:
+        return min(float(value["exp"]), now + self.ttl)
+
+    @staticmethod
+    def _digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    async def verify(self, id_token: str) -> Dict[str, Any]:
+        """
+        Firebase ID 토큰 검증.
+
+        Returns:
+            토큰 클레임 (uid 포함)
+
+        Raises:
+            JWTError: 형식/서명/클레임이 올바르지 않은 토큰
+            httpx.HTTPError: 인증서를 받을 수 없음
+        """
+        digest = self._digest(id_token)
+        if self.enabled:
+            claims = self._entries.get(digest)
+            if claims is not None:
+                return claims
+
+        header = jwt.get_unverified_header(id_token)
+        if header.get("alg") != "RS256":
+            raise JWTError("ID token must be signed with RS256")
+        key = await self.certificates.get_key(header.get("kid") or "")
+        if key is None:
+            raise JWTError("ID token has an unknown key id")
+
+        project_id = self.project_id or _default_project_id()
+        if not project_id:
+            raise JWTError("Firebase project id is not configured")
+        claims = jwt.decode(
+            id_token, key, algorithms=["RS256"], audience=project_id, issuer=ISSUER_PREFIX + project_id,
+            options={"leeway": CLOCK_SKEW_SECONDS, "require_aud": True, "require_iss": True,
+                     "require_exp": True, "require_iat": True, "require_sub": True},
+        )
+        subject = claims["sub"]
+        if not isinstance(subject, str) or not subject or len(subject) > 128:
+            raise JWTError("ID token has an invalid subject")
+        now = self._timer()
+        if claims["iat"] > now + CLOCK_SKEW_SECONDS or claims.get("auth_time", claims["iat"]) > now + CLOCK_SKEW_SECONDS:
+            raise JWTError("ID token was issued in the future")
+
+        claims["uid"] = subject
+        if self.enabled:
+            self._entries[digest] = claims
+        return claims
+
+    def start(self) -> None:
+        """앱 시작 시 호출. 인증서 백그라운드 갱신 시작."""
+        self.certificates.start()
+
+    async def stop(self) -> None:
+        """앱 종료 시 호출."""
+        await self.certificates.stop()
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# 프로세스 전역 Firebase ID 토큰 검증기
+firebase_token_verifier = FirebaseTokenVerifier()
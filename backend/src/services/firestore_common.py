@@ -0,0 +1,60 @@
+"""
+Firestore 공용 상수/헬퍼 모듈
+
+할 일 서비스(todo_service_firestore_async)와 인증 서비스(auth_service_firestore_async),
+마이그레이션 스크립트가 함께 쓰는 문서 규칙을 정의.
+
+- 아이템 문서: 조상 경로(ancestor_ids), 마이그레이션 이전 문서 폴백 여부
+- 사용자 문서: username 인덱스 문서(usernames/{username_key}) 규칙
+- batch 쓰기 최대 작업 수
+"""
+import os
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List
+from urllib.parse import quote
+
+# Firestore batch write 최대 작업 수
+BATCH_WRITE_LIMIT = 500
+
+# 마이그레이션(user_id, rank 백필) 이전 문서를 위한 폴백 조회 (마이그레이션 완료 후 false 권장)
+LEGACY_ITEM_FALLBACK = os.getenv("LEGACY_ITEM_FALLBACK", "true").lower() == "true"
+
+USERNAME_INDEX_COLLECTION = 'usernames'
+
+# 인덱스 문서가 없는 기존 사용자를 위한 username 쿼리 폴백
+# (backfill_username_index 마이그레이션 완료 후 false 권장)
+LEGACY_USERNAME_FALLBACK = os.getenv("LEGACY_USERNAME_FALLBACK", "true").lower() == "true"
+
+
+def child_ancestor_ids(parent_item: Dict[str, Any]) -> List[str]:
+    """
+    부모 아이템 아래에 생성될 자식의 ancestor_ids 계산.
+
+    ancestor_ids는 루트부터 직계 부모까지의 아이템 ID 목록으로,
+    array_contains 쿼리 한 번으로 서브트리 전체를 조회하는 데 사용.
+    """
+    return list(parent_item.get('ancestor_ids') or []) + [parent_item['id']]
+
+
+def username_key(username: str) -> str:
+    """
+    username 인덱스 문서 ID.
+
+    username을 그대로 쓰며(폴백 쿼리, SQLite 엔진과 같이 대소문자를 구분), 문서 ID에 쓸 수 없는
+    문자('/' 등)만 퍼센트 인코딩. 접두사로 '.', '..', '__*__' 같은 예약 ID를 피함.
+    """
+    return f"u:{quote(username, safe='')}"
+
+
+def new_user_document(username: str, email: str, hashed_password: str) -> dict:
+    """새 사용자 문서 (users/{id}와 인덱스 문서에 같은 내용을 씀)."""
+    now = datetime.utcnow()
+    return {
+        "id": str(uuid.uuid4()),
+        "username": username,
+        "email": email,
+        "hashed_password": hashed_password,
+        "created_at": now,
+        "updated_at": now,
+    }
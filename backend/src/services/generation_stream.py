@@ -0,0 +1,72 @@
+"""
+스트리밍 프로젝트 생성 모듈
+
+POST /todos/generate/stream의 처리 흐름. 전체 목록을 기다리지 않고
+Gemini 스트리밍 응답에서 아이템이 완성될 때마다 저장하고 이벤트로 알림.
+
+이벤트 (이름, 데이터) 순서:
+- list: 빈 프로젝트를 저장한 직후 (생성 시작 전)
+- item: 아이템 하나를 저장한 직후. 부모가 자식보다 먼저 오며 path는 트리 내 위치
+- error: 아이템 일부를 저장한 뒤 생성이 실패한 경우 (저장된 아이템은 유지)
+- done: 마지막. 저장된 전체 프로젝트 (POST /todos/generate 응답과 같은 형식)
+
+저장은 storage.todo_service의 create_todo_list/add_generated_item 계약을 사용하므로 저장 엔진과 무관.
+"""
+import logging
+import time
+from typing import Any, AsyncIterator, Dict, Tuple
+
+from ..instrumentation import Histogram, register_metric
+from .ai_service import stream_todo_items_from_keyword
+from .rank import rank_after, rank_between
+from .storage import todo_service
+from .todo_tree import build_item_tree
+from .tree_stream import Path
+
+logger = logging.getLogger(__name__)
+
+Event = Tuple[str, Dict[str, Any]]
+
+
+async def stream_todo_list_generation(user: Any, keyword: str) -> AsyncIterator[Event]:
+    """
+    AI로 프로젝트를 생성하면서 저장 단계마다 이벤트 반환.
+
+    Args:
+        user: 요청 사용자
+        keyword: 프로젝트 키워드
+
+    Yields:
+        (이벤트 이름, 데이터) - list, item..., [error], done
+    """
+    start = time.perf_counter()
+    todo_list = await todo_service.create_todo_list(user, keyword)
+    list_id = todo_list["id"]
+    yield "list", todo_list
+
+    saved: Dict[Path, Dict[str, Any]] = {}
+    last_ranks: Dict[Path, str] = {}
+    try:
+        async for path, description in stream_todo_items_from_keyword(keyword, user_id=user.id):
+            parent_path = path[:-1]
+            previous = last_ranks.get(parent_path)
+            position = {"rank": rank_after(previous) if previous else rank_between(None, None), "order": path[-1]}
+            item = await todo_service.add_generated_item(user, list_id, description, position,
+                                                         parent=saved.get(parent_path))
+            if not saved:
+                GENERATION_FIRST_ITEM_SECONDS.observe(time.perf_counter() - start)
+            saved[path] = item
+            last_ranks[parent_path] = position["rank"]
+            yield "item", {**item, "path": list(path)}
+    except Exception as e:
+        logger.warning(f"Streaming generation for list {list_id} stopped after {len(saved)} items: {e}")
+        yield "error", {"detail": "Generation stopped before completion", "saved_items": len(saved)}
+
+    # 저장한 아이템으로 바로 응답을 구성하므로 다시 조회하지 않음
+    yield "done", {**todo_list, "items": build_item_tree([dict(item) for item in saved.values()])}
+
+
+GENERATION_FIRST_ITEM_SECONDS = register_metric(
+    Histogram("generation_stream_first_item_seconds",
+              "Time from a streaming generation request to its first saved item.")
+)
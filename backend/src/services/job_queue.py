@@ -0,0 +1,400 @@
+"""
+백그라운드 작업 큐 모듈
+
+AI 생성처럼 오래 걸리는 요청을 HTTP 연결 밖에서 실행하기 위한 로컬 작업 큐.
+라우터는 작업을 넣고 바로 202(작업 ID)를 반환하며, 클라이언트는 GET /jobs/{id}로 상태를
+조회하거나 GET /jobs/{id}/events(SSE)로 상태 변화를 받음.
+
+- 작업 종류(kind)별 처리 함수를 register()로 등록 (처리 함수는 (사용자, 인자, 작업 ID)를 받아 JSON 결과 반환)
+- 중단된 작업은 처음부터 다시 실행되므로 처리 함수는 작업 ID로 멱등해야 함
+  (예: 생성할 문서 ID를 작업 ID에서 파생하고 이미 저장된 결과가 있으면 건너뜀)
+- 작업 상태는 SQLite 파일(JOB_QUEUE_PATH)에만 기록하며 조회도 파일에서 함. 같은 서버의 여러
+  uvicorn 워커 프로세스가 파일 하나를 공유하므로 어느 프로세스로 요청이 가도 같은 작업이 보임
+- 각 프로세스의 워커(JOB_WORKERS개)는 대기 작업을 도착 순서대로 UPDATE ... WHERE status='queued'로
+  원자적으로 가져가므로 한 작업은 한 워커만 실행. 대기 작업이 JOB_QUEUE_MAX_PENDING을 넘으면 503(Retry-After)
+- 실행 중인 작업은 주기적으로 heartbeat_at을 갱신. 프로세스가 죽어 JOB_LEASE_SECONDS 동안 갱신이 없으면
+  다른 워커가 다시 대기열로 돌려 처음부터 실행. 정상 종료 시에는 실행 중이던 작업을 바로 대기열로 돌림
+- 다른 프로세스가 넣거나 바꾼 작업은 JOB_POLL_SECONDS마다 확인 (같은 프로세스의 변화는 즉시 반영)
+- 끝난 작업은 JOB_RESULT_TTL_SECONDS 동안 결과를 조회할 수 있고 이후 정리
+- 대기열 길이, 대기 시간, 실행 시간은 /metrics의 job_queue_depth, job_wait_seconds, job_run_seconds
+
+환경 변수:
+- JOB_WORKERS: 프로세스당 동시에 실행하는 작업 수 (기본값: 2)
+- JOB_QUEUE_MAX_PENDING: 대기 작업 수 상한 (기본값: 100)
+- JOB_QUEUE_PATH: 작업 상태 SQLite 파일 경로 (기본값: jobs.db)
+- JOB_RESULT_TTL_SECONDS: 끝난 작업의 보관 시간 (기본값: 3600초)
+- JOB_LEASE_SECONDS: 실행 중인 작업을 중단된 것으로 보는 heartbeat 공백 (기본값: 60초)
+- JOB_POLL_SECONDS: 다른 프로세스의 작업/상태 변화를 확인하는 간격 (기본값: 1초)
+"""
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional
+
+from fastapi import HTTPException, status
+from starlette.concurrency import run_in_threadpool
+
+from ..instrumentation import Counter, Gauge, Histogram, register_metric
+from .security import UserObject
+
+logger = logging.getLogger(__name__)
+
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+JOB_QUEUE_MAX_PENDING = int(os.getenv("JOB_QUEUE_MAX_PENDING", "100"))
+JOB_QUEUE_PATH = os.getenv("JOB_QUEUE_PATH", "jobs.db")
+JOB_RESULT_TTL_SECONDS = float(os.getenv("JOB_RESULT_TTL_SECONDS", "3600"))
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "60"))
+JOB_POLL_SECONDS = float(os.getenv("JOB_POLL_SECONDS", "1"))
+
+# 503 응답의 Retry-After (초)
+RETRY_AFTER_SECONDS = 5
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+FINISHED = (SUCCEEDED, FAILED)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    username TEXT NOT NULL,
+    params TEXT NOT NULL,
+    status TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    heartbeat_at REAL
+);
+CREATE INDEX IF NOT EXISTS ix_jobs_status ON jobs (status, created_at);
+"""
+
+_COLUMNS = ("id", "kind", "user_id", "username", "params", "status", "result", "error",
+            "created_at", "started_at", "finished_at")
+
+Handler = Callable[[Any, Dict[str, Any], str], Awaitable[Any]]
+
+
+def queue_full_exception() -> HTTPException:
+    """작업 대기열이 가득 찼을 때 사용하는 503 예외 생성."""
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many background jobs are waiting, please retry",
+        headers={"Retry-After": str(RETRY_AFTER_SECONDS)},
+    )
+
+
+def _row_to_job(row: tuple) -> Dict[str, Any]:
+    job = dict(zip(_COLUMNS, row))
+    job["params"] = json.loads(job["params"])
+    job["result"] = None if job["result"] is None else json.loads(job["result"])
+    return job
+
+
+class JobQueue:
+    """
+    SQLite 파일을 상태 저장소로 쓰는 비동기 작업 큐 (같은 파일을 쓰는 프로세스끼리 공유).
+
+    Args:
+        workers: 이 프로세스에서 동시에 실행하는 작업 수
+        max_pending: 대기 작업 수 상한 (초과 시 503)
+        path: 작업 상태 SQLite 파일 경로
+        result_ttl: 끝난 작업의 보관 시간 (초)
+        lease: 실행 중인 작업을 중단된 것으로 보는 heartbeat 공백 (초)
+        poll_interval: 다른 프로세스의 변화를 확인하는 간격 (초)
+    """
+
+    def __init__(self, workers: int = JOB_WORKERS, max_pending: int = JOB_QUEUE_MAX_PENDING,
+                 path: str = JOB_QUEUE_PATH, result_ttl: float = JOB_RESULT_TTL_SECONDS,
+                 lease: float = JOB_LEASE_SECONDS, poll_interval: float = JOB_POLL_SECONDS):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.path = path
+        self.result_ttl = result_ttl
+        self.lease = lease
+        self.poll_interval = poll_interval
+        self._handlers: Dict[str, Handler] = {}
+        self._local = threading.local()
+        self._tasks: list = []
+        self._changed: Optional[asyncio.Event] = None
+        # 마지막으로 확인한 대기 작업 수 (/metrics가 이벤트 루프에서 DB를 조회하지 않도록)
+        self._depth = 0
+        self.running = 0
+
+    def register(self, kind: str, handler: Handler) -> None:
+        """작업 종류별 처리 함수 등록 (앱 시작 전, 라우터 모듈에서)."""
+        self._handlers[kind] = handler
+
+    @property
+    def depth(self) -> int:
+        """
+        대기 중인 작업 수 (모든 프로세스 합계).
+
+        작업을 넣거나 가져갈 때(워커는 poll_interval마다) 갱신한 값으로, DB를 조회하지 않음.
+        """
+        return self._depth
+
+    def _count_queued(self, conn: sqlite3.Connection) -> int:
+        self._depth = conn.execute("SELECT COUNT(*) FROM jobs WHERE status = ?", (QUEUED,)).fetchone()[0]
+        return self._depth
+
+    # ==================== 저장소 (스레드풀에서 호출) ====================
+    def _connection(self) -> sqlite3.Connection:
+        """현재 스레드의 작업 DB 연결 (ai_cache와 같은 방식으로 스레드마다 하나)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None or getattr(self._local, "path", None) != self.path:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=5000")
+            conn.executescript(SCHEMA)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(jobs)")}
+            if "heartbeat_at" not in columns:
+                conn.execute("ALTER TABLE jobs ADD COLUMN heartbeat_at REAL")
+            self._local.conn = conn
+            self._local.path = self.path
+        return conn
+
+    def _insert(self, job: Dict[str, Any]) -> Optional[int]:
+        """대기 작업 수를 확인하고 작업을 추가 (한 트랜잭션). 대기열이 가득 찼으면 None, 아니면 대기 순서."""
+        conn = self._connection()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            depth = self._count_queued(conn)
+            if depth >= self.max_pending:
+                return None
+            row = dict(job, params=json.dumps(job["params"], ensure_ascii=False))
+            conn.execute(f"INSERT INTO jobs ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})",
+                         [row[column] for column in _COLUMNS])
+        self._depth = depth + 1
+        return depth
+
+    def _read(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """작업 하나와 (대기 중이면) 앞에 있는 작업 수."""
+        conn = self._connection()
+        row = conn.execute(f"SELECT {', '.join(_COLUMNS)} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = _row_to_job(row)
+        job["position"] = None
+        if job["status"] == QUEUED:
+            job["position"] = conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE status = ? AND created_at < ?", (QUEUED, job["created_at"]),
+            ).fetchone()[0]
+        return job
+
+    def _claim(self) -> Optional[Dict[str, Any]]:
+        """
+        가장 오래된 대기 작업을 running으로 바꾸고 반환 (없으면 None).
+
+        heartbeat가 lease보다 오래 끊긴 running 작업(종료된 프로세스의 작업)은 먼저 대기열로 돌리고,
+        보관 기간이 지난 끝난 작업은 지움. 모두 한 쓰기 트랜잭션이므로 여러 프로세스가 동시에
+        호출해도 같은 작업을 두 번 가져가지 않음.
+        """
+        now = time.time()
+        conn = self._connection()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("UPDATE jobs SET status = ?, started_at = NULL, heartbeat_at = NULL "
+                         "WHERE status = ? AND heartbeat_at < ?", (QUEUED, RUNNING, now - self.lease))
+            conn.execute("DELETE FROM jobs WHERE finished_at IS NOT NULL AND finished_at < ?", (now - self.result_ttl,))
+            depth = self._count_queued(conn)
+            row = conn.execute(f"SELECT {', '.join(_COLUMNS)} FROM jobs WHERE status = ? "
+                               f"ORDER BY created_at LIMIT 1", (QUEUED,)).fetchone()
+            if row is None:
+                return None
+            claimed = conn.execute(
+                "UPDATE jobs SET status = ?, started_at = ?, heartbeat_at = ? WHERE id = ? AND status = ?",
+                (RUNNING, now, now, row[0], QUEUED),
+            ).rowcount
+        if not claimed:
+            return None
+        self._depth = depth - 1
+        return dict(_row_to_job(row), status=RUNNING, started_at=now)
+
+    def _heartbeat(self, job_id: str) -> None:
+        with self._connection() as conn:
+            conn.execute("UPDATE jobs SET heartbeat_at = ? WHERE id = ? AND status = ?", (time.time(), job_id, RUNNING))
+
+    def _finish(self, job: Dict[str, Any]) -> None:
+        result = None if job["result"] is None else json.dumps(job["result"], ensure_ascii=False)
+        with self._connection() as conn:
+            conn.execute("UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ?, heartbeat_at = NULL "
+                         "WHERE id = ?", (job["status"], result, job["error"], job["finished_at"], job["id"]))
+
+    def _requeue(self, job_id: str) -> None:
+        with self._connection() as conn:
+            conn.execute("UPDATE jobs SET status = ?, started_at = NULL, heartbeat_at = NULL "
+                         "WHERE id = ? AND status = ?", (QUEUED, job_id, RUNNING))
+
+    # ==================== 수명 주기 ====================
+    async def start(self) -> None:
+        """
+        앱 시작 시 호출. 워커를 띄움.
+
+        대기 중인 작업은 워커가 바로 가져가고, 종료된 프로세스가 실행하던 작업은 lease가 지나면 다시 실행됨.
+        """
+        self._changed = asyncio.Event()
+        depth = await run_in_threadpool(lambda: self._count_queued(self._connection()))
+        if depth:
+            logger.info(f"{depth} background jobs are waiting")
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        """앱 종료 시 호출. 워커를 취소하고 실행 중이던 작업은 대기열로 돌림 (다른 워커나 다음 시작 때 실행)."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    # ==================== 작업 ====================
+    async def enqueue(self, kind: str, user: Any, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        작업을 대기열에 넣고 작업 정보를 반환.
+
+        Raises:
+            HTTPException(503): 대기 작업 수가 상한에 도달
+        """
+        if kind not in self._handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+        job = {
+            "id": uuid.uuid4().hex, "kind": kind, "user_id": user.id, "username": user.username,
+            "params": params, "status": QUEUED, "result": None, "error": None,
+            "created_at": time.time(), "started_at": None, "finished_at": None,
+        }
+        position = await run_in_threadpool(self._insert, job)
+        if position is None:
+            JOBS.inc(1, kind, "rejected")
+            raise queue_full_exception()
+        self._notify()
+        return self.describe(dict(job, position=position))
+
+    async def get(self, job_id: str, user: Any) -> Optional[Dict[str, Any]]:
+        """사용자의 작업 정보 (없거나 다른 사용자의 작업이면 None)."""
+        job = await run_in_threadpool(self._read, job_id)
+        if job is None or job["user_id"] != user.id:
+            return None
+        return self.describe(job)
+
+    def describe(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """API 응답용 작업 정보 (대기 중이면 앞에 있는 작업 수 포함)."""
+        return {
+            "id": job["id"], "kind": job["kind"], "status": job["status"], "position": job.get("position"),
+            "result": job["result"], "error": job["error"], "created_at": job["created_at"],
+            "started_at": job["started_at"], "finished_at": job["finished_at"],
+        }
+
+    async def watch(self, job_id: str, user: Any) -> AsyncIterator[Dict[str, Any]]:
+        """작업 정보가 바뀔 때마다 반환하고 작업이 끝나면 종료 (없는 작업이면 아무것도 반환하지 않음)."""
+        last = None
+        while True:
+            changed = self._changed
+            job = await self.get(job_id, user)
+            if job is None:
+                return
+            if job != last:
+                last = job
+                yield job
+            if job["status"] in FINISHED:
+                return
+            await self._wait(changed)
+
+    def _notify(self) -> None:
+        """작업 상태 변화를 이 프로세스의 워커와 watch() 중인 요청에 알림."""
+        if self._changed is not None:
+            self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def _wait(self, changed: Optional[asyncio.Event]) -> None:
+        """이 프로세스의 변화 알림 또는 poll_interval (다른 프로세스의 변화 확인용) 중 먼저 오는 것까지 대기."""
+        if changed is None:
+            await asyncio.sleep(self.poll_interval)
+            return
+        try:
+            await asyncio.wait_for(changed.wait(), self.poll_interval)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _worker(self) -> None:
+        while True:
+            changed = self._changed
+            claim = asyncio.ensure_future(run_in_threadpool(self._claim))
+            try:
+                job = await asyncio.shield(claim)
+            except asyncio.CancelledError:
+                # 가져오는 중에 종료되면 가져온 작업을 대기열로 돌려놓음
+                job = await claim
+                if job is not None:
+                    await run_in_threadpool(self._requeue, job["id"])
+                raise
+            except sqlite3.Error as e:
+                logger.warning(f"Job queue claim failed: {e}")
+                job = None
+            if job is None:
+                await self._wait(changed)
+                continue
+            await self._run(job)
+
+    async def _keep_alive(self, job_id: str) -> None:
+        """실행 중인 작업의 heartbeat 갱신 (lease의 1/3 간격)."""
+        while True:
+            await asyncio.sleep(self.lease / 3)
+            try:
+                await run_in_threadpool(self._heartbeat, job_id)
+            except sqlite3.Error as e:
+                logger.warning(f"Job heartbeat failed for {job_id}: {e}")
+
+    async def _run(self, job: Dict[str, Any]) -> None:
+        kind = job["kind"]
+        JOB_WAIT_SECONDS.observe(job["started_at"] - job["created_at"], kind)
+        self._notify()
+        self.running += 1
+        start = time.perf_counter()
+        keep_alive = asyncio.create_task(self._keep_alive(job["id"]))
+        try:
+            user = UserObject(id=job["user_id"], username=job["username"], email=None, hashed_password="")
+            result = await self._handlers[kind](user, job["params"], job["id"])
+            job.update(status=SUCCEEDED, result=result)
+        except asyncio.CancelledError:
+            # 앱 종료: 바로 대기열로 돌려 다른 워커나 다음 시작 때 처음부터 다시 실행 (처리 함수는 멱등)
+            await run_in_threadpool(self._requeue, job["id"])
+            raise
+        except Exception as e:
+            logger.exception(f"Background job {job['id']} ({kind}) failed")
+            job.update(status=FAILED, error=str(e) or type(e).__name__)
+        finally:
+            keep_alive.cancel()
+            self.running -= 1
+            JOB_RUN_SECONDS.observe(time.perf_counter() - start, kind)
+        job["finished_at"] = time.time()
+        JOBS.inc(1, kind, job["status"])
+        await run_in_threadpool(self._finish, job)
+        self._notify()
+
+
+JOBS = register_metric(
+    Counter("jobs_total", "Background jobs by final status (succeeded, failed, rejected).", ["kind", "status"])
+)
+JOB_WAIT_SECONDS = register_metric(
+    Histogram("job_wait_seconds", "Time background jobs spent queued before a worker picked them up.", ["kind"],
+              buckets=(0.01, 0.05, 0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 300))
+)
+JOB_RUN_SECONDS = register_metric(
+    Histogram("job_run_seconds", "Time background jobs spent running.", ["kind"],
+              buckets=(0.1, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120))
+)
+
+# 프로세스 전역 작업 큐
+job_queue = JobQueue()
+
+register_metric(Gauge("job_queue_depth", "Background jobs waiting for a worker.", lambda: job_queue.depth))
+register_metric(Gauge("jobs_running", "Background jobs running.", lambda: job_queue.running))
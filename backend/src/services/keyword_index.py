@@ -0,0 +1,333 @@
+"""
+키워드 유사도 인덱스 모듈
+
+키워드 기반 목록 생성(generate_todo_items_from_keyword) 결과를 키워드와 함께 보관하고,
+새 키워드가 이전 키워드와 충분히 비슷하면 저장된 목록을 바로 돌려주어 Gemini 호출을 생략.
+("블로그 만들기" → "블로그 제작", "유튜브 채널 운영하기" → "유튜브 채널 운영")
+
+- 외부 임베딩 서비스 없이 글자 n-gram 벡터만 사용. 한국어는 띄어쓰기와 조사/어미가
+  달라도 음절 2·3-gram이 대부분 겹치므로 형태소 분석 없이도 가까운 키워드를 찾을 수 있음
+- 가중치는 TF-IDF. 많은 키워드에 공통으로 나오는 n-gram("만들기", "준비" 등)은
+  가중치가 낮아 "블로그 만들기"와 "유튜브 만들기"처럼 주제가 다른 키워드는 비슷하지 않게 판정
+  (항목이 적을 때를 위해 GENERIC_WORDS는 처음부터 가중치를 낮춤)
+- 유사도는 코사인 유사도. 역색인으로 n-gram을 하나라도 공유하는 항목만 비교하고,
+  공유한 n-gram만으로 가능한 최대 유사도가 현재 최고 점수 이하인 항목(단어 경계나
+  GENERIC_WORDS n-gram만 겹치는 항목 등)은 노름을 계산하지 않고 건너뜀
+- IDF와 항목 노름은 인덱스가 바뀔 때까지 메모이즈하므로 조회마다 다시 계산하지 않음
+- 항목은 메모리에 두고 AI 응답 캐시와 같은 SQLite 파일에 저장하여 재시작 후 다시 읽음
+  (다른 워커가 추가한 항목은 재시작할 때 반영)
+- 최대 항목 수를 넘으면 오래된 항목부터 제거하고, 키워드 생성 결과 캐시 유효 시간이
+  지난 항목은 사용하지 않음
+
+환경 변수:
+- AI_SIMILARITY_THRESHOLD: 저장된 목록을 재사용할 최소 코사인 유사도 (기본값: 0.75, 1 초과면 비활성화)
+- AI_SIMILARITY_MAX_ENTRIES: 보관할 최대 키워드 수 (기본값: 5000, 0이면 비활성화)
+- AI_SIMILARITY_REFRESH: 재사용한 뒤 백그라운드에서 요청 키워드로 다시 생성할지 여부 (기본값: true)
+"""
+import asyncio
+import json
+import logging
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter as TermCounter, OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+from ..instrumentation import Counter, Gauge, register_metric
+from .ai_cache import AI_CACHE_PATH, AI_CACHE_TTLS, normalize_text
+
+logger = logging.getLogger(__name__)
+
+AI_SIMILARITY_THRESHOLD = float(os.getenv("AI_SIMILARITY_THRESHOLD", "0.75"))
+AI_SIMILARITY_MAX_ENTRIES = int(os.getenv("AI_SIMILARITY_MAX_ENTRIES", "5000"))
+AI_SIMILARITY_REFRESH = os.getenv("AI_SIMILARITY_REFRESH", "true").lower() == "true"
+
+# 많은 키워드에 붙는 행위/형식 단어. 주제 단어보다 가중치를 낮춤
+GENERIC_WORDS = frozenset({
+    "만들기", "만들다", "제작", "제작하기", "하기", "준비", "준비하기", "계획", "계획하기",
+    "시작", "시작하기", "프로젝트", "관리", "관리하기",
+})
+GENERIC_WEIGHT = 0.2
+NGRAM_SIZES = (2, 3)
+# 단어 끝에서 떼는 동사형 어미와 목적격 조사 ("개발하기" → "개발", "블로그를" → "블로그")
+_SUFFIX_PATTERN = re.compile(r"(?<=..)(?:하기|하는|하다|을|를)$")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS ai_keyword_trees (
+    keyword TEXT PRIMARY KEY,
+    tree TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_ai_keyword_trees_created_at ON ai_keyword_trees (created_at);
+"""
+
+
+def keyword_ngrams(keyword: str) -> Dict[str, float]:
+    """
+    정규화한 키워드의 글자 n-gram 빈도 (단어 앞뒤에 공백을 붙여 단어 경계도 n-gram에 포함).
+
+    단어 끝의 "하기"/"를" 등은 떼고, GENERIC_WORDS에 속한 단어의 n-gram은 GENERIC_WEIGHT만큼만 셈.
+    """
+    terms: Dict[str, float] = TermCounter()
+    for word in normalize_text(keyword).split():
+        if word not in GENERIC_WORDS:
+            word = _SUFFIX_PATTERN.sub("", word)
+        weight = GENERIC_WEIGHT if word in GENERIC_WORDS else 1.0
+        padded = f" {word} "
+        for size in NGRAM_SIZES:
+            for i in range(len(padded) - size + 1):
+                terms[padded[i:i + size]] += weight
+    return terms
+
+
+class KeywordTreeIndex:
+    """
+    키워드 → 생성된 할 일 목록의 유사도 인덱스.
+
+    Args:
+        threshold: 재사용할 최소 코사인 유사도
+        max_entries: 보관할 최대 키워드 수 (0이면 비활성화)
+        path: SQLite 파일 경로 (빈 값이면 메모리에만 보관)
+        max_age: 항목 유효 시간 (초)
+        timer: 현재 시각 함수 (epoch 초)
+    """
+
+    def __init__(self, threshold: float = AI_SIMILARITY_THRESHOLD, max_entries: int = AI_SIMILARITY_MAX_ENTRIES,
+                 path: Optional[str] = AI_CACHE_PATH,
+                 max_age: float = AI_CACHE_TTLS["generate_todo_items_from_keyword"],
+                 timer: Callable[[], float] = time.time):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.path = path
+        self.max_age = max_age
+        self._timer = timer
+        # 정규화한 키워드 -> (n-gram 빈도, 목록 JSON 문자열, 생성 시각). 오래된 순서
+        self._entries: "OrderedDict[str, Tuple[Dict[str, float], str, float]]" = OrderedDict()
+        # n-gram -> 그 n-gram을 가진 키워드 (역색인, 크기가 문서 빈도)
+        self._postings: Dict[str, Set[str]] = {}
+        # 항목 추가/삭제 시 비우는 메모 (n-gram -> IDF, 키워드 -> TF-IDF 노름)
+        self._idfs: Dict[str, float] = {}
+        self._norms: Dict[str, float] = {}
+        self._refreshing: Dict[str, asyncio.Task] = {}
+        self._local = threading.local()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.threshold <= 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # ==================== 메모리 인덱스 ====================
+    def _insert(self, key: str, tree_json: str, created_at: float) -> None:
+        self._remove(key)
+        self._idfs.clear()
+        self._norms.clear()
+        terms = keyword_ngrams(key)
+        self._entries[key] = (terms, tree_json, created_at)
+        for term in terms:
+            self._postings.setdefault(term, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._idfs.clear()
+        self._norms.clear()
+        for term in entry[0]:
+            keys = self._postings[term]
+            keys.discard(key)
+            if not keys:
+                del self._postings[term]
+
+    def _idf(self, term: str) -> float:
+        # 평활화한 IDF (항목이 하나뿐이어도 0이 되지 않음)
+        idf = self._idfs.get(term)
+        if idf is None:
+            idf = math.log((1 + len(self._entries)) / (1 + len(self._postings.get(term, ())))) + 1
+            self._idfs[term] = idf
+        return idf
+
+    def _norm(self, terms: Dict[str, float]) -> float:
+        return math.sqrt(sum((weight * self._idf(term)) ** 2 for term, weight in terms.items()))
+
+    def _entry_norm(self, key: str) -> float:
+        norm = self._norms.get(key)
+        if norm is None:
+            norm = self._norms[key] = self._norm(self._entries[key][0])
+        return norm
+
+    def nearest(self, keyword: str) -> Optional[Tuple[str, float]]:
+        """가장 비슷한 저장 키워드와 코사인 유사도 (n-gram을 공유하는 항목이 없으면 None)."""
+        query = keyword_ngrams(keyword)
+        if not query or not self._entries:
+            return None
+        # 항목별 내적과, 공유한 n-gram에 대한 쿼리 가중치 제곱합
+        dots: Dict[str, float] = {}
+        shared: Dict[str, float] = {}
+        for term, weight in query.items():
+            keys = self._postings.get(term)
+            if not keys:
+                continue
+            idf = self._idf(term)
+            weighted = weight * idf
+            for key in keys:
+                dots[key] = dots.get(key, 0.0) + weighted * self._entries[key][0][term] * idf
+                shared[key] = shared.get(key, 0.0) + weighted * weighted
+        if not dots:
+            return None
+        query_norm = self._norm(query)
+        best_key, best_score = None, 0.0
+        # 코사인 유사도는 sqrt(shared) / query_norm 이하 (코시-슈바르츠)이므로
+        # 상한이 큰 항목부터 보고 상한이 최고 점수 이하가 되면 중단
+        for key in sorted(shared, key=shared.__getitem__, reverse=True):
+            if math.sqrt(shared[key]) / query_norm <= best_score:
+                break
+            score = dots[key] / (query_norm * self._entry_norm(key))
+            if score > best_score:
+                best_key, best_score = key, score
+        return best_key, min(best_score, 1.0)
+
+    def lookup(self, keyword: str) -> Optional[List[dict]]:
+        """
+        유사도가 threshold 이상인 저장 키워드의 목록 (없으면 None).
+
+        매번 JSON에서 새로 만들므로 호출자가 결과를 수정해도 인덱스는 그대로.
+        """
+        if not self.enabled:
+            return None
+        match = self.nearest(keyword)
+        if match is not None:
+            key, score = match
+            if self._timer() - self._entries[key][2] > self.max_age:
+                self._remove(key)
+                match = None
+            elif score >= self.threshold:
+                AI_SIMILARITY_REQUESTS.inc(1, "hit")
+                logger.info(f"Reusing items generated for {key!r} for {normalize_text(keyword)!r} ({score:.2f})")
+                return json.loads(self._entries[key][1])
+        AI_SIMILARITY_REQUESTS.inc(1, "miss")
+        return None
+
+    async def add(self, keyword: str, tree: List[dict]) -> None:
+        """생성된 목록을 인덱스와 SQLite 파일에 저장 (같은 키워드는 교체)."""
+        key = normalize_text(keyword)
+        if not self.enabled or not key or not tree:
+            return
+        row = (key, json.dumps(tree, ensure_ascii=False), self._timer())
+        self._insert(*row)
+        if self.path:
+            await run_in_threadpool(self._disk_put, row)
+
+    # ==================== 디스크 ====================
+    def _connection(self) -> sqlite3.Connection:
+        """현재 스레드의 SQLite 연결 (ai_cache와 같은 방식으로 스레드마다 하나)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None or getattr(self._local, "path", None) != self.path:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=5000")
+            conn.executescript(SCHEMA)
+            self._local.conn = conn
+            self._local.path = self.path
+        return conn
+
+    def _disk_put(self, row: Tuple[str, str, float]) -> None:
+        try:
+            conn = self._connection()
+            with conn:
+                conn.execute("INSERT OR REPLACE INTO ai_keyword_trees (keyword, tree, created_at) VALUES (?, ?, ?)", row)
+        except sqlite3.Error as e:
+            logger.warning(f"Keyword index disk write failed: {e}")
+
+    def load(self) -> int:
+        """
+        SQLite 파일의 유효한 항목을 메모리로 읽음 (읽은 개수 반환).
+
+        유효 시간이 지났거나 최대 개수를 넘는 오래된 행은 파일에서도 삭제.
+        """
+        if not self.enabled or not self.path:
+            return 0
+        cutoff = self._timer() - self.max_age
+        try:
+            conn = self._connection()
+            with conn:
+                conn.execute("DELETE FROM ai_keyword_trees WHERE created_at < ?", (cutoff,))
+                conn.execute(
+                    "DELETE FROM ai_keyword_trees WHERE keyword NOT IN "
+                    "(SELECT keyword FROM ai_keyword_trees ORDER BY created_at DESC LIMIT ?)",
+                    (self.max_entries,),
+                )
+            rows = conn.execute(
+                "SELECT keyword, tree, created_at FROM ai_keyword_trees ORDER BY created_at"
+            ).fetchall()
+        except sqlite3.Error as e:
+            logger.warning(f"Keyword index load failed: {e}")
+            return 0
+        for row in rows:
+            self._insert(*row)
+        return len(rows)
+
+    # ==================== 백그라운드 재생성 ====================
+    def refresh(self, keyword: str, generate: Callable[[], Awaitable[Any]]) -> None:
+        """
+        재사용한 키워드의 목록을 백그라운드에서 새로 생성 (키워드마다 동시에 하나만).
+
+        generate는 생성 결과를 캐시와 인덱스에 저장하는 코루틴 함수.
+        """
+        key = normalize_text(keyword)
+        if key in self._refreshing:
+            return
+        task = asyncio.create_task(self._run_refresh(key, generate))
+        self._refreshing[key] = task
+        task.add_done_callback(lambda _: self._refreshing.pop(key, None))
+
+    async def _run_refresh(self, key: str, generate: Callable[[], Awaitable[Any]]) -> None:
+        try:
+            await generate()
+            AI_SIMILARITY_REFRESHES.inc(1, "ok")
+        except Exception as e:
+            logger.warning(f"Background regeneration for {key!r} failed: {e}")
+            AI_SIMILARITY_REFRESHES.inc(1, "error")
+
+    async def start(self) -> None:
+        """앱 시작 시 호출. 저장된 항목을 읽음."""
+        loaded = await run_in_threadpool(self.load)
+        if loaded:
+            logger.info(f"Loaded {loaded} keyword index entries")
+
+    async def stop(self) -> None:
+        """앱 종료 시 호출. 진행 중인 백그라운드 재생성 취소."""
+        tasks = list(self._refreshing.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._refreshing.clear()
+
+    def clear(self) -> None:
+        """메모리 인덱스 비우기 (SQLite 파일은 유지)."""
+        self._entries.clear()
+        self._postings.clear()
+        self._idfs.clear()
+        self._norms.clear()
+
+
+AI_SIMILARITY_REQUESTS = register_metric(
+    Counter("ai_similarity_requests_total", "Keyword generations answered from a similar stored keyword.", ["result"])
+)
+AI_SIMILARITY_REFRESHES = register_metric(
+    Counter("ai_similarity_refreshes_total", "Background regenerations after a similarity reuse.", ["result"])
+)
+
+# 프로세스 전역 키워드 유사도 인덱스
+keyword_index = KeywordTreeIndex()
+
+register_metric(Gauge("ai_similarity_index_entries", "Keywords held in the similarity index.", lambda: len(keyword_index)))
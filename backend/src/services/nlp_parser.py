@@ -4,33 +4,274 @@
 사용자가 입력한 자연어 문장을 구조화된 작업 데이터로 변환.
 
 주요 기능:
-- AI 서비스를 통한 자연어 분석
+- 규칙 기반 한국어 파서 (KoreanRuleParser): 상대 날짜/시각, 우선순위 키워드, 소요 시간을
+  정규식으로 추출하고 신뢰도를 계산. 신뢰도가 높으면 AI 호출 없이 바로 사용
+- AI 서비스를 통한 자연어 분석 (규칙으로 확신할 수 없는 문장)
 - 추출된 데이터의 유효성 검증 및 정제
 - 기본값 처리 및 폴백 로직
+
+날짜 규칙은 ai_service 프롬프트와 같음: KST 기준, 시각 없는 "내일(까지)"는
+지금부터 24시간 뒤를 30분 단위로 올린 시각, 시각이 있으면 "YYYY-MM-DD HH:MM:SS",
+날짜만 있으면 "YYYY-MM-DD".
+
+환경 변수:
+- NLP_RULES_MIN_CONFIDENCE: 규칙 결과를 AI 없이 사용할 최소 신뢰도 (기본값: 0.8, 1 초과면 항상 AI 사용)
+- NLP_BATCH_MAX_LINES: 일괄 가져오기 요청 하나의 최대 줄 수 (기본값: 200)
 """
-from datetime import datetime
-from .ai_service import analyze_task_from_natural_language
+import os
+import re
+import unicodedata
+from datetime import date, datetime, time, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..instrumentation import Counter, register_metric
+from .ai_service import (
+    KST, analyze_task_from_natural_language, analyze_tasks_from_natural_language, tomorrow_due_date,
+)
+
+NLP_RULES_MIN_CONFIDENCE = float(os.getenv("NLP_RULES_MIN_CONFIDENCE", "0.8"))
+NLP_BATCH_MAX_LINES = int(os.getenv("NLP_BATCH_MAX_LINES", "200"))
+
+WEEKDAYS = {"월": 0, "화": 1, "수": 2, "목": 3, "금": 4, "토": 5, "일": 6}
+WEEK_OFFSETS = {"이번": 0, "금": 0, "다음": 1, "담": 1, "차": 1, "다다음": 2}
+RELATIVE_DAYS = {"오늘": 0, "금일": 0, "내일": 1, "명일": 1, "모레": 2, "글피": 3}
+PM_WORDS = ("오후", "저녁", "밤", "낮")
+
+# 날짜/시각 뒤에 붙는 마감 표현 ("까지", "전까지", "에" 등)
+_DEADLINE_SUFFIX = r"(?:\s*(?:전까지|까지|중으로|안에|쯤|경|에))?"
+
+_PRIORITY_PATTERNS = [
+    ("high", re.compile(r"(?:매우|아주|정말)?\s*(?:긴급|시급|급함|급하게|급해|ASAP|asap|당장|중요(?:한|함)?)")),
+    ("medium", re.compile(r"(?:우선순위\s*)?보통")),
+    ("low", re.compile(r"(?:나중에|천천히|여유\s*있게|여유롭게|언젠가)")),
+]
+_RELATIVE_DAY = re.compile(r"(오늘|금일|내일|명일|모레|글피)" + _DEADLINE_SUFFIX)
+_DAYS_LATER = re.compile(r"(\d{1,3})\s*(일|주)\s*(?:후|뒤)" + _DEADLINE_SUFFIX)
+_WEEKDAY = re.compile(r"(?:(이번|금|다다음|다음|담|차)\s*주\s*)?([월화수목금토일])요일" + _DEADLINE_SUFFIX)
+_MONTH_DAY = re.compile(r"(\d{1,2})\s*월\s*(\d{1,2})\s*일" + _DEADLINE_SUFFIX)
+_CLOCK = re.compile(r"(오전|아침|새벽|오후|저녁|밤|낮)?\s*(\d{1,2})\s*시(?!간)\s*(?:(\d{1,2})\s*분|(반))?" + _DEADLINE_SUFFIX)
+_CLOCK_24H = re.compile(r"([01]?\d|2[0-3]):([0-5]\d)" + _DEADLINE_SUFFIX)
+_NOON = re.compile(r"정오" + _DEADLINE_SUFFIX)
+_DURATION = re.compile(r"(?:(\d{1,2})\s*시간\s*(?:(\d{1,2})\s*분|(반))?|(\d{1,3})\s*분)(?:\s*(?:동안|간|짜리))?")
+
+# 규칙이 처리하지 못한 시간 표현 (남아 있으면 AI에 맡김)
+_UNHANDLED = re.compile(
+    r"\d|어제|요일|주말|다음|이번|지난|매일|매주|매달|매월|마다|까지|이전|이후|오전|오후|아침|저녁|밤|새벽|"
+    r"점심|자정|시간|월말|월초|연말|연초|이따|곧|조만간|개월|달|주일|평일|반나절"
+)
+_PUNCTUATION = re.compile(r"[!！?？~.,·]+")
+
+# 앞에서부터 확인 ("과제 제출"은 업무가 아니라 학습)
+CATEGORY_KEYWORDS = {
+    "학습": ("공부", "강의", "수업", "숙제", "과제", "시험", "복습", "예습", "학원", "인강"),
+    "운동": ("운동", "헬스", "러닝", "달리기", "조깅", "요가", "필라테스", "스트레칭", "산책", "수영", "등산"),
+    "업무": ("보고서", "회의", "미팅", "제출", "메일", "발표", "기획서", "결재", "출장", "업무", "계약", "보고"),
+    "개인": ("장보기", "청소", "빨래", "설거지", "병원", "치과", "약속", "독서", "책", "요리", "은행", "택배", "예약"),
+}
+
+# 신뢰도 감점
+AMBIGUOUS_HOUR_PENALTY = 0.25   # 오전/오후 없는 1~12시
+LONG_TEXT_PENALTY = 0.2         # 규칙이 놓친 뉘앙스가 있을 가능성이 큰 긴 문장
+LONG_TEXT_LENGTH = 30
+UNHANDLED_CONFIDENCE = 0.3      # 처리하지 못한 시간 표현이 남음
+
+
+class KoreanRuleParser:
+    """
+    규칙 기반 한국어 작업 파서.
+
+    parse()는 AI 분석과 같은 형식의 결과와 0~1 사이의 신뢰도를 반환.
+    신뢰도는 문장의 시간 표현을 모두 이해했는지를 나타내며,
+    처리하지 못한 표현이 남거나 해석이 모호하면 낮아짐.
+    """
+
+    def parse(self, text: str, now: datetime) -> Tuple[Dict[str, Any], float]:
+        """
+        Args:
+            text: 사용자가 입력한 자연어 문장
+            now: 상대 날짜의 기준 시각 (KST)
+
+        Returns:
+            (작업 딕셔너리, 신뢰도)
+        """
+        text = " ".join(unicodedata.normalize("NFKC", text).split())
+        confidence = 1.0
+        consumed: List[Tuple[int, int]] = []
+
+        def take(pattern: re.Pattern) -> List[re.Match]:
+            matches = [m for m in pattern.finditer(text) if not _overlaps(m.span(), consumed)]
+            consumed.extend(m.span() for m in matches)
+            return matches
+
+        priority = "none"
+        for level, pattern in _PRIORITY_PATTERNS:
+            if take(pattern):
+                priority = level
+                break
+
+        # "7시 30분"의 "30분"이 소요 시간으로 읽히지 않도록 시각을 먼저 추출
+        clocks = take(_CLOCK) + take(_CLOCK_24H) + take(_NOON)
+        durations = take(_DURATION)
+        minutes = None
+        if durations:
+            hours, extra, half, only_minutes = durations[0].groups()
+            minutes = int(only_minutes) if only_minutes else int(hours) * 60 + (30 if half else int(extra or 0))
+
+        days: List[date] = []
+        relative_tomorrow = False
+        for match in take(_RELATIVE_DAY):
+            days.append(now.date() + timedelta(days=RELATIVE_DAYS[match.group(1)]))
+            relative_tomorrow = RELATIVE_DAYS[match.group(1)] == 1
+        for match in take(_DAYS_LATER):
+            count = int(match.group(1)) * (7 if match.group(2) == "주" else 1)
+            days.append(now.date() + timedelta(days=count))
+        for match in take(_WEEKDAY):
+            days.append(_weekday_date(now.date(), match.group(1), WEEKDAYS[match.group(2)]))
+        for match in take(_MONTH_DAY):
+            month_day = _month_day(now.date(), int(match.group(1)), int(match.group(2)))
+            if month_day is None:
+                confidence = min(confidence, UNHANDLED_CONFIDENCE)
+            else:
+                days.append(month_day)
+
+        clock, ambiguous = (None, False)
+        if clocks:
+            clock, ambiguous = _clock_time(clocks[0])
+            if ambiguous:
+                confidence -= AMBIGUOUS_HOUR_PENALTY
+        if len(days) > 1 or len(clocks) > 1 or len(durations) > 1:
+            confidence = min(confidence, UNHANDLED_CONFIDENCE)
+
+        due_date = None
+        if clock is not None:
+            due = datetime.combine(days[0] if days else now.date(), time()) + clock
+            due_date = due.strftime("%Y-%m-%d %H:%M:%S")
+        elif days and relative_tomorrow:
+            due_date = tomorrow_due_date(now).strftime("%Y-%m-%d %H:%M:%S")
+        elif days:
+            due_date = days[0].strftime("%Y-%m-%d")
+
+        description = _remaining_text(text, consumed)
+        if not description:
+            return _result(text, due_date, priority, minutes), 0.0
+        if _UNHANDLED.search(description):
+            confidence = min(confidence, UNHANDLED_CONFIDENCE)
+        if len(description) > LONG_TEXT_LENGTH:
+            confidence -= LONG_TEXT_PENALTY
+        return _result(description, due_date, priority, minutes), max(confidence, 0.0)
+
+
+def _overlaps(span: Tuple[int, int], spans: List[Tuple[int, int]]) -> bool:
+    return any(span[0] < end and start < span[1] for start, end in spans)
+
+
+def _remaining_text(text: str, spans: List[Tuple[int, int]]) -> str:
+    """추출한 표현을 뺀 나머지 (작업 내용)."""
+    kept, position = [], 0
+    for start, end in sorted(spans):
+        kept.append(text[position:start])
+        position = max(position, end)
+    kept.append(text[position:])
+    return " ".join(_PUNCTUATION.sub(" ", " ".join(kept)).split())
+
+
+def _weekday_date(today: date, week_word: Optional[str], weekday: int) -> date:
+    """
+    요일이 가리키는 날짜.
+
+    "이번 주/다음 주 X요일"은 월요일 시작 주 기준, 요일만 있으면 오늘 이후 가장 가까운 그 요일 (오늘 포함).
+    """
+    if week_word is None:
+        return today + timedelta(days=(weekday - today.weekday()) % 7)
+    monday = today - timedelta(days=today.weekday())
+    return monday + timedelta(weeks=WEEK_OFFSETS[week_word], days=weekday)
+
+
+def _month_day(today: date, month: int, day: int) -> Optional[date]:
+    """올해의 M월 D일 (이미 지났으면 내년, 없는 날짜면 None)."""
+    try:
+        candidate = date(today.year, month, day)
+        return candidate if candidate >= today else date(today.year + 1, month, day)
+    except ValueError:
+        return None
+
+
+def _clock_time(match: re.Match) -> Tuple[timedelta, bool]:
+    """
+    시각 표현을 자정 기준 timedelta로 변환.
+
+    Returns:
+        (시각, 오전/오후가 모호한지 여부). 오전/오후 표시가 없는 1~6시는 오후, 7~11시는 오전으로 가정
+    """
+    if match.re is _NOON:
+        return timedelta(hours=12), False
+    if match.re is _CLOCK_24H:
+        return timedelta(hours=int(match.group(1)), minutes=int(match.group(2))), False
+    meridiem, hour, minute, half = match.groups()
+    hour = int(hour)
+    minute = 30 if half else int(minute or 0)
+    ambiguous = False
+    if meridiem in PM_WORDS:
+        if hour < 12:
+            hour += 12
+        elif meridiem == "밤":
+            hour = 24  # 밤 12시 = 다음 날 0시
+    elif meridiem is not None:
+        hour = 0 if hour == 12 else hour
+    elif hour <= 12:
+        ambiguous = True
+        if hour <= 6:
+            hour += 12
+    return timedelta(hours=hour, minutes=minute), ambiguous
+
+
+def _category(description: str) -> Optional[str]:
+    for category, keywords in CATEGORY_KEYWORDS.items():
+        if any(keyword in description for keyword in keywords):
+            return category
+    return None
+
+
+def _result(description: str, due_date: Optional[str], priority: str, minutes: Optional[int]) -> Dict[str, Any]:
+    return {
+        "description": description,
+        "due_date": due_date,
+        "priority": priority,
+        "estimated_time_minutes": minutes,
+        "category": _category(description),
+    }
 
 
 class NaturalLanguageParser:
     """
     자연어 작업 파서 클래스.
-    
+
     자연어 문장을 분석하여 description, due_date, priority 등
     구조화된 작업 속성으로 변환.
+
+    Args:
+        min_confidence: 규칙 결과를 AI 없이 사용할 최소 신뢰도
+        clock: 현재 시각 함수 (KST)
     """
-    
-    def parse_task(self, text: str) -> dict:
+
+    def __init__(self, min_confidence: float = NLP_RULES_MIN_CONFIDENCE,
+                 clock: Callable[[], datetime] = lambda: datetime.now(KST)):
+        self.min_confidence = min_confidence
+        self.rules = KoreanRuleParser()
+        self._clock = clock
+
+    async def parse_task(self, text: str, user_id: Optional[str] = None) -> dict:
         """
         자연어 문장을 구조화된 작업 딕셔너리로 변환.
-        
-        AI 서비스를 호출하여 핵심 분석을 수행하고,
-        결과 데이터를 검증/정제하여 반환.
-        
+
+        규칙 기반 파서의 신뢰도가 min_confidence 이상이면 그 결과를 사용하고,
+        아니면 AI 서비스를 호출하여 분석. 결과 데이터를 검증/정제하여 반환.
+
         Args:
             text: 사용자가 입력한 자연어 문장
                   예: "내일까지 보고서 제출 긴급!"
-        
+            user_id: 요청 사용자 ID (AI 사용자별 동시 호출 수 제한용)
+
         Returns:
             구조화된 작업 딕셔너리:
             - description: 작업 내용
@@ -38,17 +279,61 @@ class NaturalLanguageParser:
             - priority: 우선순위 (high/medium/low/none)
             - estimated_time_minutes: 예상 시간 (분)
             - category: 카테고리
-            
+
             입력이 비어있으면 None 반환
         """
         if not text:
             return None
 
-        # AI 서비스를 통한 자연어 분석
-        ai_result = analyze_task_from_natural_language(text)
+        now = self._clock()
+        ai_result, confidence = self.rules.parse(text, now)
+        if confidence >= self.min_confidence:
+            NLP_PARSE_REQUESTS.inc(1, "rules")
+        else:
+            # AI 서비스를 통한 자연어 분석
+            NLP_PARSE_REQUESTS.inc(1, "ai")
+            ai_result = await analyze_task_from_natural_language(text, user_id=user_id, now=now)
+
+        return self._clean(ai_result, text)
+
+    async def parse_tasks(self, texts: List[str], user_id: Optional[str] = None) -> List[Optional[dict]]:
+        """
+        여러 자연어 문장을 한 번에 변환 (여러 줄 붙여넣기용).
+
+        문장마다 규칙 기반 파서를 먼저 적용하고, 신뢰도가 낮은 문장만 모아
+        AI 일괄 분석(analyze_tasks_from_natural_language)을 한 번 호출.
+
+        Args:
+            texts: 자연어 문장 목록 (빈 문장 없음)
+            user_id: 요청 사용자 ID (AI 사용자별 동시 호출 수 제한용)
 
-        # ==================== 데이터 정제 및 검증 ====================
-        
+        Returns:
+            texts와 같은 순서의 작업 딕셔너리 목록 (parse_task와 같은 형식).
+            AI가 분석하지 못한 문장은 None
+        """
+        now = self._clock()
+        results: List[Optional[dict]] = []
+        pending: List[int] = []
+        for index, text in enumerate(texts):
+            result, confidence = self.rules.parse(text, now)
+            if confidence >= self.min_confidence:
+                results.append(result)
+            else:
+                results.append(None)
+                pending.append(index)
+        NLP_PARSE_REQUESTS.inc(len(texts) - len(pending), "rules")
+        if pending:
+            NLP_PARSE_REQUESTS.inc(len(pending), "ai")
+            analyzed = await analyze_tasks_from_natural_language(
+                [texts[index] for index in pending], user_id=user_id, now=now,
+            )
+            for index, result in zip(pending, analyzed):
+                results[index] = result
+        return [self._clean(result, text) if result is not None else None for result, text in zip(results, texts)]
+
+    @staticmethod
+    def _clean(ai_result: dict, text: str) -> dict:
+        """분석 결과 정제 및 검증 (빈 값/잘못된 형식은 기본값으로)."""
         # description: 빈 값이면 원본 텍스트로 대체
         if not ai_result.get("description"):
             ai_result["description"] = text
@@ -77,5 +362,9 @@ class NaturalLanguageParser:
         return ai_result
 
 
+NLP_PARSE_REQUESTS = register_metric(
+    Counter("nlp_parse_requests_total", "Natural-language task parses by the path that answered.", ["path"])
+)
+
 # 싱글톤 인스턴스 (전역 사용)
-nlp_parser = NaturalLanguageParser()
\ No newline at end of file
+nlp_parser = NaturalLanguageParser()
@@ -0,0 +1,162 @@
+"""
+OAuth 제공자 HTTP 클라이언트 모듈
+
+네이버/카카오 OAuth 콜백의 토큰 발급·프로필 조회 요청을 프로세스 전역
+httpx.AsyncClient 하나로 보냄.
+
+- 연결 풀 + HTTP keep-alive로 로그인마다 새 TCP/TLS 연결을 맺지 않음
+- 연결/읽기 타임아웃을 명시하여 느린 제공자가 요청을 무한정 붙잡지 않음
+- 일시적 오류는 횟수를 제한하여 재시도 (지수 백오프)
+  - 연결 단계 오류(요청이 전송되지 않음)는 모든 메서드 재시도
+  - 읽기 타임아웃, 5xx/429 응답은 멱등 요청(GET)만 재시도.
+    인가 코드는 1회용이므로 제공자가 이미 처리했을 수 있는 토큰 발급 POST는 재시도하지 않음
+- 재시도 후에도 실패하면 httpx.HTTPError를 그대로 올림 (라우터에서 503으로 변환)
+
+환경 변수:
+- OAUTH_HTTP_CONNECT_TIMEOUT: 연결 타임아웃 (기본값: 3초)
+- OAUTH_HTTP_READ_TIMEOUT: 읽기/쓰기/연결 풀 대기 타임아웃 (기본값: 5초)
+- OAUTH_HTTP_MAX_RETRIES: 최대 재시도 횟수 (기본값: 2)
+- OAUTH_HTTP_MAX_CONNECTIONS: 최대 동시 연결 수 (기본값: 20)
+"""
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Optional
+
+import httpx
+from fastapi import HTTPException, status
+
+from ..instrumentation import Counter, Histogram, register_metric
+
+logger = logging.getLogger(__name__)
+
+OAUTH_HTTP_CONNECT_TIMEOUT = float(os.getenv("OAUTH_HTTP_CONNECT_TIMEOUT", "3"))
+OAUTH_HTTP_READ_TIMEOUT = float(os.getenv("OAUTH_HTTP_READ_TIMEOUT", "5"))
+OAUTH_HTTP_MAX_RETRIES = int(os.getenv("OAUTH_HTTP_MAX_RETRIES", "2"))
+OAUTH_HTTP_MAX_CONNECTIONS = int(os.getenv("OAUTH_HTTP_MAX_CONNECTIONS", "20"))
+
+# 유휴 keep-alive 연결 유지 시간 (초)
+KEEPALIVE_EXPIRY = 30
+# 첫 재시도 전 대기 시간 (초, 재시도마다 2배)
+RETRY_BACKOFF_SECONDS = 0.2
+# 503 응답의 Retry-After (초)
+RETRY_AFTER_SECONDS = 5
+
+# 재시도해도 같은 결과를 내는 메서드
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+# 요청이 제공자에 도달하지 않았음이 확실한 오류
+_NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+def _is_retryable_status(status_code: int) -> bool:
+    return status_code == 429 or status_code >= 500
+
+
+def provider_unavailable_exception(provider: str) -> HTTPException:
+    """OAuth 제공자 호출이 재시도 후에도 실패했을 때 사용하는 503 예외 생성."""
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=f"{provider} login is temporarily unavailable, please retry",
+        headers={"Retry-After": str(RETRY_AFTER_SECONDS)},
+    )
+
+
+class OAuthHttpClient:
+    """
+    연결 풀 기반 OAuth 제공자 HTTP 클라이언트.
+
+    Args:
+        connect_timeout: 연결 타임아웃 (초)
+        read_timeout: 읽기/쓰기/연결 풀 대기 타임아웃 (초)
+        max_retries: 최대 재시도 횟수 (0이면 재시도 안 함)
+        max_connections: 최대 동시 연결 수
+    """
+
+    def __init__(self, connect_timeout: float = OAUTH_HTTP_CONNECT_TIMEOUT,
+                 read_timeout: float = OAUTH_HTTP_READ_TIMEOUT, max_retries: int = OAUTH_HTTP_MAX_RETRIES,
+                 max_connections: int = OAUTH_HTTP_MAX_CONNECTIONS):
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_retries = max_retries
+        self.max_connections = max_connections
+        self.backoff = RETRY_BACKOFF_SECONDS
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _timeout(self) -> httpx.Timeout:
+        return httpx.Timeout(self.read_timeout, connect=self.connect_timeout)
+
+    def _http(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self._timeout(),
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                    keepalive_expiry=KEEPALIVE_EXPIRY,
+                ),
+            )
+        return self._client
+
+    async def request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """
+        요청 전송 (일시적 오류는 재시도).
+
+        Returns:
+            4xx를 포함한 제공자 응답 (오류 내용은 응답 본문으로 판단)
+
+        Raises:
+            httpx.TransportError: 연결/타임아웃 오류가 재시도 후에도 계속됨
+            httpx.HTTPStatusError: 5xx/429 응답이 재시도 후에도 계속됨
+        """
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+        host = httpx.URL(url).host
+        attempt = 0
+        while True:
+            last_attempt = attempt >= self.max_retries
+            start = time.perf_counter()
+            try:
+                response = await self._http().request(method, url, timeout=self._timeout(), **kwargs)
+            except httpx.TransportError as e:
+                if last_attempt or not (idempotent or isinstance(e, _NOT_SENT_ERRORS)):
+                    raise
+                logger.warning(f"OAuth request {method} {host} failed ({type(e).__name__}), retrying")
+            else:
+                if not _is_retryable_status(response.status_code):
+                    return response
+                if last_attempt or not idempotent:
+                    response.raise_for_status()
+                logger.warning(f"OAuth request {method} {host} returned {response.status_code}, retrying")
+            finally:
+                OAUTH_HTTP_DURATION.observe(time.perf_counter() - start, host)
+
+            OAUTH_HTTP_RETRIES.inc(1, host)
+            await asyncio.sleep(self.backoff * 2 ** attempt)
+            attempt += 1
+
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    def start(self) -> None:
+        """앱 시작 시 호출. 연결 풀 생성."""
+        self._http()
+
+    async def stop(self) -> None:
+        """앱 종료 시 호출. 유휴 연결 정리."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+OAUTH_HTTP_DURATION = register_metric(
+    Histogram("oauth_http_request_duration_seconds", "OAuth provider HTTP request time per attempt.", ["host"])
+)
+OAUTH_HTTP_RETRIES = register_metric(
+    Counter("oauth_http_retries_total", "OAuth provider HTTP requests retried after a transient error.", ["host"])
+)
+
+# 프로세스 전역 클라이언트 인스턴스
+oauth_http = OAuthHttpClient()
@@ -0,0 +1,186 @@
+"""
+비밀번호 해싱 모듈
+
+비밀번호 해싱/검증은 CPU를 수십 ms씩 점유하므로 요청 스레드(스레드풀)가 아닌
+별도 프로세스 풀에서 실행.
+
+- 동시에 처리 중이거나 대기 중인 작업 수가 상한을 넘으면 503(Retry-After)으로 즉시 거절
+- 해시 비용(pbkdf2_sha256 rounds)은 환경 변수로 지정하거나, 목표 소요 시간(ms)에 맞춰 앱 시작 시 보정
+- 로그인 시 저장된 해시가 현재 설정보다 약하면(rounds 부족, bcrypt) 새 해시를 함께 반환하여 갱신
+
+환경 변수:
+- PASSWORD_HASH_WORKERS: 프로세스 풀 크기 (기본값: CPU 수, 0이면 스레드풀에서 실행)
+- PASSWORD_HASH_MAX_PENDING: 처리 중 + 대기 작업 수 상한 (기본값: 워커 수 x 8)
+- PASSWORD_HASH_ROUNDS: pbkdf2_sha256 rounds (기본값: 29000, passlib 기본값).
+  OWASP는 pbkdf2-sha256에 600,000 이상을 권고하므로 운영 환경에서는 올려서 설정
+- PASSWORD_HASH_TARGET_MS: 지정하면 앱 시작 시 해시 1회가 이 시간(ms)이 되도록 rounds 보정.
+  보정은 rounds를 올리기만 하며 PASSWORD_HASH_ROUNDS 미만으로는 내리지 않음
+"""
+import asyncio
+import logging
+import math
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+from starlette.concurrency import run_in_threadpool
+
+from ..instrumentation import Counter, Gauge, Histogram, register_metric
+
+logger = logging.getLogger(__name__)
+
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 1)))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", str(max(PASSWORD_HASH_WORKERS, 1) * 8)))
+PASSWORD_HASH_ROUNDS = int(os.getenv("PASSWORD_HASH_ROUNDS", "29000"))
+PASSWORD_HASH_TARGET_MS = float(os.getenv("PASSWORD_HASH_TARGET_MS", "0"))
+
+# 보정값을 이 비율 간격의 격자로 내림 (측정 잡음 때문에 재시작마다 rounds가 바뀌어
+# 저장된 해시가 로그인 때마다 다시 만들어지지 않도록)
+CALIBRATION_STEP = 1.25
+# 503 응답의 Retry-After (초)
+RETRY_AFTER_SECONDS = 1
+
+
+@lru_cache(maxsize=8)
+def crypt_context(rounds: int) -> CryptContext:
+    """
+    rounds별 CryptContext (프로세스마다 한 번 생성).
+
+    rounds보다 약한 pbkdf2 해시와 bcrypt 해시는 needs_update 대상으로 표시됨.
+    """
+    return CryptContext(
+        schemes=["pbkdf2_sha256", "bcrypt"],
+        deprecated=["bcrypt"],
+        pbkdf2_sha256__default_rounds=rounds,
+        pbkdf2_sha256__min_rounds=rounds,
+    )
+
+
+def hash_password_sync(password: str, rounds: int) -> str:
+    """비밀번호 해싱 (워커 프로세스에서 실행)."""
+    return crypt_context(rounds).hash(password)
+
+
+def verify_password_sync(password: str, hashed_password: str, rounds: int) -> Tuple[bool, Optional[str]]:
+    """
+    비밀번호 검증 (워커 프로세스에서 실행).
+
+    Returns:
+        (일치 여부, 갱신이 필요하면 새 해시 아니면 None)
+    """
+    try:
+        return crypt_context(rounds).verify_and_update(password, hashed_password)
+    except ValueError:
+        # 알 수 없는 형식의 해시
+        return False, None
+
+
+def calibrate_rounds(target_ms: float, floor: int = PASSWORD_HASH_ROUNDS, sample_rounds: int = 20000) -> int:
+    """
+    해시 1회가 target_ms가 되도록 rounds 계산 (pbkdf2 소요 시간은 rounds에 비례).
+
+    현재 프로세스에서 sample_rounds로 몇 번 측정한 최솟값을 기준으로 환산하고 CALIBRATION_STEP 격자로
+    내림하여, 같은 서버에서는 재시작해도 같은 값이 나옴. floor(설정된 rounds) 미만으로는 내리지 않음.
+    """
+    context = crypt_context(sample_rounds)
+    samples = []
+    for _ in range(3):
+        start = time.perf_counter()
+        context.hash("calibration-sample")
+        samples.append(time.perf_counter() - start)
+    per_round_ms = min(samples) * 1000 / sample_rounds
+    rounds = target_ms / per_round_ms
+    if rounds >= 1:
+        rounds = CALIBRATION_STEP ** math.floor(math.log(rounds, CALIBRATION_STEP))
+    return max(floor, int(rounds))
+
+
+def hasher_busy_exception() -> HTTPException:
+    """해싱 대기열이 가득 찼을 때 사용하는 503 예외 생성."""
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Authentication is temporarily overloaded, please retry",
+        headers={"Retry-After": str(RETRY_AFTER_SECONDS)},
+    )
+
+
+class PasswordHasher:
+    """
+    프로세스 풀 기반 비밀번호 해셔.
+
+    Args:
+        workers: 프로세스 수 (0이면 스레드풀에서 실행)
+        max_pending: 처리 중 + 대기 작업 수 상한 (초과 시 503)
+        rounds: pbkdf2_sha256 rounds
+    """
+
+    def __init__(self, workers: int = PASSWORD_HASH_WORKERS, max_pending: int = PASSWORD_HASH_MAX_PENDING,
+                 rounds: int = PASSWORD_HASH_ROUNDS):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.rounds = rounds
+        self.pending = 0
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # fork는 부모의 스레드/이벤트 루프 상태를 복제하므로 spawn 사용
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+        return self._pool
+
+    async def _run(self, operation: str, func, *args):
+        if self.pending >= self.max_pending:
+            PASSWORD_HASH_REJECTED.inc(1, operation)
+            raise hasher_busy_exception()
+        self.pending += 1
+        start = time.perf_counter()
+        try:
+            if self.workers <= 0:
+                return await run_in_threadpool(func, *args)
+            return await asyncio.get_running_loop().run_in_executor(self._executor(), func, *args)
+        finally:
+            self.pending -= 1
+            PASSWORD_HASH_DURATION.observe(time.perf_counter() - start, operation)
+
+    async def hash(self, password: str) -> str:
+        """비밀번호 해싱."""
+        return await self._run("hash", hash_password_sync, password, self.rounds)
+
+    async def verify(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """비밀번호 검증. 저장된 해시가 현재 설정보다 약하면 새 해시를 함께 반환."""
+        return await self._run("verify", verify_password_sync, password, hashed_password, self.rounds)
+
+    def start(self) -> None:
+        """
+        앱 시작 시 호출. PASSWORD_HASH_TARGET_MS가 있으면 rounds를 보정하고 워커를 미리 띄움.
+        """
+        if PASSWORD_HASH_TARGET_MS > 0:
+            self.rounds = calibrate_rounds(PASSWORD_HASH_TARGET_MS, floor=self.rounds)
+            logger.info(f"Calibrated password hash rounds to {self.rounds} ({PASSWORD_HASH_TARGET_MS}ms target)")
+        if self.workers > 0:
+            self._executor()
+
+    def stop(self) -> None:
+        """앱 종료 시 호출. 워커 프로세스 종료."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+PASSWORD_HASH_DURATION = register_metric(
+    Histogram("password_hash_duration_seconds", "Password hash/verify time including queueing.", ["operation"])
+)
+PASSWORD_HASH_REJECTED = register_metric(
+    Counter("password_hash_rejected_total", "Password hash/verify calls shed with 503.", ["operation"])
+)
+
+# 프로세스 전역 해셔 인스턴스
+password_hasher = PasswordHasher()
+
+register_metric(Gauge("password_hash_pending", "Password hash/verify calls running or queued.",
+                      lambda: password_hasher.pending))
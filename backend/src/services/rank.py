@@ -0,0 +1,131 @@
+"""
+정렬 키(Rank) 모듈
+
+형제 아이템의 순서를 정수 order 대신 사전식(lexicographic) 문자열 키로 관리.
+
+두 키 사이에는 항상 새로운 키를 만들 수 있으므로, 아이템 추가/삽입/이동 시
+다른 형제 문서를 다시 번호 매길 필요 없이 해당 문서 하나만 쓰면 됨.
+
+키 형식:
+- base62 숫자(0-9A-Za-z, ASCII 순서)로 구성된 소수부 표현 (예: "V" ≈ 0.5)
+- 마지막 문자는 '0'이 될 수 없음 (모든 두 키 사이에 키가 존재하도록 보장)
+- 키 길이가 RANK_MAX_LENGTH를 넘으면 형제 전체 재배치(rebalance) 권장
+"""
+from typing import List, Optional
+
+DIGITS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+BASE = len(DIGITS)
+
+# 이 길이를 넘는 키가 생성되면 형제 아이템 재배치
+RANK_MAX_LENGTH = 32
+
+# 정수 order에서 파생한 레거시 키의 자릿수 (62^3 = 238,328개 형제까지 순서 보존)
+_LEGACY_WIDTH = 3
+
+
+def _digit(ch: str) -> int:
+    index = DIGITS.find(ch)
+    if index < 0:
+        raise ValueError(f"Invalid rank character: {ch!r}")
+    return index
+
+
+def _midpoint(lower: str, upper: Optional[str]) -> str:
+    """lower < 결과 < upper 인 가장 짧은 키 계산 (upper가 None이면 상한 없음)."""
+    if upper is not None:
+        # 공통 접두사는 그대로 두고 나머지 구간에서 중간값 계산
+        n = 0
+        while n < len(upper) and (lower[n] if n < len(lower) else "0") == upper[n]:
+            n += 1
+        if n > 0:
+            return upper[:n] + _midpoint(lower[n:], upper[n:])
+
+    digit_lower = _digit(lower[0]) if lower else 0
+    digit_upper = _digit(upper[0]) if upper is not None else BASE
+    if digit_upper - digit_lower > 1:
+        return DIGITS[(digit_lower + digit_upper) // 2]
+    if upper is not None and len(upper) > 1:
+        return upper[0]
+    return DIGITS[digit_lower] + _midpoint(lower[1:], None)
+
+
+def rank_between(lower: Optional[str], upper: Optional[str]) -> str:
+    """
+    두 키 사이의 새 키 생성.
+
+    Args:
+        lower: 앞 형제의 키 (None이면 맨 앞)
+        upper: 뒤 형제의 키 (None이면 맨 뒤)
+
+    Returns:
+        lower < key < upper 를 만족하는 키
+
+    Raises:
+        ValueError: lower >= upper 인 경우
+    """
+    if lower is not None and upper is not None and lower >= upper:
+        raise ValueError(f"Invalid rank range: {lower!r} >= {upper!r}")
+    if lower is None and upper is None:
+        return DIGITS[BASE // 2]
+    if upper is None:
+        return rank_after(lower)
+    if lower is None:
+        return rank_before(upper)
+    return _midpoint(lower, upper)
+
+
+def rank_after(key: str) -> str:
+    """
+    key 뒤에 오는 짧은 키 생성 (맨 뒤에 추가).
+
+    연속 추가 시 키 길이가 자릿수당 약 30회마다 1씩만 늘어나도록
+    중간값 대신 첫 번째로 증가 가능한 자리를 1 증가시킴.
+    """
+    for i, ch in enumerate(key):
+        digit = _digit(ch)
+        if digit < BASE - 1:
+            return key[:i] + DIGITS[digit + 1]
+    return key + DIGITS[BASE // 2]
+
+
+def rank_before(key: str) -> str:
+    """key 앞에 오는 짧은 키 생성 (맨 앞에 추가)."""
+    for i, ch in enumerate(key):
+        digit = _digit(ch)
+        if digit > 1:
+            return key[:i] + DIGITS[digit - 1]
+    return _midpoint("", key)
+
+
+def rank_sequence(count: int) -> List[str]:
+    """
+    균등한 간격의 키 count개 생성 (재배치 및 일괄 생성용).
+
+    각 키 사이에 한 자리 이상의 여유가 생기도록 자릿수를 정하고
+    전체 구간을 count + 1 등분.
+    """
+    if count <= 0:
+        return []
+    width = 1
+    while BASE ** width < (count + 1) * BASE:
+        width += 1
+    span = BASE ** width
+    return [_encode(i * span // (count + 1), width) for i in range(1, count + 1)]
+
+
+def rank_from_order(order: int) -> str:
+    """
+    레거시 정수 order에서 파생한 키.
+
+    rank 필드가 없는 기존 문서도 order 순서를 유지한 채 새 키와 함께 정렬되도록 함.
+    """
+    return _encode(min(max(int(order), 0) + 1, BASE ** _LEGACY_WIDTH - 1), _LEGACY_WIDTH)
+
+
+def _encode(value: int, width: int) -> str:
+    """정수를 고정 자릿수 base62 소수부로 인코딩 (끝의 '0'은 제거)."""
+    chars = []
+    for _ in range(width):
+        value, remainder = divmod(value, BASE)
+        chars.append(DIGITS[remainder])
+    return "".join(reversed(chars)).rstrip("0") or DIGITS[1]
@@ -0,0 +1,104 @@
+"""
+요청 수 제한 모듈 (slowapi)
+
+스크립트 하나가 AI 생성을 반복 호출하여 Gemini 비용을 올리고 다른 사용자를 대기시키지 않도록
+요청 수를 제한. 429 응답과 일반 응답 모두에 X-RateLimit-Limit / X-RateLimit-Remaining /
+X-RateLimit-Reset, Retry-After 헤더를 붙여 클라이언트가 속도를 줄일 수 있게 함.
+
+- 키: 유효한 액세스 토큰이 있으면 사용자별("user:<username>"), 없으면 IP별("ip:<주소>")
+- AI 생성 엔드포인트(@ai_limit): 사용자별 분당 한도와 일일 할당량(AI_RATE_LIMIT)을
+  모든 AI 엔드포인트가 함께 사용. 그 외 엔드포인트와는 별도 한도
+- 그 외 엔드포인트: 키별 공용 한도(RATE_LIMIT_DEFAULT, SlowAPIASGIMiddleware가 적용)
+- 카운터 전략은 sliding-window-counter (고정 구간 경계에서 한도의 두 배가 몰리지 않고
+  토큰 버킷처럼 시간에 따라 고르게 회복)
+- 카운터는 REDIS_URL이 있으면 Redis(워커/인스턴스 공용), 없으면 프로세스 메모리에 저장.
+  Redis 오류 시 메모리로 대체하며 제한 실패로 요청을 거절하지 않음
+
+환경 변수:
+- RATE_LIMIT_ENABLED: 요청 수 제한 사용 여부 (기본값: true)
+- RATE_LIMIT_DEFAULT: 일반 엔드포인트 한도 (기본값: 120/minute)
+- AI_RATE_LIMIT: AI 생성 엔드포인트 한도, ;로 여러 개 (기본값: 10/minute;200/day)
+- RATE_LIMIT_TRUSTED_PROXIES: 앞단 신뢰 프록시 수. X-Forwarded-For의 오른쪽에서 이 번째 주소
+  (신뢰 프록시가 기록한 주소)를 클라이언트 IP로 사용 (기본값: Render 배포 환경이면 1, 아니면 0)
+"""
+import os
+
+from fastapi import Request
+from fastapi.responses import JSONResponse
+from slowapi import Limiter
+from slowapi.errors import RateLimitExceeded
+from slowapi.util import get_remote_address
+
+from ..instrumentation import Counter, register_metric
+from .security import decode_access_token, principal_cache
+from .shared_cache import KEY_PREFIX, REDIS_URL
+
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+RATE_LIMIT_DEFAULT = os.getenv("RATE_LIMIT_DEFAULT", "120/minute")
+AI_RATE_LIMIT = os.getenv("AI_RATE_LIMIT", "10/minute;200/day")
+RATE_LIMIT_TRUSTED_PROXIES = int(os.getenv("RATE_LIMIT_TRUSTED_PROXIES", "1" if os.getenv("RENDER") else "0"))
+
+
+def client_address(request: Request) -> str:
+    """
+    클라이언트 IP.
+
+    X-Forwarded-For의 왼쪽 주소는 클라이언트가 마음대로 보낼 수 있으므로, 신뢰 프록시가
+    덧붙인 오른쪽에서 RATE_LIMIT_TRUSTED_PROXIES 번째 주소만 사용. 주소가 그보다 적으면
+    프록시를 거치지 않은 요청이므로 연결 주소를 사용.
+    """
+    if RATE_LIMIT_TRUSTED_PROXIES > 0:
+        forwarded = [address.strip() for address in request.headers.get("x-forwarded-for", "").split(",")]
+        forwarded = [address for address in forwarded if address]
+        if len(forwarded) >= RATE_LIMIT_TRUSTED_PROXIES:
+            return forwarded[-RATE_LIMIT_TRUSTED_PROXIES]
+    return get_remote_address(request)
+
+
+def rate_limit_key(request: Request) -> str:
+    """
+    요청 수를 셀 키.
+
+    인증 캐시(principal_cache)에 있는 토큰이면 조회만 하고, 아니면 JWT 서명만 검증 (DB 조회 없음).
+    토큰이 없거나 잘못되었으면 IP별로 셈.
+    """
+    authorization = request.headers.get("authorization", "")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() == "bearer" and token:
+        user = principal_cache.get(token)
+        if user is not None:
+            return f"user:{user.username}"
+        try:
+            return f"user:{decode_access_token(token)}"
+        except Exception:
+            pass
+    return f"ip:{client_address(request)}"
+
+
+async def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded) -> JSONResponse:
+    """429 응답 (초과한 한도와 다시 시도할 수 있는 시각 헤더 포함)."""
+    scope = "ai" if request.state.view_rate_limit and "ai" in request.state.view_rate_limit[1] else "default"
+    RATE_LIMITED_REQUESTS.inc(1, scope)
+    response = JSONResponse(status_code=429, content={"detail": f"Rate limit exceeded: {exc.detail}"})
+    return request.app.state.limiter._inject_headers(response, request.state.view_rate_limit)
+
+
+# 프로세스 전역 요청 수 제한기
+limiter = Limiter(
+    key_func=rate_limit_key,
+    application_limits=[RATE_LIMIT_DEFAULT],
+    headers_enabled=True,
+    strategy="sliding-window-counter",
+    storage_uri=REDIS_URL or "memory://",
+    key_prefix=f"{KEY_PREFIX}:ratelimit",
+    in_memory_fallback_enabled=True,
+    swallow_errors=True,
+    enabled=RATE_LIMIT_ENABLED,
+)
+
+# AI 생성 엔드포인트 공용 한도 (엔드포인트 함수에 request: Request, response: Response 인자가 필요)
+ai_limit = limiter.shared_limit(AI_RATE_LIMIT, scope="ai")
+
+RATE_LIMITED_REQUESTS = register_metric(
+    Counter("rate_limited_requests_total", "Requests rejected with 429 by the rate limiter.", ["scope"])
+)
@@ -0,0 +1,100 @@
+"""
+저장소 인터페이스 모듈
+
+저장 엔진(Firestore/SQLite)별 서비스 모듈이 구현해야 하는 함수 계약을 정의.
+
+각 엔진은 모듈 단위로 아래 Protocol의 함수들을 제공하며,
+라우터는 storage 모듈을 통해 현재 설정된 엔진의 구현을 사용.
+
+구현 모듈:
+- TodoRepository: todo_service_firestore_async, todo_service_sqlite
+- UserRepository: auth_service_firestore_async, auth_service_sqlite
+
+*_firestore_async 모듈은 계약을 코루틴(async def)으로 구현하며,
+요청 경로에서는 storage 모듈이 엔진에 맞는 비동기 구현을 제공.
+"""
+from typing import Any, Dict, List, Optional, Protocol
+
+from ..schemas import ToDoItemBatchUpdate, ToDoItemMove, ToDoItemUpdate, ToDoListUpdate
+
+
+class TodoRepository(Protocol):
+    """할 일(프로젝트/아이템) 저장소 계약. 소유권이 없거나 대상이 없으면 None/False 반환."""
+
+    def create_todo_list_with_ai_items(self, user: Any, keyword: str, list_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        AI 생성 아이템과 함께 프로젝트 저장.
+
+        list_id가 주어지면 그 ID로 만들고, 이미 있으면(같은 작업의 재실행) 새로 생성하지 않고 반환.
+        """
+
+    def create_todo_list(self, user: Any, keyword: str) -> Dict[str, Any]:
+        """빈 프로젝트 생성 (스트리밍 생성에서 아이템보다 먼저 저장)."""
+
+    def add_generated_item(self, user: Any, list_id: str, description: str, position: Dict[str, Any],
+                           parent: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        스트리밍 생성 중 완성된 아이템 하나를 position(rank/order)에 저장.
+
+        create_todo_list로 방금 만든 프로젝트에만 사용하므로 소유권/형제 조회를 생략.
+        parent는 같은 스트림에서 이전에 반환된 부모 아이템.
+        """
+
+    def create_subtasks_for_item(self, user: Any, parent_item_id: str,
+                                 request_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        하위 작업 AI 생성.
+
+        request_id가 주어지면 하위 작업 ID를 request_item_id로 파생하고, 이미 저장되어 있으면
+        (같은 작업의 재실행) 다시 생성하지 않고 부모 아이템을 반환.
+        """
+
+    def create_todo_item(self, user: Any, list_id: str, description: str, priority: str = "none",
+                         due_date: Optional[str] = None, parent_id: Optional[str] = None) -> Optional[Dict[str, Any]]: ...
+
+    def create_todo_item_from_parsed_data(self, user: Any, list_id: str,
+                                          parsed_data: Dict[str, Any]) -> Optional[Dict[str, Any]]: ...
+
+    def create_todo_items_from_parsed_data(self, user: Any, list_id: str,
+                                           parsed_items: List[Dict[str, Any]]) -> Optional[List[Dict[str, Any]]]:
+        """
+        자연어 파싱 데이터 여러 개를 프로젝트 루트 맨 뒤에 입력 순서대로 추가 (일괄 가져오기).
+
+        소유권 확인과 마지막 형제 조회는 한 번만 하고 모든 아이템을 한 번의 일괄 쓰기로 저장.
+        """
+
+    def get_todo_lists_by_user(self, user: Any) -> List[Dict[str, Any]]: ...
+
+    def get_todo_list_by_id(self, list_id: str, user: Any) -> Optional[Dict[str, Any]]: ...
+
+    def get_todo_item_by_id(self, item_id: str) -> Optional[Dict[str, Any]]: ...
+
+    def update_todo_list(self, list_id: str, user: Any, list_update: ToDoListUpdate) -> Optional[Dict[str, Any]]: ...
+
+    def update_todo_item(self, item_id: str, user: Any, item_update: ToDoItemUpdate) -> Optional[Dict[str, Any]]: ...
+
+    def batch_update_todo_items(self, user: Any, updates: List[ToDoItemBatchUpdate]) -> List[Dict[str, Any]]: ...
+
+    def move_todo_item(self, item_id: str, user: Any, move: ToDoItemMove) -> Optional[Dict[str, Any]]: ...
+
+    def delete_todo_item(self, item_id: str, user: Any) -> bool: ...
+
+    def delete_todo_list(self, list_id: str, user: Any) -> bool: ...
+
+
+class UserRepository(Protocol):
+    """사용자 저장소 계약 (비밀번호/JWT 처리는 security 모듈 공용)."""
+
+    def get_user_by_username(self, username: str) -> Optional[Dict[str, Any]]: ...
+
+    def create_user(self, username: str, email: str, hashed_password: str) -> Optional[Dict[str, Any]]:
+        """username이 이미 사용 중이면 None (확인과 생성이 원자적)."""
+        ...
+
+    def update_password_hash(self, user: Dict[str, Any], hashed_password: str) -> None:
+        """로그인 시 더 강한 설정으로 다시 만든 해시 저장."""
+        ...
+
+    def delete_user(self, user_id: str) -> bool: ...
+
+    def get_current_user(self, token: str) -> Any: ...
@@ -0,0 +1,225 @@
+"""
+보안 유틸리티 모듈
+
+저장 엔진(Firestore/SQLite)과 무관한 인증 공용 로직을 담당.
+
+주요 기능:
+- 비밀번호 해싱 및 검증 (pbkdf2_sha256, bcrypt)
+- JWT 액세스 토큰 생성 및 검증
+- 인증된 사용자 객체(UserObject)
+- 인증 주체 캐시(principal_cache): 토큰 → UserObject
+
+환경 변수:
+- PRINCIPAL_CACHE_MAX_ENTRIES: 캐시할 최대 토큰 수 (기본값: 10000, 0이면 비활성화)
+- PRINCIPAL_CACHE_TTL_SECONDS: 항목 유효 시간 상한 (기본값: 300초, 토큰 만료가 더 이르면 그 시각까지)
+"""
+import hashlib
+import os
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional
+
+from cachetools import TLRUCache
+from jose import jwt, JWTError
+
+from fastapi import HTTPException, status
+from fastapi.security import OAuth2PasswordBearer
+
+from .password_hashing import PASSWORD_HASH_ROUNDS, crypt_context
+
+# ==================== JWT 설정 ====================
+SECRET_KEY = os.getenv("SECRET_KEY", "a_default_secret_key_for_testing")
+ALGORITHM = "HS256"
+ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24 * 7  # 7일 유효
+
+# 비밀번호 해싱 컨텍스트 (pbkdf2_sha256 우선, bcrypt 호환)
+# 요청 경로에서는 password_hashing.password_hasher(프로세스 풀)를 사용
+pwd_context = crypt_context(PASSWORD_HASH_ROUNDS)
+
+# OAuth2 토큰 URL 설정
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
+
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """
+    평문 비밀번호와 해시 비밀번호 일치 여부 확인.
+    
+    Args:
+        plain_password: 사용자 입력 평문 비밀번호
+        hashed_password: DB에 저장된 해시 비밀번호
+    
+    Returns:
+        일치 시 True, 불일치 시 False
+    """
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+def get_password_hash(password: str) -> str:
+    """
+    평문 비밀번호를 해시로 변환.
+    
+    Args:
+        password: 해싱할 평문 비밀번호
+    
+    Returns:
+        해시된 비밀번호 문자열
+    """
+    return pwd_context.hash(password)
+
+
+def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
+    """
+    JWT 액세스 토큰 생성.
+    
+    Args:
+        data: 토큰에 포함할 데이터 (예: {"sub": username})
+        expires_delta: 토큰 만료 시간 (기본값: 7일)
+    
+    Returns:
+        인코딩된 JWT 토큰 문자열
+    """
+    to_encode = data.copy()
+    if expires_delta:
+        expire = datetime.utcnow() + expires_delta
+    else:
+        expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    to_encode.update({"exp": expire})
+    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    return encoded_jwt
+
+
+def credentials_exception() -> HTTPException:
+    """인증 실패 시 사용하는 401 예외 생성."""
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def decode_access_token(token: str) -> str:
+    """
+    JWT 액세스 토큰 검증 후 username(sub) 추출.
+
+    Raises:
+        HTTPException(401): 토큰이 유효하지 않거나 sub가 없는 경우
+    """
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        raise credentials_exception()
+    username: str = payload.get("sub")
+    if username is None:
+        raise credentials_exception()
+    return username
+
+
+@dataclass(frozen=True, slots=True)
+class UserObject:
+    """
+    인증된 사용자 (읽기 전용).
+
+    principal_cache를 통해 여러 요청이 같은 인스턴스를 공유하므로 불변으로 유지.
+    """
+
+    id: str
+    username: str
+    email: Optional[str]
+    hashed_password: str
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "UserObject":
+        """저장소의 사용자 문서(dict)로부터 생성."""
+        return cls(
+            id=data['id'],
+            username=data['username'],
+            email=data.get('email'),
+            hashed_password=data['hashed_password'],
+            created_at=data.get('created_at'),
+            updated_at=data.get('updated_at'),
+        )
+
+
+PRINCIPAL_CACHE_MAX_ENTRIES = int(os.getenv("PRINCIPAL_CACHE_MAX_ENTRIES", "10000"))
+PRINCIPAL_CACHE_TTL_SECONDS = float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "300"))
+
+
+class PrincipalCache:
+    """
+    토큰 → UserObject 캐시.
+
+    - 키는 토큰 원문이 아닌 SHA-256 다이제스트
+    - 항목은 토큰 만료 시각(exp)과 ttl 중 이른 시각에 만료되며, 최대 개수를 넘으면 LRU로 제거
+    - 계정 삭제 시 invalidate(user_id 또는 username)로 해당 사용자의 모든 토큰 항목 제거
+
+    적중 시 JWT 검증과 저장소 조회를 모두 생략하므로, 캐시에 넣는 토큰은
+    반드시 decode_access_token()으로 검증을 마친 것이어야 함.
+
+    Args:
+        max_entries: 최대 항목 수
+        ttl: 항목 유효 시간 상한 (초)
+        timer: 현재 시각 함수 (epoch 초, 토큰 exp와 비교하므로 time.time 기준)
+    """
+
+    def __init__(self, max_entries: int = PRINCIPAL_CACHE_MAX_ENTRIES, ttl: float = PRINCIPAL_CACHE_TTL_SECONDS,
+                 timer: Callable[[], float] = time.time):
+        self.enabled = max_entries > 0
+        self.ttl = ttl
+        self._entries = TLRUCache(maxsize=max(max_entries, 1), ttu=self._expires_at, timer=timer)
+        self._lock = threading.Lock()
+
+    def _expires_at(self, key: bytes, value: tuple, now: float) -> float:
+        _, token_expires_at = value
+        return min(token_expires_at, now + self.ttl)
+
+    @staticmethod
+    def _digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def get(self, token: str) -> Optional[UserObject]:
+        """캐시된 사용자 (없거나 만료되면 None)."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(self._digest(token))
+        return entry[0] if entry is not None else None
+
+    def put(self, token: str, user: UserObject) -> None:
+        """검증된 토큰의 사용자 저장 (exp가 없는 토큰은 저장하지 않음)."""
+        if not self.enabled:
+            return
+        token_expires_at = jwt.get_unverified_claims(token).get("exp")
+        if token_expires_at is None:
+            return
+        with self._lock:
+            self._entries[self._digest(token)] = (user, float(token_expires_at))
+
+    def invalidate(self, *user_keys: Optional[str]) -> None:
+        """user_id 또는 username이 일치하는 사용자의 모든 항목 제거 (계정 삭제는 드물어 전체 순회)."""
+        user_keys = {key for key in user_keys if key}
+        if not user_keys:
+            return
+        with self._lock:
+            self._entries.expire()
+            stale = [
+                digest for digest, (user, _) in self._entries.items()
+                if user.id in user_keys or user.username in user_keys
+            ]
+            for digest in stale:
+                self._entries.pop(digest, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+# 프로세스 전역 인증 주체 캐시
+principal_cache = PrincipalCache()
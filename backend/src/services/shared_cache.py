@@ -0,0 +1,236 @@
+"""
+공유 캐시 모듈 (Redis)
+
+여러 uvicorn 워커/인스턴스가 함께 쓰는 2차 캐시. 프로세스 내 캐시(tree_cache)에서
+놓친 프로젝트 트리와 사용자 문서를 Firestore보다 먼저 Redis에서 찾음.
+
+- 값은 msgpack으로 직렬화 (datetime은 ISO 문자열 확장 타입으로 보존)
+- 키마다 무효화 세대(generation) 키를 두고, 값에 저장 당시 세대를 함께 기록.
+  조회 시 두 키를 한 번에(MGET) 읽어 세대가 다르면 미스로 처리하므로
+  변경 전에 시작된 조회가 오래된 값을 다시 채워도 읽히지 않음
+- 무효화는 세대 증가 + 값 삭제 후 pub/sub 채널로 브로드캐스트하여
+  모든 워커가 프로세스 내 캐시 항목을 함께 제거
+
+Redis는 캐시일 뿐이므로 연결 오류는 로그만 남기고 미스로 처리.
+
+환경 변수:
+- REDIS_URL: Redis 주소 (없으면 공유 캐시 비활성화)
+- SHARED_CACHE_TTL_SECONDS: 항목 유효 시간 (기본값: 300초)
+"""
+import asyncio
+import logging
+import os
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+import msgpack
+from redis import asyncio as redis_asyncio
+from redis.exceptions import RedisError
+
+from ..instrumentation import Counter, register_metric
+from .security import principal_cache
+from .tree_cache import tree_cache
+
+logger = logging.getLogger(__name__)
+
+REDIS_URL = os.getenv("REDIS_URL")
+SHARED_CACHE_TTL_SECONDS = int(os.getenv("SHARED_CACHE_TTL_SECONDS", "300"))
+
+KEY_PREFIX = "taskgenie"
+INVALIDATION_CHANNEL = f"{KEY_PREFIX}:invalidate"
+
+# msgpack 확장 타입 코드
+_DATETIME_EXT = 1
+
+
+def _encode_extra(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return msgpack.ExtType(_DATETIME_EXT, value.isoformat().encode("utf-8"))
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def _decode_extra(code: int, data: bytes) -> Any:
+    if code == _DATETIME_EXT:
+        return datetime.fromisoformat(data.decode("utf-8"))
+    return msgpack.ExtType(code, data)
+
+
+def pack(value: Any) -> bytes:
+    """캐시 값 직렬화 (msgpack)."""
+    return msgpack.packb(value, default=_encode_extra, use_bin_type=True)
+
+
+def unpack(data: bytes) -> Any:
+    """캐시 값 역직렬화."""
+    return msgpack.unpackb(data, ext_hook=_decode_extra, raw=False)
+
+
+class SharedCache:
+    """
+    Redis 기반 공유 캐시.
+
+    kind는 값의 종류("tree": 프로젝트 트리, "user": 사용자 문서,
+    "principal": 인증 주체 - 무효화 전파만 사용)로 키 공간과 무효화 메시지를 구분하는 데 사용.
+
+    Args:
+        client: redis.asyncio 클라이언트 (None이면 비활성화)
+        ttl: 항목 유효 시간 (초)
+        local_caches: kind → 프로세스 내 캐시 (invalidate(*keys), clear()를 제공)
+    """
+
+    def __init__(self, client=None, ttl: int = SHARED_CACHE_TTL_SECONDS,
+                 local_caches: Optional[Dict[str, Any]] = None):
+        self.client = client
+        self.ttl = ttl
+        self.local_caches = local_caches or {}
+        self.instance_id = uuid.uuid4().hex
+        self._listener: Optional[asyncio.Task] = None
+        self._owns_client = False
+
+    @property
+    def enabled(self) -> bool:
+        return self.client is not None
+
+    def _key(self, kind: str, key: str) -> str:
+        return f"{KEY_PREFIX}:{kind}:{key}"
+
+    def _generation_key(self, kind: str, key: str) -> str:
+        return f"{KEY_PREFIX}:{kind}-gen:{key}"
+
+    async def get(self, kind: str, key: str) -> Tuple[Optional[Any], int]:
+        """
+        캐시된 값과 현재 무효화 세대 조회.
+
+        Returns:
+            (값 또는 None, 세대) - 미스일 때 받은 세대를 put()에 넘김
+        """
+        if not self.enabled:
+            return None, 0
+        try:
+            data, generation = await self.client.mget(self._key(kind, key), self._generation_key(kind, key))
+        except (RedisError, OSError) as e:
+            logger.warning(f"Shared cache get failed ({kind}:{key}): {e}")
+            SHARED_CACHE_ERRORS.inc(1, "get")
+            return None, -1
+        generation = int(generation or 0)
+        if data is not None:
+            entry = unpack(data)
+            if entry["generation"] == generation:
+                SHARED_CACHE_HITS.inc(1, kind)
+                return entry["value"], generation
+        SHARED_CACHE_MISSES.inc(1, kind)
+        return None, generation
+
+    async def put(self, kind: str, key: str, value: Any, generation: int) -> None:
+        """get() 미스 시 받은 세대와 함께 값 저장 (세대가 -1이면 조회 실패였으므로 저장하지 않음)."""
+        if not self.enabled or generation < 0:
+            return
+        try:
+            await self.client.set(self._key(kind, key), pack({"generation": generation, "value": value}), ex=self.ttl)
+        except (RedisError, OSError) as e:
+            logger.warning(f"Shared cache put failed ({kind}:{key}): {e}")
+            SHARED_CACHE_ERRORS.inc(1, "put")
+
+    async def invalidate(self, kind: str, *keys: Optional[str]) -> None:
+        """
+        프로세스 내 캐시와 Redis 항목을 무효화하고 다른 워커에 알림.
+
+        세대 키는 값보다 오래 유지하여(TTL 2배) 세대가 초기화되며
+        오래된 값이 다시 유효해지는 일을 막음.
+        """
+        keys = [key for key in keys if key]
+        if not keys:
+            return
+        if kind in self.local_caches:
+            self.local_caches[kind].invalidate(*keys)
+        if not self.enabled:
+            return
+        try:
+            async with self.client.pipeline(transaction=True) as pipe:
+                for key in keys:
+                    pipe.incr(self._generation_key(kind, key))
+                    pipe.expire(self._generation_key(kind, key), self.ttl * 2)
+                    pipe.delete(self._key(kind, key))
+                pipe.publish(INVALIDATION_CHANNEL, pack({"origin": self.instance_id, "kind": kind, "keys": keys}))
+                await pipe.execute()
+        except (RedisError, OSError) as e:
+            # 다른 워커의 캐시는 TTL이 지날 때까지 오래된 값을 볼 수 있음
+            logger.warning(f"Shared cache invalidation failed ({kind}:{keys}): {e}")
+            SHARED_CACHE_ERRORS.inc(1, "invalidate")
+
+    def handle_message(self, data: bytes) -> None:
+        """다른 워커가 보낸 무효화 메시지를 프로세스 내 캐시에 반영."""
+        message = unpack(data)
+        if message.get("origin") == self.instance_id:
+            return
+        local_cache = self.local_caches.get(message.get("kind"))
+        if local_cache is not None:
+            local_cache.invalidate(*message.get("keys", []))
+
+    async def listen(self) -> None:
+        """무효화 채널 구독 (연결이 끊기면 프로세스 내 캐시를 비우고 재연결)."""
+        while True:
+            pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                async for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        self.handle_message(message["data"])
+            except (RedisError, OSError) as e:
+                logger.warning(f"Shared cache invalidation channel lost: {e}")
+                # 끊긴 동안 놓친 무효화가 있을 수 있으므로 프로세스 내 캐시를 모두 버림
+                for local_cache in self.local_caches.values():
+                    local_cache.clear()
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.aclose()
+
+    async def start(self) -> None:
+        """
+        앱 시작 시 호출. REDIS_URL이 있으면 클라이언트를 만들고 무효화 채널 구독 시작.
+        """
+        if self.client is None and REDIS_URL:
+            self.client = redis_asyncio.from_url(REDIS_URL)
+            self._owns_client = True
+        if self.enabled and self._listener is None:
+            self._listener = asyncio.create_task(self.listen())
+
+    async def stop(self) -> None:
+        """앱 종료 시 호출. 구독 중지 및 연결 종료."""
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        if self._owns_client:
+            await self.client.aclose()
+            self.client = None
+            self._owns_client = False
+
+
+SHARED_CACHE_HITS = register_metric(Counter("shared_cache_hits_total", "Redis cache hits.", ["kind"]))
+SHARED_CACHE_MISSES = register_metric(Counter("shared_cache_misses_total", "Redis cache misses.", ["kind"]))
+SHARED_CACHE_ERRORS = register_metric(
+    Counter("shared_cache_errors_total", "Redis cache operations that failed.", ["operation"])
+)
+
+# 프로세스 전역 공유 캐시 인스턴스
+# "principal"(user_id 키) 무효화는 계정 삭제 시 각 워커의 인증 주체 캐시 항목을 제거
+shared_cache = SharedCache(local_caches={"tree": tree_cache, "principal": principal_cache})
+
+
+async def invalidate_trees(*list_ids: Optional[str]) -> None:
+    """프로젝트 트리 캐시 무효화 (프로세스 내 캐시 + Redis + 다른 워커)."""
+    await shared_cache.invalidate("tree", *list_ids)
+
+
+def set_shared_cache_client(client) -> None:
+    """
+    공유 캐시 Redis 클라이언트 주입.
+
+    테스트에서 인메모리 Redis를 주입하거나 None으로 비활성화할 때 사용.
+    """
+    shared_cache.client = client
@@ -0,0 +1,93 @@
+"""
+동시 요청 합치기(single-flight) 모듈
+
+같은 키의 작업이 이미 진행 중이면 새로 시작하지 않고 진행 중인 작업의 결과를 함께 기다림.
+더블 클릭이나 마감 시간 초과 후 재시도처럼 같은 요청이 겹쳐 들어올 때
+Gemini 호출과 저장이 중복되지 않도록 사용.
+
+- 결과와 예외는 모든 대기자에게 같게 전달 (폴백 처리는 각 호출 쪽에서)
+- 먼저 요청한 쪽이 취소돼도(연결 종료 등) 작업은 계속되어 나머지 대기자에게 결과를 전달
+- 나중에 합류한 대기자는 결과의 복사본을 받음 (호출 쪽에서 결과를 수정해도 서로 영향 없음)
+- 작업이 끝나면 바로 등록이 지워지므로 끝난 뒤의 요청은 새로 실행 (결과 재사용은 ai_cache의 역할)
+- 프로세스 단위 (여러 워커/인스턴스 사이의 중복은 합치지 않음)
+
+합류한 요청 수는 /metrics의 coalesced_requests_total{operation}으로 확인.
+"""
+import asyncio
+import copy
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from ..instrumentation import Counter, register_metric
+
+
+class SingleFlight:
+    """키별 진행 중 작업 등록부."""
+
+    def __init__(self):
+        self._in_flight: Dict[Hashable, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._in_flight)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._in_flight
+
+    async def run(self, key: Hashable, call: Callable[[], Awaitable[Any]], operation: str) -> Any:
+        """
+        key의 작업이 진행 중이면 그 결과를, 아니면 call()을 시작하여 그 결과를 반환.
+
+        Args:
+            key: 같은 요청을 식별하는 키 (정규화된 입력 등)
+            call: 작업을 시작하는 코루틴 함수
+            operation: 계측용 작업 이름
+        """
+        future = self.joinable(key, operation)
+        if future is not None:
+            return await self.wait(future)
+        future = asyncio.ensure_future(call())
+        self._register(key, future)
+        return await asyncio.shield(future)
+
+    def joinable(self, key: Hashable, operation: str) -> Optional[asyncio.Future]:
+        """진행 중인 key의 작업 (있으면 합류한 요청으로 집계), 없으면 None."""
+        future = self._in_flight.get(key)
+        if future is not None:
+            COALESCED_REQUESTS.inc(1, operation)
+        return future
+
+    @staticmethod
+    async def wait(future: asyncio.Future) -> Any:
+        """
+        합류한 작업의 결과 복사본 (이 대기자가 취소돼도 작업은 계속됨).
+
+        Raises:
+            작업의 예외
+        """
+        return copy.deepcopy(await asyncio.shield(future))
+
+    def lead(self, key: Hashable) -> asyncio.Future:
+        """
+        결과를 직접 채울 작업 등록 (스트리밍처럼 코루틴 하나로 감쌀 수 없는 경우).
+
+        반환된 Future에 set_result/set_exception을 호출하면 대기자에게 전달되고 등록이 지워짐.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._register(key, future)
+        return future
+
+    def _register(self, key: Hashable, future: asyncio.Future) -> None:
+        self._in_flight[key] = future
+
+        def done(finished: asyncio.Future) -> None:
+            if self._in_flight.get(key) is finished:
+                del self._in_flight[key]
+            if not finished.cancelled():
+                finished.exception()  # 대기자가 모두 떠나도 "exception was never retrieved" 경고가 나지 않도록
+
+        future.add_done_callback(done)
+
+
+COALESCED_REQUESTS = register_metric(
+    Counter("coalesced_requests_total", "Requests that joined an identical in-flight request instead of starting one.",
+            ["operation"])
+)
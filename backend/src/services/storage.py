@@ -0,0 +1,107 @@
+"""
+저장 엔진 선택 모듈
+
+환경 변수에 따라 Firestore 또는 SQLite 서비스 구현을 선택하여 제공.
+
+환경 변수:
+- STORAGE_ENGINE: 'firestore' | 'sqlite'
+  (미설정 시 기존 USE_FIRESTORE=true면 firestore, 아니면 sqlite)
+
+라우터는 이 모듈의 todo_service / auth_service / get_current_user를 사용하므로
+엔진별 분기 없이 동일한 코드로 동작. 라우터는 async def이므로 서비스 함수는 모두 await로 호출:
+- firestore: AsyncClient 기반 *_firestore_async 모듈 (스레드풀 미사용)
+- sqlite: 동기 모듈의 함수를 스레드풀에서 실행하는 어댑터
+"""
+import os
+from types import ModuleType
+from typing import Any, Dict
+
+from fastapi import Depends
+from starlette.concurrency import run_in_threadpool
+
+from .security import oauth2_scheme, principal_cache
+
+_default_engine = "firestore" if os.getenv("USE_FIRESTORE", "false").lower() == "true" else "sqlite"
+STORAGE_ENGINE = os.getenv("STORAGE_ENGINE", _default_engine).lower()
+
+
+class _ThreadpoolService:
+    """동기 서비스 모듈의 함수를 스레드풀에서 실행하는 코루틴으로 감싸는 어댑터 (SQLite 엔진용)."""
+
+    def __init__(self, module: ModuleType):
+        self._module = module
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._module, name)
+        if not callable(attr):
+            return attr
+
+        async def call(*args, **kwargs):
+            return await run_in_threadpool(attr, *args, **kwargs)
+
+        return call
+
+
+_threadpool_services: Dict[str, _ThreadpoolService] = {}
+
+
+def _threadpool_service(module: ModuleType) -> _ThreadpoolService:
+    if module.__name__ not in _threadpool_services:
+        _threadpool_services[module.__name__] = _ThreadpoolService(module)
+    return _threadpool_services[module.__name__]
+
+
+def get_todo_service() -> Any:
+    """현재 엔진의 비동기 할 일 서비스 (repository.TodoRepository 계약, 코루틴)."""
+    if STORAGE_ENGINE == "sqlite":
+        from . import todo_service_sqlite
+        return _threadpool_service(todo_service_sqlite)
+    from . import todo_service_firestore_async
+    return todo_service_firestore_async
+
+
+def get_auth_service() -> Any:
+    """현재 엔진의 비동기 인증 서비스 (repository.UserRepository 계약, 코루틴)."""
+    if STORAGE_ENGINE == "sqlite":
+        from . import auth_service_sqlite
+        return _threadpool_service(auth_service_sqlite)
+    from . import auth_service_firestore_async
+    return auth_service_firestore_async
+
+
+class _ServiceProxy:
+    """속성 접근 시점에 현재 엔진의 서비스로 위임하는 프록시."""
+
+    def __init__(self, resolver):
+        self._resolver = resolver
+
+    def __getattr__(self, name: str):
+        return getattr(self._resolver(), name)
+
+
+todo_service = _ServiceProxy(get_todo_service)
+auth_service = _ServiceProxy(get_auth_service)
+
+
+async def get_current_user(token: str = Depends(oauth2_scheme)):
+    """
+    JWT 토큰에서 현재 사용자 가져오기 (FastAPI Dependency, 엔진 공통)
+
+    같은 토큰의 반복 요청은 principal_cache에서 바로 반환하여
+    JWT 검증과 사용자 조회를 생략.
+    """
+    user = principal_cache.get(token)
+    if user is None:
+        user = await get_auth_service().get_current_user(token)
+        principal_cache.put(token, user)
+    return user
+
+
+def init_storage() -> None:
+    """현재 엔진의 연결/스키마 초기화 (앱 시작 시 1회)."""
+    if STORAGE_ENGINE == "sqlite":
+        from ..database import init_db
+        init_db()
+    else:
+        from ..firestore_db import initialize_firestore
+        initialize_firestore()
@@ -0,0 +1,756 @@
+"""
+할 일 서비스 모듈 (Firestore, 비동기)
+
+할 일 저장소 계약(repository.TodoRepository)의 Firestore 구현 (모든 함수가 코루틴).
+
+Firestore AsyncClient를 사용하므로 요청 처리 중 스레드풀 슬롯을 점유하지 않으며,
+서로 독립적인 조회(프로젝트 소유권 확인, 형제 조회, 서브트리 조회 등)는
+asyncio.gather로 동시에 실행하여 왕복 대기 시간을 줄임.
+
+AI 생성(Gemini)은 ai_client를 통해 비동기로 호출 (동시 호출 수 제한/마감 시간 적용).
+
+프로젝트 트리는 tree_cache(프로세스 내)와 shared_cache(Redis, 설정 시)에 캐시하며,
+모든 변경 작업은 쓰기 완료 후 해당 프로젝트의 캐시 항목을 무효화(새 프로젝트 생성 시에는 바로 저장).
+"""
+from typing import List, Dict, Any, Optional, Tuple
+import asyncio
+import uuid
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from google.cloud import firestore
+
+from ..firestore_db import get_async_firestore_db
+from ..schemas import ToDoItemUpdate, ToDoListUpdate, ToDoItemBatchUpdate, ToDoItemMove
+from ..services.rank import RANK_MAX_LENGTH, rank_after, rank_between, rank_sequence
+from ..services.todo_tree import build_item_tree, item_rank, positions_for_orders, request_item_id
+from ..services.shared_cache import invalidate_trees, shared_cache
+from ..services.tree_cache import tree_cache
+from ..services.ai_service import generate_todo_items_from_keyword, generate_sub_tasks_from_main_task
+from .firestore_common import BATCH_WRITE_LIMIT, LEGACY_ITEM_FALLBACK, child_ancestor_ids
+
+KST = ZoneInfo("Asia/Seoul")
+
+
+def _snapshot_to_dict(doc) -> Dict[str, Any]:
+    data = doc.to_dict()
+    data['id'] = doc.id
+    return data
+
+
+async def _get_owned_list(db: firestore.AsyncClient, list_id: str, user: Any) -> Optional[Dict[str, Any]]:
+    """사용자 소유의 프로젝트 조회 (없거나 다른 사용자의 프로젝트면 None)."""
+    doc = await db.collection('todo_lists').document(list_id).get()
+    if not doc.exists or doc.to_dict().get('user_id') != user.id:
+        return None
+    return _snapshot_to_dict(doc)
+
+
+async def _get_item(db: firestore.AsyncClient, item_id: str) -> Optional[Dict[str, Any]]:
+    doc = await db.collection('todo_items').document(item_id).get()
+    return _snapshot_to_dict(doc) if doc.exists else None
+
+
+async def _query_items(query) -> List[Dict[str, Any]]:
+    return [_snapshot_to_dict(doc) async for doc in query.stream()]
+
+
+async def _fetch_list_items(db: firestore.AsyncClient, list_id: str) -> List[Dict[str, Any]]:
+    """특정 프로젝트의 모든 아이템 조회 (플랫 구조)."""
+    return await _query_items(db.collection('todo_items').where('todo_list_id', '==', list_id))
+
+
+async def _fetch_subtree_items(db: firestore.AsyncClient, item_id: str) -> List[Dict[str, Any]]:
+    """특정 아이템의 모든 자손 아이템을 단일 쿼리로 조회 (플랫 구조)."""
+    return await _query_items(db.collection('todo_items').where('ancestor_ids', 'array_contains', item_id))
+
+
+async def _collect_descendant_ids(db: firestore.AsyncClient, item_id: str, item_data: Dict[str, Any]) -> List[str]:
+    """
+    특정 아이템의 모든 자손 아이템 ID 수집.
+
+    ancestor_ids가 있으면 단일 쿼리로, 백필 이전 문서는 parent_id BFS로 조회.
+    BFS는 같은 깊이의 자식 조회를 동시에 실행.
+    """
+    if 'ancestor_ids' in item_data:
+        return [descendant['id'] for descendant in await _fetch_subtree_items(db, item_id)]
+
+    descendant_ids = []
+    level = [item_id]
+    while level:
+        children = await asyncio.gather(*(
+            _query_items(db.collection('todo_items').where('parent_id', '==', parent_id)) for parent_id in level
+        ))
+        level = [child['id'] for group in children for child in group]
+        descendant_ids.extend(level)
+    return descendant_ids
+
+
+async def _last_sibling(db: firestore.AsyncClient, list_id: str, parent_id: Optional[str]) -> Optional[Dict[str, Any]]:
+    """
+    같은 부모 아래에서 정렬 키가 가장 큰 형제 아이템 조회.
+
+    rank 내림차순 limit(1) 쿼리와 (레거시 폴백 시) order 기준 쿼리를 동시에 실행.
+    """
+    siblings = db.collection('todo_items').where('todo_list_id', '==', list_id).where('parent_id', '==', parent_id)
+    queries = [siblings.order_by('rank', direction=firestore.Query.DESCENDING).limit(1)]
+    if LEGACY_ITEM_FALLBACK:
+        queries.append(siblings.order_by('order', direction=firestore.Query.DESCENDING).limit(1))
+    results = await asyncio.gather(*(_query_items(query) for query in queries))
+    candidates = [item for result in results for item in result]
+    return max(candidates, key=item_rank, default=None)
+
+
+async def _next_position(db: firestore.AsyncClient, list_id: str, parent_id: Optional[str]) -> Dict[str, Any]:
+    """맨 뒤에 추가될 아이템의 rank/order 계산."""
+    last = await _last_sibling(db, list_id, parent_id)
+    if last is None:
+        return {"rank": rank_between(None, None), "order": 0}
+    return {"rank": rank_after(item_rank(last)), "order": (last.get('order') or 0) + 1}
+
+
+async def _commit_in_batches(db: firestore.AsyncClient, writes: List[tuple], operation: str = 'update') -> None:
+    """(문서 참조, 데이터) 목록을 최대 500개 단위 batch로 적용 (operation: 'update' | 'set')."""
+    for start in range(0, len(writes), BATCH_WRITE_LIMIT):
+        batch = db.batch()
+        for doc_ref, data in writes[start:start + BATCH_WRITE_LIMIT]:
+            getattr(batch, operation)(doc_ref, data)
+        await batch.commit()
+
+
+async def _rebalance_siblings(db: firestore.AsyncClient, list_id: str, parent_id: Optional[str],
+                              moved_item: Dict[str, Any], after_id: Optional[str],
+                              before_id: Optional[str]) -> Tuple[str, List[tuple]]:
+    """
+    형제 아이템 정렬 키 재배치.
+
+    키가 너무 길어졌거나 순서가 어긋난 경우에만 호출되며, 이동 중인 아이템을
+    지정 위치에 둔 채 모든 형제에 균등 간격의 키를 다시 부여.
+
+    Returns:
+        (이동 아이템에 부여할 새 rank, 다른 형제의 (문서 참조, 데이터) 쓰기 목록).
+        쓰기는 호출 측이 이동 아이템 쓰기와 함께 적용
+    """
+    query = db.collection('todo_items').where('todo_list_id', '==', list_id).where('parent_id', '==', parent_id)
+    siblings = [sibling for sibling in await _query_items(query) if sibling['id'] != moved_item['id']]
+    siblings.sort(key=item_rank)
+
+    sibling_ids = [sibling['id'] for sibling in siblings]
+    if after_id in sibling_ids:
+        index = sibling_ids.index(after_id) + 1
+    elif before_id in sibling_ids:
+        index = sibling_ids.index(before_id)
+    else:
+        index = 0
+    siblings.insert(index, moved_item)
+
+    ranks = rank_sequence(len(siblings))
+    writes = [
+        (db.collection('todo_items').document(sibling['id']), {"rank": rank, "order": order})
+        for order, (sibling, rank) in enumerate(zip(siblings, ranks))
+        if sibling is not moved_item
+    ]
+    return ranks[index], writes
+
+
+async def _order_positions(db: firestore.AsyncClient, items: List[Dict[str, Any]],
+                           orders: Dict[str, int]) -> Dict[str, Dict[str, Any]]:
+    """
+    정수 order 변경을 형제 rank 사이 위치로 변환 (todo_tree.positions_for_orders).
+
+    형제 그룹(프로젝트, 부모)별 조회는 동시에 실행하며, 결과에는 재배치된 다른 형제가 포함될 수 있음.
+    """
+    groups: Dict[tuple, Dict[str, int]] = {}
+    for item in items:
+        if item['id'] in orders:
+            groups.setdefault((item['todo_list_id'], item.get('parent_id')), {})[item['id']] = orders[item['id']]
+
+    async def group_positions(list_id: str, parent_id: Optional[str], group_orders: Dict[str, int]):
+        query = db.collection('todo_items').where('todo_list_id', '==', list_id).where('parent_id', '==', parent_id)
+        return positions_for_orders(await _query_items(query), group_orders)
+
+    results = await asyncio.gather(*(
+        group_positions(list_id, parent_id, group_orders) for (list_id, parent_id), group_orders in groups.items()
+    ))
+    return {item_id: position for result in results for item_id, position in result.items()}
+
+
+def _new_item_document(list_id: str, user_id: str, parent_id: Optional[str], ancestor_ids: List[str],
+                       description: str, position: Dict[str, Any], priority: str = "none",
+                       due_date: Optional[datetime] = None, now: Optional[datetime] = None,
+                       item_id: Optional[str] = None) -> Dict[str, Any]:
+    """새 아이템 문서 생성 (id, 위치, 조상 경로 포함)."""
+    now = now or datetime.utcnow()
+    return {
+        "id": item_id or str(uuid.uuid4()),
+        "todo_list_id": list_id,
+        "user_id": user_id,
+        "parent_id": parent_id,
+        "ancestor_ids": ancestor_ids,
+        "description": description,
+        "is_completed": False,
+        "order": position["order"],
+        "rank": position["rank"],
+        "priority": priority,
+        "due_date": due_date,
+        "reminder_date": None,
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+def _collect_generated_items(items_data: List[Dict[str, Any]], todo_list_id: str, user_id: str,
+                             parent_id: str = None, ancestor_ids: List[str] = None) -> List[Dict[str, Any]]:
+    """AI가 생성한 중첩 아이템을 저장할 문서 목록(플랫 구조)으로 변환."""
+    ancestor_ids = ancestor_ids or []
+    ranks = rank_sequence(len(items_data))
+    documents = []
+    for order, item_data in enumerate(items_data):
+        item_doc = _new_item_document(
+            todo_list_id, user_id, parent_id, ancestor_ids, item_data["description"],
+            {"rank": ranks[order], "order": order},
+        )
+        documents.append(item_doc)
+        if item_data.get("children"):
+            documents += _collect_generated_items(
+                item_data["children"], todo_list_id, user_id, item_doc["id"], ancestor_ids + [item_doc["id"]]
+            )
+    return documents
+
+
+def _parse_due_date(value: Any) -> Optional[datetime]:
+    """ISO 형식 마감일 문자열을 KST 기준 datetime으로 변환 (형식 오류 시 None)."""
+    if not value or not isinstance(value, str):
+        return None
+    try:
+        return datetime.fromisoformat(value).replace(tzinfo=KST)
+    except ValueError:
+        return None
+
+
+async def create_todo_list_with_ai_items(user: Any, keyword: str, list_id: Optional[str] = None) -> Dict[str, Any]:
+    """
+    AI를 사용하여 새로운 Todo 리스트 생성
+
+    생성한 문서로 바로 응답을 구성하므로 저장 후 다시 조회하지 않음.
+    list_id가 주어지고 그 프로젝트가 이미 있으면(같은 백그라운드 작업의 재실행) 기존 프로젝트를 반환.
+    프로젝트 문서를 마지막에 쓰므로 프로젝트가 있으면 아이템도 모두 저장된 상태.
+    """
+    db = get_async_firestore_db()
+    if list_id is not None:
+        if await _get_owned_list(db, list_id, user) is not None:
+            return await get_todo_list_by_id(list_id, user)
+    else:
+        list_id = str(uuid.uuid4())
+    todo_list = {
+        "id": list_id,
+        "user_id": user.id,
+        "keyword": keyword,
+        "color": "#3b82f6",
+        "icon": "📋",
+        "created_at": datetime.utcnow(),
+        "updated_at": datetime.utcnow(),
+    }
+    generated_items_json = await generate_todo_items_from_keyword(keyword, user_id=user.id)
+    item_docs = _collect_generated_items(generated_items_json, list_id, user.id, None)
+    writes = [(db.collection('todo_items').document(item["id"]), item) for item in item_docs]
+    writes.append((db.collection('todo_lists').document(list_id), todo_list))
+    await _commit_in_batches(db, writes, operation='set')
+    list_data = {**todo_list, "items": build_item_tree([dict(item) for item in item_docs])}
+    tree_cache.put(list_id, list_data)
+    await shared_cache.put("tree", list_id, list_data, generation=0)
+    return dict(list_data)
+
+
+async def create_todo_list(user: Any, keyword: str) -> Dict[str, Any]:
+    """
+    빈 프로젝트 생성 (스트리밍 생성용, 아이템은 add_generated_item으로 추가)
+    """
+    db = get_async_firestore_db()
+    todo_list = {
+        "id": str(uuid.uuid4()),
+        "user_id": user.id,
+        "keyword": keyword,
+        "color": "#3b82f6",
+        "icon": "📋",
+        "created_at": datetime.utcnow(),
+        "updated_at": datetime.utcnow(),
+    }
+    await db.collection('todo_lists').document(todo_list["id"]).set(todo_list)
+    return {**todo_list, "items": []}
+
+
+async def add_generated_item(user: Any, list_id: str, description: str, position: Dict[str, Any],
+                             parent: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    스트리밍 생성 중 완성된 아이템 하나를 지정한 위치에 저장.
+
+    생성 중에 프로젝트를 조회한 요청이 있을 수 있으므로 저장할 때마다 트리 캐시를 무효화.
+    """
+    db = get_async_firestore_db()
+    item_doc = _new_item_document(
+        list_id, user.id, parent["id"] if parent else None, child_ancestor_ids(parent) if parent else [],
+        description, position,
+    )
+    await db.collection('todo_items').document(item_doc["id"]).set(item_doc)
+    await invalidate_trees(list_id)
+    return {**item_doc, "children": []}
+
+
+async def create_subtasks_for_item(user: Any, parent_item_id: str,
+                                   request_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    특정 아이템의 하위 작업 생성
+
+    request_id가 주어지면 하위 작업 ID를 그로부터 파생하고, 이미 저장되어 있으면
+    (같은 백그라운드 작업의 재실행) 다시 생성하지 않음. 하위 작업은 한 batch로 저장.
+    """
+    db = get_async_firestore_db()
+    parent_item = await _get_item(db, parent_item_id)
+    if parent_item is None:
+        return None
+    list_id = parent_item['todo_list_id']
+
+    async def load_context_path() -> List[str]:
+        if 'ancestor_ids' in parent_item:
+            ancestor_refs = [db.collection('todo_items').document(a_id) for a_id in parent_item['ancestor_ids']]
+            ancestors_by_id = {doc.id: doc.to_dict() async for doc in db.get_all(ancestor_refs) if doc.exists}
+            path = [ancestors_by_id[a_id]['description'] for a_id in parent_item['ancestor_ids'] if a_id in ancestors_by_id]
+            return path + [parent_item['description']]
+        path = []
+        current_item = parent_item
+        while current_item:
+            path.insert(0, current_item['description'])
+            current_item = await _get_item(db, current_item['parent_id']) if current_item.get('parent_id') else None
+        return path
+
+    # 소유권 확인, 상위 경로 조회, 마지막 하위 작업 조회는 서로 독립적이므로 동시에 실행
+    todo_list, context_path, position = await asyncio.gather(
+        _get_owned_list(db, list_id, user),
+        load_context_path(),
+        _next_position(db, list_id, parent_item_id),
+    )
+    if todo_list is None:
+        return None
+    if request_id is not None and await _get_item(db, request_item_id(request_id, 0)) is not None:
+        return await get_todo_item_by_id(parent_item_id)
+    sub_task_descriptions = await generate_sub_tasks_from_main_task(
+        main_task_description=parent_item['description'],
+        project_keyword=todo_list['keyword'],
+        context_path=context_path,
+        user_id=user.id,
+    )
+    sub_task_ancestor_ids = child_ancestor_ids(parent_item)
+    writes = []
+    for offset, description in enumerate(sub_task_descriptions):
+        if offset:
+            position = {"rank": rank_after(position["rank"]), "order": position["order"] + 1}
+        sub_task = _new_item_document(list_id, user.id, parent_item_id, sub_task_ancestor_ids, description, position,
+                                      item_id=request_item_id(request_id, offset) if request_id else None)
+        writes.append((db.collection('todo_items').document(sub_task["id"]), sub_task))
+    await _commit_in_batches(db, writes, operation='set')
+    await invalidate_trees(list_id)
+    return await get_todo_item_by_id(parent_item_id)
+
+
+async def get_todo_lists_by_user(user: Any) -> List[Dict[str, Any]]:
+    """
+    사용자의 모든 Todo 리스트 가져오기
+
+    프로젝트 조회와 user_id 기준 전체 아이템 조회를 동시에 실행한 뒤
+    todo_list_id 기준으로 묶어 트리를 구성.
+
+    LEGACY_ITEM_FALLBACK이 켜져 있으면 user_id가 없는 기존 아이템과 새 아이템이 한 프로젝트에
+    섞여 있을 수 있으므로, 프로젝트별 조회(todo_list_id 기준, 기존/새 아이템 모두 포함)를
+    동시에 실행해 id 기준으로 합침.
+    """
+    db = get_async_firestore_db()
+    lists_query = _query_items(db.collection('todo_lists').where('user_id', '==', user.id))
+    if LEGACY_ITEM_FALLBACK:
+        all_lists = await lists_query
+        list_items = await asyncio.gather(*(_fetch_list_items(db, list_data['id']) for list_data in all_lists))
+        all_items = list({item['id']: item for items in list_items for item in items}.values())
+    else:
+        all_lists, all_items = await asyncio.gather(
+            lists_query, _query_items(db.collection('todo_items').where('user_id', '==', user.id)),
+        )
+    items_by_list: Dict[str, List[Dict[str, Any]]] = {}
+    for item_data in all_items:
+        items_by_list.setdefault(item_data['todo_list_id'], []).append(item_data)
+
+    for list_data in all_lists:
+        list_data['items'] = build_item_tree(items_by_list.get(list_data['id'], []))
+    return all_lists
+
+
+async def get_todo_list_by_id(list_id: str, user: Any) -> Optional[Dict[str, Any]]:
+    """
+    특정 Todo 리스트 가져오기
+
+    프로세스 내 캐시 → 공유 캐시(Redis) 순으로 찾고, 모두 없으면 프로젝트 문서와
+    아이템을 동시에 조회하여 트리를 만든 뒤 두 캐시에 저장.
+    """
+    cached = tree_cache.get(list_id)
+    if cached is None:
+        generation = tree_cache.generation(list_id)
+        cached, shared_generation = await shared_cache.get("tree", list_id)
+        if cached is not None:
+            tree_cache.put(list_id, cached, generation)
+    if cached is not None:
+        return dict(cached) if cached.get('user_id') == user.id else None
+
+    db = get_async_firestore_db()
+    list_data, list_items = await asyncio.gather(
+        _get_owned_list(db, list_id, user),
+        _fetch_list_items(db, list_id),
+    )
+    if list_data is None:
+        return None
+    list_data['items'] = build_item_tree(list_items)
+    tree_cache.put(list_id, list_data, generation)
+    await shared_cache.put("tree", list_id, list_data, shared_generation)
+    return dict(list_data)
+
+
+async def get_todo_item_by_id(item_id: str) -> Optional[Dict[str, Any]]:
+    """
+    특정 Todo 아이템과 그 자식들을 가져오기
+
+    아이템 문서와 서브트리(ancestor_ids array_contains) 쿼리를 동시에 실행.
+    """
+    db = get_async_firestore_db()
+    item_data, descendants = await asyncio.gather(_get_item(db, item_id), _fetch_subtree_items(db, item_id))
+    if item_data is None:
+        return None
+    if 'ancestor_ids' in item_data:
+        item_data['children'] = build_item_tree(descendants, root_id=item_id)
+        return item_data
+
+    # ancestor_ids 백필 이전 문서: 프로젝트 전체 트리에서 탐색
+    def find_item_in_tree(items, target_id):
+        for item in items:
+            if item['id'] == target_id:
+                return item
+            found = find_item_in_tree(item['children'], target_id)
+            if found:
+                return found
+        return None
+    found_item = find_item_in_tree(build_item_tree(await _fetch_list_items(db, item_data['todo_list_id'])), item_id)
+    item_data['children'] = found_item['children'] if found_item else []
+    return item_data
+
+
+async def update_todo_list(list_id: str, user: Any, list_update: ToDoListUpdate) -> Optional[Dict[str, Any]]:
+    """
+    Todo 리스트 업데이트
+    """
+    db = get_async_firestore_db()
+    list_data = await _get_owned_list(db, list_id, user)
+    if list_data is None:
+        return None
+    update_data = list_update.model_dump(exclude_unset=True)
+    update_data['updated_at'] = datetime.utcnow()
+    await db.collection('todo_lists').document(list_id).update(update_data)
+    await invalidate_trees(list_id)
+    return await get_todo_list_by_id(list_id, user)
+
+
+async def update_todo_item(item_id: str, user: Any, item_update: ToDoItemUpdate) -> Optional[Dict[str, Any]]:
+    """
+    Todo 아이템 업데이트
+    """
+    db = get_async_firestore_db()
+    item_doc_ref = db.collection('todo_items').document(item_id)
+    item_data = await _get_item(db, item_id)
+    if item_data is None or await _get_owned_list(db, item_data['todo_list_id'], user) is None:
+        return None
+    update_data = item_update.model_dump(exclude_unset=True)
+    positions = {}
+    if update_data.get('order') is not None:
+        # 정수 order로 재정렬하는 클라이언트도 rank 정렬과 일치하도록 형제 rank 사이에 배치
+        positions = await _order_positions(db, [item_data], {item_id: update_data['order']})
+        update_data.update(positions.pop(item_id))
+    update_data['updated_at'] = datetime.utcnow()
+    writes = [(item_doc_ref, update_data)]
+    writes.extend((db.collection('todo_items').document(i_id), position) for i_id, position in positions.items())
+    await _commit_in_batches(db, writes)
+    await invalidate_trees(item_data['todo_list_id'])
+    updated_item = await _get_item(db, item_id)
+    if updated_item is None:
+        return None
+    updated_item['children'] = []  # 자식 데이터는 포함하지 않음
+    return updated_item
+
+
+async def batch_update_todo_items(user: Any, updates: List[ToDoItemBatchUpdate]) -> List[Dict[str, Any]]:
+    """
+    여러 Todo 아이템을 한 번에 부분 업데이트 (드래그 앤 드롭 재정렬 등).
+
+    Returns:
+        요청 순서대로의 항목별 결과 [{"id": ..., "status": "updated" | "not_found"}]
+    """
+    db = get_async_firestore_db()
+    item_refs = {}
+    for update in updates:
+        item_refs.setdefault(update.id, db.collection('todo_items').document(update.id))
+
+    items = {}
+    async for doc in db.get_all(list(item_refs.values())):
+        if doc.exists:
+            items[doc.id] = _snapshot_to_dict(doc)
+    list_id_by_item = {i_id: item.get('todo_list_id') for i_id, item in items.items()}
+
+    list_refs = [db.collection('todo_lists').document(l_id) for l_id in set(list_id_by_item.values()) if l_id]
+    owned_list_ids = set()
+    async for doc in db.get_all(list_refs):
+        if doc.exists and doc.to_dict().get('user_id') == user.id:
+            owned_list_ids.add(doc.id)
+
+    orders = {
+        update.id: update.order for update in updates
+        if update.order is not None and list_id_by_item.get(update.id) in owned_list_ids
+    }
+    positions = await _order_positions(db, list(items.values()), orders) if orders else {}
+
+    results = []
+    writes = []
+    now = datetime.utcnow()
+    for update in updates:
+        if list_id_by_item.get(update.id) not in owned_list_ids:
+            results.append({"id": update.id, "status": "not_found"})
+            continue
+        update_data = update.model_dump(exclude_unset=True, exclude={'id'})
+        update_data.update(positions.pop(update.id, {}))
+        update_data['updated_at'] = now
+        writes.append((item_refs[update.id], update_data))
+        results.append({"id": update.id, "status": "updated"})
+    # 재배치로 rank가 바뀐 나머지 형제
+    writes.extend((db.collection('todo_items').document(i_id), position) for i_id, position in positions.items())
+    await _commit_in_batches(db, writes)
+    if writes:
+        await invalidate_trees(*owned_list_ids)
+    return results
+
+
+async def move_todo_item(item_id: str, user: Any, move: ToDoItemMove) -> Optional[Dict[str, Any]]:
+    """
+    Todo 아이템 이동 (형제 사이 삽입 또는 다른 부모 아래로 이동).
+
+    이동 아이템 조회 후 소유권 확인과 기준 형제/새 부모 일괄 조회를 동시에 실행.
+
+    Returns:
+        이동된 아이템 (자식 포함). 아이템/프로젝트가 없거나 권한이 없으면 None
+
+    Raises:
+        ValueError: 기준 형제나 새 부모가 유효하지 않은 경우
+    """
+    db = get_async_firestore_db()
+    item_data = await _get_item(db, item_id)
+    if item_data is None:
+        return None
+    list_id = item_data['todo_list_id']
+    current_parent_id = item_data.get('parent_id')
+    parent_id = move.parent_id if 'parent_id' in move.model_fields_set else current_parent_id
+    related_ids = {i for i in (move.after_id, move.before_id, parent_id) if i}
+
+    async def load_related() -> Dict[str, Dict[str, Any]]:
+        refs = [db.collection('todo_items').document(i) for i in related_ids]
+        return {doc.id: _snapshot_to_dict(doc) async for doc in db.get_all(refs) if doc.exists}
+
+    todo_list, related = await asyncio.gather(_get_owned_list(db, list_id, user), load_related())
+    if todo_list is None:
+        return None
+
+    neighbours = []
+    for neighbour_id in (move.after_id, move.before_id):
+        if neighbour_id is None:
+            neighbours.append(None)
+            continue
+        neighbour = related.get(neighbour_id)
+        if (neighbour is None or neighbour_id == item_id or neighbour.get('todo_list_id') != list_id
+                or neighbour.get('parent_id') != parent_id):
+            raise ValueError(f"Invalid sibling: {neighbour_id}")
+        neighbours.append(neighbour)
+    after, before = neighbours
+
+    update_data = {}
+    writes = []
+    if parent_id != current_parent_id:
+        ancestor_ids = []
+        if parent_id:
+            parent = related.get(parent_id)
+            if (parent is None or parent.get('todo_list_id') != list_id or parent_id == item_id
+                    or item_id in (parent.get('ancestor_ids') or [])):
+                raise ValueError(f"Invalid parent: {parent_id}")
+            ancestor_ids = child_ancestor_ids(parent)
+        update_data['parent_id'] = parent_id
+        if 'ancestor_ids' in item_data:
+            # 자손의 ancestor_ids에서 이동 아이템 위쪽 경로만 교체
+            update_data['ancestor_ids'] = ancestor_ids
+            for descendant in await _fetch_subtree_items(db, item_id):
+                old_path = descendant.get('ancestor_ids') or []
+                below = old_path[old_path.index(item_id) + 1:] if item_id in old_path else []
+                writes.append((
+                    db.collection('todo_items').document(descendant['id']),
+                    {"ancestor_ids": ancestor_ids + [item_id] + below},
+                ))
+
+    lower = item_rank(after) if after else None
+    upper = item_rank(before) if before else None
+    try:
+        rank = rank_between(lower, upper)
+    except ValueError:
+        rank = None
+    if rank is None or len(rank) > RANK_MAX_LENGTH:
+        rank, sibling_writes = await _rebalance_siblings(
+            db, list_id, parent_id, item_data, move.after_id, move.before_id,
+        )
+        writes.extend(sibling_writes)
+
+    update_data['rank'] = rank
+    update_data['updated_at'] = datetime.utcnow()
+    # 이동 아이템과 자손 ancestor_ids, 형제 재배치를 한 batch로 기록 (BATCH_WRITE_LIMIT 이내면 원자적).
+    # 한도를 넘으면 이동 아이템을 마지막 batch에 두어, 중간에 실패해도 같은 이동을 다시 요청하면
+    # 자손 경로가 이동 아이템 기준으로 다시 계산되어 복구됨
+    writes.append((db.collection('todo_items').document(item_id), update_data))
+    await _commit_in_batches(db, writes)
+    await invalidate_trees(list_id)
+    return await get_todo_item_by_id(item_id)
+
+
+async def delete_todo_item(item_id: str, user: Any) -> bool:
+    """
+    Todo 아이템 삭제 (자식 아이템도 함께 삭제)
+
+    소유권 확인과 자손 조회를 동시에 실행하고, 권한이 없으면 아무것도 쓰지 않음.
+    """
+    db = get_async_firestore_db()
+    item_data = await _get_item(db, item_id)
+    if item_data is None:
+        return False
+    todo_list, descendant_ids = await asyncio.gather(
+        _get_owned_list(db, item_data['todo_list_id'], user),
+        _collect_descendant_ids(db, item_id, item_data),
+    )
+    if todo_list is None:
+        return False
+
+    batch = db.batch()
+    for i_id in [item_id] + descendant_ids:
+        batch.delete(db.collection('todo_items').document(i_id))
+    await batch.commit()
+    await invalidate_trees(item_data['todo_list_id'])
+    return True
+
+
+async def delete_todo_list(list_id: str, user: Any) -> bool:
+    """
+    Todo 리스트 삭제 (모든 아이템 포함, 소유권 확인과 아이템 조회를 동시에 실행)
+    """
+    db = get_async_firestore_db()
+    todo_list, list_items = await asyncio.gather(_get_owned_list(db, list_id, user), _fetch_list_items(db, list_id))
+    if todo_list is None:
+        return False
+
+    batch = db.batch()
+    for item in list_items:
+        batch.delete(db.collection('todo_items').document(item['id']))
+    batch.delete(db.collection('todo_lists').document(list_id))
+    await batch.commit()
+    await invalidate_trees(list_id)
+    return True
+
+
+async def create_todo_item(user: Any, list_id: str, description: str, priority: str = "none",
+                           due_date: Optional[str] = None, parent_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    빠른 작업 추가 (AI 파싱 없이 직접 생성).
+
+    프로젝트 소유권 확인, 부모 조회, 마지막 형제 조회를 동시에 실행.
+
+    Returns:
+        생성된 아이템. 프로젝트/부모가 없거나 권한이 없으면 None
+    """
+    db = get_async_firestore_db()
+
+    async def no_parent():
+        return None
+
+    todo_list, parent_item, position = await asyncio.gather(
+        _get_owned_list(db, list_id, user),
+        _get_item(db, parent_id) if parent_id else no_parent(),
+        _next_position(db, list_id, parent_id),
+    )
+    if todo_list is None:
+        return None
+    ancestor_ids = []
+    if parent_id:
+        if parent_item is None or parent_item.get('todo_list_id') != list_id:
+            return None
+        ancestor_ids = child_ancestor_ids(parent_item)
+
+    new_item_doc = _new_item_document(
+        list_id, user.id, parent_id, ancestor_ids, description, position,
+        priority=priority, due_date=_parse_due_date(due_date), now=datetime.now(KST),
+    )
+    await db.collection('todo_items').document(new_item_doc["id"]).set(new_item_doc)
+    await invalidate_trees(list_id)
+    return {**new_item_doc, "children": []}
+
+
+async def create_todo_item_from_parsed_data(user: Any, list_id: str,
+                                            parsed_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    자연어 파싱 데이터 기반 아이템 생성 (프로젝트 루트 맨 뒤에 추가).
+
+    프로젝트 소유권 확인과 마지막 루트 아이템 조회를 동시에 실행.
+    """
+    db = get_async_firestore_db()
+    todo_list, position = await asyncio.gather(
+        _get_owned_list(db, list_id, user),
+        _next_position(db, list_id, None),
+    )
+    if todo_list is None:
+        return None
+
+    new_item_doc = _new_item_document(
+        list_id, user.id, None, [], parsed_data.get("description", "New Task"), position,
+        priority=parsed_data.get("priority", "none"),
+        due_date=_parse_due_date(parsed_data.get("due_date")), now=datetime.now(KST),
+    )
+    await db.collection('todo_items').document(new_item_doc["id"]).set(new_item_doc)
+    await invalidate_trees(list_id)
+    return {**new_item_doc, "children": []}
+
+
+async def create_todo_items_from_parsed_data(user: Any, list_id: str,
+                                             parsed_items: List[Dict[str, Any]]) -> Optional[List[Dict[str, Any]]]:
+    """
+    자연어 파싱 데이터 여러 개를 프로젝트 루트 맨 뒤에 순서대로 추가 (일괄 가져오기).
+
+    프로젝트 소유권 확인과 마지막 루트 아이템 조회를 한 번만 동시에 실행하고,
+    이어지는 rank/order를 한 번에 배정한 뒤 최대 500개 단위 batch로 저장.
+    """
+    db = get_async_firestore_db()
+    todo_list, position = await asyncio.gather(
+        _get_owned_list(db, list_id, user),
+        _next_position(db, list_id, None),
+    )
+    if todo_list is None:
+        return None
+
+    now = datetime.now(KST)
+    item_docs = []
+    for parsed_data in parsed_items:
+        item_docs.append(_new_item_document(
+            list_id, user.id, None, [], parsed_data.get("description", "New Task"), position,
+            priority=parsed_data.get("priority", "none"),
+            due_date=_parse_due_date(parsed_data.get("due_date")), now=now,
+        ))
+        position = {"rank": rank_after(position["rank"]), "order": position["order"] + 1}
+    await _commit_in_batches(
+        db, [(db.collection('todo_items').document(item["id"]), item) for item in item_docs], operation='set',
+    )
+    if item_docs:
+        await invalidate_trees(list_id)
+    return [{**item_doc, "children": []} for item_doc in item_docs]
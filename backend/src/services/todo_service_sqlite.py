@@ -0,0 +1,570 @@
+"""
+할 일 서비스 모듈 (SQLite)
+
+todo_service_firestore_async와 동일한 인터페이스(repository.TodoRepository)를
+로컬 SQLite 저장 엔진으로 구현.
+
+주요 특징:
+- 사용자별/프로젝트별 조회는 인덱스를 사용하는 단일 쿼리
+- 서브트리 조회/삭제와 상위 경로 조회는 재귀 CTE로 처리
+- 여러 행을 쓰는 작업은 하나의 트랜잭션으로 적용
+"""
+from typing import List, Dict, Any, Optional
+import sqlite3
+import uuid
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from ..database import get_connection, SUBTREE_QUERY, DELETE_SUBTREE_QUERY, ANCESTRY_QUERY
+from ..schemas import ToDoItemUpdate, ToDoListUpdate, ToDoItemBatchUpdate, ToDoItemMove
+from ..services.rank import RANK_MAX_LENGTH, rank_after, rank_between, rank_sequence
+from ..services.todo_tree import build_item_tree, item_rank, positions_for_orders, request_item_id
+from ..services.ai_client import call_from_thread
+from ..services.ai_service import generate_todo_items_from_keyword, generate_sub_tasks_from_main_task
+
+_DATETIME_FIELDS = ("due_date", "reminder_date", "created_at", "updated_at")
+
+
+def _row_to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+    """SQLite 행을 서비스 계층 딕셔너리로 변환 (datetime/bool 복원)."""
+    data = dict(row)
+    for field in _DATETIME_FIELDS:
+        if data.get(field):
+            data[field] = datetime.fromisoformat(data[field])
+    if "is_completed" in data:
+        data["is_completed"] = bool(data["is_completed"])
+    return data
+
+
+def _to_db_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, bool):
+        return int(value)
+    return value
+
+
+def _insert(conn: sqlite3.Connection, table: str, data: Dict[str, Any]) -> None:
+    columns = ", ".join(f'"{column}"' for column in data)
+    placeholders = ", ".join(f":{column}" for column in data)
+    conn.execute(
+        f"INSERT INTO {table} ({columns}) VALUES ({placeholders})",
+        {column: _to_db_value(value) for column, value in data.items()},
+    )
+
+
+def _update(conn: sqlite3.Connection, table: str, row_id: str, data: Dict[str, Any]) -> None:
+    assignments = ", ".join(f'"{column}" = :{column}' for column in data)
+    params = {column: _to_db_value(value) for column, value in data.items()}
+    params["_id"] = row_id
+    conn.execute(f"UPDATE {table} SET {assignments} WHERE id = :_id", params)
+
+
+def _get_owned_list(conn: sqlite3.Connection, list_id: str, user: Any) -> Optional[Dict[str, Any]]:
+    row = conn.execute("SELECT * FROM todo_lists WHERE id = ?", (list_id,)).fetchone()
+    if row is None or row["user_id"] != user.id:
+        return None
+    return _row_to_dict(row)
+
+
+def _get_owned_item(conn: sqlite3.Connection, item_id: str, user: Any) -> Optional[Dict[str, Any]]:
+    row = conn.execute(
+        "SELECT i.* FROM todo_items AS i JOIN todo_lists AS l ON l.id = i.todo_list_id "
+        "WHERE i.id = ? AND l.user_id = ?",
+        (item_id, user.id),
+    ).fetchone()
+    return _row_to_dict(row) if row else None
+
+
+def _fetch_and_build_tree_for_list(conn: sqlite3.Connection, list_id: str) -> List[Dict[str, Any]]:
+    rows = conn.execute("SELECT * FROM todo_items WHERE todo_list_id = ?", (list_id,)).fetchall()
+    return build_item_tree([_row_to_dict(row) for row in rows])
+
+
+def _next_position(conn: sqlite3.Connection, list_id: str, parent_id: Optional[str]) -> Dict[str, Any]:
+    """맨 뒤에 추가될 아이템의 rank/order 계산 (인덱스로 마지막 형제 한 행만 조회)."""
+    last = conn.execute(
+        'SELECT rank, "order" FROM todo_items WHERE todo_list_id = ? AND parent_id IS ? '
+        "ORDER BY rank DESC LIMIT 1",
+        (list_id, parent_id),
+    ).fetchone()
+    if last is None:
+        return {"rank": rank_between(None, None), "order": 0}
+    return {"rank": rank_after(last["rank"]), "order": last["order"] + 1}
+
+
+def _order_positions(conn: sqlite3.Connection, items: List[Dict[str, Any]],
+                     orders: Dict[str, int]) -> Dict[str, Dict[str, Any]]:
+    """정수 order 변경을 형제 rank 사이 위치로 변환 (재배치된 다른 형제가 포함될 수 있음)."""
+    groups: Dict[tuple, Dict[str, int]] = {}
+    for item in items:
+        if item["id"] in orders:
+            groups.setdefault((item["todo_list_id"], item["parent_id"]), {})[item["id"]] = orders[item["id"]]
+    positions = {}
+    for (list_id, parent_id), group_orders in groups.items():
+        rows = conn.execute(
+            'SELECT id, rank, "order" FROM todo_items WHERE todo_list_id = ? AND parent_id IS ?', (list_id, parent_id),
+        ).fetchall()
+        positions.update(positions_for_orders([dict(row) for row in rows], group_orders))
+    return positions
+
+
+def _insert_items_recursively(conn: sqlite3.Connection, items_data: List[Dict[str, Any]], todo_list_id: str,
+                              user_id: str, parent_id: str = None) -> None:
+    ranks = rank_sequence(len(items_data))
+    for order, item_data in enumerate(items_data):
+        item_id = str(uuid.uuid4())
+        _insert(conn, "todo_items", {
+            "id": item_id,
+            "todo_list_id": todo_list_id,
+            "user_id": user_id,
+            "parent_id": parent_id,
+            "description": item_data["description"],
+            "is_completed": False,
+            "order": order,
+            "rank": ranks[order],
+            "priority": "none",
+            "due_date": None,
+            "reminder_date": None,
+            "created_at": datetime.utcnow(),
+            "updated_at": datetime.utcnow(),
+        })
+        if item_data.get("children"):
+            _insert_items_recursively(conn, item_data["children"], todo_list_id, user_id, item_id)
+
+
+def create_todo_list_with_ai_items(user: Any, keyword: str, list_id: Optional[str] = None) -> Dict[str, Any]:
+    """
+    AI를 사용하여 새로운 Todo 리스트 생성
+
+    list_id가 주어지고 그 프로젝트가 이미 있으면(같은 백그라운드 작업의 재실행) 기존 프로젝트를 반환.
+    """
+    conn = get_connection()
+    if list_id is not None and _get_owned_list(conn, list_id, user) is not None:
+        return get_todo_list_by_id(list_id, user)
+    # AI 응답을 먼저 받은 뒤 짧은 트랜잭션으로 저장 (생성 대기 중 쓰기 잠금 방지)
+    generated_items_json = call_from_thread(generate_todo_items_from_keyword, keyword, user_id=user.id)
+    list_id = list_id or str(uuid.uuid4())
+    with conn:
+        _insert(conn, "todo_lists", {
+            "id": list_id,
+            "user_id": user.id,
+            "keyword": keyword,
+            "color": "#3b82f6",
+            "icon": "📋",
+            "created_at": datetime.utcnow(),
+            "updated_at": datetime.utcnow(),
+        })
+        _insert_items_recursively(conn, generated_items_json, list_id, user.id, None)
+    return get_todo_list_by_id(list_id, user)
+
+
+def create_todo_list(user: Any, keyword: str) -> Dict[str, Any]:
+    """
+    빈 프로젝트 생성 (스트리밍 생성용, 아이템은 add_generated_item으로 추가)
+    """
+    conn = get_connection()
+    todo_list = {
+        "id": str(uuid.uuid4()),
+        "user_id": user.id,
+        "keyword": keyword,
+        "color": "#3b82f6",
+        "icon": "📋",
+        "created_at": datetime.utcnow(),
+        "updated_at": datetime.utcnow(),
+    }
+    with conn:
+        _insert(conn, "todo_lists", todo_list)
+    return {**todo_list, "items": []}
+
+
+def add_generated_item(user: Any, list_id: str, description: str, position: Dict[str, Any],
+                       parent: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    스트리밍 생성 중 완성된 아이템 하나를 지정한 위치에 저장
+    """
+    conn = get_connection()
+    now = datetime.utcnow()
+    item = {
+        "id": str(uuid.uuid4()),
+        "todo_list_id": list_id,
+        "user_id": user.id,
+        "parent_id": parent["id"] if parent else None,
+        "description": description,
+        "is_completed": False,
+        "order": position["order"],
+        "rank": position["rank"],
+        "priority": "none",
+        "due_date": None,
+        "reminder_date": None,
+        "created_at": now,
+        "updated_at": now,
+    }
+    with conn:
+        _insert(conn, "todo_items", item)
+    return {**item, "children": []}
+
+
+def create_subtasks_for_item(user: Any, parent_item_id: str, request_id: Optional[str] = None) -> Dict[str, Any]:
+    """
+    특정 아이템의 하위 작업 생성
+
+    request_id가 주어지면 하위 작업 ID를 그로부터 파생하고, 이미 저장되어 있으면
+    (같은 백그라운드 작업의 재실행) 다시 생성하지 않음.
+    """
+    conn = get_connection()
+    parent_item = _get_owned_item(conn, parent_item_id, user)
+    if parent_item is None:
+        return None
+    if request_id is not None and conn.execute(
+        "SELECT 1 FROM todo_items WHERE id = ?", (request_item_id(request_id, 0),),
+    ).fetchone() is not None:
+        return get_todo_item_by_id(parent_item_id)
+    todo_list = conn.execute("SELECT keyword FROM todo_lists WHERE id = ?", (parent_item["todo_list_id"],)).fetchone()
+    context_path = [row["description"] for row in conn.execute(ANCESTRY_QUERY, {"item_id": parent_item_id})]
+
+    sub_task_descriptions = call_from_thread(
+        generate_sub_tasks_from_main_task,
+        main_task_description=parent_item["description"],
+        project_keyword=todo_list["keyword"],
+        context_path=context_path,
+        user_id=user.id,
+    )
+    with conn:
+        # 기존 하위 작업 뒤에 이어서 추가
+        position = _next_position(conn, parent_item["todo_list_id"], parent_item_id)
+        for offset, description in enumerate(sub_task_descriptions):
+            if offset:
+                position = {"rank": rank_after(position["rank"]), "order": position["order"] + 1}
+            _insert(conn, "todo_items", {
+                "id": request_item_id(request_id, offset) if request_id else str(uuid.uuid4()),
+                "todo_list_id": parent_item["todo_list_id"],
+                "user_id": user.id,
+                "parent_id": parent_item_id,
+                "description": description,
+                "is_completed": False,
+                "order": position["order"],
+                "rank": position["rank"],
+                "priority": "none",
+                "due_date": None,
+                "reminder_date": None,
+                "created_at": datetime.utcnow(),
+                "updated_at": datetime.utcnow(),
+            })
+    return get_todo_item_by_id(parent_item_id)
+
+
+def get_todo_lists_by_user(user: Any) -> List[Dict[str, Any]]:
+    """
+    사용자의 모든 Todo 리스트 가져오기 (프로젝트 조회 1회 + 아이템 조회 1회)
+    """
+    conn = get_connection()
+    all_lists = [_row_to_dict(row) for row in conn.execute("SELECT * FROM todo_lists WHERE user_id = ?", (user.id,))]
+
+    items_by_list: Dict[str, List[Dict[str, Any]]] = {}
+    for row in conn.execute("SELECT * FROM todo_items WHERE user_id = ?", (user.id,)):
+        item_data = _row_to_dict(row)
+        items_by_list.setdefault(item_data["todo_list_id"], []).append(item_data)
+
+    for list_data in all_lists:
+        list_data["items"] = build_item_tree(items_by_list.get(list_data["id"], []))
+    return all_lists
+
+
+def get_todo_list_by_id(list_id: str, user: Any) -> Dict[str, Any]:
+    """
+    특정 Todo 리스트 가져오기
+    """
+    conn = get_connection()
+    list_data = _get_owned_list(conn, list_id, user)
+    if list_data is None:
+        return None
+    list_data["items"] = _fetch_and_build_tree_for_list(conn, list_id)
+    return list_data
+
+
+def get_todo_item_by_id(item_id: str) -> Dict[str, Any]:
+    """
+    특정 Todo 아이템과 그 자식들을 가져오기 (재귀 CTE로 서브트리만 조회)
+    """
+    conn = get_connection()
+    row = conn.execute("SELECT * FROM todo_items WHERE id = ?", (item_id,)).fetchone()
+    if row is None:
+        return None
+    item_data = _row_to_dict(row)
+    descendants = [_row_to_dict(child) for child in conn.execute(SUBTREE_QUERY, {"item_id": item_id})]
+    item_data["children"] = build_item_tree(descendants, root_id=item_id)
+    return item_data
+
+
+def update_todo_list(list_id: str, user: Any, list_update: ToDoListUpdate) -> Dict[str, Any]:
+    """
+    Todo 리스트 업데이트
+    """
+    conn = get_connection()
+    if _get_owned_list(conn, list_id, user) is None:
+        return None
+    update_data = list_update.model_dump(exclude_unset=True)
+    update_data["updated_at"] = datetime.utcnow()
+    with conn:
+        _update(conn, "todo_lists", list_id, update_data)
+    return get_todo_list_by_id(list_id, user)
+
+
+def update_todo_item(item_id: str, user: Any, item_update: ToDoItemUpdate) -> Dict[str, Any]:
+    """
+    Todo 아이템 업데이트
+    """
+    conn = get_connection()
+    item_data = _get_owned_item(conn, item_id, user)
+    if item_data is None:
+        return None
+    update_data = item_update.model_dump(exclude_unset=True)
+    update_data["updated_at"] = datetime.utcnow()
+    with conn:
+        if update_data.get("order") is not None:
+            # 정수 order로 재정렬하는 클라이언트도 rank 정렬과 일치하도록 형제 rank 사이에 배치
+            positions = _order_positions(conn, [item_data], {item_id: update_data["order"]})
+            update_data.update(positions.pop(item_id))
+            for sibling_id, position in positions.items():
+                _update(conn, "todo_items", sibling_id, position)
+        _update(conn, "todo_items", item_id, update_data)
+    item_data.update(update_data)
+    item_data["children"] = []  # 자식 데이터는 포함하지 않음
+    return item_data
+
+
+def batch_update_todo_items(user: Any, updates: List[ToDoItemBatchUpdate]) -> List[Dict[str, Any]]:
+    """
+    여러 Todo 아이템을 한 트랜잭션으로 부분 업데이트.
+
+    Returns:
+        요청 순서대로의 항목별 결과 [{"id": ..., "status": "updated" | "not_found"}]
+    """
+    conn = get_connection()
+    item_ids = list({update.id for update in updates})
+    owned_items = {}
+    # SQLite 바인딩 변수 수 제한을 고려해 나누어 조회
+    for start in range(0, len(item_ids), 500):
+        chunk = item_ids[start:start + 500]
+        placeholders = ", ".join("?" for _ in chunk)
+        rows = conn.execute(
+            f"SELECT i.id, i.todo_list_id, i.parent_id FROM todo_items AS i "
+            f"JOIN todo_lists AS l ON l.id = i.todo_list_id WHERE l.user_id = ? AND i.id IN ({placeholders})",
+            (user.id, *chunk),
+        )
+        owned_items.update((row["id"], dict(row)) for row in rows)
+
+    results = []
+    now = datetime.utcnow()
+    with conn:
+        orders = {update.id: update.order for update in updates if update.order is not None and update.id in owned_items}
+        positions = _order_positions(conn, list(owned_items.values()), orders)
+        for update in updates:
+            if update.id not in owned_items:
+                results.append({"id": update.id, "status": "not_found"})
+                continue
+            update_data = update.model_dump(exclude_unset=True, exclude={"id"})
+            update_data.update(positions.pop(update.id, {}))
+            update_data["updated_at"] = now
+            _update(conn, "todo_items", update.id, update_data)
+            results.append({"id": update.id, "status": "updated"})
+        # 재배치로 rank가 바뀐 나머지 형제
+        for sibling_id, position in positions.items():
+            _update(conn, "todo_items", sibling_id, position)
+    return results
+
+
+def _rebalance_siblings(conn: sqlite3.Connection, list_id: str, parent_id: Optional[str], moved_item: Dict[str, Any],
+                        after_id: Optional[str], before_id: Optional[str]) -> str:
+    """형제 아이템 정렬 키 재배치 후 이동 아이템에 부여할 rank 반환."""
+    rows = conn.execute(
+        "SELECT id, rank, \"order\" FROM todo_items WHERE todo_list_id = ? AND parent_id IS ? AND id != ?",
+        (list_id, parent_id, moved_item["id"]),
+    ).fetchall()
+    siblings = sorted((dict(row) for row in rows), key=item_rank)
+    sibling_ids = [sibling["id"] for sibling in siblings]
+    if after_id in sibling_ids:
+        index = sibling_ids.index(after_id) + 1
+    elif before_id in sibling_ids:
+        index = sibling_ids.index(before_id)
+    else:
+        index = 0
+    siblings.insert(index, moved_item)
+
+    ranks = rank_sequence(len(siblings))
+    for order, (sibling, rank) in enumerate(zip(siblings, ranks)):
+        if sibling is not moved_item:
+            _update(conn, "todo_items", sibling["id"], {"rank": rank, "order": order})
+    return ranks[index]
+
+
+def move_todo_item(item_id: str, user: Any, move: ToDoItemMove) -> Dict[str, Any]:
+    """
+    Todo 아이템 이동 (형제 사이 삽입 또는 다른 부모 아래로 이동).
+
+    Returns:
+        이동된 아이템 (자식 포함). 아이템이 없거나 권한이 없으면 None
+
+    Raises:
+        ValueError: 기준 형제나 새 부모가 유효하지 않은 경우
+    """
+    conn = get_connection()
+    item_data = _get_owned_item(conn, item_id, user)
+    if item_data is None:
+        return None
+    list_id = item_data["todo_list_id"]
+    current_parent_id = item_data.get("parent_id")
+    parent_id = move.parent_id if "parent_id" in move.model_fields_set else current_parent_id
+
+    neighbours = []
+    for neighbour_id in (move.after_id, move.before_id):
+        if neighbour_id is None:
+            neighbours.append(None)
+            continue
+        row = conn.execute("SELECT * FROM todo_items WHERE id = ?", (neighbour_id,)).fetchone()
+        if (row is None or neighbour_id == item_id or row["todo_list_id"] != list_id
+                or row["parent_id"] != parent_id):
+            raise ValueError(f"Invalid sibling: {neighbour_id}")
+        neighbours.append(dict(row))
+    after, before = neighbours
+
+    update_data = {}
+    if parent_id != current_parent_id:
+        if parent_id:
+            parent = conn.execute("SELECT todo_list_id FROM todo_items WHERE id = ?", (parent_id,)).fetchone()
+            path_ids = [row["id"] for row in conn.execute(ANCESTRY_QUERY, {"item_id": parent_id})]
+            if parent is None or parent["todo_list_id"] != list_id or item_id in path_ids:
+                raise ValueError(f"Invalid parent: {parent_id}")
+        update_data["parent_id"] = parent_id
+
+    with conn:
+        try:
+            rank = rank_between(item_rank(after) if after else None, item_rank(before) if before else None)
+        except ValueError:
+            rank = None
+        if rank is None or len(rank) > RANK_MAX_LENGTH:
+            rank = _rebalance_siblings(conn, list_id, parent_id, item_data, move.after_id, move.before_id)
+        update_data["rank"] = rank
+        update_data["updated_at"] = datetime.utcnow()
+        _update(conn, "todo_items", item_id, update_data)
+    return get_todo_item_by_id(item_id)
+
+
+def delete_todo_item(item_id: str, user: Any) -> bool:
+    """
+    Todo 아이템 삭제 (재귀 CTE로 자식 아이템도 함께 삭제)
+    """
+    conn = get_connection()
+    if _get_owned_item(conn, item_id, user) is None:
+        return False
+    with conn:
+        conn.execute(DELETE_SUBTREE_QUERY, {"item_id": item_id})
+    return True
+
+
+def delete_todo_list(list_id: str, user: Any) -> bool:
+    """
+    Todo 리스트 삭제 (모든 아이템 포함)
+    """
+    conn = get_connection()
+    if _get_owned_list(conn, list_id, user) is None:
+        return False
+    with conn:
+        conn.execute("DELETE FROM todo_items WHERE todo_list_id = ?", (list_id,))
+        conn.execute("DELETE FROM todo_lists WHERE id = ?", (list_id,))
+    return True
+
+
+def _parse_kst_due_date(due_date: Any) -> Optional[datetime]:
+    """ISO 문자열 마감일을 KST 기준 datetime으로 변환 (실패 시 None)."""
+    if not due_date or not isinstance(due_date, str):
+        return None
+    try:
+        return datetime.fromisoformat(due_date).replace(tzinfo=ZoneInfo("Asia/Seoul"))
+    except ValueError:
+        return None
+
+
+def create_todo_item(user: Any, list_id: str, description: str, priority: str = "none",
+                     due_date: Optional[str] = None, parent_id: Optional[str] = None) -> Dict[str, Any]:
+    """
+    빠른 작업 추가 (AI 파싱 없이 직접 생성).
+
+    Returns:
+        생성된 아이템. 프로젝트/부모가 없거나 권한이 없으면 None
+    """
+    conn = get_connection()
+    if _get_owned_list(conn, list_id, user) is None:
+        return None
+    if parent_id:
+        parent = conn.execute("SELECT todo_list_id FROM todo_items WHERE id = ?", (parent_id,)).fetchone()
+        if parent is None or parent["todo_list_id"] != list_id:
+            return None
+
+    item_id = str(uuid.uuid4())
+    with conn:
+        position = _next_position(conn, list_id, parent_id)
+        _insert(conn, "todo_items", {
+            "id": item_id,
+            "todo_list_id": list_id,
+            "user_id": user.id,
+            "parent_id": parent_id,
+            "description": description,
+            "is_completed": False,
+            "order": position["order"],
+            "rank": position["rank"],
+            "priority": priority,
+            "due_date": _parse_kst_due_date(due_date),
+            "reminder_date": None,
+            "created_at": datetime.now(ZoneInfo("Asia/Seoul")),
+            "updated_at": datetime.now(ZoneInfo("Asia/Seoul")),
+        })
+    return get_todo_item_by_id(item_id)
+
+
+def create_todo_item_from_parsed_data(user: Any, list_id: str, parsed_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    자연어 파싱 결과로 루트 아이템 생성.
+    """
+    return create_todo_item(
+        user,
+        list_id,
+        description=parsed_data.get("description", "New Task"),
+        priority=parsed_data.get("priority", "none"),
+        due_date=parsed_data.get("due_date"),
+    )
+
+
+def create_todo_items_from_parsed_data(user: Any, list_id: str,
+                                       parsed_items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    자연어 파싱 결과 여러 개를 루트 맨 뒤에 순서대로 추가 (한 트랜잭션).
+    """
+    conn = get_connection()
+    if _get_owned_list(conn, list_id, user) is None:
+        return None
+    now = datetime.now(ZoneInfo("Asia/Seoul"))
+    items = []
+    with conn:
+        position = _next_position(conn, list_id, None)
+        for parsed_data in parsed_items:
+            item = {
+                "id": str(uuid.uuid4()),
+                "todo_list_id": list_id,
+                "user_id": user.id,
+                "parent_id": None,
+                "description": parsed_data.get("description", "New Task"),
+                "is_completed": False,
+                "order": position["order"],
+                "rank": position["rank"],
+                "priority": parsed_data.get("priority", "none"),
+                "due_date": _parse_kst_due_date(parsed_data.get("due_date")),
+                "reminder_date": None,
+                "created_at": now,
+                "updated_at": now,
+            }
+            _insert(conn, "todo_items", item)
+            items.append({**item, "children": []})
+            position = {"rank": rank_after(position["rank"]), "order": position["order"] + 1}
+    return items
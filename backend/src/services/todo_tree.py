@@ -0,0 +1,117 @@
+"""
+할 일 트리 구성 모듈
+
+저장 엔진과 무관하게 플랫한 아이템 목록을 계층 구조로 변환하는 공용 로직.
+"""
+import uuid
+from typing import List, Dict, Any
+from datetime import datetime
+from google.cloud import firestore
+
+from .rank import RANK_MAX_LENGTH, rank_between, rank_from_order, rank_sequence
+
+
+def item_rank(item: Dict[str, Any]) -> str:
+    """
+    아이템의 정렬 키.
+
+    rank 필드가 없는 레거시 문서는 정수 order에서 파생한 키를 사용.
+    """
+    return item.get('rank') or rank_from_order(item.get('order') or 0)
+
+
+def request_item_id(request_id: str, offset: int) -> str:
+    """
+    요청(백그라운드 작업) ID에서 파생한 offset번째 새 아이템 ID.
+
+    같은 작업이 다시 실행되어도 같은 ID가 나오므로 이미 저장된 결과를 확인하는 데 사용.
+    """
+    return str(uuid.uuid5(uuid.UUID(request_id), str(offset)))
+
+
+def positions_for_orders(siblings: List[Dict[str, Any]], orders: Dict[str, int]) -> Dict[str, Dict[str, Any]]:
+    """
+    정수 order로 재정렬하는 형제 아이템의 rank 계산.
+
+    order가 지정되지 않은 형제는 기존 순서와 rank를 유지하고, 지정된 아이템은 그 위치의
+    앞뒤 형제 rank 사이 키를 받음. 일부 아이템만 보내는 부분 재정렬도 순서가 유지되며,
+    키가 너무 길어지거나 기존 키가 겹치면 형제 전체에 균등 간격 키를 다시 부여.
+
+    Args:
+        siblings: 같은 부모 아래의 모든 형제 아이템 (현재 저장된 값)
+        orders: 새 위치를 지정한 아이템 {id: order}
+
+    Returns:
+        써야 할 위치 {id: {"rank": ..., "order": ...}} (지정된 아이템, 재배치 시 모든 형제)
+    """
+    placed = sorted((item for item in siblings if item['id'] not in orders), key=item_rank)
+    moved = sorted((item for item in siblings if item['id'] in orders), key=lambda item: (orders[item['id']], item_rank(item)))
+    for item in moved:
+        placed.insert(min(max(orders[item['id']], 0), len(placed)), item)
+
+    positions = {}
+    lower = None
+    for index, item in enumerate(placed):
+        if item['id'] not in orders:
+            lower = item_rank(item)
+            continue
+        upper = next((item_rank(after) for after in placed[index + 1:] if after['id'] not in orders), None)
+        try:
+            rank = rank_between(lower, upper)
+        except ValueError:
+            rank = None
+        if rank is None or len(rank) > RANK_MAX_LENGTH:
+            ranks = rank_sequence(len(placed))
+            return {item['id']: {"rank": ranks[i], "order": i} for i, item in enumerate(placed)}
+        positions[item['id']] = {"rank": rank, "order": index}
+        lower = rank
+    return positions
+
+
+def build_item_tree(all_items: List[Dict[str, Any]], root_id: str = None) -> List[Dict[str, Any]]:
+    """
+    플랫 데이터를 트리 구조로 변환.
+    
+    저장소(Firestore/SQLite)의 평면 구조 데이터를 parent_id를 기준으로
+    중첩된 계층 구조로 재구성.
+    
+    Args:
+        all_items: 모든 할 일 아이템 목록 (플랫 구조)
+        root_id: 서브트리 구성 시 기준 아이템 ID (parent_id가 이 값인 아이템이 루트)
+    
+    Returns:
+        루트 아이템 목록 (각 아이템에 children 필드 포함)
+    
+    Note:
+        - rank 키 기준으로 정렬하고, order는 형제 내 위치(0부터)로 다시 채움
+        - SERVER_TIMESTAMP는 현재 시간으로 변환
+    """
+    # 아이템 ID를 키로 하는 딕셔너리 생성 (빠른 조회용)
+    items_by_id = {}
+    for item in all_items:
+        for key, value in item.items():
+            if isinstance(value, firestore.SERVER_TIMESTAMP.__class__):
+                item[key] = datetime.utcnow()
+            elif isinstance(value, datetime):
+                pass
+        item['children'] = []
+        items_by_id[item['id']] = item
+
+    # 부모-자식 관계 구축
+    root_items = []
+    for item in all_items:
+        parent_id = item.get('parent_id')
+        if parent_id and parent_id != root_id:
+            parent = items_by_id.get(parent_id)
+            if parent:
+                parent['children'].append(item)
+        else:
+            root_items.append(item)
+
+    # rank 키 기준 정렬 후 형제 내 위치를 order로 노출
+    for siblings in [root_items] + [item['children'] for item in all_items]:
+        siblings.sort(key=item_rank)
+        for index, sibling in enumerate(siblings):
+            sibling['order'] = index
+
+    return root_items
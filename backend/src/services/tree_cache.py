@@ -0,0 +1,143 @@
+"""
+프로젝트 트리 캐시 모듈
+
+프로젝트(Todo List) 문서와 트리 구조로 조립한 아이템을 프로세스 메모리에 캐시.
+
+- list_id를 키로 하는 LRU + TTL 캐시 (cachetools.TTLCache)
+- 항목 크기(직렬화 바이트 수 추정)를 합산하여 전체 용량을 제한
+- 서비스의 모든 변경 작업은 해당 프로젝트 항목을 무효화(또는 새 값으로 교체)
+- 무효화 세대(generation)를 두어, 변경 전에 시작된 조회 결과가
+  변경 후에 캐시에 들어가는 경쟁 상태를 방지. 프로젝트별 마지막 무효화 세대는
+  최근 GENERATION_LIMIT개만 보관하고, 밀려난 세대보다 먼저 시작된 조회는 저장하지 않음
+
+캐시된 트리는 여러 요청이 공유하므로 읽기 전용으로 다뤄야 함.
+
+환경 변수:
+- TREE_CACHE_MAX_BYTES: 최대 용량 (기본값: 32MB, 0이면 캐시 비활성화)
+- TREE_CACHE_TTL_SECONDS: 항목 유효 시간 (기본값: 60초)
+"""
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+from cachetools import TTLCache
+
+from ..instrumentation import Counter, Gauge, register_metric
+
+TREE_CACHE_MAX_BYTES = int(os.getenv("TREE_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+TREE_CACHE_TTL_SECONDS = float(os.getenv("TREE_CACHE_TTL_SECONDS", "60"))
+
+# 마지막 무효화 세대를 기억하는 프로젝트 수
+GENERATION_LIMIT = 10000
+
+
+def estimate_size(value: Any) -> int:
+    """캐시 항목의 대략적인 크기 (JSON 직렬화 바이트 수)."""
+    return len(json.dumps(value, default=str, ensure_ascii=False).encode("utf-8"))
+
+
+class TreeCache:
+    """
+    list_id → {프로젝트 문서 + items 트리} 캐시.
+
+    Args:
+        max_bytes: 전체 항목 크기 합계 상한 (초과 시 가장 오래 사용하지 않은 항목부터 제거)
+        ttl: 항목 유효 시간 (초)
+        timer: 시간 함수 (테스트용)
+        generation_limit: 마지막 무효화 세대를 기억하는 프로젝트 수
+    """
+
+    def __init__(self, max_bytes: int = TREE_CACHE_MAX_BYTES, ttl: float = TREE_CACHE_TTL_SECONDS,
+                 timer: Optional[Callable[[], float]] = None, generation_limit: int = GENERATION_LIMIT):
+        self.enabled = max_bytes > 0
+        cache_kwargs = {"timer": timer} if timer else {}
+        self._entries = TTLCache(maxsize=max(max_bytes, 1), ttl=ttl, getsizeof=estimate_size, **cache_kwargs)
+        # 무효화마다 1씩 늘어나는 전역 세대와, 프로젝트별 마지막 무효화 세대 (오래된 것부터 제거)
+        self._generation = 0
+        self._generations: "OrderedDict[str, int]" = OrderedDict()
+        self._generation_limit = generation_limit
+        # 목록에서 밀려난 프로젝트의 마지막 무효화 세대 상한
+        self._evicted_generation = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def generation(self, list_id: str) -> int:
+        """현재 무효화 세대. 조회 시작 전에 읽어 두고 put()에 넘김."""
+        with self._lock:
+            return self._generation
+
+    def get(self, list_id: str) -> Optional[Dict[str, Any]]:
+        """캐시된 프로젝트 (없거나 만료되면 None). 반환값은 읽기 전용."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(list_id)
+            if entry is None:
+                self.misses += 1
+                TREE_CACHE_MISSES.inc()
+            else:
+                self.hits += 1
+                TREE_CACHE_HITS.inc()
+            return entry
+
+    def put(self, list_id: str, list_data: Dict[str, Any], generation: Optional[int] = None) -> None:
+        """
+        프로젝트 저장.
+
+        generation이 주어지고 그 사이 무효화가 있었다면 저장하지 않음
+        (오래된 조회 결과가 최신 변경을 덮어쓰지 않도록).
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            if generation is not None and generation < self._generations.get(list_id, self._evicted_generation):
+                return
+            try:
+                self._entries[list_id] = list_data
+            except ValueError:
+                # 단일 항목이 전체 용량보다 큰 경우 캐시하지 않음
+                self._entries.pop(list_id, None)
+
+    def invalidate(self, *list_ids: Optional[str]) -> None:
+        """프로젝트 항목 제거 및 무효화 세대 증가."""
+        with self._lock:
+            for list_id in list_ids:
+                if not list_id:
+                    continue
+                self._entries.pop(list_id, None)
+                self._generation += 1
+                self._generations[list_id] = self._generation
+                self._generations.move_to_end(list_id)
+            while len(self._generations) > self._generation_limit:
+                _, evicted = self._generations.popitem(last=False)
+                self._evicted_generation = max(self._evicted_generation, evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._generations.clear()
+            # 비우기 전에 시작된 조회도 저장하지 않음
+            self._generation += 1
+            self._evicted_generation = self._generation
+
+    @property
+    def size_bytes(self) -> int:
+        with self._lock:
+            return int(self._entries.currsize)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+TREE_CACHE_HITS = register_metric(Counter("tree_cache_hits_total", "Project tree cache hits."))
+TREE_CACHE_MISSES = register_metric(Counter("tree_cache_misses_total", "Project tree cache misses."))
+
+# 프로세스 전역 캐시 인스턴스
+tree_cache = TreeCache()
+
+register_metric(Gauge("tree_cache_bytes", "Estimated size of cached project trees.", lambda: tree_cache.size_bytes))
+register_metric(Gauge("tree_cache_entries", "Cached project trees.", lambda: len(tree_cache)))
@@ -0,0 +1,225 @@
+"""
+할 일 트리 스트리밍 파서 모듈
+
+Gemini가 스트리밍 모드로 보내는 계층적 할 일 목록 JSON을 조각 단위로 읽어,
+항목(description이 완성된 객체)이 나오는 즉시 순서대로 꺼냄.
+
+입력 형식은 generate_todo_items_from_keyword와 같음:
+[{"description": "...", "children": [{"description": "..."}]}, ...]
+
+- 첫 '[' 앞(```json 등)과 최상위 배열 뒤의 텍스트는 무시
+- 항목은 (경로, description)으로 전달. 경로는 최상위부터의 위치 튜플 (예: (0, 1)은 첫 항목의 두 번째 하위 항목)
+- 부모가 항상 자식보다 먼저 나옴. children이 description보다 먼저 오면 부모의 description이
+  나올 때까지 자식을 보류
+- description, children 외의 키와 값은 무시. 항목에 description이 없거나 JSON이 깨지면 ValueError
+"""
+import json
+import re
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+Path = Tuple[int, ...]
+Node = Tuple[Path, str]
+
+_LITERAL_PATTERN = re.compile(r'[^\s{}\[\],:"]+')
+_VALUE_TOKENS = frozenset({"{", "[", "str", "lit"})
+
+
+class _Frame:
+    """파싱 중인 배열/객체 하나."""
+
+    __slots__ = ("kind", "path", "count", "key", "state", "description", "empty")
+
+    def __init__(self, kind: str, path: Optional[Path] = None):
+        # kind: "items"(항목 배열) | "array"(그 외 배열) | "node"(항목 객체) | "object"(그 외 객체)
+        self.kind = kind
+        self.path = path
+        self.count = 0
+        self.key: Optional[str] = None
+        self.state = "key" if kind in ("node", "object") else "value"
+        self.description: Optional[str] = None
+        self.empty = True
+
+
+class TreeStreamParser:
+    """
+    계층적 할 일 목록 JSON의 증분 파서.
+
+    feed()에 텍스트 조각을 넣을 때마다 새로 완성된 항목을 반환하고,
+    close()로 입력이 끝났음을 확인한 뒤 전체 트리를 얻음.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._pos = 0
+        self._stack: List[_Frame] = []
+        self._started = False
+        self._finished = False
+        # 부모의 description을 기다리는 항목 (도착 순서)
+        self._deferred: List[Node] = []
+        self._nodes: Dict[Path, Dict[str, Any]] = {}
+        self.tree: List[Dict[str, Any]] = []
+
+    @property
+    def finished(self) -> bool:
+        return self._finished
+
+    def feed(self, text: str) -> List[Node]:
+        """
+        텍스트 조각 입력.
+
+        Returns:
+            이번 조각으로 새로 완성된 항목 (경로, description) 목록
+
+        Raises:
+            ValueError: 올바르지 않은 JSON 또는 항목 형식
+        """
+        self._buffer = self._buffer[self._pos:] + text
+        self._pos = 0
+        nodes: List[Node] = []
+        while not self._finished:
+            token = self._next_token()
+            if token is None:
+                break
+            self._handle(token, nodes)
+        return nodes
+
+    def close(self) -> List[Dict[str, Any]]:
+        """
+        입력 종료. 전체 트리 반환.
+
+        Raises:
+            ValueError: 최상위 배열이 닫히지 않음
+        """
+        if not self._finished:
+            raise ValueError("Generated item list ended before the closing bracket")
+        return self.tree
+
+    # ==================== 토큰 ====================
+    def _next_token(self) -> Optional[Tuple[str, Any]]:
+        """다음 토큰 (조각이 토큰 중간에서 끝나면 None, 다음 feed에서 이어서 읽음)."""
+        buffer, i = self._buffer, self._pos
+        if not self._started:
+            i = buffer.find("[", i)
+            if i < 0:
+                self._pos = len(buffer)
+                return None
+        while i < len(buffer) and buffer[i] in " \t\r\n":
+            i += 1
+        self._pos = i
+        if i >= len(buffer):
+            return None
+        char = buffer[i]
+        if char in "{}[],:":
+            self._pos = i + 1
+            return char, None
+        if char == '"':
+            end = i + 1
+            while True:
+                end = buffer.find('"', end)
+                if end < 0:
+                    return None
+                backslashes = 0
+                while buffer[end - 1 - backslashes] == "\\":
+                    backslashes += 1
+                if backslashes % 2 == 0:
+                    break
+                end += 1
+            self._pos = end + 1
+            return "str", json.loads(buffer[i:end + 1])
+        match = _LITERAL_PATTERN.match(buffer, i)
+        if match is None:
+            raise ValueError(f"Unexpected character {char!r} in generated item list")
+        if match.end() == len(buffer):
+            return None  # 숫자 등이 다음 조각에서 이어질 수 있음
+        self._pos = match.end()
+        return "lit", json.loads(match.group())
+
+    # ==================== 구조 ====================
+    def _handle(self, token: Tuple[str, Any], nodes: List[Node]) -> None:
+        kind, value = token
+        if not self._stack:
+            if kind != "[":
+                raise ValueError("Generated item list must be a JSON array")
+            self._started = True
+            self._stack.append(_Frame("items", ()))
+            return
+
+        frame = self._stack[-1]
+        if kind in ("}", "]"):
+            self._close(frame, kind)
+            return
+        if kind in _VALUE_TOKENS:
+            frame.empty = False
+        if kind == ",":
+            if frame.state != "comma":
+                raise ValueError("Unexpected ',' in generated item list")
+            frame.state = "key" if frame.kind in ("node", "object") else "value"
+        elif frame.kind in ("node", "object") and frame.state == "key":
+            if kind != "str":
+                raise ValueError("Object keys in generated item list must be strings")
+            frame.key = value
+            frame.state = "colon"
+        elif kind == ":":
+            if frame.state != "colon":
+                raise ValueError("Unexpected ':' in generated item list")
+            frame.state = "value"
+        elif kind in _VALUE_TOKENS and frame.state == "value":
+            frame.state = "comma"
+            self._value(frame, kind, value, nodes)
+        else:
+            raise ValueError("Malformed generated item list")
+
+    def _value(self, frame: _Frame, kind: str, value: Any, nodes: List[Node]) -> None:
+        if frame.kind == "items":
+            if kind != "{":
+                raise ValueError("Generated items must be objects")
+            self._stack.append(_Frame("node", frame.path + (frame.count,)))
+            frame.count += 1
+        elif frame.kind == "node" and frame.key == "description" and kind != "{" and kind != "[":
+            if kind != "str" or frame.description is not None:
+                raise ValueError("Generated item description must be a single string")
+            frame.description = value
+            self._publish((frame.path, value), nodes)
+        elif frame.kind == "node" and frame.key == "children" and kind == "[":
+            self._stack.append(_Frame("items", frame.path))
+        elif kind == "{":
+            self._stack.append(_Frame("object"))
+        elif kind == "[":
+            self._stack.append(_Frame("array"))
+
+    def _close(self, frame: _Frame, kind: str) -> None:
+        expected = "}" if frame.kind in ("node", "object") else "]"
+        if kind != expected or not (frame.empty or frame.state == "comma"):
+            raise ValueError(f"Unexpected '{kind}' in generated item list")
+        if frame.kind == "node" and frame.description is None:
+            raise ValueError("Generated item has no description")
+        self._stack.pop()
+        if not self._stack:
+            self._finished = True
+
+    def _publish(self, node: Node, nodes: List[Node]) -> None:
+        """부모가 이미 나왔으면 바로 내보내고, 아니면 보류. 내보낼 때마다 보류 중인 자식 확인."""
+        self._deferred.append(node)
+        progressed = True
+        while progressed:
+            progressed = False
+            for pending in self._deferred:
+                path, description = pending
+                parent = self._nodes.get(path[:-1]) if len(path) > 1 else None
+                if len(path) > 1 and parent is None:
+                    continue
+                item = {"description": description}
+                (parent.setdefault("children", []) if parent is not None else self.tree).append(item)
+                self._nodes[path] = item
+                nodes.append(pending)
+                self._deferred.remove(pending)
+                progressed = True
+                break
+
+
+def iter_tree_nodes(tree: List[Dict[str, Any]], prefix: Path = ()) -> Iterator[Node]:
+    """완성된 트리의 항목을 스트리밍 파서와 같은 순서(부모 먼저)와 형식으로 나열."""
+    for index, item in enumerate(tree):
+        path = prefix + (index,)
+        yield path, item["description"]
+        yield from iter_tree_nodes(item.get("children") or [], path)
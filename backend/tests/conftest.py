@@ -1,35 +1,35 @@
 import sys
 import os
+import asyncio
+import json
+import tempfile
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
 import pytest
 
 # Add the project root to the Python path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from src.main import app
-from src.database import Base, get_db
-
-# Use an in-memory SQLite database for testing
-SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
-
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
-)
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Run the API against a throwaway SQLite database
+os.environ["STORAGE_ENGINE"] = "sqlite"
+_test_dir = tempfile.mkdtemp(prefix="taskgenie-test-")
+os.environ["SQLITE_PATH"] = os.path.join(_test_dir, "test.db")
+os.environ["AI_CACHE_PATH"] = os.path.join(_test_dir, "ai_cache.db")
+os.environ["JOB_QUEUE_PATH"] = os.path.join(_test_dir, "jobs.db")
+# Most tests reuse one user for many requests; test_rate_limit turns limiting back on
+os.environ["RATE_LIMIT_ENABLED"] = "false"
 
-# Create the database tables before running tests
-Base.metadata.create_all(bind=engine)
-
-def override_get_db():
-    try:
-        db = TestingSessionLocal()
-        yield db
-    finally:
-        db.close()
+from src.main import app
+from src import database, firestore_db
+from src.api import auth_firestore, todos_firestore
+from src.services import ai_service, generation_stream, storage, todo_service_firestore_async
+from src.services.firebase_tokens import firebase_token_verifier
+from src.services.security import principal_cache
+from src.services.tree_cache import tree_cache
+from src.services.tree_stream import iter_tree_nodes
 
-app.dependency_overrides[get_db] = override_get_db
+from firebase_keys import PROJECT_ID, FirebaseSigner
+from firestore_fake import FakeFirestore
+from oauth_stub import OAuthStubServer
 
 @pytest.fixture(scope="module")
 def client():
@@ -42,10 +42,151 @@ def client():
 @pytest.fixture(scope="module", autouse=True)
 def setup_and_teardown_database():
     """
-    Fixture to set up and tear down the database for each test session.
+    Fixture to set up and tear down the database for each test module.
     """
     # Create all tables
-    Base.metadata.create_all(bind=engine)
+    database.init_db()
     yield
     # Drop all tables
-    Base.metadata.drop_all(bind=engine)
+    database.drop_db()
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    """
+    Serve the Firestore engine from an in-memory fake with deterministic AI output.
+    """
+    fake = FakeFirestore()
+    tree_cache.clear()
+    principal_cache.clear()
+    firestore_db.set_firestore_db(fake)
+    firestore_db.set_async_firestore_db(fake.async_client())
+    monkeypatch.setattr(storage, "STORAGE_ENGINE", "firestore")
+    async def generate_todo_items(keyword, user_id=None):
+        return [
+            {"description": f"step {i}", "children": [{"description": f"step {i}.{j}"} for j in range(2)]}
+            for i in range(3)
+        ]
+
+    async def stream_todo_items(keyword, user_id=None):
+        for node in iter_tree_nodes(await generate_todo_items(keyword)):
+            yield node
+
+    async def generate_sub_tasks(user_id=None, **kwargs):
+        return ["sub 1", "sub 2", "sub 3"]
+
+    async def parse_task(text, user_id=None):
+        return {"description": text, "priority": "high", "due_date": None}
+
+    async def parse_tasks(texts, user_id=None):
+        return [await parse_task(text) for text in texts]
+
+    monkeypatch.setattr(todo_service_firestore_async, "generate_todo_items_from_keyword", generate_todo_items)
+    monkeypatch.setattr(generation_stream, "stream_todo_items_from_keyword", stream_todo_items)
+    monkeypatch.setattr(todo_service_firestore_async, "generate_sub_tasks_from_main_task", generate_sub_tasks)
+    monkeypatch.setattr(todos_firestore.nlp_parser, "parse_task", parse_task)
+    monkeypatch.setattr(todos_firestore.nlp_parser, "parse_tasks", parse_tasks)
+    yield fake
+    firestore_db.set_firestore_db(None)
+    firestore_db.set_async_firestore_db(None)
+
+
+@pytest.fixture
+def auth_headers(client: TestClient, fake_db):
+    client.post("/auth/register", json={"username": "budget", "password": "budget", "email": "budget@example.com"})
+    response = client.post("/auth/login", data={"username": "budget", "password": "budget"})
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture
+def project(client: TestClient, fake_db, auth_headers):
+    response = client.post("/todos/generate", headers=auth_headers, json={"keyword": "budget"})
+    assert response.status_code == 200
+    fake_db.reset_counts()
+    return response.json()
+
+
+@pytest.fixture
+def oauth_stub(monkeypatch):
+    """
+    Point the Naver and Kakao callbacks at a local stub OAuth server.
+    """
+    server = OAuthStubServer().start()
+    monkeypatch.setattr(auth_firestore, "NAVER_TOKEN_URL", f"{server.base_url}/naver/token")
+    monkeypatch.setattr(auth_firestore, "NAVER_PROFILE_URL", f"{server.base_url}/naver/me")
+    monkeypatch.setattr(auth_firestore, "KAKAO_TOKEN_URL", f"{server.base_url}/kakao/token")
+    monkeypatch.setattr(auth_firestore, "KAKAO_PROFILE_URL", f"{server.base_url}/kakao/me")
+    yield server
+    server.stop()
+
+
+@pytest.fixture(scope="session")
+def signing_key():
+    return FirebaseSigner("test-kid")
+
+
+@pytest.fixture
+def firebase_signer(oauth_stub, signing_key, monkeypatch):
+    """
+    Serve locally minted Firebase signing certificates from the stub server.
+    """
+    oauth_stub.routes[("GET", "/certs")] = signing_key.certificates()
+    oauth_stub.headers["/certs"] = {"Cache-Control": "public, max-age=3600, must-revalidate"}
+    monkeypatch.setattr(firebase_token_verifier.certificates, "url", f"{oauth_stub.base_url}/certs")
+    monkeypatch.setattr(firebase_token_verifier, "project_id", PROJECT_ID)
+    firebase_token_verifier.clear()
+    firebase_token_verifier.certificates.clear()
+    yield signing_key
+    firebase_token_verifier.clear()
+    firebase_token_verifier.certificates.clear()
+
+
+class FakeClock:
+    """Time source for caches and breakers that tests move forward by setting `now`."""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class ScriptedGemini:
+    """
+    Stands in for ai_client.generate: each call waits `delay` seconds and takes the
+    next scripted response (the last one repeats). Strings are returned as-is,
+    exceptions are raised and anything else is returned as JSON.
+    """
+
+    def __init__(self):
+        self.responses = []
+        self.prompts = []
+        self.delay = 0.0
+
+    def script(self, *responses, delay=0.0):
+        self.responses = list(responses)
+        self.delay = delay
+        return self
+
+    async def __call__(self, prompt, operation, user_id=None, **kwargs):
+        self.prompts.append(prompt)
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        response = self.responses[min(len(self.prompts), len(self.responses)) - 1]
+        if isinstance(response, BaseException):
+            raise response
+        return response if isinstance(response, str) else json.dumps(response, ensure_ascii=False)
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def gemini(monkeypatch):
+    """
+    Replace Gemini calls made through ai_client with a ScriptedGemini (set answers with gemini.script()).
+    """
+    fake = ScriptedGemini()
+    monkeypatch.setattr(ai_service.ai_client, "generate", fake)
+    return fake
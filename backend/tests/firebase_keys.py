@@ -0,0 +1,56 @@
+"""
+Locally minted Firebase signing keys and ID tokens.
+
+FirebaseSigner holds an RSA key and a self-signed certificate under a key id;
+certificates() is the JSON body Google serves for its signing certificates,
+and mint() issues an RS256 ID token for the given project.
+"""
+import time
+from datetime import datetime, timedelta, timezone
+
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.x509.oid import NameOID
+from jose import jwt
+
+PROJECT_ID = "taskgenie-test"
+
+
+class FirebaseSigner:
+    def __init__(self, kid):
+        self.kid = kid
+        self._key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "securetoken.system.gserviceaccount.com")])
+        now = datetime.now(timezone.utc)
+        certificate = (
+            x509.CertificateBuilder()
+            .subject_name(name)
+            .issuer_name(name)
+            .public_key(self._key.public_key())
+            .serial_number(x509.random_serial_number())
+            .not_valid_before(now - timedelta(days=1))
+            .not_valid_after(now + timedelta(days=1))
+            .sign(self._key, hashes.SHA256())
+        )
+        self.certificate_pem = certificate.public_bytes(serialization.Encoding.PEM).decode("utf-8")
+        self._private_pem = self._key.private_bytes(
+            serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption(),
+        ).decode("utf-8")
+
+    def certificates(self):
+        return {self.kid: self.certificate_pem}
+
+    def mint(self, uid="firebase-uid", project_id=PROJECT_ID, kid=None, lifetime=3600, **overrides):
+        now = int(time.time())
+        claims = {
+            "iss": f"https://securetoken.google.com/{project_id}",
+            "aud": project_id,
+            "sub": uid,
+            "iat": now,
+            "auth_time": now,
+            "exp": now + lifetime,
+            "email": f"{uid}@example.com",
+        }
+        claims.update(overrides)
+        return jwt.encode(claims, self._private_pem, algorithm="RS256", headers={"kid": kid or self.kid})
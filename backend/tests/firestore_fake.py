@@ -0,0 +1,446 @@
+"""
+In-memory stand-in for the subset of google.cloud.firestore.Client used by the backend.
+
+Every operation is recorded so tests can assert how many billable reads and
+writes an endpoint issues. Counting follows Firestore billing:
+- document get / get_all: 1 read per requested document (missing ones included)
+- query: 1 read per returned document, minimum 1 read per query
+- create / set / update / delete (direct or in a batch): 1 write per document
+
+Inject it through firestore_db.set_firestore_db(fake) and, for the async
+request path, firestore_db.set_async_firestore_db(fake.async_client()).
+Both clients share the same documents and counters.
+"""
+import copy
+import uuid
+from datetime import datetime, timezone
+
+from google.api_core.exceptions import AlreadyExists, InvalidArgument, NotFound
+from google.cloud import firestore
+
+# Firestore rejects batches with more operations than this
+MAX_BATCH_OPERATIONS = 500
+
+
+def _resolve_timestamps(data):
+    now = datetime.now(timezone.utc)
+    resolved = {}
+    for key, value in data.items():
+        if value is firestore.SERVER_TIMESTAMP:
+            resolved[key] = now
+        elif value is firestore.DELETE_FIELD:
+            resolved[key] = value
+        else:
+            resolved[key] = copy.deepcopy(value)
+    return resolved
+
+
+def _get_field(data, field_path):
+    value = data
+    for part in field_path.split('.'):
+        if not isinstance(value, dict) or part not in value:
+            raise KeyError(field_path)
+        value = value[part]
+    return value
+
+
+def _matches(data, field_path, op, expected):
+    try:
+        value = _get_field(data, field_path)
+    except KeyError:
+        return False
+    if op == '==':
+        return value == expected
+    if op == '!=':
+        return value is not None and value != expected
+    if op == 'in':
+        return value in expected
+    if op == 'not-in':
+        return value is not None and value not in expected
+    if op == 'array_contains':
+        return isinstance(value, list) and expected in value
+    if op == 'array_contains_any':
+        return isinstance(value, list) and any(v in value for v in expected)
+    if value is None:
+        return False
+    try:
+        if op == '<':
+            return value < expected
+        if op == '<=':
+            return value <= expected
+        if op == '>':
+            return value > expected
+        if op == '>=':
+            return value >= expected
+    except TypeError:
+        return False
+    raise ValueError(f"Unsupported operator: {op}")
+
+
+class FakeDocumentSnapshot:
+    def __init__(self, reference, data):
+        self.reference = reference
+        self.id = reference.id
+        self._data = data
+
+    @property
+    def exists(self):
+        return self._data is not None
+
+    def to_dict(self):
+        return copy.deepcopy(self._data) if self._data is not None else None
+
+    def get(self, field_path):
+        return _get_field(self._data, field_path)
+
+
+class FakeDocumentReference:
+    def __init__(self, client, collection_name, doc_id):
+        self._client = client
+        self._collection_name = collection_name
+        self.id = doc_id
+
+    @property
+    def path(self):
+        return f"{self._collection_name}/{self.id}"
+
+    def get(self):
+        self._client._record_read('get', self.path, 1)
+        return self._snapshot()
+
+    def create(self, data):
+        if self._snapshot().exists:
+            raise AlreadyExists(f"Document already exists: {self.path}")
+        self._client._record_write('create', self.path)
+        self._client._apply_set(self, data, False)
+
+    def set(self, data, merge=False):
+        self._client._record_write('set', self.path)
+        self._client._apply_set(self, data, merge)
+
+    def update(self, data):
+        self._client._record_write('update', self.path)
+        self._client._apply_update(self, data)
+
+    def delete(self):
+        self._client._record_write('delete', self.path)
+        self._client._apply_delete(self)
+
+    def _snapshot(self):
+        return FakeDocumentSnapshot(self, self._client._documents(self._collection_name).get(self.id))
+
+    def __eq__(self, other):
+        return isinstance(other, FakeDocumentReference) and other.path == self.path
+
+    def __hash__(self):
+        return hash(self.path)
+
+
+class FakeQuery:
+    def __init__(self, client, collection_name, filters=(), orders=(), limit_count=None):
+        self._client = client
+        self._collection_name = collection_name
+        self._filters = tuple(filters)
+        self._orders = tuple(orders)
+        self._limit = limit_count
+
+    def _copy(self, **changes):
+        state = {
+            'filters': self._filters,
+            'orders': self._orders,
+            'limit_count': self._limit,
+        }
+        state.update(changes)
+        return FakeQuery(self._client, self._collection_name, **state)
+
+    def where(self, field_path=None, op_string=None, value=None, *, filter=None):
+        if filter is not None:
+            field_path, op_string, value = filter.field_path, filter.op_string, filter.value
+        return self._copy(filters=self._filters + ((field_path, op_string, value),))
+
+    def order_by(self, field_path, direction=firestore.Query.ASCENDING):
+        return self._copy(orders=self._orders + ((field_path, direction),))
+
+    def limit(self, count):
+        return self._copy(limit_count=count)
+
+    def stream(self):
+        return iter(self._execute())
+
+    def get(self):
+        return self._execute()
+
+    def _execute(self):
+        documents = self._client._documents(self._collection_name)
+        matched = [
+            (doc_id, data) for doc_id, data in documents.items()
+            if all(_matches(data, f, op, v) for f, op, v in self._filters)
+        ]
+        # Like Firestore, documents without an ordered field are excluded
+        for field_path, _ in self._orders:
+            matched = [(doc_id, data) for doc_id, data in matched if _has_field(data, field_path)]
+        matched.sort(key=lambda entry: entry[0])
+        for field_path, direction in reversed(self._orders):
+            matched.sort(
+                key=lambda entry: _order_key(_get_field(entry[1], field_path)),
+                reverse=direction == firestore.Query.DESCENDING,
+            )
+        if self._limit is not None:
+            matched = matched[:self._limit]
+
+        description = self._describe()
+        self._client.queries.append(description)
+        self._client._record_read('query', description, max(1, len(matched)))
+        return [
+            FakeDocumentSnapshot(FakeDocumentReference(self._client, self._collection_name, doc_id), data)
+            for doc_id, data in matched
+        ]
+
+    def _describe(self):
+        parts = [self._collection_name]
+        parts += [f"where({f} {op} {v!r})" for f, op, v in self._filters]
+        parts += [f"order_by({f} {d})" for f, d in self._orders]
+        if self._limit is not None:
+            parts.append(f"limit({self._limit})")
+        return ".".join(parts)
+
+
+def _has_field(data, field_path):
+    try:
+        _get_field(data, field_path)
+    except KeyError:
+        return False
+    return True
+
+
+def _order_key(value):
+    # null sorts before every other value
+    return (value is not None, value if value is not None else 0)
+
+
+class FakeCollectionReference(FakeQuery):
+    def __init__(self, client, name):
+        super().__init__(client, name)
+        self.id = name
+
+    def document(self, document_id=None):
+        return FakeDocumentReference(self._client, self._collection_name, document_id or uuid.uuid4().hex[:20])
+
+    def add(self, data):
+        reference = self.document()
+        reference.set(data)
+        return None, reference
+
+
+class FakeWriteBatch:
+    def __init__(self, client):
+        self._client = client
+        self._operations = []
+
+    def create(self, reference, data):
+        self._operations.append(('create', reference, data, False))
+
+    def set(self, reference, data, merge=False):
+        self._operations.append(('set', reference, data, merge))
+
+    def update(self, reference, data):
+        self._operations.append(('update', reference, data, None))
+
+    def delete(self, reference):
+        self._operations.append(('delete', reference, None, None))
+
+    def commit(self):
+        if len(self._operations) > MAX_BATCH_OPERATIONS:
+            raise InvalidArgument(f"maximum {MAX_BATCH_OPERATIONS} writes allowed per request")
+        for kind, reference, _, _ in self._operations:
+            if kind == 'update' and not reference._snapshot().exists:
+                raise NotFound(f"No document to update: {reference.path}")
+            if kind == 'create' and reference._snapshot().exists:
+                raise AlreadyExists(f"Document already exists: {reference.path}")
+        self._client.batch_commits += 1
+        for kind, reference, data, merge in self._operations:
+            self._client._record_write(kind, reference.path)
+            if kind in ('create', 'set'):
+                self._client._apply_set(reference, data, merge)
+            elif kind == 'update':
+                self._client._apply_update(reference, data)
+            else:
+                self._client._apply_delete(reference)
+        self._operations = []
+
+
+class FakeFirestore:
+    """In-memory Firestore client that records every read, write and query."""
+
+    def __init__(self):
+        self._collections = {}
+        self.reset_counts()
+
+    def reset_counts(self):
+        self.reads = 0
+        self.writes = 0
+        self.batch_commits = 0
+        self.queries = []
+        self.operations = []
+
+    def collection(self, name):
+        return FakeCollectionReference(self, name)
+
+    def async_client(self):
+        return FakeAsyncFirestore(self)
+
+    def batch(self):
+        return FakeWriteBatch(self)
+
+    def get_all(self, references):
+        references = list(references)
+        for reference in references:
+            self._record_read('get_all', reference.path, 1)
+        return iter([reference._snapshot() for reference in references])
+
+    def _documents(self, collection_name):
+        return self._collections.setdefault(collection_name, {})
+
+    def _record_read(self, kind, detail, count):
+        self.reads += count
+        self.operations.append((kind, detail, count))
+
+    def _record_write(self, kind, path):
+        self.writes += 1
+        self.operations.append((kind, path, 1))
+
+    def _apply_set(self, reference, data, merge):
+        documents = self._documents(reference._collection_name)
+        resolved = _resolve_timestamps(data)
+        if merge and reference.id in documents:
+            documents[reference.id].update(resolved)
+        else:
+            documents[reference.id] = resolved
+
+    def _apply_update(self, reference, data):
+        documents = self._documents(reference._collection_name)
+        if reference.id not in documents:
+            raise NotFound(f"No document to update: {reference.path}")
+        for key, value in _resolve_timestamps(data).items():
+            if value is firestore.DELETE_FIELD:
+                documents[reference.id].pop(key, None)
+            else:
+                documents[reference.id][key] = value
+
+    def _apply_delete(self, reference):
+        self._documents(reference._collection_name).pop(reference.id, None)
+
+
+class _AsyncSnapshots:
+    def __init__(self, snapshots):
+        self._snapshots = iter(snapshots)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._snapshots)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+def _async_snapshot(snapshot):
+    return FakeDocumentSnapshot(FakeAsyncDocumentReference(snapshot.reference), snapshot._data)
+
+
+class FakeAsyncDocumentReference:
+    def __init__(self, reference):
+        self._sync = reference
+        self.id = reference.id
+
+    @property
+    def path(self):
+        return self._sync.path
+
+    async def get(self):
+        return _async_snapshot(self._sync.get())
+
+    async def create(self, data):
+        self._sync.create(data)
+
+    async def set(self, data, merge=False):
+        self._sync.set(data, merge=merge)
+
+    async def update(self, data):
+        self._sync.update(data)
+
+    async def delete(self):
+        self._sync.delete()
+
+    def __eq__(self, other):
+        return isinstance(other, FakeAsyncDocumentReference) and other.path == self.path
+
+    def __hash__(self):
+        return hash(self.path)
+
+
+class FakeAsyncQuery:
+    def __init__(self, query):
+        self._sync = query
+
+    def where(self, *args, **kwargs):
+        return FakeAsyncQuery(self._sync.where(*args, **kwargs))
+
+    def order_by(self, *args, **kwargs):
+        return FakeAsyncQuery(self._sync.order_by(*args, **kwargs))
+
+    def limit(self, count):
+        return FakeAsyncQuery(self._sync.limit(count))
+
+    def stream(self):
+        return _AsyncSnapshots(_async_snapshot(snapshot) for snapshot in self._sync._execute())
+
+    async def get(self):
+        return [_async_snapshot(snapshot) for snapshot in self._sync._execute()]
+
+
+class FakeAsyncCollectionReference(FakeAsyncQuery):
+    def __init__(self, collection):
+        super().__init__(collection)
+        self.id = collection.id
+
+    def document(self, document_id=None):
+        return FakeAsyncDocumentReference(self._sync.document(document_id))
+
+
+class FakeAsyncWriteBatch:
+    def __init__(self, batch):
+        self._sync = batch
+
+    def create(self, reference, data):
+        self._sync.create(reference._sync, data)
+
+    def set(self, reference, data, merge=False):
+        self._sync.set(reference._sync, data, merge=merge)
+
+    def update(self, reference, data):
+        self._sync.update(reference._sync, data)
+
+    def delete(self, reference):
+        self._sync.delete(reference._sync)
+
+    async def commit(self):
+        self._sync.commit()
+
+
+class FakeAsyncFirestore:
+    """AsyncClient view of a FakeFirestore (shares documents and counters)."""
+
+    def __init__(self, client):
+        self._client = client
+
+    def collection(self, name):
+        return FakeAsyncCollectionReference(self._client.collection(name))
+
+    def batch(self):
+        return FakeAsyncWriteBatch(self._client.batch())
+
+    def get_all(self, references):
+        snapshots = self._client.get_all([reference._sync for reference in references])
+        return _AsyncSnapshots(_async_snapshot(snapshot) for snapshot in snapshots)
@@ -0,0 +1,113 @@
+"""
+Local HTTP server standing in for the Naver and Kakao OAuth endpoints.
+
+It speaks HTTP/1.1 with keep-alive, so tests can check that the pooled client
+reuses connections (server.connections counts accepted TCP connections).
+Queue faults per path in server.faults: an int status code answers once with
+that status, "slow" sleeps past the client's read timeout before answering,
+and "drop" closes the connection without a response. server.requests records
+(method, path) for every request that reached the server. Extra routes
+(such as Firebase signing certificates) go in server.routes, and extra
+response headers per path in server.headers.
+"""
+import json
+import threading
+import time
+from collections import defaultdict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+NAVER_PROFILE = {"resultcode": "00", "response": {"id": "naver-1", "email": "stub@naver.com", "name": "stub"}}
+KAKAO_PROFILE = {"id": 1, "kakao_account": {"email": "stub@kakao.com", "profile": {"nickname": "stub"}}}
+
+ROUTES = {
+    ("POST", "/naver/token"): {"access_token": "naver-access"},
+    ("GET", "/naver/me"): NAVER_PROFILE,
+    ("POST", "/kakao/token"): {"access_token": "kakao-access"},
+    ("GET", "/kakao/me"): KAKAO_PROFILE,
+}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def _respond(self, status, payload, headers=None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _handle(self):
+        path = urlsplit(self.path).path
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        with self.server.lock:
+            self.server.requests.append((self.command, path))
+            faults = self.server.faults[path]
+            fault = faults.popleft() if faults else None
+
+        if fault == "slow":
+            time.sleep(self.server.slow_seconds)
+        elif fault == "drop":
+            self.close_connection = True
+            return
+        elif isinstance(fault, int):
+            self._respond(fault, {"error": "stub fault"})
+            return
+
+        payload = self.server.routes.get((self.command, path))
+        if payload is None:
+            self._respond(404, {"error": "not found"})
+        else:
+            self._respond(200, payload, self.server.headers.get(path))
+
+    do_GET = _handle
+    do_POST = _handle
+
+
+class OAuthStubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    block_on_close = False
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.requests = []
+        self.faults = defaultdict(deque)
+        self.routes = dict(ROUTES)
+        self.headers = {}
+        self.slow_seconds = 1.0
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def handle_error(self, request, client_address):
+        pass  # clients that timed out close their end before "slow" answers
+
+    def count(self, method, path):
+        return self.requests.count((method, path))
@@ -0,0 +1,162 @@
+"""
+In-memory stand-in for the subset of redis.asyncio.Redis used by the shared cache.
+
+A FakeRedisServer holds the keyspace and pub/sub channels; each call to
+server.client() returns a connection to it, so several SharedCache instances
+can play the part of separate workers. Set server.down = True to make every
+command fail with a ConnectionError, as a lost Redis would.
+"""
+import asyncio
+import time
+
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+
+def _encode(value):
+    if isinstance(value, bytes):
+        return value
+    return str(value).encode("utf-8")
+
+
+class FakeRedisServer:
+    def __init__(self, timer=time.monotonic):
+        self._timer = timer
+        self._data = {}  # key -> (value, expires_at or None)
+        self._subscribers = {}  # channel -> list of queues
+        self.down = False
+
+    def client(self):
+        return FakeRedis(self)
+
+    def _check(self):
+        if self.down:
+            raise RedisConnectionError("fake redis is down")
+
+    def _get(self, key):
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= self._timer():
+            del self._data[key]
+            return None
+        return value
+
+    def _set(self, key, value, ex=None):
+        self._data[key] = (_encode(value), self._timer() + ex if ex else None)
+        return True
+
+    def _incr(self, key):
+        value = int(self._get(key) or 0) + 1
+        expires_at = self._data[key][1] if key in self._data else None
+        self._data[key] = (_encode(value), expires_at)
+        return value
+
+    def _expire(self, key, seconds):
+        if self._get(key) is None:
+            return False
+        self._data[key] = (self._data[key][0], self._timer() + seconds)
+        return True
+
+    def _delete(self, *keys):
+        return sum(1 for key in keys if self._data.pop(key, None) is not None)
+
+    def _publish(self, channel, message):
+        queues = self._subscribers.get(_encode(channel), [])
+        for queue in queues:
+            queue.put_nowait({"type": "message", "channel": _encode(channel), "data": _encode(message)})
+        return len(queues)
+
+
+class FakeRedis:
+    def __init__(self, server):
+        self._server = server
+
+    async def get(self, key):
+        self._server._check()
+        return self._server._get(key)
+
+    async def mget(self, *keys):
+        self._server._check()
+        return [self._server._get(key) for key in keys]
+
+    async def set(self, key, value, ex=None):
+        self._server._check()
+        return self._server._set(key, value, ex)
+
+    async def incr(self, key):
+        self._server._check()
+        return self._server._incr(key)
+
+    async def expire(self, key, seconds):
+        self._server._check()
+        return self._server._expire(key, seconds)
+
+    async def delete(self, *keys):
+        self._server._check()
+        return self._server._delete(*keys)
+
+    async def publish(self, channel, message):
+        self._server._check()
+        return self._server._publish(channel, message)
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self._server)
+
+    def pubsub(self, ignore_subscribe_messages=False):
+        return FakePubSub(self._server)
+
+    async def aclose(self):
+        pass
+
+
+class FakePipeline:
+    def __init__(self, server):
+        self._server = server
+        self._commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self._commands = []
+
+    def _queue(name):
+        def queue(self, *args, **kwargs):
+            self._commands.append((name, args, kwargs))
+            return self
+        return queue
+
+    incr = _queue("_incr")
+    expire = _queue("_expire")
+    delete = _queue("_delete")
+    set = _queue("_set")
+    publish = _queue("_publish")
+
+    async def execute(self):
+        self._server._check()
+        results = [getattr(self._server, name)(*args, **kwargs) for name, args, kwargs in self._commands]
+        self._commands = []
+        return results
+
+
+class FakePubSub:
+    def __init__(self, server):
+        self._server = server
+        self._queue = asyncio.Queue()
+        self._channels = []
+
+    async def subscribe(self, *channels):
+        self._server._check()
+        for channel in channels:
+            self._server._subscribers.setdefault(_encode(channel), []).append(self._queue)
+            self._channels.append(_encode(channel))
+
+    async def listen(self):
+        while True:
+            yield await self._queue.get()
+
+    async def aclose(self):
+        for channel in self._channels:
+            self._server._subscribers[channel].remove(self._queue)
+        self._channels = []
@@ -0,0 +1,137 @@
+"""
+AI response cache: results are keyed by normalized inputs (plus the date and
+due-time bucket for natural-language parsing), served from memory first and
+from the SQLite file after a restart, expire per function, and never store
+fallbacks.
+"""
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from src.services import ai_cache as ai_cache_module
+from src.services import ai_service
+from src.services.ai_cache import AIResponseCache
+from src.services.keyword_index import KeywordTreeIndex
+
+FUNCTION = "generate_todo_items_from_keyword"
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = AIResponseCache(max_entries=16, path=str(tmp_path / "ai_cache.db"))
+    monkeypatch.setattr(ai_service, "ai_cache", cache)
+    monkeypatch.setattr(ai_service, "keyword_index", KeywordTreeIndex(path=None))
+    return cache
+
+
+def test_keys_ignore_case_width_and_whitespace(cache):
+    key = cache.key(FUNCTION, "gemini", "웹사이트 개발")
+    assert cache.key(FUNCTION, "gemini", "  웹사이트   개발 ") == key
+    assert cache.key(FUNCTION, "gemini", "React 공부") == cache.key(FUNCTION, "gemini", "ＲＥＡＣＴ 공부")
+    assert cache.key(FUNCTION, "other-model", "웹사이트 개발") != key
+    assert cache.key("generate_sub_tasks_from_main_task", "gemini", "웹사이트 개발") != key
+
+
+def test_memory_then_disk_tiers(tmp_path):
+    path = str(tmp_path / "ai_cache.db")
+    requests = ai_cache_module.AI_CACHE_REQUESTS
+    saved = ai_cache_module.AI_CACHE_SAVED_SECONDS
+    before = {tier: requests.value(FUNCTION, tier) for tier in ("memory", "disk", "miss")}
+    saved_before = saved.value(FUNCTION)
+
+    async def scenario():
+        cache = AIResponseCache(max_entries=16, path=path)
+        key = cache.key(FUNCTION, "gemini", "여행")
+        assert await cache.get(FUNCTION, key) is None
+        await cache.put(FUNCTION, key, [{"description": "짐 싸기"}], latency=2.5)
+        assert await cache.get(FUNCTION, key) == [{"description": "짐 싸기"}]
+        # A new process only has the SQLite file
+        restarted = AIResponseCache(max_entries=16, path=path)
+        assert await restarted.get(FUNCTION, key) == [{"description": "짐 싸기"}]
+        assert await restarted.get(FUNCTION, key) == [{"description": "짐 싸기"}]
+
+    asyncio.run(scenario())
+    assert {tier: requests.value(FUNCTION, tier) - before[tier] for tier in before} == {"memory": 2, "disk": 1, "miss": 1}
+    assert saved.value(FUNCTION) - saved_before == pytest.approx(7.5)
+
+
+def test_entries_expire_per_function_ttl(tmp_path, clock):
+    cache = AIResponseCache(max_entries=16, path=str(tmp_path / "ai_cache.db"), timer=clock,
+                            ttls={FUNCTION: 60, "analyze_task_from_natural_language": 0})
+
+    async def scenario():
+        key = cache.key(FUNCTION, "gemini", "여행")
+        await cache.put(FUNCTION, key, ["a"], latency=1)
+        await cache.put("analyze_task_from_natural_language", "parse-key", {"description": "a"}, latency=1)
+        assert await cache.get("analyze_task_from_natural_language", "parse-key") is None
+        clock.now += 59
+        assert await cache.get(FUNCTION, key) == ["a"]
+        clock.now += 2
+        assert await cache.get(FUNCTION, key) is None
+
+    asyncio.run(scenario())
+    assert cache.prune() == 1
+
+
+def test_repeated_keyword_generation_calls_gemini_once(cache, gemini):
+    gemini.script([{"description": "기획"}])
+    first = asyncio.run(ai_service.generate_todo_items_from_keyword("웹사이트 개발"))
+    first[0]["description"] = "changed by caller"
+    second = asyncio.run(ai_service.generate_todo_items_from_keyword(" 웹사이트 개발"))
+    assert second == [{"description": "기획"}]
+    assert len(gemini.prompts) == 1
+
+
+def test_subtask_key_includes_parent_context(cache, gemini):
+    gemini.script("1. 자료 조사\n2. 초안 작성")
+
+    async def scenario():
+        for parents in (["보고서", "작성"], ["보고서", "작성"], ["발표", "작성"]):
+            await ai_service.generate_sub_tasks_from_main_task("작성", "업무", parents)
+
+    asyncio.run(scenario())
+    assert len(gemini.prompts) == 2
+
+
+def test_fallback_responses_are_not_cached(cache, gemini):
+    gemini.script(TimeoutError())
+    for _ in range(2):
+        items = asyncio.run(ai_service.generate_todo_items_from_keyword("여행"))
+        assert items[0]["description"] == "여행 관련 작업 브레인스토밍"
+    assert len(gemini.prompts) == 2
+
+
+def test_parse_key_uses_the_date_and_due_bucket(cache, gemini, monkeypatch):
+    gemini.script({"description": "운동하기", "due_date": None})
+    frozen = {"now": datetime(2026, 10, 18, 9, 5, 10)}
+
+    class _FrozenDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return frozen["now"].replace(tzinfo=tz)
+
+    monkeypatch.setattr(ai_service, "datetime", _FrozenDatetime)
+    asyncio.run(ai_service.analyze_task_from_natural_language("내일까지 운동하기"))
+    # Minutes later "내일까지" still rounds up to the same half hour, so the cached result is reused
+    frozen["now"] = datetime(2026, 10, 18, 9, 20, 50)
+    asyncio.run(ai_service.analyze_task_from_natural_language("내일까지 운동하기"))
+    assert len(gemini.prompts) == 1
+    # "내일까지" now resolves to a different due time, so the text is parsed again
+    frozen["now"] = datetime(2026, 10, 18, 9, 35, 0)
+    asyncio.run(ai_service.analyze_task_from_natural_language("내일까지 운동하기"))
+    assert len(gemini.prompts) == 2
+
+
+def test_parse_ttl_covers_the_whole_due_bucket(tmp_path, gemini, clock, monkeypatch):
+    cache = AIResponseCache(max_entries=16, path=str(tmp_path / "ai_cache.db"), timer=clock)
+    monkeypatch.setattr(ai_service, "ai_cache", cache)
+    gemini.script({"description": "운동하기", "due_date": None})
+
+    # 09:01:00 and 09:30:50 both round "내일까지" up to 09:30, almost 30 minutes apart
+    first = datetime(2026, 10, 18, 9, 1, 0)
+    last = datetime(2026, 10, 18, 9, 30, 50)
+    asyncio.run(ai_service.analyze_task_from_natural_language("내일까지 운동하기", now=first))
+    clock.now += (last - first).total_seconds()
+    asyncio.run(ai_service.analyze_task_from_natural_language("내일까지 운동하기", now=last))
+    assert len(gemini.prompts) == 1
@@ -0,0 +1,123 @@
+"""
+Gemini calls share one client: model instances are reused, calls run on the
+event loop behind a global and a per-user concurrency limit, and every call
+has a deadline that includes time spent waiting for a slot.
+"""
+import asyncio
+import threading
+
+import anyio
+import anyio.to_thread
+import pytest
+
+from src.services import ai_client as ai_client_module
+from src.services import ai_service
+from src.services.ai_client import AIClient, call_from_thread
+
+
+class _FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class _FakeModel:
+    """Records how many calls overlap and the request options each call got."""
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.running = 0
+        self.max_running = 0
+        self.request_options = []
+
+    async def generate_content_async(self, prompt, request_options=None):
+        self.request_options.append(request_options)
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.running -= 1
+        return _FakeResponse(f"echo {prompt}")
+
+
+def _client(model, **kwargs):
+    client = AIClient(model_name="fake", **kwargs)
+    client._models["fake"] = model
+    return client
+
+
+def test_models_are_created_once_per_name():
+    client = AIClient(model_name="gemini-2.5-flash")
+    assert client.model() is client.model("gemini-2.5-flash")
+
+
+def test_global_limit_queues_calls():
+    model = _FakeModel()
+    client = _client(model, max_concurrency=2, max_concurrency_per_user=10)
+
+    async def scenario():
+        return await asyncio.gather(*(client.generate(f"p{i}", "test", user_id=f"u{i}") for i in range(6)))
+
+    assert asyncio.run(scenario()) == [f"echo p{i}" for i in range(6)]
+    assert model.max_running == 2
+    assert client.in_flight == client.waiting == 0
+
+
+def test_per_user_limit_leaves_room_for_other_users():
+    model = _FakeModel()
+    client = _client(model, max_concurrency=10, max_concurrency_per_user=1)
+    snapshot = {}
+
+    async def call(user_id):
+        await client.generate("p", "test", user_id=user_id)
+
+    async def scenario():
+        tasks = [asyncio.create_task(call("alice")) for _ in range(3)] + [asyncio.create_task(call("bob"))]
+        await asyncio.sleep(0.01)
+        snapshot.update(running=model.running, waiting=client.waiting)
+        await asyncio.gather(*tasks)
+
+    asyncio.run(scenario())
+    # One call per user is running; alice's other two wait for her slot
+    assert snapshot == {"running": 2, "waiting": 2}
+    assert client._user_slots == {}
+
+
+def test_deadline_includes_queue_wait():
+    model = _FakeModel(delay=0.3)
+    client = _client(model, max_concurrency=1)
+    timeouts = ai_client_module.AI_CALL_TIMEOUTS
+
+    async def scenario():
+        first = asyncio.create_task(client.generate("slow", "deadline-test"))
+        await asyncio.sleep(0.01)
+        with pytest.raises(TimeoutError):
+            await client.generate("queued", "deadline-test", timeout=0.1)
+        assert client.waiting == 0
+        await first
+
+    before = timeouts.value("deadline-test", "queued")
+    asyncio.run(scenario())
+    assert timeouts.value("deadline-test", "queued") - before == 1
+    # The SDK call itself is told how much of the deadline is left
+    assert 0 < model.request_options[0]["timeout"] <= client.timeout
+
+
+def test_service_falls_back_when_deadline_passes(gemini):
+    gemini.script(TimeoutError())
+    items = asyncio.run(ai_service.generate_todo_items_from_keyword("여행", user_id="u1"))
+    assert items[0]["description"] == "여행 관련 작업 브레인스토밍"
+
+
+def test_call_from_thread_runs_on_the_event_loop():
+    async def loop_thread():
+        return threading.get_ident()
+
+    async def scenario():
+        worker_result = await anyio.to_thread.run_sync(call_from_thread, loop_thread)
+        return worker_result, threading.get_ident()
+
+    worker_result, loop_ident = anyio.run(scenario)
+    assert worker_result == loop_ident
+    # Outside a worker thread it falls back to a private event loop
+    assert call_from_thread(loop_thread) == threading.get_ident()
@@ -0,0 +1,211 @@
+"""
+Gemini outages fail fast: each AI function has its own deadline, a circuit
+breaker opens on errors or slow answers and rejects calls immediately until a
+half-open probe succeeds, and the global concurrency limit backs off (AIMD)
+when Gemini answers 429/503. Faults come from a scripted fake model.
+"""
+import asyncio
+import time
+
+import pytest
+from google.api_core import exceptions as google_exceptions
+
+from src.services import ai_service
+from src.services.ai_cache import AIResponseCache
+from src.services.ai_client import AIClient
+from src.services.circuit_breaker import CLOSED, OPEN, CircuitBreaker, CircuitOpenError
+
+
+class _Response:
+    def __init__(self, text):
+        self.text = text
+
+
+class _Chunks:
+    def __init__(self, texts):
+        self._texts = iter(texts)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return _Response(next(self._texts))
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+class _FaultyModel:
+    """
+    Fake GenerativeModel: each call takes the next scripted fault (an exception
+    to raise or None to succeed) after sleeping `delay` seconds.
+    """
+
+    def __init__(self, faults=(), delay=0.0):
+        self.faults = list(faults)
+        self.delay = delay
+        self.calls = 0
+        self.running = 0
+        self.max_running = 0
+
+    async def generate_content_async(self, prompt, stream=False, request_options=None):
+        self.calls += 1
+        fault = self.faults.pop(0) if self.faults else None
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.running -= 1
+        if fault is not None:
+            raise fault
+        return _Chunks(["1. ", "done"]) if stream else _Response("1. done")
+
+
+def _client(model, breaker=None, **kwargs):
+    client = AIClient(model_name="fake", breaker=breaker or CircuitBreaker(window=4, min_calls=4), **kwargs)
+    client._models["fake"] = model
+    return client
+
+
+async def _outcomes(client, count, operation="test"):
+    results = await asyncio.gather(*(client.generate("p", operation) for _ in range(count)), return_exceptions=True)
+    return [type(result).__name__ if isinstance(result, BaseException) else "ok" for result in results]
+
+
+def test_breaker_opens_on_errors_and_fails_fast(clock):
+    model = _FaultyModel([google_exceptions.InternalServerError("boom")] * 2 + [None] * 2, delay=0.01)
+    client = _client(model, CircuitBreaker(window=4, min_calls=4, failure_rate=0.5, open_seconds=30, clock=clock))
+
+    assert asyncio.run(_outcomes(client, 4)) == ["InternalServerError"] * 2 + ["ok"] * 2
+    assert client.breaker.state == OPEN
+
+    model.delay = 10
+    start = time.perf_counter()
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(client.generate("p", "test"))
+    assert time.perf_counter() - start < 0.1
+    assert model.calls == 4
+
+
+def test_half_open_probe_closes_or_reopens(clock):
+    model = _FaultyModel([TimeoutError()] * 4, delay=0.05)
+    client = _client(model, CircuitBreaker(window=4, min_calls=4, open_seconds=30, probes=1, clock=clock))
+    asyncio.run(_outcomes(client, 4))
+    assert client.breaker.state == OPEN
+
+    # After the open period one probe goes through while others are still rejected; it fails, so reopen
+    clock.now += 30
+    model.faults = [google_exceptions.ServiceUnavailable("down")]
+    assert asyncio.run(_outcomes(client, 3)) == ["ServiceUnavailable", "CircuitOpenError", "CircuitOpenError"]
+    assert client.breaker.state == OPEN and model.calls == 5
+    assert client.breaker.retry_after() == 30
+
+    clock.now += 30
+    assert asyncio.run(client.generate("p", "test")) == "1. done"
+    assert client.breaker.state == CLOSED
+    assert asyncio.run(_outcomes(client, 3)) == ["ok"] * 3
+
+
+def test_slow_answers_open_the_breaker_but_client_errors_do_not():
+    model = _FaultyModel([google_exceptions.InvalidArgument("bad prompt")] * 4)
+    client = _client(model, CircuitBreaker(window=4, min_calls=4, slow_call_seconds=0.02))
+    asyncio.run(_outcomes(client, 4))
+    assert client.breaker.state == CLOSED
+
+    model.delay = 0.05
+    assert asyncio.run(_outcomes(client, 4)) == ["ok"] * 4
+    assert client.breaker.state == OPEN
+
+
+def test_abandoned_probe_frees_its_slot(clock):
+    breaker = CircuitBreaker(window=1, min_calls=1, open_seconds=1, clock=clock)
+    client = _client(_FaultyModel([TimeoutError()], delay=0.05), breaker)
+    asyncio.run(_outcomes(client, 1))
+    clock.now += 1
+
+    async def scenario():
+        probe = asyncio.create_task(client.generate("p", "test"))
+        await asyncio.sleep(0.01)
+        probe.cancel()
+        await asyncio.gather(probe, return_exceptions=True)
+        return await client.generate("p", "test")
+
+    assert asyncio.run(scenario()) == "1. done"
+    assert breaker.state == CLOSED
+
+
+def test_each_function_has_its_own_deadline():
+    model = _FaultyModel(delay=0.2)
+    client = _client(model, deadlines={"parse": 0.05}, timeout=1)
+
+    async def scenario():
+        start = time.perf_counter()
+        with pytest.raises(TimeoutError):
+            await client.generate("p", "parse")
+        parse_seconds = time.perf_counter() - start
+        return parse_seconds, await client.generate("p", "keyword")
+
+    parse_seconds, answer = asyncio.run(scenario())
+    assert parse_seconds < 0.15
+    assert answer == "1. done"
+
+
+def test_throttling_halves_the_concurrency_limit_once_per_burst():
+    model = _FaultyModel([google_exceptions.ResourceExhausted("quota")] * 8, delay=0.02)
+    client = _client(model, CircuitBreaker(window=100, min_calls=100), max_concurrency=8, max_concurrency_per_user=8)
+
+    assert asyncio.run(_outcomes(client, 8)) == ["ResourceExhausted"] * 8
+    # Eight 429s from calls that were already running count as one signal
+    assert client.concurrency_limit == 4
+
+    model.faults = [google_exceptions.TooManyRequests("slow down")]
+    asyncio.run(_outcomes(client, 1))
+    assert client.concurrency_limit == 2
+
+    # The lowered limit is enforced, and successes raise it again by about one per limit's worth of calls
+    snapshot = {}
+
+    async def scenario():
+        calls = asyncio.gather(*(client.generate("p", "test") for _ in range(6)))
+        await asyncio.sleep(0.01)
+        snapshot.update(running=model.running, waiting=client.waiting)
+        return await calls
+
+    assert asyncio.run(scenario()) == ["1. done"] * 6
+    assert snapshot == {"running": 2, "waiting": 4}
+    assert 4 < client.concurrency_limit < 4.5
+
+
+def test_stream_is_guarded_by_the_breaker(clock):
+    model = _FaultyModel([google_exceptions.InternalServerError("boom")] * 2)
+    client = _client(model, CircuitBreaker(window=2, min_calls=2, slow_call_seconds=0, clock=clock))
+
+    async def collect():
+        return "".join([chunk async for chunk in client.stream("p", "test")])
+
+    for _ in range(2):
+        with pytest.raises(google_exceptions.InternalServerError):
+            asyncio.run(collect())
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(collect())
+
+    clock.now += client.breaker.open_seconds
+    assert client.breaker.state == OPEN
+    assert asyncio.run(collect()) == "1. done"
+    assert client.breaker.state == CLOSED
+
+
+def test_service_serves_fallback_immediately_when_open(monkeypatch):
+    model = _FaultyModel(delay=10)
+    client = _client(model)
+    client.breaker.state = OPEN
+    client.breaker._opened_at = time.monotonic()
+    monkeypatch.setattr(ai_service, "ai_client", client)
+    monkeypatch.setattr(ai_service, "ai_cache", AIResponseCache(max_entries=16, path=None))
+
+    start = time.perf_counter()
+    sub_tasks = asyncio.run(ai_service.generate_sub_tasks_from_main_task("보고서 작성"))
+    assert time.perf_counter() - start < 0.5
+    assert sub_tasks[0] == "'보고서 작성'에 대한 첫 번째 세부 계획"
+    assert model.calls == 0
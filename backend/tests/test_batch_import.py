@@ -0,0 +1,125 @@
+"""
+Batch natural-language import: POST /todos/parse-and-create-items parses all
+pasted lines at once (rules first, one packed Gemini prompt for the rest),
+appends the parsed lines in input order with a single batched write, and
+reports every line's outcome, including lines Gemini could not parse.
+"""
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from src.api import todos_firestore
+from src.services import ai_service
+from src.services import nlp_parser as nlp_parser_module
+from src.services.ai_cache import AIResponseCache
+from src.services.ai_service import KST
+from src.services.keyword_index import KeywordTreeIndex
+from src.services.nlp_parser import NaturalLanguageParser
+
+NOW = datetime(2026, 10, 19, 10, 7, tzinfo=KST)  # 월요일
+
+
+class _FakeBatchAnalyzer:
+    """Stands in for analyze_tasks_from_natural_language; lines in `unparsable` come back as None."""
+
+    def __init__(self, unparsable=()):
+        self.unparsable = set(unparsable)
+        self.calls = []
+
+    async def __call__(self, texts, user_id=None, now=None):
+        self.calls.append(list(texts))
+        return [None if text in self.unparsable else {"description": text, "priority": "low"}
+                for text in texts]
+
+
+@pytest.fixture
+def batch_parser(monkeypatch):
+    """Real rule-based batch parsing at a fixed time, with Gemini replaced by a fake."""
+    def install(analyzer):
+        monkeypatch.setattr(nlp_parser_module, "analyze_tasks_from_natural_language", analyzer)
+        monkeypatch.setattr(todos_firestore.nlp_parser, "parse_tasks",
+                            NaturalLanguageParser(min_confidence=0.8, clock=lambda: NOW).parse_tasks)
+        return analyzer
+
+    return install
+
+
+def test_lines_are_parsed_together_and_appended_in_order(client, fake_db, auth_headers, project, batch_parser):
+    analyzer = batch_parser(_FakeBatchAnalyzer(unparsable={"매주 화요일 ???"}))
+    lines = ["내일 보고서 제출 긴급", "", "다음 달 초에 이사 준비", "30분 스트레칭", "매주 화요일 ???", "  책 읽기  "]
+
+    response = client.post("/todos/parse-and-create-items", headers=auth_headers,
+                           json={"list_id": project["id"], "lines": lines})
+    assert response.status_code == 200
+    results = response.json()
+    assert [(result["line"], result["status"]) for result in results] == [
+        (0, "created"), (1, "skipped"), (2, "created"), (3, "created"), (4, "failed"), (5, "created"),
+    ]
+    assert results[4]["detail"]
+    # Only the lines the rules were unsure about went to Gemini, in one call
+    assert analyzer.calls == [["다음 달 초에 이사 준비", "매주 화요일 ???"]]
+
+    first = results[0]["item"]
+    assert (first["description"], first["priority"]) == ("보고서 제출", "high")
+    assert first["due_date"].startswith("2026-10-20T10:30:00")
+    assert (results[2]["item"]["description"], results[2]["item"]["priority"]) == ("다음 달 초에 이사 준비", "low")
+
+    # Created items follow the existing root items in input order
+    items = client.get(f"/todos/{project['id']}", headers=auth_headers).json()["items"]
+    created = [result["item"]["id"] for result in results if result["status"] == "created"]
+    assert [item["id"] for item in items][-4:] == created
+    assert [item["order"] for item in items][-4:] == [3, 4, 5, 6]
+
+
+def test_batch_import_rejects_foreign_list_and_oversized_paste(client, fake_db, auth_headers, batch_parser,
+                                                               monkeypatch):
+    batch_parser(_FakeBatchAnalyzer())
+    response = client.post("/todos/parse-and-create-items", headers=auth_headers,
+                           json={"list_id": "missing", "lines": ["책 읽기"]})
+    assert response.status_code == 404
+
+    monkeypatch.setattr(todos_firestore, "NLP_BATCH_MAX_LINES", 2)
+    response = client.post("/todos/parse-and-create-items", headers=auth_headers,
+                           json={"list_id": "missing", "lines": ["a", "b", "c"]})
+    assert response.status_code == 400
+
+
+def test_batch_import_on_sqlite(client, gemini, monkeypatch, batch_parser):
+    batch_parser(_FakeBatchAnalyzer())
+    monkeypatch.setattr(ai_service, "ai_cache", AIResponseCache(max_entries=16, path=None))
+    monkeypatch.setattr(ai_service, "keyword_index", KeywordTreeIndex(path=None))
+    gemini.script([{"description": "기존 작업"}])
+    client.post("/auth/register", json={"username": "importer", "password": "importer", "email": "i@example.com"})
+    token = client.post("/auth/login", data={"username": "importer", "password": "importer"}).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    list_id = client.post("/todos/generate", headers=headers, json={"keyword": "가져오기"}).json()["id"]
+
+    results = client.post("/todos/parse-and-create-items", headers=headers,
+                          json={"list_id": list_id, "lines": ["30분 스트레칭", "모레까지 세금 납부"]}).json()
+    assert [result["status"] for result in results] == ["created", "created"]
+    items = client.get(f"/todos/{list_id}", headers=headers).json()["items"]
+    assert [item["description"] for item in items] == ["기존 작업", "스트레칭", "세금 납부"]
+
+
+def test_packed_prompt_maps_answers_back_by_index(gemini, monkeypatch):
+    monkeypatch.setattr(ai_service, "ai_cache", AIResponseCache(max_entries=16, path=None))
+    monkeypatch.setattr(ai_service, "AI_PARSE_BATCH_SIZE", 3)
+    gemini.script(
+        # Out of order, one item missing, one malformed
+        [{"index": 3, "description": "c"}, {"index": 1, "description": "a"}, "b"],
+        "not json",
+    )
+    texts = ["first", "second", "third", "fourth"]
+
+    results = asyncio.run(ai_service.analyze_tasks_from_natural_language(texts, now=NOW))
+    assert [result and result["description"] for result in results] == ["a", None, "c", None]
+    assert len(gemini.prompts) == 2
+    assert '1. "first"' in gemini.prompts[0] and '1. "fourth"' in gemini.prompts[1]
+
+    # Answered lines are cached under the single-line key and not sent again
+    gemini.responses.append([{"index": 1, "description": "b"}, {"index": 2, "description": "d"}])
+    again = asyncio.run(ai_service.analyze_tasks_from_natural_language(texts, now=NOW))
+    assert [result["description"] for result in again] == ["a", "b", "c", "d"]
+    assert '1. "second"' in gemini.prompts[2] and "first" not in gemini.prompts[2]
+    assert asyncio.run(ai_service.analyze_task_from_natural_language("third", now=NOW))["description"] == "c"
@@ -0,0 +1,145 @@
+"""
+Firebase ID tokens are verified locally against Google signing certificates
+cached per Cache-Control and refreshed ahead of expiry; verified tokens are
+cached by digest, so repeated social logins make no outbound HTTP call and
+cost one username index read.
+"""
+import asyncio
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from jose import JWTError
+
+from firebase_keys import PROJECT_ID, FirebaseSigner
+from src.services.firebase_tokens import FirebaseTokenVerifier, GoogleCertificates, firebase_token_verifier
+from src.services.oauth_http import OAuthHttpClient, oauth_http
+
+
+def _social_login(client, token, email="social@example.com"):
+    return client.post("/auth/social-login", json={"provider": "google", "id_token": token, "email": email})
+
+
+def _run_with_certificates(oauth_stub, scenario, timer=None):
+    async def run():
+        http = OAuthHttpClient(max_retries=0)
+        certificates = GoogleCertificates(f"{oauth_stub.base_url}/certs", http=http, **({"timer": timer} if timer else {}))
+        try:
+            return await scenario(certificates)
+        finally:
+            await certificates.stop()
+            await http.stop()
+
+    return asyncio.run(run())
+
+
+def test_repeated_social_login_makes_no_outbound_call(client: TestClient, fake_db, firebase_signer, oauth_stub):
+    token = firebase_signer.mint()
+    assert _social_login(client, token).status_code == 200
+    assert oauth_stub.requests == [("GET", "/certs")]
+
+    fake_db.reset_counts()
+    assert _social_login(client, token).status_code == 200
+    assert fake_db.reads == 1 and fake_db.writes == 0
+    # A new token for the same user is verified with the cached certificates
+    assert _social_login(client, firebase_signer.mint(lifetime=1800)).status_code == 200
+    assert oauth_stub.requests == [("GET", "/certs")]
+    assert len(firebase_token_verifier) == 2
+
+
+@pytest.mark.parametrize("overrides", [
+    {"project_id": "other-project"},
+    {"iss": "https://accounts.google.com"},
+    {"lifetime": -3600},
+    {"iat": 4102444800},
+    {"sub": ""},
+])
+def test_invalid_claims_are_rejected(client: TestClient, fake_db, firebase_signer, overrides):
+    response = _social_login(client, firebase_signer.mint(**overrides))
+    assert response.status_code == 401
+
+
+def test_forged_signature_is_rejected(client: TestClient, fake_db, firebase_signer):
+    forger = FirebaseSigner(firebase_signer.kid)
+    assert _social_login(client, forger.mint()).status_code == 401
+
+
+def test_unavailable_certificates_return_503(client: TestClient, fake_db, firebase_signer, oauth_stub, monkeypatch):
+    monkeypatch.setattr(oauth_http, "backoff", 0)
+    oauth_stub.faults["/certs"].extend([503] * (oauth_http.max_retries + 1))
+    response = _social_login(client, firebase_signer.mint())
+    assert response.status_code == 503
+    assert response.headers["retry-after"]
+
+
+def test_certificates_expire_per_cache_control(firebase_signer, oauth_stub, clock):
+    oauth_stub.headers["/certs"] = {"Cache-Control": "public, max-age=100", "Age": "40"}
+
+    async def scenario(certificates):
+        assert await certificates.get_key(firebase_signer.kid) is not None
+        assert certificates.expires_at == clock.now + 60
+        clock.now += 59
+        await certificates.get_key(firebase_signer.kid)
+        assert oauth_stub.count("GET", "/certs") == 1
+        clock.now += 2
+        await certificates.get_key(firebase_signer.kid)
+        assert oauth_stub.count("GET", "/certs") == 2
+
+    _run_with_certificates(oauth_stub, scenario, timer=clock)
+
+
+def test_unknown_key_id_refetches_at_most_once_per_interval(firebase_signer, oauth_stub, clock):
+    rotated = FirebaseSigner("rotated-kid")
+
+    async def scenario(certificates):
+        await certificates.get_key(firebase_signer.kid)
+        oauth_stub.routes[("GET", "/certs")] = {**firebase_signer.certificates(), **rotated.certificates()}
+        # Unknown key ids right after a fetch do not trigger another one
+        assert await certificates.get_key(rotated.kid) is None
+        assert oauth_stub.count("GET", "/certs") == 1
+        clock.now += 61
+        assert await certificates.get_key(rotated.kid) is not None
+        assert await certificates.get_key("bogus") is None
+        assert oauth_stub.count("GET", "/certs") == 2
+
+    _run_with_certificates(oauth_stub, scenario, timer=clock)
+
+
+def test_background_refresh_renews_before_expiry(firebase_signer, oauth_stub):
+    oauth_stub.headers["/certs"] = {"Cache-Control": "public, max-age=1"}
+
+    async def scenario(certificates):
+        certificates.start()
+        await asyncio.sleep(1.5)
+        return certificates.fresh
+
+    assert _run_with_certificates(oauth_stub, scenario)
+    assert oauth_stub.count("GET", "/certs") >= 2
+
+
+def test_verified_tokens_are_cached_until_token_expiry(firebase_signer, oauth_stub, clock):
+    clock.now = time.time()
+    token = firebase_signer.mint(lifetime=120)
+
+    async def scenario(certificates):
+        verifier = FirebaseTokenVerifier(certificates, project_id=PROJECT_ID, ttl=300, timer=clock)
+        assert (await verifier.verify(token))["uid"] == "firebase-uid"
+        # Cache hits skip signature verification, so they need no certificates
+        certificates.clear()
+        clock.now += 100
+        await verifier.verify(token)
+        assert oauth_stub.count("GET", "/certs") == 1
+        clock.now += 21
+        await verifier.verify(token)
+        assert oauth_stub.count("GET", "/certs") == 2
+
+    _run_with_certificates(oauth_stub, scenario)
+
+
+def test_malformed_token_raises_jwt_error(firebase_signer, oauth_stub):
+    async def scenario(certificates):
+        verifier = FirebaseTokenVerifier(certificates, project_id=PROJECT_ID)
+        with pytest.raises(JWTError):
+            await verifier.verify("not-a-jwt")
+
+    _run_with_certificates(oauth_stub, scenario)
@@ -0,0 +1,308 @@
+"""
+Firestore read/write budgets per endpoint.
+
+Each test runs one request against the in-memory Firestore fake and fails if
+the endpoint issues more billable reads or writes than its budget. Read counts
+include documents returned by queries, so they depend on the seeded project:
+3 root items with 2 children each (9 items). Creating the project primes the
+tree cache and the principal cache, so authenticated requests cost no user
+lookup and plain list reads are measured warm unless marked "cold cache".
+Users are looked up through the username index only (the legacy username
+query fallback is disabled here), and GET /todos is measured after the item
+user_id backfill (no per-list legacy item queries). If a change legitimately needs more round
+trips, raise the budget in the same commit and say why.
+"""
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.services import auth_service_firestore_async, todo_service_firestore_async
+from src.services.tree_cache import tree_cache
+
+from firestore_fake import FakeWriteBatch
+
+# endpoint -> (max reads, max writes)
+BUDGETS = {
+    "POST /auth/register": (0, 2),
+    "POST /auth/login": (1, 0),
+    "POST /auth/social-login": (1, 2),
+    "POST /auth/social-login (repeat)": (1, 0),
+    "POST /auth/naver-callback": (1, 2),
+    "POST /auth/kakao-callback": (1, 2),
+    "DELETE /auth/me": (11, 12),
+    "POST /todos/generate": (1, 10),
+    "POST /todos/generate/stream": (1, 10),
+    "GET /todos": (10, 0),
+    "GET /todos/{list_id}": (0, 0),
+    "GET /todos/{list_id} (cold cache)": (10, 0),
+    "PUT /todos/{list_id}": (11, 1),
+    "POST /todos/items": (3, 1),
+    "POST /todos/items (subtask)": (4, 1),
+    "POST /todos/parse-and-create-item": (3, 1),
+    "POST /todos/parse-and-create-items (20 lines)": (3, 20),
+    "POST /todos/items/{item_id}/generate-subtasks": (10, 3),
+    "PUT /todos/items/{item_id}": (3, 1),
+    "POST /todos/items:batch": (7, 3),
+    "POST /todos/items/{item_id}/move": (6, 1),
+    "POST /todos/items/{item_id}/move (reparent)": (8, 3),
+    "DELETE /todos/items/{item_id}": (4, 3),
+    "DELETE /todos/{list_id}": (10, 10),
+}
+
+
+@pytest.fixture(autouse=True)
+def username_index_only(monkeypatch):
+    """Measure the post-migration path: user lookups hit usernames/{key} only."""
+    monkeypatch.setattr(auth_service_firestore_async, "LEGACY_USERNAME_FALLBACK", False)
+
+
+@pytest.fixture
+def item_user_id_only(monkeypatch):
+    """Measure the post-backfill path: all of a user's items come from one user_id query."""
+    monkeypatch.setattr(todo_service_firestore_async, "LEGACY_ITEM_FALLBACK", False)
+
+
+def assert_within_budget(fake_db, endpoint):
+    max_reads, max_writes = BUDGETS[endpoint]
+    log = "\n".join(f"  {kind} {detail} ({count})" for kind, detail, count in fake_db.operations)
+    assert fake_db.reads <= max_reads, f"{endpoint}: {fake_db.reads} reads > {max_reads}\n{log}"
+    assert fake_db.writes <= max_writes, f"{endpoint}: {fake_db.writes} writes > {max_writes}\n{log}"
+
+
+def test_register_budget(client: TestClient, fake_db):
+    response = client.post("/auth/register", json={"username": "new", "password": "pw", "email": "new@example.com"})
+    assert response.status_code == 201
+    assert_within_budget(fake_db, "POST /auth/register")
+
+
+def test_login_budget(client: TestClient, fake_db, auth_headers):
+    fake_db.reset_counts()
+    response = client.post("/auth/login", data={"username": "budget", "password": "budget"})
+    assert response.status_code == 200
+    assert_within_budget(fake_db, "POST /auth/login")
+
+
+def test_social_login_budget(client: TestClient, fake_db, firebase_signer):
+    body = {"provider": "google", "id_token": firebase_signer.mint(), "email": "social@example.com"}
+    response = client.post("/auth/social-login", json=body)
+    assert response.status_code == 200
+    assert_within_budget(fake_db, "POST /auth/social-login")
+
+    fake_db.reset_counts()
+    assert client.post("/auth/social-login", json=body).status_code == 200
+    assert_within_budget(fake_db, "POST /auth/social-login (repeat)")
+
+
+def test_naver_callback_budget(client: TestClient, fake_db, oauth_stub):
+    response = client.post("/auth/naver-callback", json={"code": "c", "state": "s", "redirect_uri": "http://x"})
+    assert response.status_code == 200
+    assert_within_budget(fake_db, "POST /auth/naver-callback")
+
+
+def test_kakao_callback_budget(client: TestClient, fake_db, oauth_stub):
+    response = client.post("/auth/kakao-callback", json={"code": "c", "redirect_uri": "http://x"})
+    assert response.status_code == 200
+    assert_within_budget(fake_db, "POST /auth/kakao-callback")
+
+
+def test_delete_me_budget(client: TestClient, fake_db, auth_headers, project):
+    response = client.delete("/auth/me", headers=auth_headers)
+    assert response.status_code == 200
+    assert_within_budget(fake_db, "DELETE /auth/me")
+
+
+def test_generate_budget(client: TestClient, fake_db, auth_headers):
+    fake_db.reset_counts()
+    response = client.post("/todos/generate", headers=auth_headers, json={"keyword": "budget"})
+    assert response.status_code == 200
+    assert_within_budget(fake_db, "POST /todos/generate")
+
+
+def test_generate_stream_budget(client: TestClient, fake_db, auth_headers):
+    fake_db.reset_counts()
+    response = client.post("/todos/generate/stream", headers=auth_headers, json={"keyword": "budget"})
+    assert response.status_code == 200
+    assert response.text.rstrip().splitlines()[-2] == "event: done"
+    assert_within_budget(fake_db, "POST /todos/generate/stream")
+
+
+def test_get_all_lists_budget(client: TestClient, fake_db, auth_headers, project, item_user_id_only):
+    response = client.get("/todos", headers=auth_headers)
+    assert response.status_code == 200
+    assert_within_budget(fake_db, "GET /todos")
+
+
+def test_get_all_lists_query_count_is_independent_of_list_count(
+    client: TestClient, fake_db, auth_headers, project, item_user_id_only,
+):
+    def queries_for_all_lists():
+        fake_db.reset_counts()
+        response = client.get("/todos", headers=auth_headers)
+        assert response.status_code == 200
+        return len(response.json()), len(fake_db.operations)
+
+    lists, queries = queries_for_all_lists()
+    for keyword in ("second", "third", "fourth"):
+        assert client.post("/todos/generate", headers=auth_headers, json={"keyword": keyword}).status_code == 200
+    assert queries_for_all_lists() == (lists + 3, queries)
+
+
+def test_get_all_lists_merges_legacy_items(client: TestClient, fake_db, auth_headers, project, monkeypatch):
+    # An item written before the user_id backfill, in a list that also has new items
+    legacy = fake_db.collection("todo_items").document(project["items"][0]["id"]).get().to_dict()
+    legacy_id = str(uuid.uuid4())
+    legacy = {**legacy, "id": legacy_id, "rank": "zz"}
+    del legacy["user_id"]
+    fake_db.collection("todo_items").document(legacy_id).set(legacy)
+
+    items = client.get("/todos", headers=auth_headers).json()[0]["items"]
+    assert legacy_id in {item["id"] for item in items}
+    assert len(items) == len(project["items"]) + 1
+
+    # After the backfill the fallback is switched off and one user_id query serves every list
+    monkeypatch.setattr(todo_service_firestore_async, "LEGACY_ITEM_FALLBACK", False)
+    fake_db.reset_counts()
+    items = client.get("/todos", headers=auth_headers).json()[0]["items"]
+    assert legacy_id not in {item["id"] for item in items}
+    assert_within_budget(fake_db, "GET /todos")
+
+
+def test_get_list_budget(client: TestClient, fake_db, auth_headers, project):
+    response = client.get(f"/todos/{project['id']}", headers=auth_headers)
+    assert response.status_code == 200
+    assert_within_budget(fake_db, "GET /todos/{list_id}")
+
+
+def test_get_list_cold_cache_budget(client: TestClient, fake_db, auth_headers, project):
+    tree_cache.clear()
+    response = client.get(f"/todos/{project['id']}", headers=auth_headers)
+    assert response.status_code == 200
+    assert_within_budget(fake_db, "GET /todos/{list_id} (cold cache)")
+
+
+def test_update_list_budget(client: TestClient, fake_db, auth_headers, project):
+    response = client.put(f"/todos/{project['id']}", headers=auth_headers, json={"keyword": "renamed"})
+    assert response.status_code == 200
+    assert_within_budget(fake_db, "PUT /todos/{list_id}")
+
+
+def test_create_item_budget(client: TestClient, fake_db, auth_headers, project):
+    response = client.post("/todos/items", headers=auth_headers, json={"list_id": project["id"], "description": "new"})
+    assert response.status_code == 200
+    assert_within_budget(fake_db, "POST /todos/items")
+
+
+def test_create_subitem_budget(client: TestClient, fake_db, auth_headers, project):
+    parent_id = project["items"][0]["id"]
+    response = client.post(
+        "/todos/items", headers=auth_headers,
+        json={"list_id": project["id"], "description": "new", "parent_id": parent_id},
+    )
+    assert response.status_code == 200
+    assert_within_budget(fake_db, "POST /todos/items (subtask)")
+
+
+def test_parse_and_create_budget(client: TestClient, fake_db, auth_headers, project):
+    response = client.post(
+        "/todos/parse-and-create-item", headers=auth_headers, json={"list_id": project["id"], "text": "report"},
+    )
+    assert response.status_code == 200
+    assert_within_budget(fake_db, "POST /todos/parse-and-create-item")
+
+
+def test_batch_parse_and_create_budget(client: TestClient, fake_db, auth_headers, project):
+    lines = [f"task {i}" for i in range(20)]
+    response = client.post(
+        "/todos/parse-and-create-items", headers=auth_headers, json={"list_id": project["id"], "lines": lines},
+    )
+    assert response.status_code == 200
+    assert [result["status"] for result in response.json()] == ["created"] * 20
+    assert_within_budget(fake_db, "POST /todos/parse-and-create-items (20 lines)")
+
+
+def test_generate_subtasks_budget(client: TestClient, fake_db, auth_headers, project):
+    item_id = project["items"][0]["id"]
+    response = client.post(f"/todos/items/{item_id}/generate-subtasks", headers=auth_headers)
+    assert response.status_code == 200
+    assert_within_budget(fake_db, "POST /todos/items/{item_id}/generate-subtasks")
+
+
+def test_update_item_budget(client: TestClient, fake_db, auth_headers, project):
+    item_id = project["items"][0]["id"]
+    response = client.put(f"/todos/items/{item_id}", headers=auth_headers, json={"is_completed": True})
+    assert response.status_code == 200
+    assert_within_budget(fake_db, "PUT /todos/items/{item_id}")
+
+
+def test_batch_update_budget(client: TestClient, fake_db, auth_headers, project):
+    updates = [{"id": item["id"], "order": index} for index, item in enumerate(reversed(project["items"]))]
+    response = client.post("/todos/items:batch", headers=auth_headers, json=updates)
+    assert response.status_code == 200
+    assert_within_budget(fake_db, "POST /todos/items:batch")
+
+
+def test_move_item_budget(client: TestClient, fake_db, auth_headers, project):
+    first, second = project["items"][0], project["items"][1]
+    response = client.post(f"/todos/items/{first['id']}/move", headers=auth_headers, json={"after_id": second["id"]})
+    assert response.status_code == 200
+    assert_within_budget(fake_db, "POST /todos/items/{item_id}/move")
+
+
+def test_move_item_reparent_budget(client: TestClient, fake_db, auth_headers, project):
+    first, second = project["items"][0], project["items"][1]
+    response = client.post(f"/todos/items/{first['id']}/move", headers=auth_headers, json={"parent_id": second["id"]})
+    assert response.status_code == 200
+    assert_within_budget(fake_db, "POST /todos/items/{item_id}/move (reparent)")
+    child = fake_db.collection("todo_items").document(first["children"][0]["id"]).get().to_dict()
+    assert child["ancestor_ids"] == [second["id"], first["id"]]
+
+
+def test_move_item_reparent_is_atomic(client: TestClient, fake_db, auth_headers, project, monkeypatch):
+    first, second = project["items"][0], project["items"][1]
+
+    def fail(self):
+        raise RuntimeError("commit failed")
+
+    # The item and its descendants' ancestor_ids go out in one batch, so a failed commit changes nothing
+    monkeypatch.setattr(FakeWriteBatch, "commit", fail)
+    with pytest.raises(RuntimeError):
+        client.post(f"/todos/items/{first['id']}/move", headers=auth_headers, json={"parent_id": second["id"]})
+    assert fake_db.collection("todo_items").document(first["id"]).get().to_dict()["parent_id"] is None
+
+
+def test_delete_item_budget(client: TestClient, fake_db, auth_headers, project):
+    item_id = project["items"][0]["id"]
+    response = client.delete(f"/todos/items/{item_id}", headers=auth_headers)
+    assert response.status_code == 204
+    assert_within_budget(fake_db, "DELETE /todos/items/{item_id}")
+
+
+def test_delete_list_budget(client: TestClient, fake_db, auth_headers, project):
+    response = client.delete(f"/todos/{project['id']}", headers=auth_headers)
+    assert response.status_code == 204
+    assert_within_budget(fake_db, "DELETE /todos/{list_id}")
+
+
+def test_crud_endpoints_do_not_use_threadpool(client: TestClient, fake_db, auth_headers, project, monkeypatch):
+    import anyio.to_thread
+
+    offloaded = []
+    run_sync = anyio.to_thread.run_sync
+
+    async def recording_run_sync(func, *args, **kwargs):
+        offloaded.append(getattr(func, "__name__", repr(func)))
+        return await run_sync(func, *args, **kwargs)
+
+    monkeypatch.setattr(anyio.to_thread, "run_sync", recording_run_sync)
+    first, second = project["items"][0], project["items"][1]
+    responses = [
+        client.get("/todos", headers=auth_headers),
+        client.get(f"/todos/{project['id']}", headers=auth_headers),
+        client.post("/todos/items", headers=auth_headers, json={"list_id": project["id"], "description": "new"}),
+        client.put(f"/todos/items/{first['id']}", headers=auth_headers, json={"is_completed": True}),
+        client.post(f"/todos/items/{first['id']}/move", headers=auth_headers, json={"after_id": second["id"]}),
+        client.delete(f"/todos/items/{second['id']}", headers=auth_headers),
+    ]
+    assert [response.status_code for response in responses] == [200, 200, 200, 200, 200, 204]
+    assert offloaded == []
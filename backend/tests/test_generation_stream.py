@@ -0,0 +1,151 @@
+"""
+Streaming generation: POST /todos/generate/stream saves each item as soon as
+the incremental parser completes it and sends it as an SSE event, so the first
+item does not wait for the whole Gemini response. Gemini is replaced by a
+scripted fake stream that records how many items were saved before each chunk.
+"""
+import json
+
+import pytest
+
+from src.services import ai_service, generation_stream
+from src.services.ai_cache import AIResponseCache
+from src.services.keyword_index import KeywordTreeIndex
+from src.services.tree_stream import TreeStreamParser, iter_tree_nodes
+
+TREE = [
+    {"description": "기획", "children": [{"description": "목표 정의"}, {"description": "사이트맵 작성"}]},
+    {"description": "디자인", "children": [{"description": "와이어프레임"}]},
+    {"description": "배포"},
+]
+RESPONSE = "```json\n" + json.dumps(TREE, ensure_ascii=False, indent=2) + "\n```"
+
+
+class _ScriptedStream:
+    """Stands in for ai_client.stream: yields the scripted chunks, then raises `error` if set."""
+
+    def __init__(self, chunks, saved_count=lambda: 0, error=None):
+        self.chunks = chunks
+        self.saved_count = saved_count
+        self.error = error
+        self.calls = 0
+        self.saved_before_chunk = []
+
+    async def __call__(self, prompt, operation, user_id=None, **kwargs):
+        self.calls += 1
+        for chunk in self.chunks:
+            self.saved_before_chunk.append(self.saved_count())
+            yield chunk
+        if self.error:
+            raise self.error
+
+
+def _split(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def _events(body):
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def _descriptions(items):
+    return [{"description": item["description"], **({"children": _descriptions(item["children"])}
+                                                    if item["children"] else {})} for item in items]
+
+
+@pytest.fixture
+def scripted_stream(monkeypatch):
+    monkeypatch.setattr(ai_service, "ai_cache", AIResponseCache(max_entries=16, path=None))
+    monkeypatch.setattr(ai_service, "keyword_index", KeywordTreeIndex(path=None))
+    # Undo the fake_db shortcut so items come from ai_client.stream through the parser
+    monkeypatch.setattr(generation_stream, "stream_todo_items_from_keyword", ai_service.stream_todo_items_from_keyword)
+
+    def install(*args, **kwargs):
+        stream = _ScriptedStream(*args, **kwargs)
+        monkeypatch.setattr(ai_service.ai_client, "stream", stream)
+        return stream
+
+    return install
+
+
+def test_parser_emits_parents_first_for_any_chunking():
+    nodes = list(iter_tree_nodes(TREE))
+    for size in (1, 2, 3, 7, 64):
+        parser = TreeStreamParser()
+        emitted = [node for chunk in _split(RESPONSE, size) for node in parser.feed(chunk)]
+        assert emitted == nodes
+        assert parser.close() == TREE
+
+    parser = TreeStreamParser()
+    emitted = parser.feed('[{"children": [{"description": "b"}], "note": {"x": [1, 2.5]}, "description": "a"}]')
+    assert emitted == [((0,), "a"), ((0, 0), "b")]
+
+
+@pytest.mark.parametrize("text", ['[{"title": "a"}]', '["a"]', '[{"description": "a"},]', '{"description": "a"}'])
+def test_parser_rejects_malformed_lists(text):
+    parser = TreeStreamParser()
+    with pytest.raises(ValueError):
+        parser.feed(text)
+        parser.close()
+
+
+def test_items_are_saved_while_gemini_is_still_streaming(client, fake_db, auth_headers, scripted_stream):
+    stream = scripted_stream(_split(RESPONSE, 12), saved_count=lambda: len(fake_db._documents("todo_items")))
+
+    response = client.post("/todos/generate/stream", headers=auth_headers, json={"keyword": "웹사이트"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = _events(response.text)
+
+    assert [name for name, _ in events] == ["list"] + ["item"] * 6 + ["done"]
+    items = [data for name, data in events if name == "item"]
+    assert [(tuple(item["path"]), item["description"]) for item in items] == list(iter_tree_nodes(TREE))
+    assert items[1]["parent_id"] == items[0]["id"]
+    # Items were written between chunks, long before the last chunk arrived
+    assert stream.saved_before_chunk[0] == 0
+    assert stream.saved_before_chunk[len(stream.saved_before_chunk) // 2] >= 2
+    assert stream.saved_before_chunk[-1] == 6
+
+    done = events[-1][1]
+    assert done["id"] == events[0][1]["id"]
+    assert _descriptions(done["items"]) == TREE
+    assert client.get(f"/todos/{done['id']}", headers=auth_headers).json()["items"] == done["items"]
+
+    # The completed tree is cached, so the same keyword does not stream again
+    again = _events(client.post("/todos/generate/stream", headers=auth_headers, json={"keyword": "웹사이트"}).text)
+    assert _descriptions(again[-1][1]["items"]) == TREE
+    assert stream.calls == 1
+
+
+def test_failure_mid_stream_keeps_saved_items(client, fake_db, auth_headers, scripted_stream):
+    partial = RESPONSE[:RESPONSE.index("디자인")]
+    scripted_stream(_split(partial, 16), error=TimeoutError())
+
+    events = _events(client.post("/todos/generate/stream", headers=auth_headers, json={"keyword": "여행"}).text)
+    assert [name for name, _ in events] == ["list", "item", "item", "item", "error", "done"]
+    assert events[-2][1]["saved_items"] == 3
+    assert _descriptions(events[-1][1]["items"]) == [TREE[0]]
+
+
+def test_failure_before_first_item_falls_back(client, fake_db, auth_headers, scripted_stream):
+    scripted_stream([], error=TimeoutError())
+
+    events = _events(client.post("/todos/generate/stream", headers=auth_headers, json={"keyword": "여행"}).text)
+    assert "error" not in [name for name, _ in events]
+    assert events[-1][1]["items"][0]["description"] == "여행 관련 작업 브레인스토밍"
+
+
+def test_streaming_generation_on_sqlite(client, scripted_stream):
+    client.post("/auth/register", json={"username": "streamer", "password": "streamer", "email": "s@example.com"})
+    token = client.post("/auth/login", data={"username": "streamer", "password": "streamer"}).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    scripted_stream(_split(RESPONSE, 5))
+
+    events = _events(client.post("/todos/generate/stream", headers=headers, json={"keyword": "웹사이트"}).text)
+    done = events[-1][1]
+    assert _descriptions(done["items"]) == TREE
+    assert client.get(f"/todos/{done['id']}", headers=headers).json()["items"] == done["items"]
@@ -0,0 +1,65 @@
+import logging
+
+from fastapi.testclient import TestClient
+
+from src import instrumentation, main
+from src.services.security import principal_cache
+from src.services.tree_cache import tree_cache
+
+
+def test_server_timing_reports_datastore_usage(client: TestClient, fake_db, auth_headers, project):
+    tree_cache.clear()
+    response = client.get(f"/todos/{project['id']}", headers=auth_headers)
+    assert response.status_code == 200
+    server_timing = response.headers["server-timing"]
+    assert server_timing.startswith("total;dur=")
+    assert f'reads={fake_db.reads} writes=0' in server_timing
+
+
+def test_metrics_are_labelled_by_route_template(client: TestClient, fake_db, auth_headers, project, monkeypatch):
+    monkeypatch.setattr(main, "METRICS_TOKEN", "scrape")
+    tree_cache.clear()
+    before = instrumentation.DATASTORE_READS_TOTAL.value("/todos/{list_id}")
+    client.get(f"/todos/{project['id']}", headers=auth_headers)
+    assert instrumentation.DATASTORE_READS_TOTAL.value("/todos/{list_id}") == before + fake_db.reads
+
+    response = client.get("/metrics", headers={"Authorization": "Bearer scrape"})
+    assert response.status_code == 200
+    assert 'http_requests_total{method="GET",route="/todos/{list_id}",status="200"}' in response.text
+    assert 'datastore_reads_per_request_bucket{route="/todos/{list_id}",le="+Inf"}' in response.text
+
+
+def test_metrics_require_the_scrape_token(client: TestClient, monkeypatch):
+    # Not exposed at all unless a token is configured
+    monkeypatch.setattr(main, "METRICS_TOKEN", None)
+    assert client.get("/metrics").status_code == 404
+
+    monkeypatch.setattr(main, "METRICS_TOKEN", "scrape")
+    response = client.get("/metrics")
+    assert response.status_code == 401
+    assert response.headers["www-authenticate"] == "Bearer"
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer scrape"}).status_code == 200
+
+
+def test_slow_request_log_includes_query_shapes(client: TestClient, fake_db, auth_headers, project, monkeypatch, caplog):
+    monkeypatch.setattr(instrumentation, "SLOW_REQUEST_MS", 0)
+    tree_cache.clear()
+    principal_cache.clear()
+    with caplog.at_level(logging.WARNING, logger=instrumentation.__name__):
+        client.get(f"/todos/{project['id']}", headers=auth_headers)
+    message = next(record.getMessage() for record in caplog.records if "Slow request" in record.getMessage())
+    assert "GET /todos/{list_id} -> 200" in message
+    assert "todo_items where todo_list_id==" in message
+    assert "usernames get" in message
+
+
+def test_ai_calls_are_recorded():
+    before = instrumentation.AI_CALLS_TOTAL.value("example")
+    try:
+        with instrumentation.record_ai_call("example"):
+            raise RuntimeError("quota")
+    except RuntimeError:
+        pass
+    assert instrumentation.AI_CALLS_TOTAL.value("example") == before + 1
+    assert instrumentation.AI_CALL_DURATION.count("example") >= 1
@@ -0,0 +1,209 @@
+"""
+Background jobs: with `Prefer: respond-async` the AI generation endpoints
+enqueue a job and answer 202 with its location, the job can be polled or
+followed over SSE, a full queue answers 503, queued or interrupted jobs are
+picked up again after a restart, and processes sharing the queue file see the
+same jobs and never run one twice.
+"""
+import asyncio
+import json
+import time
+import uuid
+
+from src.api import todos_firestore
+from src.services import job_queue as job_queue_module
+from src.services.job_queue import JOB_WAIT_SECONDS, JobQueue, job_queue
+from src.services.security import UserObject
+
+ASYNC = {"Prefer": "respond-async"}
+
+
+def _wait_for_job(client, headers, job_id):
+    for _ in range(200):
+        job = client.get(f"/jobs/{job_id}", headers=headers).json()
+        if job["status"] in ("succeeded", "failed"):
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+def test_generate_returns_202_and_job_result(client, fake_db, auth_headers):
+    response = client.post("/todos/generate", headers={**auth_headers, **ASYNC}, json={"keyword": "이사"})
+    assert response.status_code == 202
+    job = response.json()
+    assert response.headers["location"] == f"/jobs/{job['id']}"
+    assert (job["kind"], job["status"]) == ("generate_todo_list", "queued")
+
+    job = _wait_for_job(client, auth_headers, job["id"])
+    assert job["status"] == "succeeded"
+    assert job["started_at"] and job["finished_at"]
+    todo_list = client.get(f"/todos/{job['result']['id']}", headers=auth_headers).json()
+    assert todo_list["keyword"] == job["result"]["keyword"] == "이사"
+    assert len(todo_list["items"]) == len(job["result"]["items"]) > 0
+
+    # Without the header the endpoint still answers synchronously
+    assert client.post("/todos/generate", headers=auth_headers, json={"keyword": "이사"}).status_code == 200
+
+
+def test_subtask_job_events_and_failures(client, fake_db, auth_headers, project):
+    item = project["items"][0]
+    job = client.post(f"/todos/items/{item['id']}/generate-subtasks", headers={**auth_headers, **ASYNC}).json()
+
+    with client.stream("GET", f"/jobs/{job['id']}/events", headers=auth_headers) as response:
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = [line.split(": ", 1)[1] for line in response.iter_lines() if line.startswith("event: ")]
+    assert events[-1] == "succeeded"
+    result = client.get(f"/jobs/{job['id']}", headers=auth_headers).json()["result"]
+    assert len(result["children"]) == len(item["children"]) + 3
+
+    job = client.post("/todos/items/missing/generate-subtasks", headers={**auth_headers, **ASYNC}).json()
+    job = _wait_for_job(client, auth_headers, job["id"])
+    assert job["status"] == "failed"
+    assert job["error"] == "Parent item not found or not authorized"
+
+
+def test_jobs_are_private_and_queue_is_bounded(client, fake_db, auth_headers, monkeypatch):
+    job = client.post("/todos/generate", headers={**auth_headers, **ASYNC}, json={"keyword": "비밀"}).json()
+    client.post("/auth/register", json={"username": "other", "password": "other", "email": "o@example.com"})
+    token = client.post("/auth/login", data={"username": "other", "password": "other"}).json()["access_token"]
+    other = {"Authorization": f"Bearer {token}"}
+    assert client.get(f"/jobs/{job['id']}", headers=other).status_code == 404
+    assert client.get(f"/jobs/{job['id']}/events", headers=other).status_code == 404
+    _wait_for_job(client, auth_headers, job["id"])
+
+    monkeypatch.setattr(job_queue, "max_pending", 0)
+    response = client.post("/todos/generate", headers={**auth_headers, **ASYNC}, json={"keyword": "초과"})
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == str(job_queue_module.RETRY_AFTER_SECONDS)
+
+
+def test_rerun_jobs_do_not_duplicate_their_writes(client, fake_db, auth_headers, project):
+    user_id = next(doc["id"] for doc in fake_db._documents("users").values() if doc["username"] == "budget")
+    user = UserObject(id=user_id, username="budget", email=None, hashed_password="")
+
+    # A job interrupted after its writes runs again from scratch
+    job_id = uuid.uuid4().hex
+    first = asyncio.run(todos_firestore._generate_todo_list_job(user, {"keyword": "재시도"}, job_id))
+    again = asyncio.run(todos_firestore._generate_todo_list_job(user, {"keyword": "재시도"}, job_id))
+    assert again["id"] == first["id"]
+    lists = client.get("/todos", headers=auth_headers).json()
+    assert [todo_list["keyword"] for todo_list in lists].count("재시도") == 1
+
+    item = project["items"][0]
+    job_id = uuid.uuid4().hex
+    for _ in range(2):
+        parent = asyncio.run(todos_firestore._create_subtasks_job(user, {"item_id": item["id"]}, job_id))
+    assert len(parent["children"]) == len(item["children"]) + 3
+    children = [doc for doc in fake_db._documents("todo_items").values() if doc.get("parent_id") == item["id"]]
+    assert len(children) == len(item["children"]) + 3
+
+
+def test_unfinished_jobs_survive_a_restart(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    user = UserObject(id="u1", username="alice", email=None, hashed_password="")
+    started = []
+    waits = JOB_WAIT_SECONDS.count("echo")
+
+    async def hang(user, params, job_id):
+        started.append(params["n"])
+        await asyncio.sleep(60)
+
+    async def echo(user, params, job_id):
+        return {"n": params["n"], "user": user.id}
+
+    async def before_restart():
+        queue = JobQueue(workers=1, path=path)
+        queue.register("echo", hang)
+        await queue.start()
+        jobs = [await queue.enqueue("echo", user, {"n": n}) for n in range(3)]
+        while not started:
+            await asyncio.sleep(0.01)
+        assert [(await queue.get(job["id"], user))["position"] for job in jobs] == [None, 0, 1]
+        assert queue.depth == 2
+        await queue.stop()
+        return [job["id"] for job in jobs]
+
+    async def after_restart(job_ids):
+        queue = JobQueue(workers=2, path=path)
+        queue.register("echo", echo)
+        await queue.start()
+        jobs = []
+        while not jobs or any(job["status"] != "succeeded" for job in jobs):
+            await asyncio.sleep(0.01)
+            jobs = [await queue.get(job_id, user) for job_id in job_ids]
+        await queue.stop()
+        return [job["result"] for job in jobs]
+
+    job_ids = asyncio.run(before_restart())
+    assert started == [0]
+    # The interrupted job and the two queued ones all run on the next start
+    assert asyncio.run(after_restart(job_ids)) == [{"n": n, "user": "u1"} for n in range(3)]
+    assert JOB_WAIT_SECONDS.count("echo") - waits == 4
+
+    # Finished results are still readable from disk after another restart
+    async def reload():
+        queue = JobQueue(workers=0, path=path)
+        await queue.start()
+        return await queue.get(job_ids[2], user), await queue.get(job_ids[2], UserObject("u2", "bob", None, ""))
+
+    job, foreign = asyncio.run(reload())
+    assert json.dumps(job["result"]) == json.dumps({"n": 2, "user": "u1"})
+    assert foreign is None
+
+
+def test_processes_sharing_the_file_share_jobs(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    user = UserObject(id="u1", username="alice", email=None, hashed_password="")
+    runs = []
+
+    async def echo(user, params, job_id):
+        runs.append(params["n"])
+        await asyncio.sleep(0.01)
+        return {"n": params["n"]}
+
+    async def scenario():
+        # Two queues on one file stand in for two uvicorn worker processes
+        first, second = (JobQueue(workers=2, path=path, poll_interval=0.01) for _ in range(2))
+        for queue in (first, second):
+            queue.register("echo", echo)
+        await first.start()
+        await second.start()
+        jobs = [await first.enqueue("echo", user, {"n": n}) for n in range(10)]
+        results = []
+        while not results or any(job["status"] != "succeeded" for job in results):
+            await asyncio.sleep(0.01)
+            results = [await second.get(job["id"], user) for job in jobs]
+        await first.stop()
+        await second.stop()
+        return results
+
+    results = asyncio.run(scenario())
+    assert [job["result"] for job in results] == [{"n": n} for n in range(10)]
+    assert sorted(runs) == list(range(10))
+
+
+def test_jobs_of_a_dead_process_are_reclaimed_after_the_lease(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    user = UserObject(id="u1", username="alice", email=None, hashed_password="")
+
+    async def echo(user, params, job_id):
+        return {"n": params["n"]}
+
+    async def scenario():
+        dead = JobQueue(workers=0, path=path, lease=0.05)
+        dead.register("echo", echo)
+        job = await dead.enqueue("echo", user, {"n": 1})
+        # Claimed by a process that then died without finishing or heartbeating
+        assert dead._claim()["id"] == job["id"]
+        assert dead._claim() is None
+        assert (await dead.get(job["id"], user))["status"] == "running"
+
+        alive = JobQueue(workers=1, path=path, lease=0.05, poll_interval=0.01)
+        alive.register("echo", echo)
+        await alive.start()
+        while (await alive.get(job["id"], user))["status"] != "succeeded":
+            await asyncio.sleep(0.01)
+        await alive.stop()
+        return await alive.get(job["id"], user)
+
+    assert asyncio.run(scenario())["result"] == {"n": 1}
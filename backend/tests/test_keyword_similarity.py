@@ -0,0 +1,136 @@
+"""
+Keyword similarity index: near-identical Korean keywords reuse a stored tree
+instead of calling Gemini, unrelated topics sharing a generic verb do not, and
+a reused keyword is regenerated in the background so its own tree is cached.
+"""
+import asyncio
+import math
+
+import pytest
+
+from src.services import ai_service
+from src.services import keyword_index as keyword_index_module
+from src.services.ai_cache import AIResponseCache
+from src.services.keyword_index import KeywordTreeIndex
+
+BLOG_TREE = [{"description": "주제 정하기"}, {"description": "플랫폼 선택"}]
+
+
+@pytest.fixture
+def index(tmp_path, monkeypatch):
+    index = KeywordTreeIndex(threshold=0.75, max_entries=16, path=str(tmp_path / "ai_cache.db"))
+    monkeypatch.setattr(ai_service, "keyword_index", index)
+    monkeypatch.setattr(ai_service, "ai_cache", AIResponseCache(max_entries=16, path=None))
+    return index
+
+
+def _seed(index, *keywords):
+    for keyword in keywords:
+        index._insert(keyword, "[]", index._timer())
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("블로그 제작", "블로그 만들기"),
+    ("블로그를 만들기", "블로그 만들기"),
+    ("웹사이트 개발하기", "웹사이트 개발"),
+    ("이사 준비하기", "이사 준비"),
+])
+def test_near_identical_keywords_match(index, query, expected):
+    _seed(index, "블로그 만들기", "유튜브 만들기", "웹사이트 개발", "이사 준비", "영어 공부")
+    key, score = index.nearest(query)
+    assert key == expected
+    assert score >= index.threshold
+
+
+@pytest.mark.parametrize("query", ["유튜브 만들기", "블로그 운영", "홈페이지 개발", "일본어 공부", "캠핑 장비"])
+def test_different_topics_do_not_match(index, query):
+    _seed(index, "블로그 만들기", "웹사이트 개발", "영어 공부")
+    assert index.lookup(query) is None
+
+
+def test_similar_keyword_is_served_then_regenerated_in_background(index, gemini):
+    refreshed = [{"description": "블로그 콘셉트 정하기"}]
+    gemini.script(BLOG_TREE, refreshed)
+    hits = keyword_index_module.AI_SIMILARITY_REQUESTS.value("hit")
+
+    async def scenario():
+        assert await ai_service.generate_todo_items_from_keyword("블로그 만들기") == BLOG_TREE
+        reused = await ai_service.generate_todo_items_from_keyword("블로그 제작")
+        assert reused == BLOG_TREE
+        assert len(gemini.prompts) == 1
+        await asyncio.gather(*index._refreshing.values())
+        assert "'블로그 제작'" in gemini.prompts[1]
+        # The regenerated tree is now cached under the requested keyword
+        assert await ai_service.generate_todo_items_from_keyword("블로그 제작") == refreshed
+
+    asyncio.run(scenario())
+    assert len(gemini.prompts) == 2
+    assert keyword_index_module.AI_SIMILARITY_REQUESTS.value("hit") - hits == 1
+
+
+def test_background_refresh_can_be_disabled(index, gemini, monkeypatch):
+    gemini.script(BLOG_TREE)
+    monkeypatch.setattr(ai_service, "AI_SIMILARITY_REFRESH", False)
+
+    async def scenario():
+        await ai_service.generate_todo_items_from_keyword("블로그 만들기")
+        assert await ai_service.generate_todo_items_from_keyword("블로그 제작") == BLOG_TREE
+        assert not index._refreshing
+
+    asyncio.run(scenario())
+    assert len(gemini.prompts) == 1
+
+
+def test_nearest_skips_candidates_that_cannot_beat_the_best_match(tmp_path):
+    index = KeywordTreeIndex(max_entries=500, path=None)
+    # Hundreds of topics that share only the generic word (and its word-boundary n-grams) with the query
+    topics = [chr(0xAC00 + 7 * i) + chr(0xB098 + 11 * i) + " 만들기" for i in range(300)]
+    _seed(index, *topics, "블로그 만들기", "블로그 운영")
+
+    def brute_force(keyword):
+        query = keyword_index_module.keyword_ngrams(keyword)
+        scores = {}
+        for key, (terms, _, _) in index._entries.items():
+            dot = sum(weight * terms.get(term, 0.0) * index._idf(term) ** 2 for term, weight in query.items())
+            if dot:
+                scores[key] = dot / (index._norm(query) * index._norm(terms))
+        best = max(scores, key=scores.get)
+        return best, scores[best]
+
+    key, score = index.nearest("블로그 제작")
+    expected_key, expected_score = brute_force("블로그 제작")
+    assert key == expected_key and math.isclose(score, expected_score)
+    # Only the candidates sharing topic n-grams had their norm computed
+    assert len(index._norms) <= 2
+
+    # Adding an entry invalidates the memoized IDF and norms
+    _seed(index, "블로그 제작")
+    assert not index._norms
+    assert index.nearest("블로그 제작") == ("블로그 제작", pytest.approx(1.0))
+
+
+def test_index_survives_restart_and_drops_old_entries(tmp_path):
+    path = str(tmp_path / "ai_cache.db")
+    now = {"t": 1_000_000.0}
+    index = KeywordTreeIndex(max_entries=2, path=path, max_age=3600, timer=lambda: now["t"])
+
+    async def scenario():
+        await index.add("여행 계획", [{"description": "숙소 예약"}])
+        now["t"] += 10
+        await index.add("블로그 만들기", BLOG_TREE)
+        now["t"] += 10
+        await index.add("이사 준비", [{"description": "짐 싸기"}])
+
+    asyncio.run(scenario())
+    assert len(index) == 2
+    assert index.lookup("여행 준비") is None
+
+    restarted = KeywordTreeIndex(max_entries=2, path=path, max_age=3600, timer=lambda: now["t"])
+    assert restarted.load() == 2
+    tree = restarted.lookup("블로그 제작")
+    tree[0]["description"] = "changed by caller"
+    assert restarted.lookup("블로그 제작") == BLOG_TREE
+
+    now["t"] += 3600
+    assert restarted.lookup("블로그 제작") is None
+    assert KeywordTreeIndex(max_entries=2, path=path, max_age=3600, timer=lambda: now["t"]).load() == 1
@@ -0,0 +1,77 @@
+"""
+Rule-based Korean task parsing: common phrasings (relative dates, times,
+priority words, durations) are parsed locally with high confidence and skip
+Gemini, while phrasings the rules do not fully understand fall back to it.
+All dates are relative to a fixed Monday morning in KST.
+"""
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from src.services import nlp_parser as nlp_parser_module
+from src.services.ai_service import KST
+from src.services.nlp_parser import KoreanRuleParser, NaturalLanguageParser
+
+NOW = datetime(2026, 10, 19, 10, 7, tzinfo=KST)  # 월요일
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("내일 보고서 제출 긴급",
+     {"description": "보고서 제출", "due_date": "2026-10-20 10:30:00", "priority": "high", "category": "업무"}),
+    ("내일까지 운동하기", {"description": "운동하기", "due_date": "2026-10-20 10:30:00", "category": "운동"}),
+    ("긴급! 오늘 저녁 6시까지 보고서 제출",
+     {"description": "보고서 제출", "due_date": "2026-10-19 18:00:00", "priority": "high"}),
+    ("다음 주 수요일 치과 예약", {"description": "치과 예약", "due_date": "2026-10-28", "category": "개인"}),
+    ("이번 주 금요일까지 과제 제출", {"due_date": "2026-10-23", "category": "학습"}),
+    ("모레 오후 3시 반 팀 미팅", {"description": "팀 미팅", "due_date": "2026-10-21 15:30:00"}),
+    ("내일 아침 7시 30분 러닝 40분",
+     {"description": "러닝", "due_date": "2026-10-20 07:30:00", "estimated_time_minutes": 40}),
+    ("밤 12시까지 과제 제출", {"due_date": "2026-10-20 00:00:00"}),
+    ("11월 3일 병원", {"description": "병원", "due_date": "2026-11-03"}),
+    ("30분 스트레칭", {"description": "스트레칭", "due_date": None, "estimated_time_minutes": 30}),
+    ("1시간 반 영어 공부", {"description": "영어 공부", "estimated_time_minutes": 90, "category": "학습"}),
+    ("나중에 옷장 정리", {"description": "옷장 정리", "priority": "low", "category": None}),
+])
+def test_common_phrasings_are_parsed_confidently(text, expected):
+    result, confidence = KoreanRuleParser().parse(text, NOW)
+    assert {key: result[key] for key in expected} == expected
+    assert confidence >= nlp_parser_module.NLP_RULES_MIN_CONFIDENCE
+
+
+@pytest.mark.parametrize("text", [
+    "다음 달 초에 이사 준비",      # 처리하지 못한 날짜 표현
+    "매주 월요일 주간 보고",        # 반복 일정
+    "6시 회의",                     # 오전/오후 모호
+    "내일 3시 아니면 모레 회의",    # 날짜가 여러 개
+    "오늘 저녁",                    # 작업 내용 없음
+])
+def test_unclear_phrasings_have_low_confidence(text):
+    _, confidence = KoreanRuleParser().parse(text, NOW)
+    assert confidence < nlp_parser_module.NLP_RULES_MIN_CONFIDENCE
+
+
+def test_parse_task_only_calls_gemini_below_threshold(monkeypatch):
+    calls = []
+
+    async def analyze(text, user_id=None, now=None):
+        calls.append((text, now))
+        return {"description": "이사 준비", "due_date": "2026-11-02", "priority": "none"}
+
+    monkeypatch.setattr(nlp_parser_module, "analyze_task_from_natural_language", analyze)
+    parser = NaturalLanguageParser(min_confidence=0.8, clock=lambda: NOW)
+    rules = nlp_parser_module.NLP_PARSE_REQUESTS.value("rules")
+
+    fast = asyncio.run(parser.parse_task("긴급! 오늘 저녁 6시까지 보고서 제출"))
+    assert fast["due_date"] == "2026-10-19 18:00:00"
+    assert calls == []
+    assert nlp_parser_module.NLP_PARSE_REQUESTS.value("rules") - rules == 1
+
+    slow = asyncio.run(parser.parse_task("다음 달 초에 이사 준비", user_id="u1"))
+    assert slow["due_date"] == "2026-11-02"
+    # Gemini gets the same reference time the rules used
+    assert calls == [("다음 달 초에 이사 준비", NOW)]
+
+    # A threshold above 1 disables the fast path
+    asyncio.run(NaturalLanguageParser(min_confidence=1.1, clock=lambda: NOW).parse_task("30분 스트레칭"))
+    assert len(calls) == 2
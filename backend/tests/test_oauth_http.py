@@ -0,0 +1,77 @@
+"""
+Naver and Kakao callbacks go through one pooled httpx client: connections are
+kept alive across logins, transient provider errors are retried only where a
+retry cannot replay a single-use authorization code, and slow or failing
+providers surface as 503 instead of hanging the request.
+"""
+import asyncio
+import socket
+import time
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from src.services import oauth_http as oauth_http_module
+from src.services.oauth_http import OAuthHttpClient, oauth_http
+
+NAVER_BODY = {"code": "c", "state": "s", "redirect_uri": "http://x"}
+KAKAO_BODY = {"code": "c", "redirect_uri": "http://x"}
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(oauth_http, "backoff", 0)
+
+
+def test_logins_reuse_one_keep_alive_connection(client: TestClient, fake_db, oauth_stub):
+    for _ in range(2):
+        assert client.post("/auth/naver-callback", json=NAVER_BODY).status_code == 200
+        assert client.post("/auth/kakao-callback", json=KAKAO_BODY).status_code == 200
+    assert len(oauth_stub.requests) == 8
+    assert oauth_stub.connections == 1
+
+
+def test_profile_get_is_retried_on_transient_errors(client: TestClient, fake_db, oauth_stub):
+    oauth_stub.faults["/naver/me"].extend([503, "drop"])
+    assert client.post("/auth/naver-callback", json=NAVER_BODY).status_code == 200
+    assert oauth_stub.count("GET", "/naver/me") == 3
+
+
+def test_token_post_is_not_replayed_after_server_error(client: TestClient, fake_db, oauth_stub):
+    oauth_stub.faults["/kakao/token"].append(502)
+    response = client.post("/auth/kakao-callback", json=KAKAO_BODY)
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == str(oauth_http_module.RETRY_AFTER_SECONDS)
+    assert oauth_stub.count("POST", "/kakao/token") == 1
+    assert oauth_stub.count("GET", "/kakao/me") == 0
+
+
+def test_slow_provider_times_out_with_503(client: TestClient, fake_db, oauth_stub, monkeypatch):
+    monkeypatch.setattr(oauth_http, "read_timeout", 0.2)
+    monkeypatch.setattr(oauth_http, "max_retries", 0)
+    oauth_stub.faults["/naver/me"].append("slow")
+    start = time.perf_counter()
+    response = client.post("/auth/naver-callback", json=NAVER_BODY)
+    assert response.status_code == 503
+    assert time.perf_counter() - start < oauth_stub.slow_seconds
+
+
+def test_connect_errors_are_retried_for_post():
+    # A port with no listener refuses the connection before anything is sent
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        url = f"http://127.0.0.1:{sock.getsockname()[1]}/token"
+
+    async def scenario():
+        client = OAuthHttpClient(max_retries=2)
+        client.backoff = 0
+        try:
+            with pytest.raises(httpx.ConnectError):
+                await client.post(url, data={"code": "c"})
+        finally:
+            await client.stop()
+
+    before = oauth_http_module.OAUTH_HTTP_RETRIES.value("127.0.0.1")
+    asyncio.run(scenario())
+    assert oauth_http_module.OAUTH_HTTP_RETRIES.value("127.0.0.1") - before == 2
@@ -0,0 +1,95 @@
+"""
+Password hashing runs in a bounded process pool, sheds load with 503 when the
+queue is full, calibrates its cost and upgrades weaker stored hashes at login.
+"""
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from src.services import password_hashing
+from src.services.firestore_common import username_key
+from src.services.password_hashing import PasswordHasher, calibrate_rounds, crypt_context, password_hasher
+
+# Cheap cost for tests that only exercise the plumbing
+FAST_ROUNDS = 1000
+
+
+def test_process_pool_hashes_and_verifies():
+    async def scenario():
+        hasher = PasswordHasher(workers=1, max_pending=4, rounds=FAST_ROUNDS)
+        try:
+            hashed = await hasher.hash("secret")
+            assert await hasher.verify("secret", hashed) == (True, None)
+            assert (await hasher.verify("wrong", hashed))[0] is False
+        finally:
+            hasher.stop()
+
+    asyncio.run(scenario())
+
+
+def test_full_queue_is_shed_with_503():
+    async def scenario():
+        hasher = PasswordHasher(workers=0, max_pending=1)
+        hasher.pending = 1
+        with pytest.raises(HTTPException) as excinfo:
+            await hasher.hash("secret")
+        assert excinfo.value.status_code == 503
+        assert excinfo.value.headers["Retry-After"]
+
+    asyncio.run(scenario())
+
+
+def test_weaker_hash_is_upgraded_on_verify():
+    rounds = FAST_ROUNDS
+    weak = crypt_context(rounds).hash("secret")
+    verified, new_hash = password_hashing.verify_password_sync("secret", weak, rounds * 2)
+    assert verified
+    assert crypt_context(rounds * 2).identify(new_hash) == "pbkdf2_sha256"
+    assert f"${rounds * 2}$" in new_hash
+    # Stronger hashes than configured are left alone
+    assert password_hashing.verify_password_sync("secret", new_hash, rounds) == (True, None)
+
+
+def test_unknown_hash_format_fails_verification():
+    assert password_hashing.verify_password_sync("secret", "not-a-hash", 10000) == (False, None)
+
+
+def test_calibration_scales_with_target():
+    low, high = calibrate_rounds(1), calibrate_rounds(200)
+    assert low == password_hashing.PASSWORD_HASH_ROUNDS
+    assert high > low
+
+
+def test_calibration_only_raises_and_is_stable(monkeypatch):
+    # A low target never weakens new hashes below the configured rounds
+    assert calibrate_rounds(0.001, floor=600000) == 600000
+
+    # Noisy measurements within one grid step land on the same value, so restarts do not rehash
+    timings = iter([0.0, 0.100, 0.0, 0.100, 0.0, 0.100, 0.0, 0.108, 0.0, 0.108, 0.0, 0.108])
+    monkeypatch.setattr(password_hashing.time, "perf_counter", lambda: next(timings))
+    first = calibrate_rounds(500, floor=1000)
+    second = calibrate_rounds(500, floor=1000)
+    assert first == second
+    assert first <= 100000
+
+
+def test_login_sheds_load_when_hasher_is_saturated(client: TestClient, fake_db, auth_headers, monkeypatch):
+    monkeypatch.setattr(password_hasher, "pending", password_hasher.max_pending)
+    response = client.post("/auth/login", data={"username": "budget", "password": "budget"})
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == str(password_hashing.RETRY_AFTER_SECONDS)
+
+
+def test_login_rehashes_when_rounds_increase(client: TestClient, fake_db, auth_headers, monkeypatch):
+    monkeypatch.setattr(password_hasher, "rounds", password_hasher.rounds + 1000)
+    fake_db.reset_counts()
+    assert client.post("/auth/login", data={"username": "budget", "password": "budget"}).status_code == 200
+    assert fake_db.writes == 2  # users document and username index document
+
+    stored = fake_db.collection("usernames").document(username_key("budget")).get().to_dict()["hashed_password"]
+    assert f"${password_hasher.rounds}$" in stored
+    fake_db.reset_counts()
+    assert client.post("/auth/login", data={"username": "budget", "password": "budget"}).status_code == 200
+    assert fake_db.writes == 0
@@ -0,0 +1,80 @@
+"""
+Principal cache: token digest -> immutable UserObject, bounded by token expiry,
+a TTL cap and an LRU size limit, and dropped when the account is deleted.
+"""
+import dataclasses
+from datetime import timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from jose import jwt
+
+from src.services.security import PrincipalCache, UserObject, create_access_token, principal_cache
+
+
+def _user(user_id="u1", username="alice"):
+    return UserObject.from_dict({"id": user_id, "username": username, "hashed_password": "x"})
+
+
+def test_user_object_is_slotted_and_immutable():
+    user = _user()
+    assert not hasattr(user, "__dict__")
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        user.username = "mallory"
+
+
+def test_entries_expire_with_the_token(clock):
+    token = create_access_token({"sub": "alice"}, expires_delta=timedelta(seconds=30))
+    expires_at = jwt.get_unverified_claims(token)["exp"]
+    clock.now = expires_at - 10
+    cache = PrincipalCache(max_entries=10, ttl=300, timer=clock)
+    cache.put(token, _user())
+    assert cache.get(token) == _user()
+    clock.now = expires_at
+    assert cache.get(token) is None
+
+
+def test_entries_expire_after_ttl_cap(clock):
+    token = create_access_token({"sub": "alice"})
+    cache = PrincipalCache(max_entries=10, ttl=5, timer=clock)
+    cache.put(token, _user())
+    clock.now += 6
+    assert cache.get(token) is None
+
+
+def test_least_recently_used_token_is_evicted():
+    cache = PrincipalCache(max_entries=2, ttl=300)
+    tokens = [create_access_token({"sub": name}) for name in ("a", "b", "c")]
+    cache.put(tokens[0], _user("1", "a"))
+    cache.put(tokens[1], _user("2", "b"))
+    cache.get(tokens[0])
+    cache.put(tokens[2], _user("3", "c"))
+    assert cache.get(tokens[1]) is None
+    assert cache.get(tokens[0]) is not None
+
+
+def test_invalidate_drops_every_token_of_the_user():
+    cache = PrincipalCache(max_entries=10, ttl=300)
+    first = create_access_token({"sub": "alice"}, expires_delta=timedelta(minutes=1))
+    second = create_access_token({"sub": "alice"}, expires_delta=timedelta(minutes=2))
+    other = create_access_token({"sub": "bob"})
+    cache.put(first, _user())
+    cache.put(second, _user())
+    cache.put(other, _user("u2", "bob"))
+    cache.invalidate("u1")
+    assert cache.get(first) is None and cache.get(second) is None
+    assert cache.get(other) is not None
+
+
+def test_authenticated_requests_skip_user_lookup(client: TestClient, fake_db, auth_headers):
+    client.get("/todos", headers=auth_headers)
+    fake_db.reset_counts()
+    client.get("/todos", headers=auth_headers)
+    assert not any(detail.startswith("users") for _, detail, _ in fake_db.operations)
+
+
+def test_deleted_account_token_is_rejected(client: TestClient, fake_db, auth_headers):
+    assert client.get("/todos", headers=auth_headers).status_code == 200
+    assert len(principal_cache) == 1
+    assert client.delete("/auth/me", headers=auth_headers).status_code == 200
+    assert client.get("/todos", headers=auth_headers).status_code == 401
@@ -0,0 +1,89 @@
+import random
+
+import pytest
+
+from src.services.rank import (
+    RANK_MAX_LENGTH, rank_after, rank_before, rank_between, rank_from_order, rank_sequence
+)
+from src.services.todo_tree import item_rank, positions_for_orders
+
+
+def test_rank_between_random_inserts_stay_ordered():
+    rng = random.Random(42)
+    keys = [rank_between(None, None)]
+    for _ in range(2000):
+        index = rng.randint(0, len(keys))
+        lower = keys[index - 1] if index > 0 else None
+        upper = keys[index] if index < len(keys) else None
+        key = rank_between(lower, upper)
+        assert lower is None or lower < key
+        assert upper is None or key < upper
+        assert not key.endswith("0")
+        keys.insert(index, key)
+    assert keys == sorted(keys)
+
+
+def test_rank_between_rejects_inverted_range():
+    with pytest.raises(ValueError):
+        rank_between("b", "a")
+
+
+def test_append_and_prepend_keys_grow_slowly():
+    key = rank_between(None, None)
+    for _ in range(300):
+        next_key = rank_after(key)
+        assert next_key > key
+        key = next_key
+    assert len(key) < RANK_MAX_LENGTH
+
+    key = rank_between(None, None)
+    for _ in range(300):
+        next_key = rank_before(key)
+        assert next_key < key
+        key = next_key
+    assert len(key) < RANK_MAX_LENGTH
+
+
+def test_rank_sequence_is_sorted_and_unique():
+    keys = rank_sequence(1000)
+    assert keys == sorted(keys)
+    assert len(set(keys)) == 1000
+    assert rank_sequence(0) == []
+
+
+def test_legacy_order_keys_preserve_order_and_allow_appends():
+    keys = [rank_from_order(order) for order in range(5000)]
+    assert keys == sorted(keys)
+    assert len(set(keys)) == 5000
+    assert rank_after(keys[-1]) > keys[-1]
+    assert keys[10] < rank_between(keys[10], keys[11]) < keys[11]
+
+
+def _apply_orders(siblings, orders):
+    positions = positions_for_orders(siblings, orders)
+    for sibling in siblings:
+        sibling.update(positions.get(sibling["id"], {}))
+    return positions, [sibling["id"] for sibling in sorted(siblings, key=item_rank)]
+
+
+def test_partial_order_updates_land_between_sibling_ranks():
+    siblings = [{"id": str(i), "rank": rank} for i, rank in enumerate(rank_sequence(4))]
+    # An integer order must not fall back to legacy "00x" keys that sort before every rank
+    positions, ids = _apply_orders(siblings, {"3": 0})
+    assert ids == ["3", "0", "1", "2"]
+    assert list(positions) == ["3"]
+
+    _, ids = _apply_orders(siblings, {"3": 2, "1": 0})
+    assert ids == ["1", "0", "3", "2"]
+
+    # A full reorder, as sent after drag and drop, matches the requested order exactly
+    _, ids = _apply_orders(siblings, {"0": 3, "1": 2, "2": 1, "3": 0})
+    assert ids == ["3", "2", "1", "0"]
+
+
+def test_order_updates_rebalance_when_ranks_collide():
+    siblings = [{"id": "a", "rank": "V"}, {"id": "b", "rank": "V"}, {"id": "c", "rank": "k"}]
+    positions, ids = _apply_orders(siblings, {"c": 1})
+    assert ids[1] == "c"
+    assert set(positions) == {"a", "b", "c"}
+    assert [positions[i]["order"] for i in ids] == [0, 1, 2]
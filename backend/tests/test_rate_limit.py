@@ -0,0 +1,89 @@
+"""
+Rate limiting: the AI generation and parsing endpoints share one per-user bucket that
+answers 429 with backoff headers once exhausted, while ordinary endpoints,
+other users and anonymous clients (keyed by IP) keep their own budgets.
+"""
+import pytest
+from starlette.datastructures import Headers
+
+from src.services import rate_limit as rate_limit_module
+from src.services.rate_limit import RATE_LIMITED_REQUESTS, client_address, limiter, rate_limit_key
+
+
+@pytest.fixture
+def rate_limited(monkeypatch):
+    monkeypatch.setattr(limiter, "enabled", True)
+    limiter.reset()
+    yield limiter
+    limiter.reset()
+
+
+def _login(client, username):
+    client.post("/auth/register", json={"username": username, "password": username, "email": f"{username}@example.com"})
+    token = client.post("/auth/login", data={"username": username, "password": username}).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_ai_endpoints_share_a_per_user_budget(client, fake_db, auth_headers, rate_limited):
+    rejected = RATE_LIMITED_REQUESTS.value("ai")
+    response = client.post("/todos/generate", headers=auth_headers, json={"keyword": "이사"})
+    assert response.status_code == 200
+    assert response.headers["x-ratelimit-limit"] == "10"
+    assert response.headers["x-ratelimit-remaining"] == "9"
+
+    project = response.json()
+    item = project["items"][0]
+    assert client.post(f"/todos/items/{item['id']}/generate-subtasks", headers=auth_headers).status_code == 200
+    response = client.post(
+        "/todos/parse-and-create-item", headers=auth_headers, json={"list_id": project["id"], "text": "보고서"},
+    )
+    assert response.status_code == 200
+    assert response.headers["x-ratelimit-remaining"] == "7"
+    for _ in range(7):
+        assert client.post("/todos/generate", headers=auth_headers, json={"keyword": "이사"}).status_code == 200
+
+    response = client.post(f"/todos/items/{item['id']}/generate-subtasks", headers=auth_headers)
+    assert response.status_code == 429
+    assert response.json()["detail"].startswith("Rate limit exceeded")
+    assert response.headers["x-ratelimit-remaining"] == "0"
+    assert int(response.headers["retry-after"]) > 0
+    assert RATE_LIMITED_REQUESTS.value("ai") - rejected == 1
+
+    # Ordinary endpoints and other users are not affected
+    response = client.get("/todos/", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.headers["x-ratelimit-limit"] == "120"
+    assert client.post("/todos/generate", headers=_login(client, "neighbour"), json={"keyword": "이사"}).status_code == 200
+
+
+class _Request:
+    def __init__(self, headers):
+        self.headers = Headers(headers)
+        self.client = type("Client", (), {"host": "203.0.113.9"})()
+
+
+def test_requests_are_keyed_by_user_or_ip(client, fake_db, auth_headers, rate_limited):
+    assert rate_limit_key(_Request(auth_headers)) == "user:budget"
+    assert rate_limit_key(_Request({"authorization": "Bearer nonsense"})) == "ip:203.0.113.9"
+    assert rate_limit_key(_Request({})) == "ip:203.0.113.9"
+
+    # Anonymous requests count against the IP's default budget; exempt routes carry no headers
+    first = client.get("/todos/")
+    second = client.get("/todos/")
+    assert first.status_code == 401
+    assert int(first.headers["x-ratelimit-remaining"]) - int(second.headers["x-ratelimit-remaining"]) == 1
+    assert "x-ratelimit-limit" not in client.get("/").headers
+
+
+def test_forwarded_for_uses_the_address_added_by_trusted_proxies(monkeypatch):
+    spoofed = {"X-Forwarded-For": "198.51.100.1, 192.0.2.7"}
+    assert client_address(_Request(spoofed)) == "203.0.113.9"
+
+    monkeypatch.setattr(rate_limit_module, "RATE_LIMIT_TRUSTED_PROXIES", 1)
+    # The client-supplied leftmost entry is ignored; the proxy appended the real peer
+    assert client_address(_Request(spoofed)) == "192.0.2.7"
+    assert client_address(_Request({})) == "203.0.113.9"
+
+    monkeypatch.setattr(rate_limit_module, "RATE_LIMIT_TRUSTED_PROXIES", 2)
+    assert client_address(_Request(spoofed)) == "198.51.100.1"
+    assert client_address(_Request({"X-Forwarded-For": "192.0.2.7"})) == "203.0.113.9"
@@ -0,0 +1,103 @@
+"""
+Redis-backed shared cache: msgpack round trips, generation checks, pub/sub
+invalidation between workers, and graceful degradation when Redis is down.
+"""
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.services.shared_cache import SharedCache, pack, set_shared_cache_client, unpack
+from src.services.tree_cache import TreeCache, tree_cache
+
+from redis_fake import FakeRedisServer
+
+
+@pytest.fixture
+def redis_server(fake_db):
+    server = FakeRedisServer()
+    set_shared_cache_client(server.client())
+    yield server
+    set_shared_cache_client(None)
+
+
+def test_values_round_trip_through_msgpack():
+    value = {
+        "id": "l1",
+        "created_at": datetime(2025, 1, 2, 3, 4, 5),
+        "updated_at": datetime(2025, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+        "items": [{"id": "i1", "children": [], "due_date": None, "is_completed": False}],
+    }
+    assert unpack(pack(value)) == value
+
+
+def test_stale_put_after_invalidation_is_not_served():
+    async def scenario():
+        server = FakeRedisServer()
+        reader, writer = SharedCache(server.client()), SharedCache(server.client())
+        _, generation = await reader.get("tree", "l1")
+        await writer.invalidate("tree", "l1")  # a mutation lands while the read is in flight
+        await reader.put("tree", "l1", {"keyword": "stale"}, generation)
+        assert (await reader.get("tree", "l1"))[0] is None
+
+        _, generation = await reader.get("tree", "l1")
+        await reader.put("tree", "l1", {"keyword": "fresh"}, generation)
+        assert (await writer.get("tree", "l1"))[0] == {"keyword": "fresh"}
+
+    asyncio.run(scenario())
+
+
+def test_invalidation_is_broadcast_to_other_workers():
+    async def scenario():
+        server = FakeRedisServer()
+        local_a, local_b = TreeCache(max_bytes=1024, ttl=60), TreeCache(max_bytes=1024, ttl=60)
+        worker_a = SharedCache(server.client(), local_caches={"tree": local_a})
+        worker_b = SharedCache(server.client(), local_caches={"tree": local_b})
+        local_b.put("l1", {"id": "l1"})
+        await worker_b.start()
+        await asyncio.sleep(0)  # let the listener subscribe
+
+        await worker_a.invalidate("tree", "l1")
+        for _ in range(10):
+            await asyncio.sleep(0)
+        await worker_b.stop()
+        assert local_b.get("l1") is None
+
+    asyncio.run(scenario())
+
+
+def test_redis_outage_degrades_to_cache_miss():
+    async def scenario():
+        server = FakeRedisServer()
+        cache = SharedCache(server.client())
+        server.down = True
+        value, generation = await cache.get("tree", "l1")
+        await cache.put("tree", "l1", {"id": "l1"}, generation)
+        await cache.invalidate("tree", "l1")
+        assert value is None
+        server.down = False
+        assert (await cache.get("tree", "l1"))[0] is None
+
+    asyncio.run(scenario())
+
+
+def test_other_worker_reads_project_from_redis(client: TestClient, fake_db, redis_server, auth_headers, project):
+    tree_cache.clear()  # a worker that has never seen this project
+    response = client.get(f"/todos/{project['id']}", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json() == project
+    assert fake_db.reads == 0
+
+
+def test_mutation_invalidates_redis_for_other_workers(client: TestClient, fake_db, redis_server, auth_headers, project):
+    item_id = project["items"][0]["id"]
+    client.put(f"/todos/items/{item_id}", headers=auth_headers, json={"is_completed": True})
+    tree_cache.clear()
+    response = client.get(f"/todos/{project['id']}", headers=auth_headers)
+    assert response.json()["items"][0]["is_completed"] is True
+
+
+def test_deleted_user_is_dropped_from_redis(client: TestClient, fake_db, redis_server, auth_headers):
+    assert client.delete("/auth/me", headers=auth_headers).status_code == 200
+    assert client.get("/todos", headers=auth_headers).status_code == 401
@@ -0,0 +1,131 @@
+"""
+Single-flight coalescing: identical AI requests that overlap (double-clicks,
+client retries) share one upstream Gemini call, a caller that gives up does
+not cancel it for the others, and concurrent subtask generation for the same
+item adds its children only once.
+"""
+import asyncio
+import threading
+
+import pytest
+
+from src.services import ai_service, todo_service_firestore_async
+from src.services.ai_cache import AIResponseCache
+from src.services.keyword_index import KeywordTreeIndex
+from src.services.single_flight import COALESCED_REQUESTS
+
+
+SUBTASKS = "1. 자료 조사\n2. 초안 작성\n3. 검토"
+
+
+@pytest.fixture
+def no_cache(monkeypatch):
+    monkeypatch.setattr(ai_service, "ai_cache", AIResponseCache(max_entries=16, path=None))
+    monkeypatch.setattr(ai_service, "keyword_index", KeywordTreeIndex(path=None))
+
+
+def test_identical_concurrent_requests_share_one_call(no_cache, gemini):
+    gemini.script(SUBTASKS, delay=0.05)
+    coalesced = COALESCED_REQUESTS.value("generate_sub_tasks_from_main_task")
+
+    async def scenario():
+        return await asyncio.gather(
+            ai_service.generate_sub_tasks_from_main_task("보고서 작성", "업무"),
+            ai_service.generate_sub_tasks_from_main_task("  보고서   작성 ", "업무", user_id="retry"),
+            ai_service.generate_sub_tasks_from_main_task("발표 준비", "업무"),
+        )
+
+    first, second, other = asyncio.run(scenario())
+    assert len(gemini.prompts) == 2
+    assert first == second == ["자료 조사", "초안 작성", "검토"]
+    assert first is not second
+    assert COALESCED_REQUESTS.value("generate_sub_tasks_from_main_task") - coalesced == 1
+    assert len(ai_service.ai_requests) == 0
+
+
+def test_failure_is_shared_and_not_remembered(no_cache, gemini):
+    gemini.script(TimeoutError(), SUBTASKS, delay=0.05)
+
+    async def scenario():
+        return await asyncio.gather(*(ai_service.generate_sub_tasks_from_main_task("보고서 작성") for _ in range(3)))
+
+    results = asyncio.run(scenario())
+    assert len(gemini.prompts) == 1
+    assert all(result[0] == "'보고서 작성'에 대한 첫 번째 세부 계획" for result in results)
+
+    # The failed call is not kept around: the next request tries again
+    assert asyncio.run(ai_service.generate_sub_tasks_from_main_task("보고서 작성"))[0] == "자료 조사"
+    assert len(gemini.prompts) == 2
+
+
+def test_cancelled_first_caller_does_not_cancel_the_shared_call(no_cache, gemini):
+    gemini.script({"description": "보고서 제출", "priority": "high"}, delay=0.1)
+
+    async def scenario():
+        first = asyncio.create_task(ai_service.analyze_task_from_natural_language("내일 보고서 제출"))
+        await asyncio.sleep(0.01)
+        second = asyncio.create_task(ai_service.analyze_task_from_natural_language("내일 보고서 제출"))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(scenario())["description"] == "보고서 제출"
+    assert len(gemini.prompts) == 1
+
+
+def test_generation_waits_for_an_identical_stream(no_cache, gemini, monkeypatch):
+    tree = '[{"description": "기획"}, {"description": "배포"}]'
+    gemini.script(tree, delay=0.05)
+    streams = []
+
+    async def stream(prompt, operation, user_id=None, **kwargs):
+        streams.append(prompt)
+        for chunk in (tree[:20], tree[20:]):
+            await asyncio.sleep(0.03)
+            yield chunk
+
+    monkeypatch.setattr(ai_service.ai_client, "stream", stream)
+
+    async def streamed():
+        return [node async for node in ai_service.stream_todo_items_from_keyword("웹사이트")]
+
+    async def scenario():
+        streaming = asyncio.create_task(streamed())
+        await asyncio.sleep(0.01)
+        generated = await ai_service.generate_todo_items_from_keyword("웹사이트")
+        duplicate_stream = await streamed()
+        return await streaming, generated, duplicate_stream
+
+    nodes, generated, duplicate = asyncio.run(scenario())
+    assert [description for _, description in nodes] == ["기획", "배포"]
+    assert generated == [{"description": "기획"}, {"description": "배포"}]
+    assert duplicate == nodes
+    assert len(streams) == 1 and not gemini.prompts
+
+
+def test_double_click_generates_subtasks_once(client, fake_db, auth_headers, project, monkeypatch):
+    calls = []
+
+    async def slow_sub_tasks(user_id=None, **kwargs):
+        calls.append(kwargs["main_task_description"])
+        await asyncio.sleep(0.2)
+        return ["sub 1", "sub 2", "sub 3"]
+
+    monkeypatch.setattr(todo_service_firestore_async, "generate_sub_tasks_from_main_task", slow_sub_tasks)
+    item = project["items"][0]
+    responses = []
+
+    def click():
+        responses.append(client.post(f"/todos/items/{item['id']}/generate-subtasks", headers=auth_headers))
+
+    threads = [threading.Thread(target=click) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert [response.status_code for response in responses] == [200, 200]
+    assert len(calls) == 1
+    assert responses[0].json() == responses[1].json()
+    children = [doc for doc in fake_db._documents("todo_items").values() if doc.get("parent_id") == item["id"]]
+    assert len(children) == len(item["children"]) + 3
@@ -0,0 +1,41 @@
+import inspect
+
+from src.services import auth_service_sqlite, todo_service_sqlite
+from src.services import auth_service_firestore_async, todo_service_firestore_async
+from src.services.repository import TodoRepository, UserRepository
+
+
+def _protocol_members(protocol):
+    return [name for name in vars(protocol) if not name.startswith("_")] + list(
+        getattr(protocol, "__annotations__", {})
+    )
+
+
+def test_todo_services_implement_repository():
+    for module in (todo_service_firestore_async, todo_service_sqlite):
+        for name in _protocol_members(TodoRepository):
+            assert callable(getattr(module, name, None)), f"{module.__name__}.{name}"
+
+
+def test_auth_services_implement_repository():
+    for module in (auth_service_firestore_async, auth_service_sqlite):
+        for name in _protocol_members(UserRepository):
+            assert hasattr(module, name), f"{module.__name__}.{name}"
+
+
+def test_todo_service_signatures_match():
+    for name in _protocol_members(TodoRepository):
+        firestore_attr = getattr(todo_service_firestore_async, name)
+        assert inspect.iscoroutinefunction(firestore_attr), f"{todo_service_firestore_async.__name__}.{name}"
+        firestore_params = list(inspect.signature(firestore_attr).parameters)
+        sqlite_params = list(inspect.signature(getattr(todo_service_sqlite, name)).parameters)
+        assert firestore_params == sqlite_params, name
+
+
+def test_auth_service_signatures_match():
+    for name in _protocol_members(UserRepository):
+        firestore_attr = getattr(auth_service_firestore_async, name)
+        assert inspect.iscoroutinefunction(firestore_attr), f"{auth_service_firestore_async.__name__}.{name}"
+        firestore_params = list(inspect.signature(firestore_attr).parameters)
+        sqlite_params = list(inspect.signature(getattr(auth_service_sqlite, name)).parameters)
+        assert firestore_params == sqlite_params, name
@@ -103,7 +103,7 @@ def test_update_todo_item_status(client: TestClient):
     item_id = generate_response.json()["items"][0]["id"]
 
     response = client.put(
-        f"/todos/{list_id}/items/{item_id}",
+        f"/todos/items/{item_id}",
         headers={
             "Authorization": f"Bearer {token}"
         },
@@ -113,4 +113,22 @@ def test_update_todo_item_status(client: TestClient):
     )
     assert response.status_code == 200
     assert response.json()["id"] == item_id
-    assert response.json()["is_completed"]
\ No newline at end of file
+    assert response.json()["is_completed"]
+
+
+def test_integer_order_updates_keep_rank_order(client: TestClient):
+    token = get_auth_token(client)
+    headers = {"Authorization": f"Bearer {token}"}
+    project = client.post("/todos/generate", headers=headers, json={"keyword": "order"}).json()
+    ids = [item["id"] for item in project["items"]]
+
+    # Partial batch, as the frontend sends after a toggle: only the moved item
+    response = client.post("/todos/items:batch", headers=headers, json=[{"id": ids[-1], "order": 1}])
+    assert response.status_code == 200
+    items = client.get(f"/todos/{project['id']}", headers=headers).json()["items"]
+    assert [item["id"] for item in items] == [ids[0], ids[-1]] + ids[1:-1]
+
+    response = client.put(f"/todos/items/{ids[0]}", headers=headers, json={"order": 5})
+    assert response.status_code == 200
+    items = client.get(f"/todos/{project['id']}", headers=headers).json()["items"]
+    assert items[-1]["id"] == ids[0]
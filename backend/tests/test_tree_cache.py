@@ -0,0 +1,97 @@
+"""
+Project tree cache: size-bounded LRU with TTL, invalidated by every mutation.
+"""
+from fastapi.testclient import TestClient
+
+from src.services.tree_cache import TreeCache, estimate_size, tree_cache
+
+
+def _tree(list_id, payload="x"):
+    return {"id": list_id, "user_id": "u", "keyword": payload, "items": []}
+
+
+def test_evicts_least_recently_used_by_size():
+    entry_size = estimate_size(_tree("a"))
+    cache = TreeCache(max_bytes=entry_size * 2, ttl=60)
+    cache.put("a", _tree("a"))
+    cache.put("b", _tree("b"))
+    assert cache.get("a") is not None  # "b" becomes least recently used
+    cache.put("c", _tree("c"))
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.size_bytes <= entry_size * 2
+
+
+def test_oversized_entry_is_not_cached():
+    cache = TreeCache(max_bytes=10, ttl=60)
+    cache.put("a", _tree("a", payload="x" * 100))
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = TreeCache(max_bytes=1024, ttl=5, timer=clock)
+    cache.put("a", _tree("a"))
+    clock.now += 4.9
+    assert cache.get("a") is not None
+    clock.now += 0.2
+    assert cache.get("a") is None
+
+
+def test_read_started_before_invalidation_is_not_cached():
+    cache = TreeCache(max_bytes=1024, ttl=60)
+    generation = cache.generation("a")
+    cache.invalidate("a")  # a mutation lands while the read is in flight
+    cache.put("a", _tree("a", payload="stale"), generation)
+    assert cache.get("a") is None
+    cache.put("a", _tree("a", payload="fresh"), cache.generation("a"))
+    assert cache.get("a")["keyword"] == "fresh"
+
+
+def test_invalidation_history_is_bounded():
+    cache = TreeCache(max_bytes=1024, ttl=60, generation_limit=2)
+    generation = cache.generation("a")
+    cache.invalidate("a", "b", "c", "d")
+    assert len(cache._generations) == 2
+    # "a" was forgotten, but a read that started before its invalidation is still rejected
+    cache.put("a", _tree("a", payload="stale"), generation)
+    assert cache.get("a") is None
+    cache.put("a", _tree("a", payload="fresh"), cache.generation("a"))
+    assert cache.get("a")["keyword"] == "fresh"
+
+
+def test_disabled_cache_stores_nothing():
+    cache = TreeCache(max_bytes=0, ttl=60)
+    cache.put("a", _tree("a"))
+    assert cache.get("a") is None
+
+
+def test_repeated_reads_are_served_from_cache(client: TestClient, fake_db, auth_headers, project):
+    first = client.get(f"/todos/{project['id']}", headers=auth_headers)
+    second = client.get(f"/todos/{project['id']}", headers=auth_headers)
+    assert first.json() == second.json()
+    assert fake_db.reads == 0
+
+
+def test_mutations_are_visible_on_next_read(client: TestClient, fake_db, auth_headers, project):
+    item_id = project["items"][0]["id"]
+    client.put(f"/todos/items/{item_id}", headers=auth_headers, json={"is_completed": True})
+    assert client.get(f"/todos/{project['id']}", headers=auth_headers).json()["items"][0]["is_completed"] is True
+
+    client.post("/todos/items", headers=auth_headers, json={"list_id": project["id"], "description": "new"})
+    assert client.get(f"/todos/{project['id']}", headers=auth_headers).json()["items"][-1]["description"] == "new"
+
+    client.delete(f"/todos/items/{item_id}", headers=auth_headers)
+    items = client.get(f"/todos/{project['id']}", headers=auth_headers).json()["items"]
+    assert item_id not in [item["id"] for item in items]
+
+    client.delete(f"/todos/{project['id']}", headers=auth_headers)
+    assert client.get(f"/todos/{project['id']}", headers=auth_headers).status_code == 404
+    assert tree_cache.get(project["id"]) is None
+
+
+def test_other_users_cannot_read_cached_project(client: TestClient, fake_db, auth_headers, project):
+    client.post("/auth/register", json={"username": "other", "password": "other", "email": "other@example.com"})
+    token = client.post("/auth/login", data={"username": "other", "password": "other"}).json()["access_token"]
+    response = client.get(f"/todos/{project['id']}", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 404
@@ -0,0 +1,92 @@
+"""
+Username index: users are found with one document get on usernames/{key},
+registration is create-if-absent, and legacy users (no index document yet)
+keep working through the username query until the backfill has run.
+"""
+import asyncio
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+
+from src.migrations.backfill_username_index import backfill_username_index
+from src.services import auth_service_firestore_async, security
+from src.services.firestore_common import username_key
+
+
+def _seed_legacy_user(fake_db, user_id, username, created_at=None):
+    fake_db.collection("users").document(user_id).set({
+        "username": username,
+        "email": f"{username}@example.com",
+        "hashed_password": security.get_password_hash("pw"),
+        "created_at": created_at or datetime(2024, 1, 1),
+        "updated_at": created_at or datetime(2024, 1, 1),
+    })
+
+
+def test_username_key_is_exact_and_escaped():
+    # Usernames stay case-sensitive, as in the fallback query and the SQLite engine
+    assert username_key("Alice") != username_key("alice")
+    assert "/" not in username_key("a/b")
+    assert username_key("..") != ".." and not username_key("__x__").startswith("__")
+
+
+def test_login_is_a_single_document_get(client: TestClient, fake_db):
+    client.post("/auth/register", json={"username": "indexed", "password": "pw", "email": "i@example.com"})
+    fake_db.reset_counts()
+    response = client.post("/auth/login", data={"username": "indexed", "password": "pw"})
+    assert response.status_code == 200
+    assert [kind for kind, _, _ in fake_db.operations] == ["get"]
+
+
+def test_register_rejects_taken_usernames_case_sensitively(client: TestClient, fake_db):
+    first = client.post("/auth/register", json={"username": "Casey", "password": "pw", "email": "c@example.com"})
+    second = client.post("/auth/register", json={"username": "Casey", "password": "pw", "email": "c@example.com"})
+    other = client.post("/auth/register", json={"username": "casey", "password": "pw", "email": "c@example.com"})
+    assert first.status_code == 201
+    assert second.status_code == 400
+    # Same rule as the SQLite engine's unique index: a different case is a different account
+    assert other.status_code == 201
+    assert len(fake_db.collection("users").get()) == 2
+
+
+def test_create_user_is_create_if_absent(fake_db, monkeypatch):
+    # No fallback query: the create precondition on the index document alone must reject the duplicate
+    monkeypatch.setattr(auth_service_firestore_async, "LEGACY_USERNAME_FALLBACK", False)
+    created = asyncio.run(auth_service_firestore_async.create_user("race", "r@example.com", "hash"))
+    duplicate = asyncio.run(auth_service_firestore_async.create_user("race", "r@example.com", "hash"))
+    assert created is not None
+    assert duplicate is None
+    assert len(fake_db.collection("users").get()) == 1
+
+
+def test_legacy_user_logs_in_through_fallback_and_after_backfill(client: TestClient, fake_db, monkeypatch):
+    _seed_legacy_user(fake_db, "legacy-id", "legacy")
+    assert client.post("/auth/login", data={"username": "legacy", "password": "pw"}).status_code == 200
+    # The fallback query also keeps the legacy username from being registered again
+    duplicate = client.post("/auth/register", json={"username": "legacy", "password": "pw", "email": "x@example.com"})
+    assert duplicate.status_code == 400
+
+    assert backfill_username_index(fake_db) == (1, [])
+    monkeypatch.setattr(auth_service_firestore_async, "LEGACY_USERNAME_FALLBACK", False)
+    response = client.post("/auth/login", data={"username": "legacy", "password": "pw"})
+    assert response.status_code == 200
+    index_doc = fake_db.collection("usernames").document(username_key("legacy")).get()
+    assert index_doc.to_dict()["id"] == "legacy-id"
+
+
+def test_backfill_reports_conflicts_and_supports_dry_run(fake_db):
+    _seed_legacy_user(fake_db, "first", "dup", created_at=datetime(2024, 1, 1))
+    _seed_legacy_user(fake_db, "second", "dup", created_at=datetime(2024, 2, 1))
+    assert backfill_username_index(fake_db, dry_run=True) == (1, ["dup"])
+    assert fake_db.collection("usernames").get() == []
+
+    assert backfill_username_index(fake_db) == (1, ["dup"])
+    assert fake_db.collection("usernames").document(username_key("dup")).get().to_dict()["id"] == "first"
+    assert backfill_username_index(fake_db) == (0, ["dup"])
+
+
+def test_delete_account_removes_index_document(client: TestClient, fake_db, auth_headers):
+    assert client.delete("/auth/me", headers=auth_headers).status_code == 200
+    assert fake_db.collection("usernames").get() == []
+    response = client.post("/auth/register", json={"username": "budget", "password": "pw", "email": "b@example.com"})
+    assert response.status_code == 201
@@ -23,6 +23,8 @@ import SkeletonToDoItem from '../components/SkeletonToDoItem';
 import {
   generateSubtasks,
   updateToDoItem,
+  batchUpdateToDoItems,
+  moveToDoItem,
   deleteToDoItem,
   deleteToDoList,
   updateToDoList,
@@ -62,6 +64,53 @@ const reorderChildren = (items, parentId, dragIndex, hoverIndex) => {
 };
 
 
+/**
+ * 드래그 앤 드롭 전후 트리를 비교하여 이동한 항목과 새 위치 계산.
+ * 한 형제 목록 안에서 항목 하나만 이동한 경우에만 결과를 반환.
+ * 
+ * @param {Array} originalItems - 이동 전 항목 배열
+ * @param {Array} reorderedItems - 이동 후 항목 배열
+ * @returns {Object|null} { itemId, afterId, beforeId } 또는 null
+ */
+const findMovedItem = (originalItems, reorderedItems) => {
+  const changes = [];
+  const compare = (before, after) => {
+    const beforeIds = before.map(item => item.id);
+    const afterIds = after.map(item => item.id);
+    if (beforeIds.join() !== afterIds.join()) {
+      changes.push({ beforeIds, afterIds });
+    }
+    after.forEach(item => {
+      if (item.children?.length) {
+        const original = before.find(o => o.id === item.id);
+        compare(original?.children || [], item.children);
+      }
+    });
+  };
+  compare(originalItems, reorderedItems);
+  if (changes.length !== 1) return null;
+
+  const { beforeIds, afterIds } = changes[0];
+  if (beforeIds.length !== afterIds.length) return null;
+  const first = afterIds.findIndex((id, index) => id !== beforeIds[index]);
+  let last = afterIds.length - 1;
+  while (afterIds[last] === beforeIds[last]) last--;
+
+  // 위로 이동했으면 first 위치, 아래로 이동했으면 last 위치에 이동한 항목이 있음
+  const movedIndex = afterIds[first] === beforeIds[last] ? first : last;
+  const movedId = afterIds[movedIndex];
+  const expected = beforeIds.filter(id => id !== movedId);
+  expected.splice(movedIndex, 0, movedId);
+  if (expected.join() !== afterIds.join()) return null;
+
+  return {
+    itemId: movedId,
+    afterId: afterIds[movedIndex - 1] ?? null,
+    beforeId: afterIds[movedIndex + 1] ?? null,
+  };
+};
+
+
 /**
  * 트리 구조에서 특정 ID의 항목 검색.
  * 
@@ -339,11 +388,10 @@ function HomePage({ project, setProjects, triggerRefetch, onOpenQuickAdd }) {
       
       const changedItems = collectChangedItems(originalItems, projectRef.current.items);
       
-      // 변경된 모든 항목 업데이트 (부모 포함)
-      const promises = changedItems.map(item =>
-        updateToDoItem(item.id, { is_completed: item.is_completed })
-      );
-      await Promise.all(promises);
+      // 변경된 모든 항목 일괄 업데이트 (부모 포함)
+      if (changedItems.length) {
+        await batchUpdateToDoItems(changedItems);
+      }
       
       // 성공 시 글로벌 상태도 업데이트
       updateGlobalProjectState(projectRef.current);
@@ -386,10 +434,9 @@ function HomePage({ project, setProjects, triggerRefetch, onOpenQuickAdd }) {
       const allItemsToUpdate = collectAllItems(currentState.items);
       
       // 순서 일괄 저장
-      const orderPromises = allItemsToUpdate.map(item =>
-        updateToDoItem(item.id, { order: item.order })
-      );
-      await Promise.all(orderPromises);
+      if (allItemsToUpdate.length) {
+        await batchUpdateToDoItems(allItemsToUpdate);
+      }
       
       // 최종 글로벌 상태 업데이트
       updateGlobalProjectState(currentState);
@@ -608,12 +655,18 @@ function HomePage({ project, setProjects, triggerRefetch, onOpenQuickAdd }) {
     };
     
     const allItemsToUpdate = collectAllItems(reorderedItems);
+    const movedItem = findMovedItem(project.items, currentProject.items);
 
     try {
-      const updatePromises = allItemsToUpdate.map(item =>
-        updateToDoItem(item.id, { order: item.order })
-      );
-      await Promise.all(updatePromises);
+      if (movedItem) {
+        // 단일 항목 이동: 이동한 항목 하나만 저장
+        await moveToDoItem(movedItem.itemId, {
+          after_id: movedItem.afterId,
+          before_id: movedItem.beforeId,
+        });
+      } else if (allItemsToUpdate.length) {
+        await batchUpdateToDoItems(allItemsToUpdate);
+      }
       updateGlobalProjectState({ ...currentProject, items: reorderedItems });
       toast.success('순서가 저장되었습니다.');
     } catch (err) {
@@ -76,6 +76,33 @@ export const updateToDoItem = async (itemId, updateData) => {
 };
 
 
+/**
+ * 여러 할 일 아이템 일괄 업데이트.
+ * 드래그 앤 드롭 순서 저장, 완료 상태 연쇄 변경 등에 사용.
+ * 
+ * @param {Array<Object>} updates - 업데이트 목록 (각 항목: { id, ...변경 필드 })
+ * @returns {Promise<Array>} 항목별 결과 ({ id, status })
+ */
+export const batchUpdateToDoItems = async (updates) => {
+  const response = await api.post('/todos/items:batch', updates);
+  return response.data;
+};
+
+
+/**
+ * 할 일 아이템 이동.
+ * 이동 후 바로 앞/뒤에 올 형제 ID만 전달하면 서버가 이동한 항목 하나만 저장.
+ * 
+ * @param {string} itemId - 이동할 아이템 ID
+ * @param {Object} position - 새 위치 ({ after_id, before_id, parent_id? })
+ * @returns {Promise<Object>} 이동된 아이템
+ */
+export const moveToDoItem = async (itemId, position) => {
+  const response = await api.post(`/todos/items/${itemId}/move`, position);
+  return response.data;
+};
+
+
 /**
  * 할 일 아이템 삭제 (자식 포함).
  * 